@@ -2,15 +2,19 @@
 
 from app.crud import analysis
 from fastapi import APIRouter, Depends, Query, Request, Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.db import get_db
-from app.cache import cache
+from app.db import get_read_db
+from app.cache import cache, cache_per_item
+from app.config import settings
+from app.responses import model_response
 from app.exceptions import PlayerNotFoundException, InvalidInputException
+from app.services import player_index
 import datetime
 
 
@@ -29,6 +33,18 @@ class StreakDefinition(str, Enum):
 # --- 進階分析 API 端點 ---
 
 
+def _resolve_player_names(player_names: Optional[List[str]]) -> List[str]:
+    """批次端點未指定球員時，預設查詢設定檔中的目標球員。"""
+    return player_names or settings.TARGET_PLAYER_NAMES
+
+
+def _to_situational_at_bat_detail(at_bat_row: Row) -> schemas.SituationalAtBatDetail:
+    """將情境打席查詢的 Row 轉換為包含比賽日期與對手的情境打席模型。"""
+    return schemas.SituationalAtBatDetail(
+        **at_bat_row._mapping, opponent_team=analysis.opponent_team_of(at_bat_row)
+    )
+
+
 @router.get(
     "/games-with-players",
     # [修改] 更新 response_model 為包含 player_summaries 的模型
@@ -40,11 +56,13 @@ def get_games_with_players(
     players: List[str] = Query(..., description="球員姓名列表"),
     skip: int = Query(0, ge=0, description="要跳過的紀錄數量"),
     limit: int = Query(100, ge=1, le=200, description="每頁回傳的最大紀錄數量"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """查詢指定的所有球員同時出賽的比賽列表。"""
     games = analysis.find_games_with_players(db, players, skip=skip, limit=limit)
-    return games
+    return model_response(
+        List[schemas.GameResultWithDetails], games, from_attributes=True
+    )
 
 
 @router.get(
@@ -52,14 +70,18 @@ def get_games_with_players(
     response_model=schemas.LastHomerunStats,
 )
 @cache()
-def get_last_homerun(request: Request, player_name: str, db: Session = Depends(get_db)):
+def get_last_homerun(
+    request: Request, player_name: str, db: Session = Depends(get_read_db)
+):
     """查詢指定球員的最後一轟，並回傳擴充後的統計數據。"""
+    if not player_index.is_known_player(db, player_name):
+        raise PlayerNotFoundException(message=f"Player '{player_name}' not found")
     stats = analysis.get_stats_since_last_homerun(db, player_name)
     if not stats:
         raise PlayerNotFoundException(
             message=f"Player '{player_name}' not found or has no home run records"
         )
-    return stats
+    return model_response(schemas.LastHomerunStats, stats, from_attributes=True)
 
 
 @router.get(
@@ -73,27 +95,24 @@ def get_situational_at_bats(
     situation: models.RunnersSituation,
     skip: int = Query(0, ge=0, description="要跳過的紀錄數量"),
     limit: int = Query(100, ge=1, le=200, description="每頁回傳的最大紀錄數量"),
-    db: Session = Depends(get_db),
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
+    db: Session = Depends(get_read_db),
 ):
     """根據指定的壘上情境，查詢球員的打席紀錄。"""
+    # [新增] 不存在的球員不會有任何紀錄，直接回傳空列表
+    if not player_index.is_known_player(db, player_name):
+        return []
     at_bats = analysis.find_at_bats_in_situation(
-        db, player_name, situation, skip=skip, limit=limit
+        db, player_name, situation, skip=skip, limit=limit, detail=detail
     )
 
-    results = []
-    for ab in at_bats:
-        game = ab.player_summary.game
-        player_team = ab.player_summary.team_name
-        opponent_team = (
-            game.away_team if game.home_team == player_team else game.home_team
-        )
-        base_at_bat = schemas.AtBatDetail.model_validate(ab)
-        result_data = base_at_bat.model_dump()
-        result_data["game_date"] = game.game_date
-        result_data["opponent_team"] = opponent_team
-        results.append(schemas.SituationalAtBatDetail(**result_data))
-
-    return results
+    return model_response(
+        List[schemas.SituationalAtBatDetail],
+        [_to_situational_at_bat_detail(ab) for ab in at_bats],
+    )
 
 
 @router.get(
@@ -108,7 +127,7 @@ def get_position_records(
         ..., ge=2000, le=datetime.date.today().year + 1, description="查詢的年份"
     ),
     position: str = Path(..., description="查詢的守備位置 (例如: 2B, SS)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     查詢指定年度與守備位置的深入分析數據，包含：
@@ -120,7 +139,9 @@ def get_position_records(
     analysis_data = analysis.get_position_analysis_by_year(
         db, year=year, position=position
     )
-    return analysis_data
+    return model_response(
+        schemas.PositionAnalysisResponse, analysis_data, from_attributes=True
+    )
 
 
 @router.get(
@@ -133,13 +154,15 @@ def get_next_at_bats_after_ibb(
     player_name: str,
     skip: int = Query(0, ge=0, description="要跳過的紀錄數量"),
     limit: int = Query(100, ge=1, le=200, description="每頁回傳的最大紀錄數量"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """查詢指定球員被故意四壞後，下一位打者的打席結果。"""
+    if not player_index.is_known_player(db, player_name):
+        return []
     results = analysis.find_next_at_bats_after_ibb(
         db, player_name, skip=skip, limit=limit
     )
-    return results
+    return model_response(List[schemas.NextAtBatResult], results, from_attributes=True)
 
 
 @router.get(
@@ -151,7 +174,7 @@ def get_next_at_bats_after_ibb(
 @cache()
 def get_on_base_streaks(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     definition_name: StreakDefinition = Query(
         StreakDefinition.consecutive_on_base, description="要使用的連線定義"
     ),
@@ -164,6 +187,10 @@ def get_on_base_streaks(
     ),
     skip: int = Query(0, ge=0, description="要跳過的紀錄數量"),
     limit: int = Query(100, ge=1, le=200, description="每頁回傳的最大紀錄數量"),
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
 ):
     """
     查詢符合「連線」定義的打席序列。
@@ -184,8 +211,9 @@ def get_on_base_streaks(
         lineup_positions=lineup_positions,
         skip=skip,
         limit=limit,
+        detail=detail,
     )
-    return streaks
+    return model_response(List[schemas.OnBaseStreak], streaks)
 
 
 @router.get(
@@ -200,12 +228,119 @@ def get_ibb_impact_analysis(
     player_name: str,
     skip: int = Query(0, ge=0, description="要跳過的紀錄數量"),
     limit: int = Query(100, ge=1, le=200, description="每頁回傳的最大紀錄數量"),
-    db: Session = Depends(get_db),
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
+    db: Session = Depends(get_read_db),
 ):
     """
     查詢指定球員被故意四壞後，該半局後續所有打席的紀錄與總失分。
     """
+    if not player_index.is_known_player(db, player_name):
+        return []
     results = analysis.analyze_ibb_impact(
-        db, player_name=player_name, skip=skip, limit=limit
+        db, player_name=player_name, skip=skip, limit=limit, detail=detail
+    )
+    return model_response(List[schemas.IbbImpactResult], results)
+
+
+# --- 批次分析 API 端點 ---
+# [新增] 一次查詢多位球員，每項分析只執行一次集合式查詢；快取以球員為單位，
+# 不同批次組合之間可以重複利用已快取的球員結果。
+
+
+@router.get(
+    "/players/last-homerun",
+    response_model=Dict[str, Optional[schemas.LastHomerunStats]],
+    summary="批次查詢多位球員的最後一轟",
+)
+def get_last_homerun_for_players(
+    player_names: Optional[List[str]] = Query(
+        None,
+        alias="player_name",
+        description="球員姓名列表，未指定時使用設定檔中的目標球員",
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """批次查詢多位球員的最後一轟；沒有全壘打紀錄的球員其值為 null。"""
+    return cache_per_item(
+        get_last_homerun_for_players,
+        _resolve_player_names(player_names),
+        params={},
+        compute=lambda names: {
+            name: schemas.LastHomerunStats.model_validate(stats) if stats else None
+            for name, stats in analysis.get_stats_since_last_homerun_for_players(
+                db, names
+            ).items()
+        },
+    )
+
+
+@router.get(
+    "/players/situational-at-bats",
+    response_model=Dict[str, List[schemas.SituationalAtBatDetail]],
+    summary="批次查詢多位球員的情境打席",
+)
+def get_situational_at_bats_for_players(
+    situation: models.RunnersSituation,
+    player_names: Optional[List[str]] = Query(
+        None,
+        alias="player_name",
+        description="球員姓名列表，未指定時使用設定檔中的目標球員",
+    ),
+    skip: int = Query(0, ge=0, description="每位球員要跳過的紀錄數量"),
+    limit: int = Query(100, ge=1, le=200, description="每位球員回傳的最大紀錄數量"),
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """根據指定的壘上情境，批次查詢多位球員的打席紀錄 (分頁套用於每位球員)。"""
+    return cache_per_item(
+        get_situational_at_bats_for_players,
+        _resolve_player_names(player_names),
+        params={
+            "situation": situation.value,
+            "skip": skip,
+            "limit": limit,
+            "detail": detail.value,
+        },
+        compute=lambda names: {
+            name: [_to_situational_at_bat_detail(ab) for ab in at_bats]
+            for name, at_bats in analysis.find_at_bats_in_situation_for_players(
+                db, names, situation, skip=skip, limit=limit, detail=detail
+            ).items()
+        },
+    )
+
+
+@router.get(
+    "/players/ibb-impact",
+    response_model=Dict[str, List[schemas.IbbImpactResult]],
+    summary="批次分析多位球員故意四壞的失分影響",
+)
+def get_ibb_impact_analysis_for_players(
+    player_names: Optional[List[str]] = Query(
+        None,
+        alias="player_name",
+        description="球員姓名列表，未指定時使用設定檔中的目標球員",
+    ),
+    skip: int = Query(0, ge=0, description="每位球員要跳過的紀錄數量"),
+    limit: int = Query(100, ge=1, le=200, description="每位球員回傳的最大紀錄數量"),
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """批次查詢多位球員被故意四壞後，該半局後續所有打席的紀錄與總失分。"""
+    return cache_per_item(
+        get_ibb_impact_analysis_for_players,
+        _resolve_player_names(player_names),
+        params={"skip": skip, "limit": limit, "detail": detail.value},
+        compute=lambda names: analysis.analyze_ibb_impact_for_players(
+            db, names, skip=skip, limit=limit, detail=detail
+        ),
     )
-    return results
@@ -1,6 +1,6 @@
 # app/api/dashboard.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from app.api.dependencies import get_dashboard_service
 from app.schemas import DashboardResponse
@@ -25,8 +25,12 @@ router = APIRouter(
 )
 def get_today_dashboard(
     service: DashboardService = Depends(get_dashboard_service),
-) -> DashboardResponse:
+):
     """
     根據當日賽況，回傳對應的儀表板數據。
     """
+    # [新增] 優先回傳 worker 預先組合的當日快照；跨日後尚未產生快照時才即時查詢
+    snapshot = service.get_today_dashboard_snapshot()
+    if snapshot is not None:
+        return Response(content=snapshot, media_type="application/json")
     return service.get_today_dashboard_data()
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from fastapi import Security
 from fastapi.security import APIKeyHeader
 from app.config import Settings, settings  # 1. 匯入 settings 實例
-from app.db import SessionLocal
+from app.db import SessionLocal, get_read_db
 from app.exceptions import InvalidCredentialsException
 from app.services.dashboard import DashboardService
 
@@ -33,7 +33,7 @@ def get_db() -> Iterator[Session]:  # 4. 修正回傳型別提示
 
 
 def get_dashboard_service(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     settings: Settings = Depends(get_settings),
 ) -> DashboardService:
     """
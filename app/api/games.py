@@ -1,16 +1,18 @@
 # app/api/games.py
 
-from fastapi import APIRouter, Query, Depends, HTTPException, Request
+import gzip
+
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response
 import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
 from app import models, schemas
 from app.crud import games
-from app.db import get_db
+from app.db import get_read_db
 from app.config import settings
 from app.cache import cache
+from app.responses import model_response
 
 # [修改] 導入新的例外類別
 from app.exceptions import InvalidInputException, ResourceNotFoundException
@@ -66,7 +68,7 @@ def process_completed_only_param(
 def get_season_games(
     *,
     request: Request,  # [修正] 加入 request 參數供 cache 裝飾器使用
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     year: int = Query(
         default_factory=lambda: datetime.datetime.now().year,
         description="查詢的年份，預設為今年。",
@@ -102,7 +104,7 @@ def get_season_games(
 @router.get("/{game_date}", response_model=List[schemas.GameResult])
 def get_games_by_date(
     game_date: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     team_name: Optional[str] = Query(None, description="依特定隊伍名稱篩選比賽"),
 ):
     """
@@ -121,23 +123,69 @@ def get_games_by_date(
     )
 
     if team_name:
-        query = query.filter(
-            or_(
-                models.GameResultDB.home_team == team_name,
-                models.GameResultDB.away_team == team_name,
-            )
-        )
+        query = query.filter(games.involving_teams(db, [team_name]))
 
     return query.all()
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    [修正] 依 Accept-Encoding 的 q 值判斷客戶端是否接受 gzip (例如 "gzip;q=0" 代表拒絕)。
+
+    gzip (或 x-gzip) 未列出時採用 "*" 的 q 值；兩者皆未列出或 q 值無法解析時視為不接受。
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
 @router.get("/details/{game_id}", response_model=schemas.GameResultWithDetails)
-def get_game_details(game_id: int, db: Session = Depends(get_db)):
+def get_game_details(
+    request: Request,
+    game_id: int,
+    detail: models.AtBatDetailLevel = Query(
+        models.AtBatDetailLevel.SUMMARY,
+        description="打席詳細程度：summary 不含逐球紀錄與完整描述，full 包含全部欄位",
+    ),
+    db: Session = Depends(get_read_db),
+):
     """
     獲取單場比賽的完整細節，包含所有球員的摘要與逐打席紀錄。
     """
-    game = games.get_game_with_details(db, game_id)
+    # [新增] 優先回傳寫入時預先渲染的文件；客戶端支援 gzip 時直接回傳壓縮內容
+    document = games.get_game_detail_document(db, game_id, detail=detail)
+    if document is not None:
+        headers = {"Vary": "Accept-Encoding"}
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+        else:
+            document = gzip.decompress(document)
+        return Response(
+            content=document, media_type="application/json", headers=headers
+        )
+
+    game = games.get_game_with_details(db, game_id, detail=detail)
     if not game:
         # [修改] 改用自訂例外
         raise ResourceNotFoundException(message=f"Game with ID {game_id} not found.")
-    return game
+    return model_response(
+        schemas.GameResultWithDetails,
+        game,
+        from_attributes=True,
+        context={"detail": detail},
+    )
@@ -2,11 +2,18 @@
 
 import logging
 import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from typing import Optional
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
+from app import schemas
 from app.api.dependencies import get_api_key
+from app.config import settings
+from app.db import get_db
+from app.responses import model_response
+from app.services import crawl_planner
+from app.services.dashboard import taipei_today
 
 # [修改] 導入新的例外類別
 from app.exceptions import InvalidInputException
@@ -17,6 +24,7 @@ from app.workers import (
     task_scrape_single_day,
     task_scrape_entire_month,
     task_scrape_entire_year,
+    task_run_crawl_plan,
 )
 
 logger = logging.getLogger(__name__)
@@ -76,3 +84,45 @@ def update_schedule_manually():
     task_update_schedule_and_reschedule.send()
     logger.info("Main app: Task sent successfully, returning API response immediately.")
     return {"message": "Schedule update task has been successfully sent to the queue."}
+
+
+@router.get(
+    "/api/crawl_plan",
+    response_model=schemas.CrawlPlanResponse,
+    summary="預覽補爬計畫 (dry-run)",
+    description="""
+    比對最近一次由賽程頁寫入的整季賽程 (season_schedule_games) 與比賽紀錄 (game_results)，
+    列出需要重新抓取的目標球隊比賽：
+    缺少紀錄、狀態未完成，或已完成但目標球隊沒有任何打席紀錄。此端點不會分派任何任務。
+
+    - **year**: 賽季年份，預設為今年 (台北時間)。
+    """,
+)
+def get_crawl_plan(
+    year: Optional[int] = Query(
+        None, ge=1990, description="檢查的賽季年份，預設為今年。"
+    ),
+    db: Session = Depends(get_db),
+):
+    """[新增] 回傳補爬計畫的 dry-run 報告。"""
+    today = taipei_today()
+    plan = crawl_planner.build_crawl_plan(
+        db, year or today.year, settings.get_target_teams_as_list(), today
+    )
+    return model_response(
+        schemas.CrawlPlanResponse, schemas.CrawlPlanResponse.model_validate(plan)
+    )
+
+
+@router.post("/api/crawl_plan", status_code=202)
+def run_crawl_plan(
+    year: Optional[int] = Query(
+        None, ge=1990, description="補爬的賽季年份，預設為今年。"
+    ),
+):
+    """[新增] 分派補爬計畫任務，只抓取計畫中列出的比賽。"""
+    year_str = str(year) if year else None
+    task_run_crawl_plan.send(year_str)
+    return {
+        "message": f"Crawl plan task for ({year_str or 'this year'}) has been sent to the queue."
+    }
@@ -0,0 +1,60 @@
+# app/api/leaderboards.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.crud import leaderboards
+from app.db import get_read_db
+from app.responses import model_response
+from app.services.dashboard import taipei_today
+
+router = APIRouter(
+    prefix="/api/leaderboards",
+    tags=["Leaderboards"],
+)
+
+
+@router.get(
+    "",
+    response_model=schemas.LeaderboardResponse,
+    summary="取得全聯盟打擊排行榜",
+    description="""
+    回傳指定數據項目的前 K 名球員，名次於球季數據更新時預先排序。
+
+    - **stat**: 數據項目，例如 ops、avg、homeruns。
+    - **qualified**: 是否只列入達規定打席 (每場球隊比賽 3.1 打席) 的球員；
+      未指定時，比率數據 (avg / obp / slg / ops) 預設為 true，計數數據預設為 false。
+    - **team**: 只列出指定球隊的球員 (名次仍為全聯盟名次)。
+    """,
+)
+def get_leaderboard(
+    stat: models.LeaderboardStat = Query(
+        models.LeaderboardStat.OPS, description="排行的數據項目"
+    ),
+    season: Optional[int] = Query(
+        None, ge=1990, description="查詢的賽季年份，預設為今年。"
+    ),
+    qualified: Optional[bool] = Query(None, description="是否只列入達規定打席的球員"),
+    team: Optional[str] = Query(None, description="球隊名稱"),
+    limit: int = Query(10, ge=1, le=100, description="回傳的名次數量"),
+    db: Session = Depends(get_read_db),
+):
+    """查詢指定賽季、數據項目的排行榜前 K 名。"""
+    if season is None:
+        season = taipei_today().year
+    if qualified is None:
+        qualified = stat in models.LEADERBOARD_RATE_STATS
+    return model_response(
+        schemas.LeaderboardResponse,
+        leaderboards.get_leaderboard(
+            db,
+            season=season,
+            stat=stat,
+            limit=limit,
+            qualified_only=qualified,
+            team_name=team,
+        ),
+    )
@@ -6,10 +6,13 @@ from fastapi import Depends
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app.db import get_db
+from app.crud import dimensions, players as crud_players
+from app.db import get_read_db
+from app.responses import model_response
+from app.services import player_index
 import datetime
 
-from app.exceptions import PlayerNotFoundException
+from app.exceptions import InvalidInputException, PlayerNotFoundException
 
 
 router = APIRouter(
@@ -18,12 +21,32 @@ router = APIRouter(
 )
 
 
+@router.get(
+    "/search",
+    response_model=List[schemas.PlayerSearchResult],
+    summary="球員名稱搜尋 (自動完成)",
+)
+def search_players(
+    db: Session = Depends(get_read_db),
+    q: str = Query(
+        ...,
+        min_length=1,
+        description="名稱、名字、拼音 (全拼或首字母) 或注音的開頭，忽略大小寫與聲調",
+        examples=["王", "bairong", "wbr", "ㄨㄤ"],
+    ),
+    limit: int = Query(10, ge=1, le=50, description="回傳的最大筆數"),
+):
+    """以行程內的球員名稱索引進行前綴搜尋，不需查詢資料庫。"""
+    names = player_index.get_player_index(db).search(q, limit=limit)
+    return [{"name": name} for name in names]
+
+
 @router.get(
     "/stats/history",
     response_model=Dict[str, List[schemas.PlayerSeasonStatsHistory]],
 )
 def get_player_stats_history(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     player_names: List[str] = Query(
         ...,
         alias="player_name",
@@ -38,8 +61,14 @@ def get_player_stats_history(
 
     回傳格式為一個字典，key 為球員姓名，value 為該球員的數據歷史列表。
     """
+    # [新增] 所有球員皆不存在時直接回傳 404，不進行資料庫查詢
+    if not any(player_index.is_known_player(db, name) for name in player_names):
+        raise PlayerNotFoundException()
+
+    # [修改] 以快取的名稱 -> player_id 對應查詢整數索引
+    player_ids = dimensions.resolve_player_ids(db, player_names)
     query = db.query(models.PlayerSeasonStatsHistoryDB).filter(
-        models.PlayerSeasonStatsHistoryDB.player_name.in_(player_names)
+        models.PlayerSeasonStatsHistoryDB.player_id.in_(player_ids)
     )
 
     if start_date:
@@ -60,7 +89,7 @@ def get_player_stats_history(
         # 為了提供更精確的錯誤，可以檢查資料庫中是否存在這些球員的任何紀錄
         found_players_count = (
             db.query(models.PlayerSeasonStatsHistoryDB.id)
-            .filter(models.PlayerSeasonStatsHistoryDB.player_name.in_(player_names))
+            .filter(models.PlayerSeasonStatsHistoryDB.player_id.in_(player_ids))
             .limit(1)
             .count()
         )
@@ -74,3 +103,143 @@ def get_player_stats_history(
         grouped_results[record.player_name].append(record)
 
     return grouped_results
+
+
+# --- [新增] 進階數據 (Advanced Metrics) ---
+
+
+@router.get(
+    "/advanced-stats",
+    response_model=schemas.AdvancedStatsResponse,
+    summary="取得球員進階數據 (wOBA、ISO、BABIP、K%、BB%、OPS+)",
+)
+def get_players_advanced_stats(
+    db: Session = Depends(get_read_db),
+    player_names: Optional[List[str]] = Query(
+        None,
+        alias="player_name",
+        description="要查詢的球員姓名，未指定時回傳所有球員",
+    ),
+    season: int = Query(
+        default_factory=lambda: datetime.date.today().year,
+        description="查詢的賽季年份，預設為今年。",
+    ),
+    split: models.StatSplit = Query(
+        models.StatSplit.SEASON,
+        description="數據分項：season、home 或 away (主 / 客場分項只涵蓋目標球隊的球員)",
+    ),
+    min_pa: int = Query(0, ge=0, description="最少打席數"),
+):
+    """
+    回傳 worker 預先計算並儲存的進階數據，依 wOBA 由高至低排序，
+    並附上該季用於縮放 wOBA 與計算 OPS+ 的聯盟常數。
+    """
+    league = crud_players.get_league_batting_constants(db, season)
+    advanced_stats = crud_players.get_player_advanced_stats(
+        db,
+        season=season,
+        split=split,
+        player_names=player_names,
+        min_plate_appearances=min_pa,
+    )
+    return model_response(
+        schemas.AdvancedStatsResponse,
+        {
+            "season": season,
+            "split": split.value,
+            "league": league,
+            "players": advanced_stats,
+        },
+        from_attributes=True,
+    )
+
+
+# --- 逐場紀錄 (Game Log) ---
+
+# 滾動區間的場數上限與可同時查詢的區間數量上限，避免產生過多的窗口欄位
+GAME_LOG_MAX_WINDOW_SIZE = 60
+GAME_LOG_MAX_WINDOWS = 5
+
+
+def _validate_game_log_windows(windows: List[int]) -> List[int]:
+    """檢查並正規化滾動區間參數 (去除重複並排序)。"""
+    normalized = sorted(set(windows))
+    if len(normalized) > GAME_LOG_MAX_WINDOWS:
+        raise InvalidInputException(
+            message=f"At most {GAME_LOG_MAX_WINDOWS} windows can be requested at once."
+        )
+    if any(n < 1 or n > GAME_LOG_MAX_WINDOW_SIZE for n in normalized):
+        raise InvalidInputException(
+            message=f"Each window must be between 1 and {GAME_LOG_MAX_WINDOW_SIZE} games."
+        )
+    return normalized
+
+
+@router.get(
+    "/game-log",
+    response_model=Dict[str, List[schemas.PlayerGameLogEntry]],
+    summary="批次取得多位球員的逐場紀錄與滾動數據",
+)
+def get_players_game_logs(
+    db: Session = Depends(get_read_db),
+    player_names: List[str] = Query(
+        ...,
+        alias="player_name",
+        description="要查詢的一個或多個球員姓名",
+        examples=["王柏融", "陳傑憲"],
+    ),
+    year: int = Query(
+        default_factory=lambda: datetime.date.today().year,
+        description="查詢的年份，預設為今年。",
+    ),
+    windows: List[int] = Query(
+        [7, 15], description="滾動區間的場數，可重複指定，例如 windows=7&windows=15"
+    ),
+):
+    """
+    一次取得**一個或多個**球員在指定年度的逐場紀錄。
+
+    每一場都會附上截至該場的球季累積數據，以及各個「近 N 場」的滾動 AVG/OBP/SLG/OPS，
+    所有球員與所有區間皆在單一查詢中計算完成。
+    """
+    normalized_windows = _validate_game_log_windows(windows)
+    game_logs = crud_players.get_player_game_logs(
+        db, player_names=player_names, year=year, windows=normalized_windows
+    )
+    if not game_logs:
+        raise PlayerNotFoundException(
+            message=f"No game logs found for the requested players in {year}."
+        )
+    return game_logs
+
+
+@router.get(
+    "/{player_name}/game-log",
+    response_model=List[schemas.PlayerGameLogEntry],
+    summary="取得單一球員的逐場紀錄與滾動數據",
+)
+def get_player_game_log(
+    player_name: str,
+    db: Session = Depends(get_read_db),
+    year: int = Query(
+        default_factory=lambda: datetime.date.today().year,
+        description="查詢的年份，預設為今年。",
+    ),
+    windows: List[int] = Query(
+        [7, 15], description="滾動區間的場數，可重複指定，例如 windows=7&windows=15"
+    ),
+):
+    """
+    取得指定球員在指定年度的逐場紀錄，附帶球季累積與「近 N 場」滾動數據。
+    """
+    normalized_windows = _validate_game_log_windows(windows)
+    if not player_index.is_known_player(db, player_name):
+        raise PlayerNotFoundException(message=f"Player '{player_name}' not found.")
+    game_logs = crud_players.get_player_game_logs(
+        db, player_names=[player_name], year=year, windows=normalized_windows
+    )
+    if player_name not in game_logs:
+        raise PlayerNotFoundException(
+            message=f"Player '{player_name}' has no game logs in {year}."
+        )
+    return game_logs[player_name]
@@ -0,0 +1,46 @@
+# app/api/standings.py
+
+import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.crud import standings
+from app.db import get_read_db
+from app.responses import model_response
+from app.services.dashboard import taipei_today
+
+router = APIRouter(
+    prefix="/api/standings",
+    tags=["Standings"],
+)
+
+
+@router.get(
+    "",
+    response_model=schemas.StandingsResponse,
+    summary="取得球隊戰績排行",
+    description="""
+    由戰績帳本回傳各隊的賽季戰績，包含勝率、勝差、近十場、連勝敗、主客場戰績與得失分差。
+
+    - **season**: 賽季年份，預設為今年 (台北時間)。
+    - **as_of**: 截止日期，回傳該日 (含) 之前的戰績；未指定時為最新戰績。
+    """,
+)
+def get_standings(
+    season: Optional[int] = Query(
+        None, ge=1990, description="查詢的賽季年份，預設為今年。"
+    ),
+    as_of: Optional[datetime.date] = Query(
+        None, description="戰績計算的截止日期 (YYYY-MM-DD)"
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """查詢指定賽季截至指定日期的戰績排行。"""
+    if season is None:
+        season = as_of.year if as_of else taipei_today().year
+    return model_response(
+        schemas.StandingsResponse, standings.get_standings(db, season, as_of=as_of)
+    )
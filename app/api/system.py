@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.db import get_db
+from app.services import player_index, read_snapshot
 from app.workers import task_e2e_workflow_test, task_run_daily_crawl
 
 # [修改] 導入新的例外類別
@@ -75,6 +76,11 @@ def clear_analysis_cache():
     """
     清除所有由 app.cache 模組產生的快取。
     """
+    # [新增] worker 寫入新資料後會呼叫此端點，一併讓行程內的球員名稱索引重新載入
+    player_index.invalidate()
+    # [新增] 並立即檢查是否有新的唯讀快照
+    read_snapshot.invalidate()
+
     if not redis_client:
         logging.warning("Redis client is not available, cannot clear cache.")
         return {"message": "Redis client not available. Cache not cleared."}
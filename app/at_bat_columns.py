@@ -0,0 +1,515 @@
+# app/at_bat_columns.py
+
+# 【新增】打席事件的欄式快照 (columnar snapshot)。
+#
+# worker 在每次爬蟲後，將每個賽季的打席事件依欄位各自存成 .npy，打包為壓縮的 .npz
+# 寫入資料庫 (at_bat_column_snapshots)；web 行程第一次用到某個版本時解壓縮至本機目錄，
+# 再以 mmap 唯讀載入，多個 uvicorn worker 共用作業系統的同一份 page cache，
+# 不需各自從資料庫讀取整季的歷史打席。快照發布之後新增的打席 (當日增量)
+# 才會從資料庫補讀。
+#
+# [修正] 快照改存放於資料庫，web 與 worker 不需共用檔案系統。
+#
+# 本機目錄結構 (web 端的解壓縮快取)：
+#   <AT_BAT_COLUMNS_DIR>/<season>/<version>/*.npy  各欄位陣列
+
+import datetime
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 欄位名稱與其 dtype；排序即為快照內的列順序 (比賽、局數、打席順序)
+COLUMN_DTYPES = {
+    "at_bat_id": np.int64,
+    "game_id": np.int32,
+    "game_date": np.int32,  # date.toordinal()
+    "player_idx": np.int32,  # player_vocabulary 的索引 (並非 players 表的 ID)
+    "inning": np.int16,
+    "is_bottom": np.bool_,  # 打者屬於主隊，即下半局
+    "sequence_in_game": np.int32,
+    "outs_before": np.int8,  # 未知時為 -1
+    "base_state": np.int8,  # 一壘=1、二壘=2、三壘=4 的位元組合，未知時為 -1
+    "result_code": np.int16,  # result_vocabulary 的索引，未知時為 -1
+    "runs_scored": np.int16,
+}
+
+_BASE_BITS = {"一壘": 1, "二壘": 2, "三壘": 4}
+
+
+def encode_base_state(runners_on_base: Optional[str]) -> int:
+    """將 runners_on_base_before 的文字描述轉換為壘包位元組合。"""
+    if not runners_on_base:
+        return -1
+    if runners_on_base == "壘上無人":
+        return 0
+    state = 0
+    for base, bit in _BASE_BITS.items():
+        if base in runners_on_base:
+            state |= bit
+    return state if state else -1
+
+
+class AtBatColumns:
+    """一組依比賽順序排列的打席事件欄位，以及結果與球員的字典編碼表。"""
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        result_vocabulary: List[str],
+        player_vocabulary: List[str],
+        max_at_bat_id: int,
+    ):
+        self.columns = columns
+        self.result_vocabulary = result_vocabulary
+        self.player_vocabulary = player_vocabulary
+        self.max_at_bat_id = max_at_bat_id
+
+    def __len__(self) -> int:
+        return len(self.columns["at_bat_id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def result_mask(self, results: Iterable[str]) -> np.ndarray:
+        """回傳結果屬於指定集合的布林遮罩。"""
+        results = set(results)
+        codes = [
+            i for i, result in enumerate(self.result_vocabulary) if result in results
+        ]
+        return np.isin(self["result_code"], codes)
+
+
+# --- 從資料庫建立欄位 ---
+
+
+def _select_at_bat_events() -> sa.Select:
+    """建立打席事件查詢，排序與「連線」分析相同 (比賽、局數、打席順序)。"""
+    return (
+        select(
+            models.AtBatDetailDB.id,
+            models.AtBatDetailDB.game_id,
+            models.GameResultDB.game_date,
+            models.PlayerGameSummaryDB.player_name,
+            (
+                models.PlayerGameSummaryDB.team_name == models.GameResultDB.home_team
+            ).label("is_bottom"),
+            models.AtBatDetailDB.inning,
+            models.AtBatDetailDB.sequence_in_game,
+            models.AtBatDetailDB.outs_before,
+            models.AtBatDetailDB.runners_on_base_before,
+            models.AtBatDetailDB.result_short,
+            models.AtBatDetailDB.runs_scored_on_play,
+        )
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .join(
+            models.GameResultDB,
+            models.AtBatDetailDB.game_id == models.GameResultDB.id,
+        )
+        .order_by(
+            models.AtBatDetailDB.game_id,
+            models.AtBatDetailDB.inning,
+            models.AtBatDetailDB.sequence_in_game,
+            models.AtBatDetailDB.id,
+        )
+    )
+
+
+def _encode(values: List[Optional[str]], vocabulary: Dict[str, int]) -> List[int]:
+    """字典編碼：新值依出現順序加入 vocabulary，None 編碼為 -1。"""
+    return [
+        -1 if value is None else vocabulary.setdefault(value, len(vocabulary))
+        for value in values
+    ]
+
+
+def build_columns(rows: List[sa.Row]) -> AtBatColumns:
+    """將打席事件查詢結果轉換為欄式陣列。"""
+    results: Dict[str, int] = {}
+    players: Dict[str, int] = {}
+    raw = {
+        "at_bat_id": [row.id for row in rows],
+        "game_id": [row.game_id for row in rows],
+        "game_date": [row.game_date.toordinal() for row in rows],
+        "player_idx": _encode([row.player_name for row in rows], players),
+        "inning": [row.inning or 0 for row in rows],
+        "is_bottom": [bool(row.is_bottom) for row in rows],
+        "sequence_in_game": [row.sequence_in_game or 0 for row in rows],
+        "outs_before": [
+            -1 if row.outs_before is None else row.outs_before for row in rows
+        ],
+        "base_state": [encode_base_state(row.runners_on_base_before) for row in rows],
+        "result_code": _encode([row.result_short for row in rows], results),
+        "runs_scored": [row.runs_scored_on_play or 0 for row in rows],
+    }
+    columns = {
+        name: np.asarray(raw[name], dtype=dtype)
+        for name, dtype in COLUMN_DTYPES.items()
+    }
+    return AtBatColumns(
+        columns,
+        result_vocabulary=list(results),
+        player_vocabulary=list(players),
+        max_at_bat_id=int(columns["at_bat_id"].max()) if rows else 0,
+    )
+
+
+def load_columns_from_db(
+    db: Session,
+    season: Optional[int] = None,
+    game_ids: Optional[Iterable[int]] = None,
+) -> AtBatColumns:
+    """從資料庫讀取指定賽季或指定比賽的打席事件並轉換為欄位。"""
+    statement = _select_at_bat_events()
+    if season is not None:
+        statement = statement.where(
+            models.GameResultDB.game_date.between(
+                datetime.date(season, 1, 1), datetime.date(season, 12, 31)
+            )
+        )
+    if game_ids is not None:
+        statement = statement.where(models.AtBatDetailDB.game_id.in_(list(game_ids)))
+    return build_columns(db.execute(statement).all())
+
+
+# --- 發布 (worker) ---
+
+
+def _season_dir(season: int, base_dir: Optional[str] = None) -> Path:
+    return Path(base_dir or settings.AT_BAT_COLUMNS_DIR) / str(season)
+
+
+def publish_season_columns(db: Session, season: int) -> str:
+    """
+    將指定賽季的打席事件寫成新版本的欄式快照並提交，回傳版本名稱。
+
+    讀取端可能仍在使用的上一個版本會保留，更早的版本則會刪除。
+    """
+    columns = load_columns_from_db(db, season=season)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{name: columns[name] for name in COLUMN_DTYPES})
+    version = str(time.time_ns())
+
+    db.add(
+        models.AtBatColumnSnapshotDB(
+            season=season,
+            version=version,
+            rows=len(columns),
+            max_at_bat_id=columns.max_at_bat_id,
+            manifest=json.dumps(
+                {
+                    "result_vocabulary": columns.result_vocabulary,
+                    "player_vocabulary": columns.player_vocabulary,
+                },
+                ensure_ascii=False,
+            ),
+            content=buffer.getvalue(),
+        )
+    )
+    db.flush()
+    keep_ids = db.scalars(
+        select(models.AtBatColumnSnapshotDB.id)
+        .where(models.AtBatColumnSnapshotDB.season == season)
+        .order_by(models.AtBatColumnSnapshotDB.id.desc())
+        .limit(2)
+    ).all()
+    db.query(models.AtBatColumnSnapshotDB).filter(
+        models.AtBatColumnSnapshotDB.season == season,
+        models.AtBatColumnSnapshotDB.id.not_in(keep_ids),
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    logger.info(
+        f"已發布 {season} 年的打席欄式快照，共 {len(columns)} 筆 ({version}，"
+        f"{len(buffer.getvalue()) / 1024:.0f} KB)。"
+    )
+    return version
+
+
+# --- 載入 (web) ---
+
+# 每個行程各自快取已 mmap 的版本；資料庫中的版本改變時才重新載入
+_loaded_snapshots: Dict[Path, Tuple[str, AtBatColumns]] = {}
+_loaded_lock = threading.Lock()
+
+
+def _extract_version(
+    db: Session, snapshot_id: int, season_dir: Path, version: str
+) -> Path:
+    """
+    將資料庫中的快照解壓縮至本機目錄並回傳該目錄；已解壓縮過則直接回傳。
+
+    先寫入暫存目錄再整個改名，其他行程不會讀到寫到一半的檔案。
+    """
+    version_dir = season_dir / version
+    if version_dir.is_dir():
+        return version_dir
+
+    content = db.scalar(
+        select(models.AtBatColumnSnapshotDB.content).where(
+            models.AtBatColumnSnapshotDB.id == snapshot_id
+        )
+    )
+    temp_dir = season_dir / f"{version}.{os.getpid()}.{threading.get_ident()}.tmp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            archive.extractall(temp_dir)
+        os.rename(temp_dir, version_dir)
+    except OSError:
+        # 其他行程已先完成同一版本的解壓縮
+        if not version_dir.is_dir():
+            raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # 已 mmap 的舊檔案在刪除後仍可讀取，只清除本機上其他的版本
+    for path in season_dir.iterdir():
+        if path.is_dir() and path.name != version and not path.name.endswith(".tmp"):
+            shutil.rmtree(path, ignore_errors=True)
+    return version_dir
+
+
+# [修正] player_idx 舊版快照的檔名為 player_id，重新發布前仍可讀取
+_LEGACY_COLUMN_NAMES = {"player_idx": "player_id"}
+
+
+def _column_file(version_dir: Path, name: str) -> Path:
+    path = version_dir / f"{name}.npy"
+    if not path.exists() and name in _LEGACY_COLUMN_NAMES:
+        return version_dir / f"{_LEGACY_COLUMN_NAMES[name]}.npy"
+    return path
+
+
+def load_season_columns(
+    db: Session, season: int, base_dir: Optional[str] = None
+) -> Optional[AtBatColumns]:
+    """以 mmap 唯讀載入指定賽季最新版本的快照；尚未發布時回傳 None。"""
+    snapshot = db.execute(
+        select(
+            models.AtBatColumnSnapshotDB.id,
+            models.AtBatColumnSnapshotDB.version,
+            models.AtBatColumnSnapshotDB.rows,
+            models.AtBatColumnSnapshotDB.max_at_bat_id,
+            models.AtBatColumnSnapshotDB.manifest,
+        )
+        .where(models.AtBatColumnSnapshotDB.season == season)
+        .order_by(models.AtBatColumnSnapshotDB.id.desc())
+        .limit(1)
+    ).first()
+    if snapshot is None:
+        return None
+
+    season_dir = _season_dir(season, base_dir)
+    with _loaded_lock:
+        cached = _loaded_snapshots.get(season_dir)
+        if cached and cached[0] == snapshot.version:
+            return cached[1]
+
+        version_dir = _extract_version(db, snapshot.id, season_dir, snapshot.version)
+        manifest = json.loads(snapshot.manifest)
+        # 空陣列無法 mmap，直接載入即可
+        mmap_mode = "r" if snapshot.rows else None
+        columns = AtBatColumns(
+            {
+                name: np.load(_column_file(version_dir, name), mmap_mode=mmap_mode)
+                for name in COLUMN_DTYPES
+            },
+            result_vocabulary=manifest["result_vocabulary"],
+            player_vocabulary=manifest["player_vocabulary"],
+            max_at_bat_id=snapshot.max_at_bat_id,
+        )
+        _loaded_snapshots[season_dir] = (snapshot.version, columns)
+        return columns
+
+
+def published_seasons(db: Session) -> List[int]:
+    """列出已發布快照的賽季。"""
+    return list(
+        db.scalars(
+            select(models.AtBatColumnSnapshotDB.season)
+            .distinct()
+            .order_by(models.AtBatColumnSnapshotDB.season)
+        )
+    )
+
+
+def _outside_seasons(seasons: List[int]) -> sa.ColumnElement:
+    """
+    [新增] 以 game_date 的範圍條件表示「不屬於指定賽季」，讓查詢可使用 game_date 索引
+    (取代對 extract(year) 的 NOT IN)。seasons 需已排序。
+    """
+    conditions = [models.GameResultDB.game_date < datetime.date(seasons[0], 1, 1)]
+    for previous, season in zip(seasons, seasons[1:]):
+        if season > previous + 1:
+            conditions.append(
+                models.GameResultDB.game_date.between(
+                    datetime.date(previous + 1, 1, 1),
+                    datetime.date(season - 1, 12, 31),
+                )
+            )
+    conditions.append(
+        models.GameResultDB.game_date >= datetime.date(seasons[-1] + 1, 1, 1)
+    )
+    return sa.or_(*conditions)
+
+
+def _removed_game_ids(db: Session, game_ids: np.ndarray) -> Set[int]:
+    """
+    [新增] 回傳快照中已不存在於 game_results 的比賽 (例如重新爬取後換了 game_id)。
+
+    先以主鍵計數確認是否有比賽被刪除，一般情況只回傳一個數字；有差異時才取回仍存在的 ID。
+    """
+    candidates = [int(game_id) for game_id in game_ids]
+    if not candidates:
+        return set()
+    in_snapshot = models.GameResultDB.id.in_(candidates)
+    stored = db.scalar(select(func.count()).where(in_snapshot))
+    if stored == len(candidates):
+        return set()
+    return set(candidates) - set(
+        db.scalars(select(models.GameResultDB.id).where(in_snapshot))
+    )
+
+
+def load_all_columns(
+    db: Session, base_dir: Optional[str] = None
+) -> Optional[List[Tuple[AtBatColumns, Optional[np.ndarray]]]]:
+    """
+    取得所有已發布賽季的快照，加上快照之後新增打席的當日增量。
+
+    增量以「含有新打席的比賽」為單位從資料庫讀取整場 (未發布快照的賽季亦同)，這些比賽在快照中的舊資料
+    會被排除，避免同一場比賽橫跨快照與增量。
+    [修正] 重新爬取的比賽會以新的 game_id 寫入，快照中已不存在於 game_results 的比賽也一併排除。
+    [修正] 增量只以打席主鍵範圍 (id > 快照的最大打席 ID) 與 game_date 範圍查詢，皆可使用索引。
+
+    Returns:
+        (欄位, 保留遮罩) 的列表；保留遮罩為 None 表示全部列都有效。
+        尚未發布任何快照時回傳 None，呼叫端應改用資料庫查詢。
+    """
+    seasons = published_seasons(db)
+    snapshots = [
+        columns
+        for columns in (load_season_columns(db, season, base_dir) for season in seasons)
+        if columns is not None
+    ]
+    if not snapshots:
+        return None
+
+    # 快照之後新增的打席，以及尚未發布快照的賽季，都從資料庫補讀
+    max_at_bat_id = max(columns.max_at_bat_id for columns in snapshots)
+    delta_game_ids: Set[int] = set(
+        db.scalars(
+            select(models.AtBatDetailDB.game_id)
+            .where(models.AtBatDetailDB.id > max_at_bat_id)
+            .distinct()
+        )
+    )
+    delta_game_ids.update(
+        db.scalars(select(models.GameResultDB.id).where(_outside_seasons(seasons)))
+    )
+
+    parts: List[Tuple[AtBatColumns, Optional[np.ndarray]]] = []
+    for columns in snapshots:
+        excluded = delta_game_ids | _removed_game_ids(db, np.unique(columns["game_id"]))
+        keep = ~np.isin(columns["game_id"], list(excluded))
+        parts.append((columns, None if keep.all() else keep))
+    if delta_game_ids:
+        parts.append((load_columns_from_db(db, game_ids=delta_game_ids), None))
+    return parts
+
+
+# --- 向量化分析 ---
+
+
+def find_streak_ranges(
+    columns: AtBatColumns,
+    valid: np.ndarray,
+    min_length: int,
+) -> List[Tuple[int, int]]:
+    """
+    找出同一場比賽、同一局內連續符合條件的打席區段。
+
+    Args:
+        columns: 依比賽順序排列的打席欄位。
+        valid: 每個打席是否符合條件的布林遮罩。
+        min_length: 區段的最短長度。
+
+    Returns:
+        [(起始索引, 結束索引 (含))] 的列表，依比賽順序排列。
+    """
+    if not len(columns):
+        return []
+    game_id = columns["game_id"]
+    inning = columns["inning"]
+    # 與前一個打席不在同一場比賽或同一局時，視為新的分組
+    new_group = np.ones(len(columns), dtype=bool)
+    new_group[1:] = (game_id[1:] != game_id[:-1]) | (inning[1:] != inning[:-1])
+
+    starts = valid.copy()
+    starts[1:] &= ~valid[:-1] | new_group[1:]
+    ends = valid.copy()
+    ends[:-1] &= ~valid[1:] | new_group[1:]
+
+    start_indexes = np.flatnonzero(starts)
+    end_indexes = np.flatnonzero(ends)
+    long_enough = (end_indexes - start_indexes + 1) >= min_length
+    return list(
+        zip(start_indexes[long_enough].tolist(), end_indexes[long_enough].tolist())
+    )
+
+
+def find_streak_at_bat_ids(
+    db: Session,
+    valid_results: Iterable[str],
+    min_length: int,
+    base_dir: Optional[str] = None,
+) -> Optional[List[List[int]]]:
+    """
+    以欄式快照找出所有「連線」的打席 ID 序列，依比賽順序排列。
+
+    Returns:
+        每個連線的打席 ID 列表；尚未發布快照時回傳 None。
+    """
+    parts = load_all_columns(db, base_dir)
+    if parts is None:
+        return None
+
+    valid_results = set(valid_results)
+    streaks = []
+    for columns, keep in parts:
+        valid = columns.result_mask(valid_results)
+        if keep is not None:
+            valid &= keep
+        at_bat_ids = columns["at_bat_id"]
+        for start, end in find_streak_ranges(columns, valid, min_length):
+            sort_key = (
+                int(columns["game_id"][start]),
+                int(columns["inning"][start]),
+                int(columns["sequence_in_game"][start]),
+                int(at_bat_ids[start]),
+            )
+            streaks.append((sort_key, at_bat_ids[start : end + 1].tolist()))
+
+    streaks.sort(key=lambda streak: streak[0])
+    return [at_bat_ids for _, at_bat_ids in streaks]
@@ -1,33 +1,550 @@
 # app/browser.py
 
 import logging
+import os
+import signal
+import threading
+import time
+from collections import defaultdict
 from contextlib import contextmanager
-from typing import Generator
-from playwright.sync_api import sync_playwright, Page
+from pathlib import Path
+from typing import Dict, Generator, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import dramatiq
+from playwright.sync_api import (
+    sync_playwright,
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    Response,
+    Route,
+)
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _launch_chromium(playwright: Playwright, headless: bool) -> Browser:
+    return playwright.chromium.launch(
+        headless=headless,
+        slow_mo=0,
+        # 確保在 Dramatiq worker 中能正常關閉
+        handle_sigint=False,
+        handle_sigterm=False,
+        handle_sighup=False,
+    )
+
+
+class BrowserStats:
+    """[新增] 行程內的瀏覽器啟動次數、頁面數與啟動耗時統計 (執行緒安全)。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.pages = 0
+        self.launch_seconds = 0.0
+
+    def record_launch(self, seconds: float):
+        with self._lock:
+            self.launches += 1
+            self.launch_seconds += seconds
+
+    def record_page(self):
+        with self._lock:
+            self.pages += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        回傳目前的統計數據。
+
+        estimated_seconds_saved 以平均啟動耗時乘上「重複使用瀏覽器而省下的啟動次數」估算。
+        """
+        with self._lock:
+            average = self.launch_seconds / self.launches if self.launches else 0.0
+            return {
+                "launches": self.launches,
+                "pages": self.pages,
+                "launch_seconds": round(self.launch_seconds, 2),
+                "estimated_seconds_saved": round(
+                    max(self.pages - self.launches, 0) * average, 2
+                ),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.launches = 0
+            self.pages = 0
+            self.launch_seconds = 0.0
+
+
+browser_stats = BrowserStats()
+
+
+class PageLoadStats:
+    """
+    [新增] 依頁面類型記錄載入次數、耗時與傳輸量 (執行緒安全)。
+
+    每筆紀錄會標記當時是否啟用請求攔截，以便比較啟用前後的差異。
+    傳輸量以回應的 Content-Length 加總估算，未提供此標頭的回應不計入。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self.blocked_requests = 0
+
+    def record(self, page_type: str, seconds: float, bytes_received: int):
+        mode = "blocking" if settings.SCRAPER_BLOCK_RESOURCES else "no_blocking"
+        with self._lock:
+            totals = self._totals.setdefault(
+                f"{page_type}:{mode}", {"loads": 0, "seconds": 0.0, "bytes": 0}
+            )
+            totals["loads"] += 1
+            totals["seconds"] += seconds
+            totals["bytes"] += bytes_received
+
+    def record_blocked(self):
+        with self._lock:
+            self.blocked_requests += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """回傳各「頁面類型:攔截模式」的載入次數、平均耗時 (秒) 與平均傳輸量 (KB)。"""
+        with self._lock:
+            return {
+                key: {
+                    "loads": totals["loads"],
+                    "avg_seconds": round(totals["seconds"] / totals["loads"], 3),
+                    "avg_kb": round(totals["bytes"] / totals["loads"] / 1024, 1),
+                }
+                for key, totals in sorted(self._totals.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self.blocked_requests = 0
+
+
+page_load_stats = PageLoadStats()
+
+
 @contextmanager
-def get_page(headless: bool = True) -> Generator[Page, None, None]:
+def measure_page_load(page: Page, page_type: str) -> Generator[None, None, None]:
+    """[新增] 記錄區塊內 (導航與等待關鍵元素) 的耗時與回應傳輸量。"""
+    bytes_received = 0
+
+    def on_response(response: Response):
+        nonlocal bytes_received
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit():
+            bytes_received += int(content_length)
+
+    page.on("response", on_response)
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        page.remove_listener("response", on_response)
+        page_load_stats.record(page_type, time.monotonic() - started_at, bytes_received)
+
+
+# 以單次 evaluate 取回各選擇器第一個符合元素的 outerHTML
+_SUBTREE_HTML_JS = """
+(selectors) => selectors
+    .map((selector) => {
+        const element = document.querySelector(selector);
+        return element ? element.outerHTML : "";
+    })
+    .join("\\n")
+"""
+
+
+def get_subtree_html(page: Page, selectors: Iterable[str]) -> str:
+    """
+    [新增] 只回傳解析器需要的 DOM 子樹 HTML，取代序列化整個頁面的 page.content()。
+
+    每個選擇器取第一個符合的元素 (與解析器的 soup.find / select_one 相同)，
+    保留元素本身 (outerHTML)，因此解析器的選擇器不需修改。
+    沒有任何選擇器命中時退回 page.content()。
+    """
+    html = page.evaluate(_SUBTREE_HTML_JS, list(selectors))
+    if isinstance(html, str) and html.strip():
+        return html
+    logger.warning(f"頁面中找不到 {list(selectors)}，改為擷取完整頁面 HTML。")
+    return page.content()
+
+
+def _domain_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+def should_block_request(url: str, resource_type: str) -> bool:
+    """
+    [新增] 依設定的允許 / 封鎖清單判斷是否攔截請求。
+
+    允許清單 (資源類型或網域) 優先；其次為封鎖清單；其餘請求一律放行。
+    """
+    host = urlsplit(url).hostname or ""
+    if resource_type in settings.SCRAPER_ALLOWED_RESOURCE_TYPES or _domain_matches(
+        host, settings.SCRAPER_ALLOWED_DOMAINS
+    ):
+        return False
+    return resource_type in settings.SCRAPER_BLOCKED_RESOURCE_TYPES or _domain_matches(
+        host, settings.SCRAPER_BLOCKED_DOMAINS
+    )
+
+
+def _handle_route(route: Route):
+    request = route.request
+    resource_type = request.resource_type
+    if resource_type == "document":
+        try:
+            if request.frame.parent_frame is not None:
+                resource_type = "subframe"
+        except Exception:
+            # Service Worker 發出的請求沒有對應的 frame
+            pass
+    if should_block_request(request.url, resource_type):
+        page_load_stats.record_blocked()
+        route.abort("blockedbyclient")
+    else:
+        route.continue_()
+
+
+def apply_request_blocking(target: Union[BrowserContext, Page]):
+    """[新增] 於 context 或頁面套用請求攔截政策 (SCRAPER_BLOCK_RESOURCES 關閉時不套用)。"""
+    if settings.SCRAPER_BLOCK_RESOURCES:
+        target.route("**/*", _handle_route)
+
+
+def _children_by_ppid() -> Optional[Dict[int, List[int]]]:
+    """讀取 /proc 建立「父行程 -> 子行程」對照表；不支援 /proc 的平台回傳 None。"""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children = defaultdict(list)
+    for stat_file in proc.glob("[0-9]*/stat"):
+        try:
+            # 行程名稱可能包含空白，取最後一個 ")" 之後的欄位：state, ppid, ...
+            ppid = int(stat_file.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(stat_file.parent.name))
+    return children
+
+
+def _process_tree_pids(root_pid: int) -> List[int]:
+    """[新增] 回傳 root_pid 與其所有子孫行程的 pid (root 在最前面)。"""
+    children = _children_by_ppid() or {}
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+
+def _process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """
+    [修正] 回傳 root_pid (某個瀏覽器的 Playwright driver) 與其子孫行程 (Chromium) 的
+    RSS 總和 (MB)，不計入同一行程中其他執行緒的瀏覽器。
+    僅支援提供 /proc 的 Linux，其他平台回傳 None。
+    """
+    if not Path("/proc").is_dir():
+        return None
+    total_kb = 0
+    for pid in _process_tree_pids(root_pid):
+        try:
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def _terminate_process_tree(root_pid: int):
+    """[新增] 對 root_pid 與其子孫行程送出 SIGTERM (子孫優先)，已結束的行程略過。"""
+    for pid in reversed(_process_tree_pids(root_pid)):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            continue
+
+
+# 啟動 Playwright 時比對前後的子行程以取得新 driver 的 pid，需避免多個執行緒同時啟動
+_launch_lock = threading.Lock()
+
+
+def _start_playwright() -> Tuple[Playwright, Optional[int]]:
+    """[新增] 啟動 Playwright，並回傳其 driver 行程的 pid (無法判斷時為 None)。"""
+    with _launch_lock:
+        before = _children_by_ppid()
+        playwright = sync_playwright().start()
+        after = _children_by_ppid()
+    if before is None or after is None:
+        return playwright, None
+    new_pids = set(after.get(os.getpid(), [])) - set(before.get(os.getpid(), []))
+    return playwright, new_pids.pop() if len(new_pids) == 1 else None
+
+
+class BrowserManager:
+    """
+    [新增] 重複使用同一個瀏覽器，每次提供一個全新的 context 與頁面。
+
+    處理超過 max_pages 個頁面，或此瀏覽器 (driver 與 Chromium 行程) 的記憶體超過
+    max_memory_mb 時，會關閉瀏覽器，於下一次取用頁面時重新啟動。
+    [修正] 瀏覽器閒置超過 idle_timeout_seconds 時，由計時器結束其行程以釋放記憶體，
+    下一次取用頁面時重新啟動；設為 0 則不因閒置而關閉。
+    Playwright 的同步 API 不可跨執行緒共用，每個執行緒需持有各自的 BrowserManager。
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_pages: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+        idle_timeout_seconds: Optional[float] = None,
+    ):
+        self.headless = headless
+        self.max_pages = max_pages or settings.BROWSER_MAX_PAGES_PER_LAUNCH
+        self.max_memory_mb = max_memory_mb or settings.BROWSER_MAX_MEMORY_MB
+        self.idle_timeout_seconds = (
+            settings.BROWSER_IDLE_TIMEOUT_SECONDS
+            if idle_timeout_seconds is None
+            else idle_timeout_seconds
+        )
+        self.pages_since_launch = 0
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._driver_pid: Optional[int] = None
+        # 閒置計時器在其他執行緒觸發，以鎖保護使用狀態與 driver 行程
+        self._lock = threading.Lock()
+        self._in_use = False
+        self._idle_closed = False
+        self._idle_timer: Optional[threading.Timer] = None
+
+    def _launch(self):
+        started_at = time.monotonic()
+        self._playwright, self._driver_pid = _start_playwright()
+        self._browser = _launch_chromium(self._playwright, self.headless)
+        self.pages_since_launch = 0
+        elapsed = time.monotonic() - started_at
+        browser_stats.record_launch(elapsed)
+        logger.info(f"已啟動可重複使用的瀏覽器 (耗時 {elapsed:.2f} 秒)。")
+
+    def _should_recycle(self) -> bool:
+        if self.pages_since_launch >= self.max_pages:
+            logger.info(f"瀏覽器已處理 {self.pages_since_launch} 個頁面，準備回收。")
+            return True
+        if self._driver_pid is None:
+            return False
+        rss_mb = _process_tree_rss_mb(self._driver_pid)
+        if rss_mb is not None and rss_mb > self.max_memory_mb:
+            logger.info(
+                f"瀏覽器記憶體用量 {rss_mb:.0f} MB 超過上限 {self.max_memory_mb} MB，準備回收。"
+            )
+            return True
+        return False
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _schedule_idle_close(self):
+        if self._browser is None or self.idle_timeout_seconds <= 0:
+            return
+        self._idle_timer = threading.Timer(
+            self.idle_timeout_seconds, self._close_if_idle
+        )
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self):
+        """
+        [新增] 閒置計時器到期時結束瀏覽器行程。
+
+        Playwright 的同步 API 只能在建立它的執行緒呼叫，因此這裡直接結束 driver 與
+        Chromium 行程，並標記為已關閉；擁有者執行緒下一次取用頁面時再清理並重新啟動。
+        """
+        with self._lock:
+            if self._in_use or self._browser is None or self._idle_closed:
+                return
+            if self._driver_pid is None:
+                return
+            self._idle_closed = True
+            _terminate_process_tree(self._driver_pid)
+        logger.info(f"瀏覽器閒置超過 {self.idle_timeout_seconds} 秒，已結束其行程。")
+
+    @contextmanager
+    def new_page(self) -> Generator[Page, None, None]:
+        """取得一個位於全新 context 的頁面，結束時關閉該 context 並檢查回收條件。"""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._in_use = True
+        try:
+            if (
+                self._browser is None
+                or self._idle_closed
+                or not self._browser.is_connected()
+            ):
+                self.close()
+                self._launch()
+            context = self._browser.new_context()
+            apply_request_blocking(context)
+            try:
+                yield context.new_page()
+            finally:
+                try:
+                    context.close()
+                except Exception as e:
+                    logger.warning(f"關閉瀏覽器 context 時發生錯誤: {e}")
+                self.pages_since_launch += 1
+                browser_stats.record_page()
+                if self._should_recycle():
+                    self.close()
+        finally:
+            with self._lock:
+                self._in_use = False
+                self._schedule_idle_close()
+
+    def close(self):
+        """關閉瀏覽器與 Playwright；重複呼叫不會出錯。"""
+        with self._lock:
+            self._cancel_idle_timer()
+            browser, playwright = self._browser, self._playwright
+            idle_closed = self._idle_closed
+            self._browser, self._playwright = None, None
+            self._driver_pid, self._idle_closed = None, False
+        try:
+            # 閒置關閉時行程已結束，只需停止 Playwright 釋放連線
+            if browser is not None and not idle_closed:
+                browser.close()
+        except Exception as e:
+            logger.warning(f"關閉瀏覽器時發生錯誤: {e}")
+        finally:
+            if playwright is not None:
+                try:
+                    playwright.stop()
+                except Exception as e:
+                    logger.warning(f"停止 Playwright 時發生錯誤: {e}")
+
+
+# 啟用重複使用的執行緒會在此保存各自的 BrowserManager (依 headless 區分)
+_thread_state = threading.local()
+
+
+def enable_browser_reuse():
+    """[新增] 讓目前執行緒之後的 get_page 呼叫重複使用同一個瀏覽器。"""
+    if getattr(_thread_state, "managers", None) is None:
+        _thread_state.managers = {}
+
+
+def close_thread_browsers():
+    """[新增] 關閉目前執行緒持有的瀏覽器，並停用重複使用。"""
+    managers = getattr(_thread_state, "managers", None) or {}
+    for manager in managers.values():
+        manager.close()
+    _thread_state.managers = None
+
+
+class BrowserReuseMiddleware(dramatiq.Middleware):
     """
-    一個 context manager，負責啟動 Playwright、建立瀏覽器頁面，並在結束時妥善關閉。
+    [新增] 讓每個 Dramatiq worker 執行緒重複使用自己的瀏覽器 (跨訊息保留)，
+    並於每個訊息處理完後記錄累計的瀏覽器啟動次數、省下的時間與各類頁面的載入統計。
+
+    [修正] 瀏覽器的回收交由 BrowserManager 的頁面數、記憶體 (僅計算該瀏覽器的行程)
+    與閒置逾時條件處理，不再於每個訊息後關閉。
+    """
+
+    def after_worker_thread_boot(self, broker, thread):
+        enable_browser_reuse()
+
+    def before_worker_thread_shutdown(self, broker, thread):
+        close_thread_browsers()
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):
+        stats = browser_stats.snapshot()
+        if stats["pages"]:
+            logger.info(
+                f"瀏覽器統計：啟動 {stats['launches']} 次、提供 {stats['pages']} 個頁面，"
+                f"啟動共耗時 {stats['launch_seconds']} 秒，"
+                f"重複使用約省下 {stats['estimated_seconds_saved']} 秒。"
+            )
+        for key, load in page_load_stats.snapshot().items():
+            logger.info(
+                f"頁面載入統計 [{key}]：{load['loads']} 次，平均 {load['avg_seconds']} 秒、"
+                f"{load['avg_kb']} KB。"
+            )
+
+
+@contextmanager
+def get_browser(headless: bool = True) -> Generator[Browser, None, None]:
+    """
+    [新增] 一個 context manager，負責啟動 Playwright 與瀏覽器，並在結束時妥善關閉。
+
+    Playwright 的同步 API 不可跨執行緒共用，每個執行緒需各自呼叫此函式。
 
     :param headless: 是否以無頭模式執行瀏覽器。
     """
     with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=headless,
-            slow_mo=0,
-            # 確保在 Dramatiq worker 中能正常關閉
-            handle_sigint=False,
-            handle_sigterm=False,
-            handle_sighup=False,
-        )
+        started_at = time.monotonic()
+        browser = _launch_chromium(p, headless)
+        browser_stats.record_launch(time.monotonic() - started_at)
+        try:
+            yield browser
+        finally:
+            logger.debug("Closing browser.")
+            browser.close()
+
+
+@contextmanager
+def new_context_page(browser: Browser) -> Generator[Page, None, None]:
+    """
+    [新增] 在既有的瀏覽器中建立獨立的 context (不共用 cookie 與快取) 與頁面，
+    結束時關閉該 context。
+    """
+    context = browser.new_context()
+    apply_request_blocking(context)
+    try:
+        yield context.new_page()
+    finally:
+        logger.debug("Closing browser context.")
+        context.close()
+        browser_stats.record_page()
+
+
+@contextmanager
+def get_page(headless: bool = True) -> Generator[Page, None, None]:
+    """
+    一個 context manager，負責提供瀏覽器頁面，並在結束時妥善關閉。
+
+    [修改] 目前執行緒已啟用重複使用時 (Dramatiq worker 執行緒)，頁面來自該執行緒
+    持續存在的瀏覽器；否則啟動一個只供此次使用的瀏覽器。
+
+    :param headless: 是否以無頭模式執行瀏覽器。
+    """
+    managers = getattr(_thread_state, "managers", None)
+    if managers is not None:
+        manager = managers.get(headless)
+        if manager is None:
+            manager = managers[headless] = BrowserManager(headless=headless)
+        with manager.new_page() as page:
+            yield page
+        return
+
+    with get_browser(headless=headless) as browser:
         page = browser.new_page()
+        apply_request_blocking(page)
         try:
             yield page
         finally:
-            logger.debug("Closing browser page and browser.")
+            logger.debug("Closing browser page.")
             page.close()
-            browser.close()
+            browser_stats.record_page()
@@ -3,10 +3,10 @@
 import functools
 import json
 import logging
-from typing import Callable
+from typing import Any, Callable, Dict, List
 
 import redis
-from fastapi import Request
+from fastapi import Request, Response
 from fastapi.encoders import jsonable_encoder
 
 from .config import settings
@@ -30,12 +30,20 @@ def _generate_cache_key(func: Callable, request: Request) -> str:
     all_params = dict(request.query_params)
     all_params.update(request.path_params)
 
-    # 排序以確保參數順序不同時，快取鍵仍然相同
-    sorted_params = sorted(all_params.items())
+    return _build_cache_key(func.__module__, func.__name__, all_params)
+
+
+def _build_cache_key(module_name: str, func_name: str, params: Dict[str, Any]) -> str:
+    """依模組、函式名稱與參數組出快取鍵，參數會排序以確保順序無關。"""
+    sorted_params = sorted(params.items())
 
     params_str = "&".join([f"{k}={v}" for k, v in sorted_params])
-    cache_key = f"{func.__module__}:{func.__name__}:{params_str}"
-    return cache_key
+    return f"{module_name}:{func_name}:{params_str}"
+
+
+# [新增] 端點直接回傳已序列化的 JSON Response 時，快取內容加上此前綴，
+# 命中時即可原樣回傳 JSON 位元組，不需再經過 response_model 的驗證與序列化。
+_RAW_JSON_PREFIX = "raw-json:"
 
 
 def cache(expire: int = 3600 * 24):  # 預設 TTL 為 24 小時
@@ -56,6 +64,11 @@ def cache(expire: int = 3600 * 24):  # 預設 TTL 為 24 小時
                 cached_result = redis_client.get(cache_key)
                 if cached_result:
                     logging.info(f"成功命中快取: {cache_key}")
+                    if cached_result.startswith(_RAW_JSON_PREFIX):
+                        return Response(
+                            content=cached_result[len(_RAW_JSON_PREFIX) :],
+                            media_type="application/json",
+                        )
                     return json.loads(cached_result)
 
                 # 2. 如果快取未命中，則執行原始函式
@@ -63,6 +76,20 @@ def cache(expire: int = 3600 * 24):  # 預設 TTL 為 24 小時
                 result = func(request=request, *args, **kwargs)
 
                 # 3. 將函式結果存入快取
+                if isinstance(result, Response):
+                    # 已序列化的 JSON 回應直接快取其內容；其他類型的回應不快取
+                    if (
+                        result.media_type != "application/json"
+                        or "content-encoding" in result.headers
+                    ):
+                        return result
+                    redis_client.setex(
+                        cache_key,
+                        expire,
+                        _RAW_JSON_PREFIX + result.body.decode("utf-8"),
+                    )
+                    return result
+
                 # 使用 jsonable_encoder 將結果轉換為 JSON 相容的格式
                 json_compatible_result = jsonable_encoder(result)
                 redis_client.setex(
@@ -78,3 +105,75 @@ def cache(expire: int = 3600 * 24):  # 預設 TTL 為 24 小時
         return wrapper
 
     return decorator
+
+
+def cache_per_item(
+    func: Callable,
+    items: List[str],
+    params: Dict[str, Any],
+    compute: Callable[[List[str]], Dict[str, Any]],
+    item_param: str = "player_name",
+    expire: int = 3600 * 24,
+) -> Dict[str, Any]:
+    """
+    為批次端點提供「逐項目」的快取。
+
+    每個項目 (例如每位球員) 各自擁有獨立的快取鍵，因此不同批次請求之間可以
+    重複利用部分命中的結果；只有未命中的項目會交給 `compute` 一次性批次計算。
+
+    Args:
+        func: 批次端點函式，用於產生快取鍵的命名空間。
+        items: 要查詢的項目列表。
+        params: 除了項目以外，會影響結果的其他參數。
+        compute: 接收未命中項目列表，回傳 {項目: 結果} 的批次計算函式。
+        item_param: 項目在快取鍵中的參數名稱。
+        expire: 快取的 TTL (秒)。
+
+    Returns:
+        依 `items` 順序排列的 {項目: 結果} 字典。
+    """
+    unique_items = list(dict.fromkeys(items))
+    if not redis_client:
+        return compute(unique_items)
+
+    cache_keys = {
+        item: _build_cache_key(
+            func.__module__, func.__name__, {**params, item_param: item}
+        )
+        for item in unique_items
+    }
+
+    try:
+        cached_values = redis_client.mget([cache_keys[item] for item in unique_items])
+    except redis.exceptions.RedisError as e:
+        logging.warning(f"Redis 操作失敗 ({e})，跳過快取並直接執行批次計算。")
+        return compute(unique_items)
+
+    results: Dict[str, Any] = {}
+    missing_items = []
+    for item, cached_value in zip(unique_items, cached_values):
+        # 以 None 判斷是否未命中，使得被快取的 null 結果也能被重複利用
+        if cached_value is None:
+            missing_items.append(item)
+        else:
+            results[item] = json.loads(cached_value)
+
+    logging.info(
+        f"批次快取: {len(results)} 項命中，{len(missing_items)} 項未命中 ({func.__name__})。"
+    )
+
+    if missing_items:
+        computed = compute(missing_items)
+        try:
+            pipeline = redis_client.pipeline()
+            for item in missing_items:
+                value = computed.get(item)
+                pipeline.setex(
+                    cache_keys[item], expire, json.dumps(jsonable_encoder(value))
+                )
+            pipeline.execute()
+        except redis.exceptions.RedisError as e:
+            logging.warning(f"Redis 寫入批次快取失敗 ({e})，本次結果將不被快取。")
+        results.update({item: computed.get(item) for item in missing_items})
+
+    return {item: results[item] for item in unique_items}
@@ -51,10 +51,49 @@ class Settings(BaseSettings):
     PLAYWRIGHT_SLOW_MO: int = 300
     PLAYWRIGHT_TIMEOUT: int = 60000
     PLAYWRIGHT_STATIC_DELAY: int = 250
+    # [新增] 文字轉播的擷取方式："evaluate" 於頁面內一次擷取所有半局 (失敗時自動退回)，
+    # "click" 為逐一點擊並擷取各半局 HTML 的舊作法
+    LIVE_EVENTS_EXTRACTION: str = "evaluate"
+    # [新增] Box Score 與文字轉播的取得方式："http" 直接呼叫網站的資料端點 (失敗時自動退回瀏覽器)，
+    # "browser" 為以 Playwright 渲染頁面的舊作法
+    GAME_DATA_FETCH_MODE: str = "browser"
+    # [新增] 資料端點 HTTP 連線池的大小
+    DATA_API_POOL_SIZE: int = 4
+    # [新增] 同時處理比賽的數量 (每場比賽使用獨立的瀏覽器 context)，1 為逐場處理
+    GAME_PROCESSING_CONCURRENCY: int = 1
+    # [新增] 所有爬蟲執行緒對 cpbl.com.tw 發出頁面請求的最小間隔 (秒)
+    SCRAPER_MIN_REQUEST_INTERVAL: float = 1.0
+    # [新增] worker 執行緒重複使用的瀏覽器，處理超過此頁面數或記憶體 (MB) 超過上限時回收
+    BROWSER_MAX_PAGES_PER_LAUNCH: int = 50
+    BROWSER_MAX_MEMORY_MB: int = 1024
+    # [新增] worker 的瀏覽器閒置超過此秒數即關閉，下一次取用頁面時重新啟動 (0 表示不關閉)
+    BROWSER_IDLE_TIMEOUT_SECONDS: int = 300
+    # [新增] 爬蟲的請求攔截政策：允許清單優先於封鎖清單，
+    # 資源類型 "subframe" 代表 iframe 內的頁面
+    SCRAPER_BLOCK_RESOURCES: bool = True
+    SCRAPER_BLOCKED_RESOURCE_TYPES: List[str] = ["image", "media", "font", "subframe"]
+    SCRAPER_BLOCKED_DOMAINS: List[str] = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googleadservices.com",
+        "facebook.com",
+        "facebook.net",
+        "youtube.com",
+        "ytimg.com",
+    ]
+    SCRAPER_ALLOWED_RESOURCE_TYPES: List[str] = []
+    SCRAPER_ALLOWED_DOMAINS: List[str] = []
+    # [新增] 將爬蟲抓取的原始頁面以 zstd 壓縮封存於資料庫，修正解析器後可直接重新解析
+    PAGE_ARCHIVE_ENABLED: bool = False
+    PAGE_ARCHIVE_ZSTD_LEVEL: int = 10
 
     # CPBL 賽季設定
     CPBL_SEASON_START_MONTH: int = 3
     CPBL_SEASON_END_MONTH: int = 11
+    # [新增] 整季賽程 (season_schedule_games) 超過此時數未更新時，補爬計畫模式才重新抓取整季賽程頁
+    SEASON_SCHEDULE_REFRESH_HOURS: int = 24
 
     # [修改] 移除 ALLOWED_ORIGINS 的預設值，使其完全由環境變數控制
     ALLOWED_ORIGINS: List[str]
@@ -64,6 +103,21 @@ class Settings(BaseSettings):
     DEFAULT_REQUEST_TIMEOUT: int = 30
     FRIENDLY_SCRAPING_DELAY: int = 2
 
+    # [修改] web 端解壓縮打席欄式快照的本機目錄；快照本身存放於資料庫，不需與 worker 共用
+    AT_BAT_COLUMNS_DIR: str = "data/at_bat_columns"
+
+    # [新增] worker 匯出的唯讀 SQLite 快照；啟用 SERVE_READ_SNAPSHOT 時，
+    # web 的唯讀端點改由此檔讀取，寫入仍以 PostgreSQL 為準
+    # [修改] 快照存放於資料庫，此路徑為 web 端下載後的本機檔名 (實際檔名會加上版本)
+    # [修改] SERVE_READ_SNAPSHOT 同時控制 worker 是否匯出快照，web 與 worker 需設定一致
+    READ_SNAPSHOT_PATH: str = "data/read_snapshot.sqlite3"
+    SERVE_READ_SNAPSHOT: bool = False
+    # [新增] web 行程檢查快照版本的間隔 (秒)
+    READ_SNAPSHOT_REFRESH_SECONDS: int = 60
+
+    # [新增] web 行程內球員名稱索引檢查資料版本的間隔 (秒)
+    PLAYER_INDEX_REFRESH_SECONDS: int = 60
+
     # 【修改】「連線」功能定義，改為引用常數模組，並將 set 轉為 list
     STREAK_DEFINITIONS: Dict[str, List[str]] = {
         # 定義 A: 連續安打
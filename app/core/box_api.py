@@ -0,0 +1,180 @@
+# app/core/box_api.py
+
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from app.browser import page_load_stats
+from app.config import settings
+from app.exceptions import FatalScraperError, RetryableScraperError
+from app.utils.rate_limiter import wait_for_request_slot
+
+logger = logging.getLogger(__name__)
+
+# Box Score / 文字轉播頁面載入資料時呼叫的端點 (相對於網站根目錄)
+GAME_DATA_ENDPOINT = "/box/getlive"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+_TOKEN_PATTERN = re.compile(
+    r'<input[^>]*name="__RequestVerificationToken"[^>]*value="([^"]+)"'
+)
+
+# requests.Session 不保證執行緒安全，每個執行緒各自持有一個 session 與驗證 token
+_thread_state = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """取得目前執行緒的 session，同一執行緒內的請求共用連線池與 cookie。"""
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.DATA_API_POOL_SIZE,
+            pool_maxsize=settings.DATA_API_POOL_SIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT})
+        _thread_state.session = session
+        _thread_state.tokens = {}
+    return session
+
+
+def close_sessions() -> None:
+    """關閉目前執行緒的 session 並捨棄已取得的驗證 token。"""
+    session = getattr(_thread_state, "session", None)
+    if session is not None:
+        session.close()
+    _thread_state.session = None
+    _thread_state.tokens = {}
+
+
+def _game_params(box_score_url: str) -> Dict[str, str]:
+    """由 Box Score URL 的查詢參數 (year / kindCode / gameSno) 組出端點所需的表單欄位。"""
+    query = {
+        key.lower(): values[0]
+        for key, values in parse_qs(urlsplit(box_score_url).query).items()
+    }
+    missing = [key for key in ("year", "kindcode", "gamesno") if not query.get(key)]
+    if missing:
+        raise FatalScraperError(
+            f"Box Score URL 缺少查詢參數 {missing}，無法呼叫資料端點: {box_score_url}"
+        )
+    return {
+        "GameSno": query["gamesno"],
+        "KindCode": query["kindcode"],
+        "Year": query["year"],
+        "PrevOrNext": "",
+        "PresentStatus": "",
+    }
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """發出請求並統一處理節流、計時與連線錯誤。"""
+    wait_for_request_slot()
+    start = time.perf_counter()
+    try:
+        response = _get_session().request(
+            method, url, timeout=settings.DEFAULT_REQUEST_TIMEOUT, **kwargs
+        )
+    except RequestException as e:
+        raise RetryableScraperError(f"請求資料端點 {url} 失敗: {e}") from e
+    page_load_stats.record(
+        "box_api", time.perf_counter() - start, len(response.content)
+    )
+    return response
+
+
+def _fetch_verification_token(page_url: str) -> str:
+    """
+    載入頁面 HTML (不執行 JS) 並取出防偽 token。
+
+    伺服器同時會設定對應的 cookie，之後的 POST 必須帶著同一個 session 的 cookie 與此 token。
+    """
+    response = _request("GET", page_url)
+    if response.status_code != 200:
+        raise RetryableScraperError(
+            f"載入 {page_url} 以取得驗證 token 失敗 (HTTP {response.status_code})"
+        )
+    match = _TOKEN_PATTERN.search(response.text)
+    if not match:
+        raise FatalScraperError(f"在 {page_url} 中找不到 __RequestVerificationToken。")
+    return match.group(1)
+
+
+def _decode_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """端點回傳的 *Json 欄位是 JSON 字串，將其解碼為 Python 物件。"""
+    decoded = {}
+    for key, value in payload.items():
+        if key.endswith("Json") and isinstance(value, str):
+            decoded[key] = json.loads(value) if value else None
+        else:
+            decoded[key] = value
+    return decoded
+
+
+def fetch_game_data(box_score_url: str) -> Dict[str, Any]:
+    """
+    [新增] 直接呼叫網站的資料端點取得單場比賽的 Box Score 與文字轉播資料，不需啟動瀏覽器。
+
+    流程與頁面上的 XHR 相同：先以 GET 取得頁面中的驗證 token 與 cookie，
+    再帶著 token POST 至資料端點。token 以「網站」為單位快取於執行緒的 session，
+    過期 (HTTP 400 / 403 或回傳 Success=false) 時會重新取得一次後重試。
+
+    Returns:
+        Dict[str, Any]: 端點回傳的資料，*Json 欄位已解碼，交由 parsers.box_data 解析。
+    """
+    parts = urlsplit(box_score_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    form = _game_params(box_score_url)
+    _get_session()
+    tokens: Dict[str, str] = _thread_state.tokens
+
+    for _ in range(2):
+        token: Optional[str] = tokens.get(origin)
+        if token is None:
+            token = _fetch_verification_token(box_score_url)
+            tokens[origin] = token
+
+        response = _request(
+            "POST",
+            origin + GAME_DATA_ENDPOINT,
+            data={"__RequestVerificationToken": token, **form},
+            headers={
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": box_score_url,
+                "RequestVerificationToken": token,
+            },
+        )
+        if response.status_code in (400, 403):
+            logger.info("資料端點拒絕驗證 token，重新取得 token 後重試...")
+            tokens.pop(origin, None)
+            continue
+        if 500 <= response.status_code < 600:
+            raise RetryableScraperError(
+                f"資料端點回傳伺服器錯誤 (HTTP {response.status_code})"
+            )
+        if response.status_code != 200:
+            raise FatalScraperError(
+                f"資料端點回傳非預期的狀態碼 (HTTP {response.status_code})"
+            )
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise FatalScraperError(f"資料端點回傳的內容不是 JSON: {e}") from e
+        if not payload.get("Success"):
+            logger.info("資料端點回傳 Success=false，重新取得 token 後重試...")
+            tokens.pop(origin, None)
+            continue
+        return _decode_payload(payload)
+
+    raise FatalScraperError(f"重新取得驗證 token 後資料端點仍拒絕請求: {box_score_url}")
@@ -3,7 +3,6 @@
 import logging
 import time
 from playwright.sync_api import (
-    sync_playwright,
     Error as PlaywrightError,
     TimeoutError as PlaywrightTimeoutError,
 )
@@ -11,6 +10,8 @@ import requests
 from requests.exceptions import RequestException, HTTPError
 from pathlib import Path
 
+from app import page_archive
+from app.browser import get_page, measure_page_load
 from app.config import settings
 
 # 新增：匯入自訂的錯誤類別
@@ -72,18 +73,19 @@ def get_dynamic_page_content(url, wait_for_selector):
         return None
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        # [修改] 透過 get_page 取得頁面，worker 執行緒中會重複使用同一個瀏覽器
+        with get_page(headless=True) as page:
             logging.info(f"Playwright: 導航至 {url}")
-            page.goto(url, timeout=settings.PLAYWRIGHT_TIMEOUT)
+            with measure_page_load(page, "dynamic"):
+                page.goto(url, timeout=settings.PLAYWRIGHT_TIMEOUT)
 
-            logging.info(f"Playwright: 正在等待元素 '{wait_for_selector}' 變為可見")
-            page.wait_for_selector(wait_for_selector, state="visible", timeout=30000)
+                logging.info(f"Playwright: 正在等待元素 '{wait_for_selector}' 變為可見")
+                page.wait_for_selector(
+                    wait_for_selector, state="visible", timeout=30000
+                )
 
             logging.info("Playwright: 頁面元素已載入，正在獲取內容。")
             content = page.content()
-            browser.close()
             return content
     except PlaywrightTimeoutError as e:
         # Playwright 的 TimeoutError 通常是網路慢或伺服器回應慢，可重試
@@ -111,11 +113,10 @@ def fetch_schedule_page(year, month):
         f"正在從 {settings.SCHEDULE_URL} 獲取 {year}-{month:02d} 的賽程頁面..."
     )
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(settings.SCHEDULE_URL, timeout=settings.PLAYWRIGHT_TIMEOUT)
-            page.wait_for_selector("div.item.year > select", timeout=15000)
+        with get_page(headless=True) as page:
+            with measure_page_load(page, "schedule"):
+                page.goto(settings.SCHEDULE_URL, timeout=settings.PLAYWRIGHT_TIMEOUT)
+                page.wait_for_selector("div.item.year > select", timeout=15000)
 
             logging.info(f"Playwright: 選擇年份 '{year}'")
             page.select_option("div.item.year > select", str(year))
@@ -138,8 +139,13 @@ def fetch_schedule_page(year, month):
 
             logging.info("Playwright: 賽程頁面元素已載入，正在獲取內容。")
             content = page.content()
-            browser.close()
-            return content
+        page_archive.archive_page(
+            page_archive.SCHEDULE,
+            f"{year}-{month:02d}",
+            content,
+            url=settings.SCHEDULE_URL,
+        )
+        return content
     except PlaywrightTimeoutError as e:
         raise RetryableScraperError(
             f"使用 Playwright 獲取賽程頁面 {year}-{month:02d} 時發生超時: {e}"
@@ -7,12 +7,72 @@ from typing import List, Dict, Any, Optional
 
 from sqlalchemy.orm import Session, joinedload, aliased
 from sqlalchemy import func, or_, select, extract
+from app import at_bat_columns
+from app.crud import dimensions
 from app.config import settings
 
-from itertools import groupby
-from operator import attrgetter
 import sqlalchemy as sa
 
+# --- 列表型分析的輕量查詢 (Core select) ---
+# [新增] 列表端點只需要組出回應所需的欄位：以 Core select() 取得 Row (named tuple)，
+# 省去 ORM identity map 與關聯物件的建立成本，再直接以 Row 建構 Pydantic 模型。
+
+_AT_BAT_RESPONSE_COLUMNS = tuple(
+    models.AtBatDetailDB.__table__.c[field_name]
+    for field_name in schemas.AtBatDetail.model_fields
+)
+
+
+def _at_bat_response_columns(detail: models.AtBatDetailLevel) -> tuple:
+    """依回應詳細程度決定 SQL 投影的打席欄位；summary 模式不讀取大型文字欄位。"""
+    if detail == models.AtBatDetailLevel.FULL:
+        return _AT_BAT_RESPONSE_COLUMNS
+    return tuple(
+        column
+        for column in _AT_BAT_RESPONSE_COLUMNS
+        if column.key not in models.AT_BAT_HEAVY_COLUMNS
+    )
+
+
+def _select_at_bat_rows(
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> sa.Select:
+    """建立打席列表查詢：打席回應欄位，加上打者、所屬球隊與比賽的必要資訊。"""
+    return (
+        select(
+            *_at_bat_response_columns(detail),
+            models.AtBatDetailDB.game_id,
+            models.PlayerGameSummaryDB.player_name,
+            models.PlayerGameSummaryDB.batting_order,
+            models.PlayerGameSummaryDB.team_name,
+            models.GameResultDB.game_date,
+            models.GameResultDB.home_team,
+            models.GameResultDB.away_team,
+        )
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .join(
+            models.GameResultDB,
+            models.AtBatDetailDB.game_id == models.GameResultDB.id,
+        )
+    )
+
+
+def opponent_team_of(at_bat_row: sa.Row) -> str:
+    """依打者所屬球隊，從打席列表 Row 中判斷對戰球隊。"""
+    if at_bat_row.home_team == at_bat_row.team_name:
+        return at_bat_row.away_team
+    return at_bat_row.home_team
+
+
+def _streak_at_bat_from_row(at_bat_row: sa.Row) -> schemas.AtBatDetailForStreak:
+    """將打席列表 Row 轉換為含打者姓名與棒次的打席模型。"""
+    return schemas.AtBatDetailForStreak(**at_bat_row._mapping)
+
+
 # --- 進階查詢函式 ---
 
 
@@ -25,10 +85,14 @@ def find_games_with_players(
 
     subquery = (
         db.query(models.PlayerGameSummaryDB.game_id)
-        .filter(models.PlayerGameSummaryDB.player_name.in_(player_names))
+        .filter(
+            models.PlayerGameSummaryDB.player_id.in_(
+                dimensions.resolve_player_ids(db, player_names)
+            )
+        )
         .group_by(models.PlayerGameSummaryDB.game_id)
         .having(
-            func.count(models.PlayerGameSummaryDB.player_name.distinct())
+            func.count(models.PlayerGameSummaryDB.player_id.distinct())
             == len(player_names)
         )
         .subquery()
@@ -50,10 +114,11 @@ def get_stats_since_last_homerun(
     db: Session, player_name: str
 ) -> Dict[str, Any] | None:
     """查詢指定球員的最後一發全壘打，並計算此後的相關數據及生涯數據。"""
+    player_ids = dimensions.resolve_player_ids(db, [player_name])
     last_hr_at_bat = (
         db.query(models.AtBatDetailDB)
         .join(models.AtBatDetailDB.player_summary)
-        .filter(models.PlayerGameSummaryDB.player_name == player_name)
+        .filter(models.PlayerGameSummaryDB.player_id.in_(player_ids))
         .filter(models.AtBatDetailDB.result_description_full.contains("全壘打"))
         .join(models.PlayerGameSummaryDB.game)
         .order_by(
@@ -78,7 +143,7 @@ def get_stats_since_last_homerun(
         )
         .join(models.GameResultDB)
         .filter(
-            models.PlayerGameSummaryDB.player_name == player_name,
+            models.PlayerGameSummaryDB.player_id.in_(player_ids),
             models.GameResultDB.game_date > last_hr_date,
         )
         .one()
@@ -109,50 +174,227 @@ def get_stats_since_last_homerun(
     }
 
 
+def get_stats_since_last_homerun_for_players(
+    db: Session, player_names: List[str]
+) -> Dict[str, Dict[str, Any] | None]:
+    """
+    批次查詢多位球員的最後一轟與其後的相關數據。
+
+    使用窗口函數 (ROW_NUMBER) 一次找出每位球員的最後一發全壘打，
+    再以單一 GROUP BY 查詢計算「此後」的出賽數與打數，查詢次數不隨球員數量增加。
+    [修正] 分組與關聯一律使用 player_id，最後才對應回球員名稱。
+    """
+    results: Dict[str, Dict[str, Any] | None] = {name: None for name in player_names}
+    names_by_id = {
+        player_id: name
+        for name, player_id in dimensions.resolve_player_id_map(
+            db, player_names
+        ).items()
+    }
+    if not names_by_id:
+        return results
+
+    ranked_homeruns = (
+        select(
+            models.AtBatDetailDB.id.label("at_bat_id"),
+            models.PlayerGameSummaryDB.player_id.label("player_id"),
+            models.GameResultDB.game_date.label("game_date"),
+            func.row_number()
+            .over(
+                partition_by=models.PlayerGameSummaryDB.player_id,
+                order_by=(
+                    models.GameResultDB.game_date.desc(),
+                    models.AtBatDetailDB.sequence_in_game.desc(),
+                ),
+            )
+            .label("rn"),
+        )
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .join(
+            models.GameResultDB,
+            models.PlayerGameSummaryDB.game_id == models.GameResultDB.id,
+        )
+        .where(
+            models.PlayerGameSummaryDB.player_id.in_(names_by_id),
+            models.AtBatDetailDB.result_description_full.contains("全壘打"),
+        )
+        .subquery()
+    )
+    last_homeruns = (
+        select(
+            ranked_homeruns.c.at_bat_id,
+            ranked_homeruns.c.player_id,
+            ranked_homeruns.c.game_date,
+        )
+        .where(ranked_homeruns.c.rn == 1)
+        .subquery()
+    )
+
+    last_hr_rows = db.execute(
+        select(
+            models.AtBatDetailDB,
+            last_homeruns.c.player_id,
+            last_homeruns.c.game_date,
+        ).join(last_homeruns, models.AtBatDetailDB.id == last_homeruns.c.at_bat_id)
+    ).all()
+    if not last_hr_rows:
+        return results
+
+    stats_since_rows = db.execute(
+        select(
+            models.PlayerGameSummaryDB.player_id,
+            func.count(models.PlayerGameSummaryDB.game_id.distinct()).label(
+                "games_since"
+            ),
+            func.sum(models.PlayerGameSummaryDB.at_bats).label("at_bats_since"),
+        )
+        .join(
+            models.GameResultDB,
+            models.PlayerGameSummaryDB.game_id == models.GameResultDB.id,
+        )
+        .join(
+            last_homeruns,
+            models.PlayerGameSummaryDB.player_id == last_homeruns.c.player_id,
+        )
+        .where(models.GameResultDB.game_date > last_homeruns.c.game_date)
+        .group_by(models.PlayerGameSummaryDB.player_id)
+    ).all()
+    stats_since_map = {row.player_id: row for row in stats_since_rows}
+
+    career_stats_map = {
+        career.player_id: schemas.PlayerCareerStats.model_validate(career)
+        for career in db.query(models.PlayerCareerStatsDB)
+        .filter(models.PlayerCareerStatsDB.player_id.in_(names_by_id))
+        .all()
+    }
+
+    today = datetime.date.today()
+    for last_hr_at_bat, player_id, last_hr_date in last_hr_rows:
+        stats_since = stats_since_map.get(player_id)
+        results[names_by_id[player_id]] = {
+            "last_homerun": last_hr_at_bat,
+            "game_date": last_hr_date,
+            "days_since": (today - last_hr_date).days,
+            "games_since": (stats_since.games_since if stats_since else 0) or 0,
+            "at_bats_since": (stats_since.at_bats_since if stats_since else 0) or 0,
+            "career_stats": career_stats_map.get(player_id),
+        }
+
+    return results
+
+
+def _situation_condition(situation: models.RunnersSituation):
+    """將壘上情境轉換為對 runners_on_base_before 欄位的 SQL 篩選條件。"""
+    if situation == models.RunnersSituation.BASES_LOADED:
+        return models.AtBatDetailDB.runners_on_base_before == "一壘、二壘、三壘有人"
+    if situation == models.RunnersSituation.SCORING_POSITION:
+        return or_(
+            models.AtBatDetailDB.runners_on_base_before.contains("二壘"),
+            models.AtBatDetailDB.runners_on_base_before.contains("三壘"),
+        )
+    if situation == models.RunnersSituation.BASES_EMPTY:
+        return models.AtBatDetailDB.runners_on_base_before == "壘上無人"
+    return None
+
+
 def find_at_bats_in_situation(
     db: Session,
     player_name: str,
     situation: models.RunnersSituation,
     skip: int = 0,
     limit: int = 100,
-) -> List[models.AtBatDetailDB]:
-    """查詢指定球員在特定壘上情境下的所有打席紀錄。"""
-    query = (
-        db.query(models.AtBatDetailDB)
-        .join(models.PlayerGameSummaryDB)
-        .join(models.GameResultDB)
-        .options(
-            joinedload(models.AtBatDetailDB.player_summary).joinedload(
-                models.PlayerGameSummaryDB.game
-            )
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> List[sa.Row]:
+    """
+    查詢指定球員在特定壘上情境下的所有打席紀錄。
+    回傳的 Row 包含打席欄位與比賽日期、主客隊等資訊 (見 _select_at_bat_rows)。
+    """
+    statement = _select_at_bat_rows(detail).where(
+        models.PlayerGameSummaryDB.player_id.in_(
+            dimensions.resolve_player_ids(db, [player_name])
         )
-        .filter(models.PlayerGameSummaryDB.player_name == player_name)
     )
 
-    if situation == models.RunnersSituation.BASES_LOADED:
-        query = query.filter(
-            models.AtBatDetailDB.runners_on_base_before == "一壘、二壘、三壘有人"
-        )
-    elif situation == models.RunnersSituation.SCORING_POSITION:
-        query = query.filter(
-            or_(
-                models.AtBatDetailDB.runners_on_base_before.contains("二壘"),
-                models.AtBatDetailDB.runners_on_base_before.contains("三壘"),
-            )
-        )
-    elif situation == models.RunnersSituation.BASES_EMPTY:
-        query = query.filter(models.AtBatDetailDB.runners_on_base_before == "壘上無人")
+    situation_condition = _situation_condition(situation)
+    if situation_condition is not None:
+        statement = statement.where(situation_condition)
 
-    at_bats = (
-        query.order_by(
+    statement = (
+        statement.order_by(
             models.GameResultDB.game_date.desc(),
             models.AtBatDetailDB.sequence_in_game.desc(),
         )
         .offset(skip)
         .limit(limit)
-        .all()
     )
-    return at_bats
+    return db.execute(statement).all()
+
+
+def find_at_bats_in_situation_for_players(
+    db: Session,
+    player_names: List[str],
+    situation: models.RunnersSituation,
+    skip: int = 0,
+    limit: int = 100,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> Dict[str, List[sa.Row]]:
+    """
+    批次查詢多位球員在特定壘上情境下的打席紀錄。
+
+    以 ROW_NUMBER 依球員分區排序後，在 SQL 端完成每位球員各自的分頁，
+    只需一次查詢即可取得所有球員的結果。
+    """
+    results: Dict[str, List[models.AtBatDetailDB]] = {name: [] for name in player_names}
+    if not player_names:
+        return results
+
+    ranked_statement = (
+        select(
+            models.AtBatDetailDB.id.label("at_bat_id"),
+            func.row_number()
+            .over(
+                partition_by=models.PlayerGameSummaryDB.player_name,
+                order_by=(
+                    models.GameResultDB.game_date.desc(),
+                    models.AtBatDetailDB.sequence_in_game.desc(),
+                ),
+            )
+            .label("rn"),
+        )
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .join(
+            models.GameResultDB,
+            models.PlayerGameSummaryDB.game_id == models.GameResultDB.id,
+        )
+        .where(
+            models.PlayerGameSummaryDB.player_id.in_(
+                dimensions.resolve_player_ids(db, player_names)
+            )
+        )
+    )
+    situation_condition = _situation_condition(situation)
+    if situation_condition is not None:
+        ranked_statement = ranked_statement.where(situation_condition)
+    ranked = ranked_statement.subquery()
+
+    at_bat_rows = db.execute(
+        _select_at_bat_rows(detail)
+        .join(ranked, models.AtBatDetailDB.id == ranked.c.at_bat_id)
+        .where(ranked.c.rn > skip, ranked.c.rn <= skip + limit)
+        .order_by(ranked.c.rn)
+    ).all()
+    for at_bat_row in at_bat_rows:
+        results[at_bat_row.player_name].append(at_bat_row)
+
+    return results
 
 
 # [T31-4 修正] 擴充函式以整合打擊與守備數據
@@ -168,55 +410,79 @@ def get_position_analysis_by_year(db: Session, year: int, position: str) -> Dict
     Returns:
         一個包含 calendar_data 和 player_stats 的字典。
     """
-    # 1. 查詢該年度、該守備位置相關的所有出場紀錄
-    #    - position.like(f"%{position}%") 會同時抓取 '2B' 和 '(2B)'
-    #    - 預先載入 game relationship 以避免 N+1 查詢
-    summaries = (
-        db.query(models.PlayerGameSummaryDB)
-        .join(models.GameResultDB)
-        .filter(extract("year", models.GameResultDB.game_date) == year)
-        .filter(models.PlayerGameSummaryDB.position.like(f"%{position}%"))
-        .options(sa.orm.joinedload(models.PlayerGameSummaryDB.game))
-        .order_by(models.GameResultDB.game_date.asc())
-        .all()
-    )
+    position = position.upper()
+    appearance = models.PlayerGamePositionDB
+
+    # 1. [修正] 以正規化的守備位置出場表進行單一分組查詢，取代 position LIKE 全表掃描
+    #    - 每場比賽一列：先發球員的 summary id 與所有替補 (含換位) 的球員姓名
+    game_rows = db.execute(
+        select(
+            appearance.game_id,
+            models.GameResultDB.game_date,
+            func.max(
+                sa.case(
+                    (appearance.is_starter.is_(True), appearance.player_game_summary_id)
+                )
+            ).label("starter_summary_id"),
+            func.aggregate_strings(
+                sa.case((appearance.is_starter.is_(False), appearance.player_name)),
+                ",",
+            ).label("substitute_names"),
+        )
+        .join(models.GameResultDB, appearance.game_id == models.GameResultDB.id)
+        .where(
+            appearance.position == position,
+            extract("year", models.GameResultDB.game_date) == year,
+        )
+        .group_by(appearance.game_id, models.GameResultDB.game_date)
+        .order_by(models.GameResultDB.game_date.asc(), appearance.game_id.asc())
+    ).all()
+
+    # 2. 一次載入所有先發球員的單場總結
+    starter_summary_ids = [
+        row.starter_summary_id for row in game_rows if row.starter_summary_id
+    ]
+    starter_summaries = {}
+    if starter_summary_ids:
+        starter_summaries = {
+            summary.id: summary
+            for summary in db.query(models.PlayerGameSummaryDB)
+            .filter(models.PlayerGameSummaryDB.id.in_(starter_summary_ids))
+            .all()
+        }
 
     calendar_data = []
-    # 2. 按 game_id 將紀錄分組
-    #    - 需要先對 summaries 排序才能正確分組
-    summaries.sort(key=attrgetter("game_id"))
-    for game_id, group in groupby(summaries, key=attrgetter("game_id")):
-        game_summaries = list(group)
-        starter_summary = None
-        substitute_player_names = []
-
-        # 3. 在每場比賽中找出先發與替補
-        for summary in game_summaries:
-            # 先發定義：守備位置完全相符，且尚未找到先發
-            if summary.position == position and not starter_summary:
-                starter_summary = summary
-            else:
-                substitute_player_names.append(summary.player_name)
-
-        # 4. 如果有找到先發球員，才建立日曆項目
-        if starter_summary:
-            # 從替補名單中移除先發球員自己
-            final_substitutes = [
-                name
-                for name in substitute_player_names
-                if name != starter_summary.player_name
-            ]
-            calendar_item = {
-                "date": starter_summary.game.game_date,
+    player_names = set()
+    for row in game_rows:
+        substitute_names = list(
+            dict.fromkeys(
+                row.substitute_names.split(",") if row.substitute_names else []
+            )
+        )
+        player_names.update(substitute_names)
+
+        # 3. 如果有找到先發球員，才建立日曆項目
+        starter_summary = starter_summaries.get(row.starter_summary_id)
+        if not starter_summary:
+            continue
+        player_names.add(starter_summary.player_name)
+
+        calendar_data.append(
+            {
+                "date": row.game_date,
                 "starter_player_name": starter_summary.player_name,
-                "substitute_player_names": final_substitutes,
+                # 從替補名單中移除先發球員自己
+                "substitute_player_names": [
+                    name
+                    for name in substitute_names
+                    if name != starter_summary.player_name
+                ],
                 "starter_player_summary": starter_summary,
             }
-            calendar_data.append(calendar_item)
+        )
 
-    # 5. 整合 player_stats (打擊與守備數據)
-    #    - 從已查詢的出場紀錄中，取得所有不重複的球員姓名
-    player_names = {summary.player_name for summary in summaries}
+    # 4. 整合 player_stats (打擊與守備數據)
+    #    - player_names 為所有曾於該位置出賽的不重複球員姓名
 
     player_stats_combined = []
     if player_names:
@@ -233,7 +499,7 @@ def get_position_analysis_by_year(db: Session, year: int, position: str) -> Dict
         fielding_stats_list = (
             db.query(models.PlayerFieldingStatsDB)
             .filter(models.PlayerFieldingStatsDB.player_name.in_(player_names))
-            .filter(models.PlayerFieldingStatsDB.position == position.upper())
+            .filter(models.PlayerFieldingStatsDB.position == position)
             .all()
         )
         fielding_stats_map = {s.player_name: s for s in fielding_stats_list}
@@ -295,7 +561,11 @@ def find_next_at_bats_after_ibb(
             next_at_bat,
             at_bat_with_next_subquery.c.next_at_bat_id == next_at_bat.id,
         )
-        .filter(models.PlayerGameSummaryDB.player_name == player_name)
+        .filter(
+            models.PlayerGameSummaryDB.player_id.in_(
+                dimensions.resolve_player_ids(db, [player_name])
+            )
+        )
         .filter(ibb_at_bat.result_description_full.contains("故意四壞"))
         .order_by(ibb_at_bat.id.desc())
         .offset(skip)
@@ -316,6 +586,7 @@ def find_on_base_streaks(
     lineup_positions: Optional[List[int]],
     skip: int = 0,
     limit: int = 100,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
 ) -> List[schemas.OnBaseStreak]:
     """查詢符合「連線」定義的打席序列。"""
     valid_results = set(settings.STREAK_DEFINITIONS.get(definition_name, []))
@@ -323,31 +594,39 @@ def find_on_base_streaks(
         logging.warning(f"無效的連線定義名稱: {definition_name}")
         return []
 
-    query = (
-        db.query(models.AtBatDetailDB)
-        .join(models.PlayerGameSummaryDB)
-        .options(
-            joinedload(models.AtBatDetailDB.player_summary).joinedload(
-                models.PlayerGameSummaryDB.game
-            )
+    if not player_names and not lineup_positions:
+        # [新增] 泛用連線優先以 worker 發布的欄式快照做向量化掃描，
+        # 只需從資料庫讀取分頁後實際要回傳的打席
+        streak_at_bat_ids = at_bat_columns.find_streak_at_bat_ids(
+            db, valid_results, min_length
         )
-    )
+        if streak_at_bat_ids is not None:
+            return _load_streaks_by_at_bat_ids(
+                db, streak_at_bat_ids[skip : skip + limit], detail
+            )[::-1]
+
+    # [修正] 改以 Core select() 取得輕量的 Row，避免載入大量 ORM 物件
+    statement = _select_at_bat_rows(detail)
 
     if player_names:
         game_ids_subquery = (
             select(models.PlayerGameSummaryDB.game_id)
-            .where(models.PlayerGameSummaryDB.player_name.in_(player_names))
+            .where(
+                models.PlayerGameSummaryDB.player_id.in_(
+                    dimensions.resolve_player_ids(db, player_names)
+                )
+            )
             .distinct()
         )
-        query = query.filter(models.AtBatDetailDB.game_id.in_(game_ids_subquery))
+        statement = statement.where(models.AtBatDetailDB.game_id.in_(game_ids_subquery))
 
-    final_query = query.order_by(
+    statement = statement.order_by(
         models.AtBatDetailDB.game_id,
         models.AtBatDetailDB.inning,
         models.AtBatDetailDB.sequence_in_game,
     )
 
-    all_at_bats = final_query.all()
+    all_at_bats = db.execute(statement).all()
 
     all_streaks = []
     if player_names or lineup_positions:
@@ -369,16 +648,14 @@ def find_on_base_streaks(
 
             is_match = False
             if player_names:
-                streak_player_names = {
-                    ab.player_summary.player_name for ab in potential_streak
-                }
+                streak_player_names = {ab.player_name for ab in potential_streak}
                 if streak_player_names == set(player_names):
                     is_match = True
             elif lineup_positions:
                 is_lineup_match = True
                 for j, ab in enumerate(potential_streak):
                     try:
-                        if int(ab.player_summary.batting_order) != lineup_positions[j]:
+                        if int(ab.batting_order) != lineup_positions[j]:
                             is_lineup_match = False
                             break
                     except (ValueError, TypeError):
@@ -413,82 +690,119 @@ def find_on_base_streaks(
             all_streaks.append(list(current_streak))
 
     paginated_streaks = all_streaks[skip : skip + limit]
-    result_models = []
-    for streak in paginated_streaks:
-        if not streak:
-            continue
-        game = streak[0].player_summary.game
-        player_team = streak[0].player_summary.team_name
-        opponent_team = (
-            game.away_team if game.home_team == player_team else game.home_team
-        )
+    result_models = [
+        _to_on_base_streak(streak) for streak in paginated_streaks if streak
+    ]
+    return result_models[::-1]
 
-        at_bat_models = [
-            schemas.AtBatDetailForStreak(
-                player_name=ab.player_summary.player_name,
-                batting_order=ab.player_summary.batting_order,
-                **ab.__dict__,
-            )
-            for ab in streak
-        ]
 
-        streak_model = schemas.OnBaseStreak(
-            game_id=game.id,
-            game_date=game.game_date,
-            inning=streak[0].inning,
-            streak_length=len(streak),
-            opponent_team=opponent_team,
-            runs_scored_during_streak=sum(ab.runs_scored_on_play for ab in streak),
-            at_bats=at_bat_models,
-        )
-        result_models.append(streak_model)
+def _to_on_base_streak(streak: List[sa.Row]) -> schemas.OnBaseStreak:
+    """將一段連續打席的 Row 組成連線模型。"""
+    first_ab = streak[0]
+    return schemas.OnBaseStreak(
+        game_id=first_ab.game_id,
+        game_date=first_ab.game_date,
+        inning=first_ab.inning,
+        streak_length=len(streak),
+        opponent_team=opponent_team_of(first_ab),
+        runs_scored_during_streak=sum(ab.runs_scored_on_play for ab in streak),
+        at_bats=[_streak_at_bat_from_row(ab) for ab in streak],
+    )
 
-    return result_models[::-1]
+
+def _load_streaks_by_at_bat_ids(
+    db: Session,
+    streak_at_bat_ids: List[List[int]],
+    detail: models.AtBatDetailLevel,
+) -> List[schemas.OnBaseStreak]:
+    """依欄式快照找出的打席 ID 序列，一次查詢取回打席並組成連線模型。"""
+    all_ids = [at_bat_id for ids in streak_at_bat_ids for at_bat_id in ids]
+    if not all_ids:
+        return []
+    rows_by_id = {
+        row.id: row
+        for row in db.execute(
+            _select_at_bat_rows(detail).where(models.AtBatDetailDB.id.in_(all_ids))
+        ).all()
+    }
+    streaks = []
+    for ids in streak_at_bat_ids:
+        streak = [rows_by_id[at_bat_id] for at_bat_id in ids if at_bat_id in rows_by_id]
+        if streak:
+            streaks.append(_to_on_base_streak(streak))
+    return streaks
 
 
 def analyze_ibb_impact(
-    db: Session, player_name: str, skip: int = 0, limit: int = 100
+    db: Session,
+    player_name: str,
+    skip: int = 0,
+    limit: int = 100,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
 ) -> List[schemas.IbbImpactResult]:
     """分析指定球員被故意四壞後，對該半局總失分的影響。"""
+    return analyze_ibb_impact_for_players(
+        db, [player_name], skip=skip, limit=limit, detail=detail
+    )[player_name]
+
+
+def analyze_ibb_impact_for_players(
+    db: Session,
+    player_names: List[str],
+    skip: int = 0,
+    limit: int = 100,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> Dict[str, List[schemas.IbbImpactResult]]:
+    """
+    批次分析多位球員被故意四壞後，對該半局總失分的影響。
+
+    以單一 Core 查詢載入所有相關比賽的打席 Row (player_name IN (...))，再於同一次
+    掃描中依球員分組，避免對每位球員重複查詢。
+    """
+    results: Dict[str, List[schemas.IbbImpactResult]] = {
+        name: [] for name in player_names
+    }
+    if not player_names:
+        return results
+
     game_ids_subquery = (
         select(models.PlayerGameSummaryDB.game_id)
-        .where(models.PlayerGameSummaryDB.player_name == player_name)
+        .where(
+            models.PlayerGameSummaryDB.player_id.in_(
+                dimensions.resolve_player_ids(db, player_names)
+            )
+        )
         .distinct()
     )
 
-    all_related_at_bats = (
-        db.query(models.AtBatDetailDB)
-        .join(models.PlayerGameSummaryDB)
-        .filter(models.PlayerGameSummaryDB.game_id.in_(game_ids_subquery))
-        .options(
-            joinedload(models.AtBatDetailDB.player_summary).joinedload(
-                models.PlayerGameSummaryDB.game
+    # 故意四壞的判斷在 SQL 端完成，summary 模式下不需讀取完整描述文字
+    all_related_at_bats = db.execute(
+        _select_at_bat_rows(detail)
+        .add_columns(
+            models.AtBatDetailDB.result_description_full.contains("故意四壞").label(
+                "is_intentional_walk"
             )
         )
+        .where(models.AtBatDetailDB.game_id.in_(game_ids_subquery))
         .order_by(
-            models.PlayerGameSummaryDB.game_id,
+            models.AtBatDetailDB.game_id,
             models.AtBatDetailDB.inning,
             models.AtBatDetailDB.id,
         )
-        .all()
-    )
+    ).all()
 
-    results = []
     for i, at_bat in enumerate(all_related_at_bats):
-        is_ibb = (
-            at_bat.result_description_full
-            and "故意四壞" in at_bat.result_description_full
-        )
-        is_target_player = at_bat.player_summary.player_name == player_name
+        is_ibb = bool(at_bat.is_intentional_walk)
+        hitter_name = at_bat.player_name
 
-        if is_ibb and is_target_player:
+        if is_ibb and hitter_name in results:
             ibb_event = at_bat
             subsequent_at_bats = []
             runs_scored_after = 0
 
             for next_ab in all_related_at_bats[i + 1 :]:
                 if (
-                    next_ab.player_summary.game_id == ibb_event.player_summary.game_id
+                    next_ab.game_id == ibb_event.game_id
                     and next_ab.inning == ibb_event.inning
                 ):
                     subsequent_at_bats.append(next_ab)
@@ -496,37 +810,20 @@ def analyze_ibb_impact(
                 else:
                     break
 
-            game = ibb_event.player_summary.game
-            player_team = ibb_event.player_summary.team_name
-            opponent_team = (
-                game.away_team if game.home_team == player_team else game.home_team
-            )
-
-            ibb_model = schemas.AtBatDetailForStreak(
-                player_name=ibb_event.player_summary.player_name,
-                batting_order=ibb_event.player_summary.batting_order,
-                **ibb_event.__dict__,
-            )
-
-            subsequent_models = [
-                schemas.AtBatDetailForStreak(
-                    player_name=ab.player_summary.player_name,
-                    batting_order=ab.player_summary.batting_order,
-                    **ab.__dict__,
-                )
-                for ab in subsequent_at_bats
-            ]
-
             impact_result = schemas.IbbImpactResult(
-                game_id=game.id,
-                game_date=game.game_date,
+                game_id=ibb_event.game_id,
+                game_date=ibb_event.game_date,
                 inning=ibb_event.inning,
-                opponent_team=opponent_team,
-                intentional_walk=ibb_model,
-                subsequent_at_bats=subsequent_models,
+                opponent_team=opponent_team_of(ibb_event),
+                intentional_walk=_streak_at_bat_from_row(ibb_event),
+                subsequent_at_bats=[
+                    _streak_at_bat_from_row(ab) for ab in subsequent_at_bats
+                ],
                 runs_scored_after_ibb=runs_scored_after,
             )
-            results.append(impact_result)
+            results[hitter_name].append(impact_result)
 
-    paginated_results = results[::-1][skip : skip + limit]
-    return paginated_results
+    return {
+        name: player_results[::-1][skip : skip + limit]
+        for name, player_results in results.items()
+    }
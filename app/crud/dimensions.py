@@ -0,0 +1,103 @@
+# app/crud/dimensions.py
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Type
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+
+# 名稱 -> id 的行程內快取。維度列建立後 id 即不再變動，因此只快取已查到的對應；
+# 查無的名稱不快取，以便之後新增的球員 / 球隊可被查到。
+_id_cache: Dict[str, Dict[str, int]] = {
+    models.PlayerDB.__tablename__: {},
+    models.TeamDB.__tablename__: {},
+}
+_cache_lock = threading.Lock()
+
+
+def clear_cache() -> None:
+    """清除名稱 -> id 快取 (資料庫重建時使用)。"""
+    with _cache_lock:
+        for cache in _id_cache.values():
+            cache.clear()
+
+
+def _lookup_ids(
+    db: Session,
+    model: Type[models.Base],
+    names: Iterable[str],
+    cache_results: bool = True,
+) -> Dict[str, int]:
+    """依名稱查詢維度列的 id，優先使用快取；查無的名稱不會出現在結果中。"""
+    cache = _id_cache[model.__tablename__]
+    names = {name for name in names if name}
+    with _cache_lock:
+        found = {name: cache[name] for name in names if name in cache}
+    missing = names - found.keys()
+    if missing:
+        rows = db.execute(
+            select(model.name, model.id).where(model.name.in_(missing))
+        ).all()
+        fetched = {row.name: row.id for row in rows}
+        if cache_results:
+            with _cache_lock:
+                cache.update(fetched)
+        found.update(fetched)
+    return found
+
+
+def _get_or_create_ids(
+    db: Session, model: Type[models.Base], names: Iterable[str]
+) -> Dict[str, int]:
+    """
+    取得名稱對應的 id，不存在的名稱會新增維度列。不會自行 commit。
+
+    寫入交易中查到的 id 可能尚未提交，因此不放入快取，避免交易回滾後快取到不存在的 id。
+    """
+    names = {name for name in names if name}
+    ids = _lookup_ids(db, model, names, cache_results=False)
+    for name in sorted(names - ids.keys()):
+        try:
+            # 以 SAVEPOINT 新增，若其他 worker 已同時新增同名資料則改為查詢
+            with db.begin_nested():
+                row = model(name=name)
+                db.add(row)
+            ids[name] = row.id
+            logging.info(f"新增{model.__tablename__}維度資料: {name}")
+        except IntegrityError:
+            ids[name] = db.scalar(select(model.id).where(model.name == name))
+    return ids
+
+
+def get_or_create_player_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """寫入時使用：取得球員名稱對應的 player_id，不存在者自動建立。"""
+    return _get_or_create_ids(db, models.PlayerDB, names)
+
+
+def get_or_create_team_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """寫入時使用：取得隊名對應的 team_id，不存在者自動建立。"""
+    return _get_or_create_ids(db, models.TeamDB, names)
+
+
+def resolve_player_ids(db: Session, names: Iterable[str]) -> List[int]:
+    """查詢時使用：將球員名稱轉換為 player_id 列表，查無的名稱會被略過。"""
+    return list(_lookup_ids(db, models.PlayerDB, names).values())
+
+
+def resolve_team_ids(db: Session, names: Iterable[str]) -> List[int]:
+    """查詢時使用：將隊名轉換為 team_id 列表，查無的隊名會被略過。"""
+    return list(_lookup_ids(db, models.TeamDB, names).values())
+
+
+def resolve_player_id_map(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """查詢時使用：回傳球員名稱 -> player_id，查無的名稱不會出現在結果中。"""
+    return _lookup_ids(db, models.PlayerDB, names)
+
+
+def resolve_player_id(db: Session, name: str) -> Optional[int]:
+    """查詢時使用：取得單一球員的 player_id，查無時回傳 None。"""
+    return _lookup_ids(db, models.PlayerDB, [name]).get(name)
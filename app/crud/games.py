@@ -1,13 +1,26 @@
 # app/crud/games.py
 
+import copy
+import gzip
+import json
 import logging
 import datetime
-from typing import List, Dict, Any, Sequence
+from typing import List, Dict, Any, Optional, Sequence
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, select, extract
+from sqlalchemy.orm import Session, defer, joinedload
+from sqlalchemy import ColumnElement, and_, func, or_, select, extract
 
-from app import models
+from app import models, schemas
+from app.crud import dimensions
+
+
+def involving_teams(db: Session, team_names: List[str]) -> ColumnElement[bool]:
+    """[新增] 比賽的主隊或客隊屬於指定球隊的條件，以整數 team_id 比對。"""
+    team_ids = dimensions.resolve_team_ids(db, team_names)
+    return or_(
+        models.GameResultDB.home_team_id.in_(team_ids),
+        models.GameResultDB.away_team_id.in_(team_ids),
+    )
 
 
 def delete_game_if_exists(db: Session, cpbl_game_id: str, game_date: datetime.date):
@@ -40,6 +53,41 @@ def delete_game_if_exists(db: Session, cpbl_game_id: str, game_date: datetime.da
         raise
 
 
+def get_final_game_fingerprint(
+    db: Session,
+    cpbl_game_id: str,
+    game_date: datetime.date,
+    target_teams: Optional[Sequence[str]] = None,
+) -> Optional[str]:
+    """
+    [新增] 取得已儲存且狀態為「已完成」之比賽的內容指紋；比賽不存在或未完成時回傳 None。
+    [修正] 比賽 (目標球隊) 沒有任何打席紀錄時同樣回傳 None，讓先前不完整的寫入會被重新處理。
+    """
+    at_bats_exist = (
+        select(models.AtBatDetailDB.id)
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .where(models.AtBatDetailDB.game_id == models.GameResultDB.id)
+    )
+    if target_teams:
+        at_bats_exist = at_bats_exist.where(
+            models.PlayerGameSummaryDB.team_name.in_(target_teams)
+        )
+    return (
+        db.query(models.GameResultDB.content_fingerprint)
+        .filter(
+            models.GameResultDB.cpbl_game_id == cpbl_game_id,
+            models.GameResultDB.game_date == game_date,
+            models.GameResultDB.status == "已完成",
+            at_bats_exist.exists(),
+        )
+        .scalar()
+    )
+
+
 def create_game_and_get_id(db: Session, game_info: Dict[str, Any]) -> int | None:
     """
     【修改】儲存單場比賽概要資訊。
@@ -51,6 +99,10 @@ def create_game_and_get_id(db: Session, game_info: Dict[str, Any]) -> int | None
         if not cpbl_game_id:
             return None
 
+        # [新增] 於寫入時解析球隊維度 id
+        team_ids = dimensions.get_or_create_team_ids(
+            db, [game_info.get("home_team"), game_info.get("away_team")]
+        )
         game_data_for_db = {
             "cpbl_game_id": game_info.get("cpbl_game_id"),
             "game_date": datetime.datetime.strptime(
@@ -59,10 +111,13 @@ def create_game_and_get_id(db: Session, game_info: Dict[str, Any]) -> int | None
             "game_time": game_info.get("game_time"),
             "home_team": game_info.get("home_team"),
             "away_team": game_info.get("away_team"),
+            "home_team_id": team_ids.get(game_info.get("home_team")),
+            "away_team_id": team_ids.get(game_info.get("away_team")),
             "home_score": game_info.get("home_score"),
             "away_score": game_info.get("away_score"),
             "venue": game_info.get("venue"),
             "status": game_info.get("status"),
+            "content_fingerprint": game_info.get("content_fingerprint"),
         }
         new_game = models.GameResultDB(**game_data_for_db)
         db.add(new_game)
@@ -134,17 +189,71 @@ def get_games_by_date(
     )
 
 
-def get_game_with_details(db: Session, game_id: int) -> models.GameResultDB | None:
+def record_season_schedule_game(db: Session, game_info: Dict[str, Any]) -> bool:
+    """
+    [新增] 將賽程頁解析出的一場比賽寫入整季賽程，同一季以 cpbl_game_id 對應同一筆。不會自行 commit。
+
+    延賽的比賽可能同時出現在原日期與補賽日期，只有日期不早於既有紀錄時才會更新，
+    因此最終保留的是最新的補賽日期。
+
+    Returns:
+        bool: 新增或更新紀錄時回傳 True；資料不完整或日期較舊而略過時回傳 False。
+    """
+    cpbl_game_id = game_info.get("cpbl_game_id")
+    if not cpbl_game_id or not game_info.get("game_date"):
+        return False
+    game_date = datetime.datetime.strptime(game_info["game_date"], "%Y-%m-%d").date()
+
+    row = db.scalar(
+        select(models.SeasonScheduleGameDB).where(
+            models.SeasonScheduleGameDB.season == game_date.year,
+            models.SeasonScheduleGameDB.cpbl_game_id == cpbl_game_id,
+        )
+    )
+    if row is None:
+        row = models.SeasonScheduleGameDB(
+            season=game_date.year, cpbl_game_id=cpbl_game_id
+        )
+        db.add(row)
+    elif row.game_date > game_date:
+        return False
+
+    row.game_date = game_date
+    row.game_time = game_info.get("game_time")
+    row.home_team = game_info.get("home_team")
+    row.away_team = game_info.get("away_team")
+    row.status = game_info.get("status")
+    # [新增] 每次出現在賽程頁都更新時間，作為判斷整季賽程是否過期的依據
+    row.updated_at = func.now()
+    # session 未開啟 autoflush，同一批賽程中重複出現的比賽需能查到剛寫入的紀錄
+    db.flush()
+    return True
+
+
+def get_game_with_details(
+    db: Session,
+    game_id: int,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> models.GameResultDB | None:
     """
     使用 joinedload 預先載入關聯資料，獲取單場比賽的完整細節。
+    [修改] 打席的大型文字欄位僅在 detail=full 時才會載入；summary 模式下
+    這些欄位設為 raiseload，序列化時需以 AtBatDetail 的 summary context 略過。
     """
+    at_bat_loader = joinedload(models.PlayerGameSummaryDB.at_bat_details)
+    if detail != models.AtBatDetailLevel.FULL:
+        at_bat_loader = at_bat_loader.options(
+            *(
+                defer(getattr(models.AtBatDetailDB, column), raiseload=True)
+                for column in models.AT_BAT_HEAVY_COLUMNS
+            )
+        )
+
     try:
         game = (
             db.query(models.GameResultDB)
             .options(
-                joinedload(models.GameResultDB.player_summaries).options(
-                    joinedload(models.PlayerGameSummaryDB.at_bat_details)
-                )
+                joinedload(models.GameResultDB.player_summaries).options(at_bat_loader)
             )
             .filter(models.GameResultDB.id == game_id)
             .first()
@@ -157,6 +266,77 @@ def get_game_with_details(db: Session, game_id: int) -> models.GameResultDB | No
         return None
 
 
+def _encode_detail_document(content: Dict[str, Any]) -> bytes:
+    """以與 FastAPI JSONResponse 相同的格式序列化，並以 gzip 壓縮。"""
+    rendered = json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    )
+    return gzip.compress(rendered.encode("utf-8"))
+
+
+def store_game_detail_documents(db: Session, game_id: int) -> bool:
+    """
+    [新增] 將單場比賽的完整細節渲染為 summary / full 兩份 JSON 文件並壓縮儲存。
+    呼叫前需先 flush，使球員摘要與打席紀錄可被查詢。
+
+    Returns:
+        bool: 成功渲染並加入 session 則回傳 True，比賽不存在則回傳 False。
+    """
+    game = (
+        db.query(models.GameResultDB)
+        .options(
+            joinedload(models.GameResultDB.player_summaries).options(
+                joinedload(models.PlayerGameSummaryDB.at_bat_details)
+            )
+        )
+        .populate_existing()
+        .filter(models.GameResultDB.id == game_id)
+        .first()
+    )
+    if not game:
+        return False
+
+    full_content = schemas.GameResultWithDetails.model_validate(game).model_dump(
+        mode="json"
+    )
+    summary_content = copy.deepcopy(full_content)
+    for summary in summary_content["player_summaries"]:
+        for at_bat in summary["at_bat_details"]:
+            for column in models.AT_BAT_HEAVY_COLUMNS:
+                at_bat[column] = None
+
+    existing_documents = {
+        document.detail: document
+        for document in db.query(models.GameDetailDocumentDB).filter(
+            models.GameDetailDocumentDB.game_id == game_id
+        )
+    }
+    for detail, content in (
+        (models.AtBatDetailLevel.SUMMARY, summary_content),
+        (models.AtBatDetailLevel.FULL, full_content),
+    ):
+        document = existing_documents.get(detail.value)
+        if document is None:
+            document = models.GameDetailDocumentDB(game_id=game_id, detail=detail.value)
+            db.add(document)
+        document.document = _encode_detail_document(content)
+    return True
+
+
+def get_game_detail_document(
+    db: Session,
+    game_id: int,
+    detail: models.AtBatDetailLevel = models.AtBatDetailLevel.SUMMARY,
+) -> bytes | None:
+    """[新增] 取得預先渲染的比賽細節文件 (gzip 壓縮的 JSON)，不存在時回傳 None。"""
+    return db.scalar(
+        select(models.GameDetailDocumentDB.document).where(
+            models.GameDetailDocumentDB.game_id == game_id,
+            models.GameDetailDocumentDB.detail == detail.value,
+        )
+    )
+
+
 def get_completed_games_by_date(
     db: Session, game_date: datetime.date
 ) -> Sequence[models.GameResultDB]:
@@ -205,10 +385,7 @@ def get_last_completed_game_for_teams(
             and_(
                 models.GameResultDB.game_date < before_date,
                 models.GameResultDB.status == "已完成",
-                or_(
-                    models.GameResultDB.home_team.in_(teams),
-                    models.GameResultDB.away_team.in_(teams),
-                ),
+                involving_teams(db, teams),
             )
         )
         .options(joinedload(models.GameResultDB.player_summaries))
@@ -230,10 +407,7 @@ def get_last_n_completed_games_for_team(
         .where(
             and_(
                 models.GameResultDB.status == "已完成",
-                or_(
-                    models.GameResultDB.home_team == team_name,
-                    models.GameResultDB.away_team == team_name,
-                ),
+                involving_teams(db, [team_name]),
             )
         )
         .order_by(models.GameResultDB.game_date.desc(), models.GameResultDB.id.desc())
@@ -242,6 +416,43 @@ def get_last_n_completed_games_for_team(
     return db.execute(statement).scalars().all()
 
 
+def upsert_dashboard_snapshot(
+    db: Session, snapshot_date: datetime.date, status: str, document: str
+) -> models.DashboardSnapshotDB:
+    """[新增] 寫入或覆蓋指定日期的儀表板快照，不會自行 commit。"""
+    snapshot = db.scalar(
+        select(models.DashboardSnapshotDB).where(
+            models.DashboardSnapshotDB.snapshot_date == snapshot_date
+        )
+    )
+    if snapshot is None:
+        snapshot = models.DashboardSnapshotDB(snapshot_date=snapshot_date)
+        db.add(snapshot)
+    snapshot.status = status
+    snapshot.document = document
+    return snapshot
+
+
+def get_dashboard_snapshot_document(
+    db: Session, snapshot_date: datetime.date
+) -> str | None:
+    """[新增] 取得指定日期的儀表板快照 JSON，不存在時回傳 None。"""
+    return db.scalar(
+        select(models.DashboardSnapshotDB.document).where(
+            models.DashboardSnapshotDB.snapshot_date == snapshot_date
+        )
+    )
+
+
+def delete_dashboard_snapshots_before(db: Session, snapshot_date: datetime.date) -> int:
+    """[新增] 刪除指定日期之前的過期儀表板快照，回傳刪除筆數。"""
+    return (
+        db.query(models.DashboardSnapshotDB)
+        .filter(models.DashboardSnapshotDB.snapshot_date < snapshot_date)
+        .delete(synchronize_session=False)
+    )
+
+
 # [T29 新增] 根據年份與球隊名稱查詢賽果
 def get_games_by_year_and_team(
     db: Session, *, year: int, team_name: str, completed_only: bool
@@ -251,10 +462,7 @@ def get_games_by_year_and_team(
     """
     query = db.query(models.GameResultDB).filter(
         extract("year", models.GameResultDB.game_date) == year,
-        or_(
-            models.GameResultDB.home_team == team_name,
-            models.GameResultDB.away_team == team_name,
-        ),
+        involving_teams(db, [team_name]),
     )
 
     if completed_only:
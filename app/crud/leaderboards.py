@@ -0,0 +1,152 @@
+# app/crud/leaderboards.py
+
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.crud import standings
+
+# 規定打席：每場球隊比賽 3.1 個打席
+QUALIFYING_PA_PER_TEAM_GAME = 3.1
+
+
+def is_qualified(plate_appearances: int, team_games: int) -> bool:
+    """判斷打席數是否達到規定打席 (球隊出賽數 x 3.1)。"""
+    return team_games > 0 and (
+        plate_appearances >= QUALIFYING_PA_PER_TEAM_GAME * team_games
+    )
+
+
+def _get_team_games(
+    db: Session, season: int, season_stats: list[models.PlayerSeasonStatsDB]
+) -> Dict[str, int]:
+    """
+    取得各隊在指定賽季的出賽數。
+
+    優先使用戰績帳本的累計勝敗和；帳本尚無該隊資料時，
+    以該隊球員中最多的出賽數作為近似值。
+    """
+    team_games = {
+        row.team_name: row.wins + row.losses + row.ties
+        for row in standings.get_latest_team_standings(db, season)
+    }
+    fallback_games: Dict[str, int] = {}
+    for stats in season_stats:
+        if stats.team_name and stats.team_name not in team_games:
+            fallback_games[stats.team_name] = max(
+                fallback_games.get(stats.team_name, 0), stats.games_played or 0
+            )
+    team_games.update(fallback_games)
+    return team_games
+
+
+def refresh_player_leaderboards(db: Session, season: int) -> int:
+    """
+    依 player_season_stats 重新計算指定賽季的所有排行榜。不會自行 commit。
+
+    只納入資料擷取日期屬於該賽季、且打席數大於 0 的球員；
+    每個數據項目同時寫入全部球員的名次與規定打席球員的名次。
+
+    Returns:
+        int: 寫入的排行榜列數。
+    """
+    season_stats = db.scalars(
+        select(models.PlayerSeasonStatsDB).where(
+            models.PlayerSeasonStatsDB.data_retrieved_date.like(f"{season}-%"),
+            models.PlayerSeasonStatsDB.plate_appearances > 0,
+        )
+    ).all()
+    team_games = _get_team_games(db, season, season_stats)
+
+    rows = []
+    for stat in models.LeaderboardStat:
+        candidates = [
+            stats for stats in season_stats if getattr(stats, stat.value) is not None
+        ]
+        candidates.sort(
+            key=lambda stats: (
+                -getattr(stats, stat.value),
+                -stats.plate_appearances,
+                stats.player_name,
+            )
+        )
+        qualified_rank = 0
+        for rank, stats in enumerate(candidates, start=1):
+            games = team_games.get(stats.team_name, 0)
+            qualified = is_qualified(stats.plate_appearances, games)
+            if qualified:
+                qualified_rank += 1
+            rows.append(
+                {
+                    "season": season,
+                    "stat": stat.value,
+                    "rank": rank,
+                    "qualified_rank": qualified_rank if qualified else None,
+                    "player_name": stats.player_name,
+                    "team_name": stats.team_name,
+                    "value": getattr(stats, stat.value),
+                    "plate_appearances": stats.plate_appearances,
+                    "team_games": games,
+                }
+            )
+
+    db.execute(
+        delete(models.PlayerLeaderboardDB).where(
+            models.PlayerLeaderboardDB.season == season
+        )
+    )
+    if rows:
+        db.execute(insert(models.PlayerLeaderboardDB), rows)
+    logging.info(f"已重新計算 {season} 年的打擊排行榜，共 {len(rows)} 筆。")
+    return len(rows)
+
+
+def get_leaderboard(
+    db: Session,
+    season: int,
+    stat: models.LeaderboardStat,
+    limit: int,
+    qualified_only: bool,
+    team_name: Optional[str] = None,
+) -> schemas.LeaderboardResponse:
+    """
+    讀取指定賽季、數據項目的前 K 名。
+
+    名次已於寫入時排好，查詢沿著 (season, stat, rank) 或
+    (season, stat, qualified_rank) 索引依序讀取，不需在查詢時排序。
+    """
+    rank_column = (
+        models.PlayerLeaderboardDB.qualified_rank
+        if qualified_only
+        else models.PlayerLeaderboardDB.rank
+    )
+    statement = select(models.PlayerLeaderboardDB).where(
+        models.PlayerLeaderboardDB.season == season,
+        models.PlayerLeaderboardDB.stat == stat.value,
+        rank_column.is_not(None),
+    )
+    if team_name:
+        statement = statement.where(models.PlayerLeaderboardDB.team_name == team_name)
+    rows = db.scalars(statement.order_by(rank_column).limit(limit)).all()
+
+    return schemas.LeaderboardResponse(
+        season=season,
+        stat=stat.value,
+        qualified_only=qualified_only,
+        team_name=team_name,
+        leaders=[
+            schemas.LeaderboardEntry(
+                rank=row.qualified_rank if qualified_only else row.rank,
+                player_name=row.player_name,
+                team_name=row.team_name,
+                value=row.value,
+                plate_appearances=row.plate_appearances,
+                team_games=row.team_games,
+                qualified=row.qualified_rank is not None,
+            )
+            for row in rows
+        ],
+    )
@@ -2,11 +2,29 @@
 
 import logging
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
 from sqlalchemy.orm import Session
 from sqlalchemy.inspection import inspect
+from sqlalchemy import delete, insert, select, func, extract
 from app import models
+from app.crud import dimensions, leaderboards
+from app.utils.parsing_helpers import parse_position_appearances
+
+# 逐場累積數據所使用的計數欄位，滾動區間與球季累積皆以這些欄位加總後再換算比率
+GAME_LOG_COUNTING_COLUMNS = (
+    "plate_appearances",
+    "at_bats",
+    "hits",
+    "doubles",
+    "triples",
+    "homeruns",
+    "rbi",
+    "walks",
+    "hit_by_pitch",
+    "sacrifice_flies",
+    "strikeouts",
+)
 
 
 def create_or_update_player_career_stats(db: Session, player_stats: Dict[str, Any]):
@@ -27,6 +45,14 @@ def create_or_update_player_career_stats(db: Session, player_stats: Dict[str, An
         return
 
     try:
+        # [新增] 於寫入時解析球員維度 id
+        player_stats = {
+            **player_stats,
+            "player_id": dimensions.get_or_create_player_ids(db, [player_name])[
+                player_name
+            ],
+        }
+
         # 檢查球員是否已存在
         existing_player = (
             db.query(models.PlayerCareerStatsDB)
@@ -69,6 +95,20 @@ def store_player_season_stats_and_history(
     player_names_to_update = [stats["player_name"] for stats in season_stats_list]
 
     try:
+        # [新增] 於寫入時解析球員與球隊維度 id
+        player_ids = dimensions.get_or_create_player_ids(db, player_names_to_update)
+        team_ids = dimensions.get_or_create_team_ids(
+            db, [stats.get("team_name") for stats in season_stats_list]
+        )
+        season_stats_list = [
+            {
+                **stats,
+                "player_id": player_ids[stats["player_name"]],
+                "team_id": team_ids.get(stats.get("team_name")),
+            }
+            for stats in season_stats_list
+        ]
+
         # 1. 更新 PlayerSeasonStatsDB (覆蓋式)
         db.query(models.PlayerSeasonStatsDB).filter(
             models.PlayerSeasonStatsDB.player_name.in_(player_names_to_update)
@@ -97,6 +137,10 @@ def store_player_season_stats_and_history(
             )
         db.add_all(history_stats_objects)
 
+        # 3. [新增] 於同一交易中重算本季排行榜，與球季數據一併提交
+        db.flush()
+        leaderboards.refresh_player_leaderboards(db, season=datetime.date.today().year)
+
         logging.info(
             f"已準備 {len(new_stats_objects)} 筆球員球季數據與 {len(history_stats_objects)} 筆歷史數據待提交。"
         )
@@ -120,6 +164,20 @@ def store_player_fielding_stats(db: Session, fielding_stats_list: List[Dict[str,
     player_names_to_update = {stats["player_name"] for stats in fielding_stats_list}
 
     try:
+        # [新增] 於寫入時解析球員與球隊維度 id
+        player_ids = dimensions.get_or_create_player_ids(db, player_names_to_update)
+        team_ids = dimensions.get_or_create_team_ids(
+            db, [stats.get("team_name") for stats in fielding_stats_list]
+        )
+        fielding_stats_list = [
+            {
+                **stats,
+                "player_id": player_ids[stats["player_name"]],
+                "team_id": team_ids.get(stats.get("team_name")),
+            }
+            for stats in fielding_stats_list
+        ]
+
         # 1. 刪除這些球員的所有既有守備數據
         db.query(models.PlayerFieldingStatsDB).filter(
             models.PlayerFieldingStatsDB.player_name.in_(player_names_to_update)
@@ -138,6 +196,94 @@ def store_player_fielding_stats(db: Session, fielding_stats_list: List[Dict[str,
         raise
 
 
+def replace_player_advanced_stats(
+    db: Session, season: int, advanced_stats_rows: List[Dict[str, Any]]
+):
+    """[新增] 以覆蓋方式寫入指定賽季的球員進階數據。不會自行 commit。"""
+    db.execute(
+        delete(models.PlayerAdvancedStatsDB).where(
+            models.PlayerAdvancedStatsDB.season == season
+        )
+    )
+    if advanced_stats_rows:
+        db.execute(insert(models.PlayerAdvancedStatsDB), advanced_stats_rows)
+
+
+def upsert_league_batting_constants(
+    db: Session, season: int, constants: Dict[str, Any]
+) -> models.LeagueBattingConstantsDB:
+    """[新增] 新增或更新指定賽季的聯盟打擊常數。不會自行 commit。"""
+    row = db.scalar(
+        select(models.LeagueBattingConstantsDB).where(
+            models.LeagueBattingConstantsDB.season == season
+        )
+    )
+    if row is None:
+        row = models.LeagueBattingConstantsDB(season=season)
+        db.add(row)
+    for key, value in constants.items():
+        setattr(row, key, value)
+    return row
+
+
+def get_league_batting_constants(
+    db: Session, season: int
+) -> Optional[models.LeagueBattingConstantsDB]:
+    """[新增] 取得指定賽季的聯盟打擊常數。"""
+    return db.scalar(
+        select(models.LeagueBattingConstantsDB).where(
+            models.LeagueBattingConstantsDB.season == season
+        )
+    )
+
+
+def get_player_advanced_stats(
+    db: Session,
+    season: int,
+    split: models.StatSplit,
+    player_names: Optional[List[str]] = None,
+    min_plate_appearances: int = 0,
+) -> Sequence[models.PlayerAdvancedStatsDB]:
+    """[新增] 查詢指定賽季與分項的球員進階數據，依 wOBA 由高至低排序。"""
+    statement = select(models.PlayerAdvancedStatsDB).where(
+        models.PlayerAdvancedStatsDB.season == season,
+        models.PlayerAdvancedStatsDB.split == split.value,
+        models.PlayerAdvancedStatsDB.plate_appearances >= min_plate_appearances,
+    )
+    if player_names:
+        statement = statement.where(
+            models.PlayerAdvancedStatsDB.player_name.in_(player_names)
+        )
+    return db.scalars(
+        statement.order_by(
+            models.PlayerAdvancedStatsDB.woba.desc().nulls_last(),
+            models.PlayerAdvancedStatsDB.player_name,
+        )
+    ).all()
+
+
+def build_position_appearances(
+    summary: models.PlayerGameSummaryDB,
+) -> List[models.PlayerGamePositionDB]:
+    """
+    [新增] 將球員單場總結的 position 字串解析為守備位置出場紀錄。
+    回傳的物件尚未加入 session，由呼叫者指派給 summary.positions。
+    """
+    return [
+        models.PlayerGamePositionDB(
+            game_id=summary.game_id,
+            player_name=summary.player_name,
+            player_id=summary.player_id,
+            position=position,
+            is_starter=is_starter,
+            position_order=order,
+        )
+        for order, (position, is_starter) in enumerate(
+            parse_position_appearances(summary.position)
+        )
+    ]
+
+
 def store_player_game_data(
     db: Session, game_id: int, all_players_data: List[Dict[str, Any]]
 ):
@@ -165,6 +311,16 @@ def store_player_game_data(
         existing_summaries_map = {
             s.player_name: s for s in existing_summaries_query.all()
         }
+        # [新增] 於寫入時一次解析所有球員與球隊的維度 id
+        player_ids = dimensions.get_or_create_player_ids(db, player_names_in_request)
+        team_ids = dimensions.get_or_create_team_ids(
+            db,
+            [
+                p["summary"].get("team_name")
+                for p in all_players_data
+                if p.get("summary")
+            ],
+        )
 
         db.flush()
         summary_ids = [s.id for s in existing_summaries_map.values()]
@@ -194,6 +350,8 @@ def store_player_game_data(
 
             player_name = summary_dict["player_name"]
             summary_dict["game_id"] = game_id
+            summary_dict["player_id"] = player_ids[player_name]
+            summary_dict["team_id"] = team_ids.get(summary_dict.get("team_name"))
             filtered_summary = {
                 k: v for k, v in summary_dict.items() if k in summary_cols
             }
@@ -206,6 +364,11 @@ def store_player_game_data(
                 summary_orm_object = models.PlayerGameSummaryDB(**filtered_summary)
                 db.add(summary_orm_object)
 
+            # [新增] 依 position 字串同步正規化的守備位置出場紀錄
+            summary_orm_object.positions = build_position_appearances(
+                summary_orm_object
+            )
+
             db.flush()
             player_game_summary_id = summary_orm_object.id
 
@@ -238,3 +401,139 @@ def store_player_game_data(
     except Exception as e:
         logging.error(f"準備儲存球員單場比賽數據時出錯: {e}", exc_info=True)
         raise
+
+
+def delete_player_game_data(db: Session, game_id: int) -> int:
+    """
+    [新增] 刪除單場比賽所有球員的逐場總結，並透過 cascade 一併刪除打席記錄與守備位置。
+
+    Returns:
+        int: 刪除的球員總結筆數。
+    """
+    summaries = (
+        db.query(models.PlayerGameSummaryDB)
+        .filter(models.PlayerGameSummaryDB.game_id == game_id)
+        .all()
+    )
+    for summary in summaries:
+        db.delete(summary)
+    db.flush()
+    return len(summaries)
+
+
+def _build_rate_line(row: Any, prefix: str) -> Dict[str, Any]:
+    """將窗口函數加總後的計數欄位換算為 AVG / OBP / SLG / OPS。"""
+    line = {"games": getattr(row, f"{prefix}_games")}
+    for col in GAME_LOG_COUNTING_COLUMNS:
+        line[col] = getattr(row, f"{prefix}_{col}") or 0
+
+    at_bats = line["at_bats"]
+    hits = line["hits"]
+    on_base_denominator = (
+        at_bats + line["walks"] + line["hit_by_pitch"] + line["sacrifice_flies"]
+    )
+    total_bases = hits + line["doubles"] + 2 * line["triples"] + 3 * line["homeruns"]
+
+    avg = hits / at_bats if at_bats else None
+    obp = (
+        (hits + line["walks"] + line["hit_by_pitch"]) / on_base_denominator
+        if on_base_denominator
+        else None
+    )
+    slg = total_bases / at_bats if at_bats else None
+    line["avg"] = round(avg, 3) if avg is not None else None
+    line["obp"] = round(obp, 3) if obp is not None else None
+    line["slg"] = round(slg, 3) if slg is not None else None
+    line["ops"] = round(obp + slg, 3) if obp is not None and slg is not None else None
+    return line
+
+
+def get_player_game_logs(
+    db: Session, player_names: List[str], year: int, windows: Sequence[int]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    查詢一位或多位球員在指定年度的逐場紀錄，並附上球季累積與「近 N 場」滾動數據。
+
+    所有球員、所有滾動區間皆透過 SQL 窗口函數 (SUM ... OVER) 在單一查詢中計算完成，
+    避免逐球員、逐區間地重複查詢 player_game_summary。
+
+    Args:
+        db: 資料庫 session。
+        player_names: 要查詢的球員姓名列表。
+        year: 查詢的年份。
+        windows: 滾動區間的場數列表，例如 [7, 15]。
+
+    Returns:
+        一個字典，key 為球員姓名，value 為依比賽日期排序的逐場紀錄列表。
+    """
+    if not player_names:
+        return {}
+
+    summary = models.PlayerGameSummaryDB
+    game = models.GameResultDB
+
+    partition = {
+        "partition_by": summary.player_id,
+        "order_by": (game.game_date, game.id),
+    }
+    season_frame = {**partition, "rows": (None, 0)}
+
+    window_columns = [func.count(summary.id).over(**season_frame).label("season_games")]
+    for col in GAME_LOG_COUNTING_COLUMNS:
+        window_columns.append(
+            func.sum(getattr(summary, col)).over(**season_frame).label(f"season_{col}")
+        )
+    for n in windows:
+        rolling_frame = {**partition, "rows": (-(n - 1), 0)}
+        window_columns.append(
+            func.count(summary.id).over(**rolling_frame).label(f"last_{n}_games")
+        )
+        for col in GAME_LOG_COUNTING_COLUMNS:
+            window_columns.append(
+                func.sum(getattr(summary, col))
+                .over(**rolling_frame)
+                .label(f"last_{n}_{col}")
+            )
+
+    statement = (
+        select(
+            summary.player_name,
+            summary.team_name,
+            summary.batting_order,
+            summary.position,
+            *[getattr(summary, col) for col in GAME_LOG_COUNTING_COLUMNS],
+            game.id.label("game_id"),
+            game.game_date,
+            game.home_team,
+            game.away_team,
+            *window_columns,
+        )
+        .join(game, summary.game_id == game.id)
+        .where(
+            summary.player_id.in_(dimensions.resolve_player_ids(db, player_names)),
+            extract("year", game.game_date) == year,
+        )
+        .order_by(summary.player_name, game.game_date, game.id)
+    )
+
+    game_logs: Dict[str, List[Dict[str, Any]]] = {}
+    for row in db.execute(statement):
+        opponent_team = (
+            row.away_team if row.home_team == row.team_name else row.home_team
+        )
+        entry = {
+            "game_id": row.game_id,
+            "game_date": row.game_date,
+            "team_name": row.team_name,
+            "opponent_team": opponent_team,
+            "batting_order": row.batting_order,
+            "position": row.position,
+            **{col: getattr(row, col) or 0 for col in GAME_LOG_COUNTING_COLUMNS},
+            "season_to_date": _build_rate_line(row, "season"),
+            "rolling": {
+                f"last_{n}": _build_rate_line(row, f"last_{n}") for n in windows
+            },
+        }
+        game_logs.setdefault(row.player_name, []).append(entry)
+
+    return game_logs
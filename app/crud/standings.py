@@ -0,0 +1,334 @@
+# app/crud/standings.py
+
+import datetime
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.utils.parsing_helpers import describe_streak, summarize_results
+
+LAST_N_GAMES = 10
+
+# 每場比賽後需要延續累計的欄位
+_CUMULATIVE_COLUMNS = (
+    "wins",
+    "losses",
+    "ties",
+    "home_wins",
+    "home_losses",
+    "home_ties",
+    "away_wins",
+    "away_losses",
+    "away_ties",
+    "runs_scored_total",
+    "runs_allowed_total",
+)
+_RESULT_COLUMNS = {"W": "wins", "L": "losses", "T": "ties"}
+
+
+def _game_result(runs_scored: int, runs_allowed: int) -> str:
+    """依得失分判斷單場結果 (W / L / T)。"""
+    if runs_scored > runs_allowed:
+        return "W"
+    if runs_scored < runs_allowed:
+        return "L"
+    return "T"
+
+
+def _apply_game(
+    previous: Optional[models.TeamGameStandingDB], row: models.TeamGameStandingDB
+) -> None:
+    """以前一場的累計戰績加上本場結果，更新本場的累計欄位。"""
+    for column in _CUMULATIVE_COLUMNS:
+        setattr(row, column, getattr(previous, column) if previous else 0)
+
+    result_column = _RESULT_COLUMNS[row.result]
+    split_column = f"{'home' if row.is_home else 'away'}_{result_column}"
+    setattr(row, result_column, getattr(row, result_column) + 1)
+    setattr(row, split_column, getattr(row, split_column) + 1)
+    row.runs_scored_total += row.runs_scored
+    row.runs_allowed_total += row.runs_allowed
+
+    previous_streak = previous.streak if previous else 0
+    if row.result == "W":
+        row.streak = previous_streak + 1 if previous_streak > 0 else 1
+    elif row.result == "L":
+        row.streak = previous_streak - 1 if previous_streak < 0 else -1
+    else:
+        row.streak = 0
+
+    previous_results = previous.last_10_results if previous else ""
+    row.last_10_results = (previous_results + row.result)[-LAST_N_GAMES:]
+
+
+def _recalculate_team_from(
+    db: Session, team_name: str, season: int, game_date: datetime.date, game_id: str
+) -> int:
+    """
+    從指定比賽開始，依序重新計算該隊之後所有比賽的累計戰績。
+    一般情況下新比賽即為最後一場，只會更新一筆；補登較早的比賽時才會連帶更新後續場次。
+    """
+    game_order = tuple_(
+        models.TeamGameStandingDB.game_date, models.TeamGameStandingDB.cpbl_game_id
+    )
+    team_filter = (
+        models.TeamGameStandingDB.team_name == team_name,
+        models.TeamGameStandingDB.season == season,
+    )
+    previous = db.scalar(
+        select(models.TeamGameStandingDB)
+        .where(*team_filter, game_order < tuple_(game_date, game_id))
+        .order_by(
+            models.TeamGameStandingDB.game_date.desc(),
+            models.TeamGameStandingDB.cpbl_game_id.desc(),
+        )
+        .limit(1)
+    )
+    rows = db.scalars(
+        select(models.TeamGameStandingDB)
+        .where(*team_filter, game_order >= tuple_(game_date, game_id))
+        .order_by(
+            models.TeamGameStandingDB.game_date,
+            models.TeamGameStandingDB.cpbl_game_id,
+        )
+    ).all()
+    for row in rows:
+        _apply_game(previous, row)
+        previous = row
+    return len(rows)
+
+
+def record_game_result(db: Session, game_info: Dict[str, Any]) -> bool:
+    """
+    將一場已完成的比賽寫入雙方球隊的戰績帳本，並增量更新累計戰績。不會自行 commit。
+
+    同一場比賽重複寫入且比分未變動時不做任何事；比分或日期有更正時，
+    會從受影響的場次開始重新計算該隊後續的累計戰績。
+
+    Returns:
+        bool: 比賽已完成且有比分而被寫入帳本時回傳 True，否則回傳 False。
+    """
+    cpbl_game_id = game_info.get("cpbl_game_id")
+    home_score = game_info.get("home_score")
+    away_score = game_info.get("away_score")
+    if (
+        game_info.get("status") != "已完成"
+        or not cpbl_game_id
+        or home_score is None
+        or away_score is None
+    ):
+        return False
+
+    game_date = datetime.datetime.strptime(game_info["game_date"], "%Y-%m-%d").date()
+    home_team = game_info["home_team"]
+    away_team = game_info["away_team"]
+
+    for team_name, opponent, is_home, runs_scored, runs_allowed in (
+        (home_team, away_team, True, home_score, away_score),
+        (away_team, home_team, False, away_score, home_score),
+    ):
+        row = db.scalar(
+            select(models.TeamGameStandingDB).where(
+                models.TeamGameStandingDB.cpbl_game_id == cpbl_game_id,
+                models.TeamGameStandingDB.team_name == team_name,
+            )
+        )
+        recalculate_from = (game_date, cpbl_game_id)
+        if row is None:
+            row = models.TeamGameStandingDB(
+                cpbl_game_id=cpbl_game_id, team_name=team_name
+            )
+            db.add(row)
+        elif (row.game_date, row.is_home, row.runs_scored, row.runs_allowed) == (
+            game_date,
+            is_home,
+            runs_scored,
+            runs_allowed,
+        ):
+            continue
+        else:
+            # 比賽日期有更動時，需從較早的日期開始重新計算
+            recalculate_from = min(recalculate_from, (row.game_date, cpbl_game_id))
+            logging.info(
+                f"比賽 {cpbl_game_id} ({team_name}) 的戰績資料有更正，將重新計算累計戰績。"
+            )
+
+        row.season = game_date.year
+        row.game_date = game_date
+        row.opponent = opponent
+        row.is_home = is_home
+        row.runs_scored = runs_scored
+        row.runs_allowed = runs_allowed
+        row.result = _game_result(runs_scored, runs_allowed)
+        db.flush()
+
+        _recalculate_team_from(db, team_name, game_date.year, *recalculate_from)
+
+    return True
+
+
+def get_latest_team_standings(
+    db: Session, season: int, as_of: Optional[datetime.date] = None
+) -> List[models.TeamGameStandingDB]:
+    """
+    取得各隊在指定賽季 (及截止日期) 內的最後一筆帳本紀錄，即當時的累計戰績。
+    每隊只讀取一筆，不需彙總整季的比賽。
+    """
+    filters = [models.TeamGameStandingDB.season == season]
+    if as_of is not None:
+        filters.append(models.TeamGameStandingDB.game_date <= as_of)
+
+    latest = (
+        select(
+            models.TeamGameStandingDB.id,
+            func.row_number()
+            .over(
+                partition_by=models.TeamGameStandingDB.team_name,
+                order_by=(
+                    models.TeamGameStandingDB.game_date.desc(),
+                    models.TeamGameStandingDB.cpbl_game_id.desc(),
+                ),
+            )
+            .label("recency"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    return db.scalars(
+        select(models.TeamGameStandingDB)
+        .join(latest, models.TeamGameStandingDB.id == latest.c.id)
+        .where(latest.c.recency == 1)
+    ).all()
+
+
+def get_latest_team_standing(
+    db: Session, team_name: str, as_of: Optional[datetime.date] = None
+) -> Optional[models.TeamGameStandingDB]:
+    """取得指定球隊 (截至指定日期) 最近一場比賽後的帳本紀錄，不限賽季。"""
+    statement = select(models.TeamGameStandingDB).where(
+        models.TeamGameStandingDB.team_name == team_name
+    )
+    if as_of is not None:
+        statement = statement.where(models.TeamGameStandingDB.game_date <= as_of)
+    return db.scalar(
+        statement.order_by(
+            models.TeamGameStandingDB.game_date.desc(),
+            models.TeamGameStandingDB.cpbl_game_id.desc(),
+        ).limit(1)
+    )
+
+
+def count_completed_games_by_team(
+    db: Session, season: int, as_of: Optional[datetime.date] = None
+) -> Dict[str, int]:
+    """
+    [新增] 計算各隊在指定賽季 (截至指定日期) 應有的已完成比賽數，作為判斷帳本是否自開季起完整的基準。
+
+    取整季賽程 (全聯盟) 與比賽紀錄 (目標球隊) 兩者中較大的場數。
+    """
+    end_date = as_of or datetime.date(season, 12, 31)
+    counts: Dict[str, int] = {}
+    for model in (models.SeasonScheduleGameDB, models.GameResultDB):
+        filters = (
+            model.status == "已完成",
+            model.game_date.between(datetime.date(season, 1, 1), end_date),
+        )
+        model_counts = Counter()
+        for team_column in (model.home_team, model.away_team):
+            model_counts.update(
+                dict(
+                    db.execute(
+                        select(team_column, func.count())
+                        .where(*filters)
+                        .group_by(team_column)
+                    ).all()
+                )
+            )
+        for team_name, games in model_counts.items():
+            counts[team_name] = max(counts.get(team_name, 0), games)
+    return counts
+
+
+def season_schedule_recorded(db: Session, season: int) -> bool:
+    """[新增] 指定賽季是否已寫入整季賽程 (否則無法確認帳本是否完整)。"""
+    return db.scalar(
+        select(
+            select(models.SeasonScheduleGameDB.id)
+            .where(models.SeasonScheduleGameDB.season == season)
+            .exists()
+        )
+    )
+
+
+def is_ledger_complete(db: Session, standing: models.TeamGameStandingDB) -> bool:
+    """
+    [新增] 帳本中該隊截至此筆紀錄的場數，是否涵蓋整季賽程與比賽紀錄中同期所有已完成的比賽。
+
+    帳本只從開始記錄後累計，開始前的比賽需以 scripts/backfill_standings.py 回填；
+    未完整時累計戰績、近十場與連勝敗 (可能始於帳本開始前) 都不可信。
+    """
+    expected = count_completed_games_by_team(
+        db, standing.season, as_of=standing.game_date
+    ).get(standing.team_name, 0)
+    return standing.wins + standing.losses + standing.ties >= expected
+
+
+def get_standings(
+    db: Session, season: int, as_of: Optional[datetime.date] = None
+) -> schemas.StandingsResponse:
+    """
+    組合指定賽季截至指定日期的戰績排行，包含勝率、勝差、近十場、連勝敗、主客場與得失分差。
+
+    [修正] 帳本場數少於整季賽程的已完成場數 (開始記錄前的比賽尚未回填) 時，
+    將該隊與整份戰績標示為不完整；尚未寫入整季賽程的賽季無法確認，一律視為不完整。
+    """
+    rows = get_latest_team_standings(db, season, as_of=as_of)
+    expected_games = count_completed_games_by_team(db, season, as_of=as_of)
+
+    def win_percentage(row: models.TeamGameStandingDB) -> float:
+        decided_games = row.wins + row.losses
+        return row.wins / decided_games if decided_games else 0.0
+
+    rows = sorted(
+        rows,
+        key=lambda row: (-win_percentage(row), -row.wins, row.losses, row.team_name),
+    )
+    leader = rows[0] if rows else None
+
+    standings = []
+    for rank, row in enumerate(rows, start=1):
+        games_behind = ((leader.wins - row.wins) + (row.losses - leader.losses)) / 2
+        standings.append(
+            schemas.TeamStanding(
+                rank=rank,
+                team_name=row.team_name,
+                games_played=row.wins + row.losses + row.ties,
+                wins=row.wins,
+                losses=row.losses,
+                ties=row.ties,
+                win_percentage=round(win_percentage(row), 3),
+                games_behind=games_behind,
+                last_10_games_record=summarize_results(row.last_10_results),
+                current_streak_description=describe_streak(row.streak),
+                home_record=f"{row.home_wins}-{row.home_losses}-{row.home_ties}",
+                away_record=f"{row.away_wins}-{row.away_losses}-{row.away_ties}",
+                runs_scored=row.runs_scored_total,
+                runs_allowed=row.runs_allowed_total,
+                run_differential=row.runs_scored_total - row.runs_allowed_total,
+                last_game_date=row.game_date,
+                is_complete=row.wins + row.losses + row.ties
+                >= expected_games.get(row.team_name, 0),
+            )
+        )
+    is_complete = (
+        season_schedule_recorded(db, season)
+        and all(standing.is_complete for standing in standings)
+        and set(expected_games) <= {row.team_name for row in rows}
+    )
+    return schemas.StandingsResponse(
+        season=season, as_of_date=as_of, is_complete=is_complete, standings=standings
+    )
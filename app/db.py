@@ -1,7 +1,10 @@
 # app/db.py
 
+import functools
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from .config import settings
 
 # 使用直接讀取到的 URL 建立資料庫引擎
@@ -17,3 +20,43 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@functools.lru_cache(maxsize=4)
+def _read_snapshot_sessionmaker(path: str) -> sessionmaker:
+    """
+    [新增] 建立唯讀 SQLite 快照的 sessionmaker。
+
+    每個版本的快照檔下載後不再修改，因此以 immutable 模式開啟 (不需檔案鎖)；
+    並以 NullPool 讓每個 Session 都重新開檔。
+    """
+    snapshot_engine = create_engine(
+        f"sqlite:///file:{path}?mode=ro&immutable=1&uri=true",
+        poolclass=NullPool,
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=snapshot_engine)
+
+
+def open_read_db() -> Session:
+    """
+    [新增] 開啟唯讀查詢用的 Session。
+    啟用 SERVE_READ_SNAPSHOT 且已取得快照時使用本機 SQLite 快照，否則使用 PostgreSQL。
+    [修正] 快照由 worker 寫入資料庫，web 的背景執行緒下載至本機 (見 read_snapshot)；
+    此處只使用已下載的檔案，不會在請求中連線 PostgreSQL 下載快照。
+    """
+    if settings.SERVE_READ_SNAPSHOT:
+        from app.services import read_snapshot
+
+        path = read_snapshot.current_snapshot_path()
+        if path is not None:
+            return _read_snapshot_sessionmaker(str(path))()
+    return SessionLocal()
+
+
+def get_read_db():
+    """[新增] 唯讀端點的 Session 依賴項，見 open_read_db。"""
+    db = open_read_db()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -6,8 +6,19 @@ from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.responses import ORJSONResponse
 from app.logging_config import setup_logging
-from app.api import games, jobs, players, analysis, system, dashboard
+from app.services import read_snapshot
+from app.api import (
+    games,
+    jobs,
+    players,
+    analysis,
+    system,
+    dashboard,
+    standings,
+    leaderboards,
+)
 
 # 導入新的 middleware 與 exceptions
 from app.middleware import RequestContextMiddleware
@@ -21,11 +32,17 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("應用程式啟動中...")
+    # [新增] 啟用唯讀快照時，於背景下載並定期同步，不佔用請求的冷啟動時間
+    if settings.SERVE_READ_SNAPSHOT:
+        read_snapshot.start_refresher()
     yield
     logger.info("應用程式正在關閉...")
+    if settings.SERVE_READ_SNAPSHOT:
+        read_snapshot.stop_refresher()
 
 
-app = FastAPI(lifespan=lifespan)
+# [修改] 以 orjson 作為全域預設的 JSON 回應類別
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # --- 掛載所有 Middleware ---
 # 將 RequestContextMiddleware 加在最前面，以確保所有後續處理都能取用到 request_id
@@ -51,3 +68,5 @@ app.include_router(analysis.router)
 app.include_router(jobs.router)
 app.include_router(system.router)
 app.include_router(dashboard.router)
+app.include_router(standings.router)
+app.include_router(leaderboards.router)
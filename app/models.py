@@ -11,8 +11,11 @@ from sqlalchemy import (
     ForeignKey,
     UniqueConstraint,
     Enum,
+    Index,
+    LargeBinary,
+    Text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 import sqlalchemy as sa
@@ -40,11 +43,78 @@ class RunnersSituation(str, enum.Enum):
     BASES_LOADED = "bases_loaded"
 
 
+class AtBatDetailLevel(str, enum.Enum):
+    """[新增] 打席列表的回應詳細程度。"""
+
+    SUMMARY = "summary"  # 不載入逐球紀錄與完整描述等大型文字欄位
+    FULL = "full"
+
+
+class LeaderboardStat(str, enum.Enum):
+    """[新增] 排行榜支援的打擊數據項目，值即為 player_season_stats 的欄位名稱。"""
+
+    AVG = "avg"
+    OBP = "obp"
+    SLG = "slg"
+    OPS = "ops"
+    HITS = "hits"
+    HOMERUNS = "homeruns"
+    RBI = "rbi"
+    RUNS_SCORED = "runs_scored"
+    DOUBLES = "doubles"
+    TOTAL_BASES = "total_bases"
+    WALKS = "walks"
+    STOLEN_BASES = "stolen_bases"
+
+
+# 比率型排行預設只列入達規定打席的球員
+LEADERBOARD_RATE_STATS = frozenset(
+    {LeaderboardStat.AVG, LeaderboardStat.OBP, LeaderboardStat.SLG, LeaderboardStat.OPS}
+)
+
+
+class StatSplit(str, enum.Enum):
+    """[新增] 進階數據的分項：整季 (來自球季累積數據) 與主 / 客場 (由逐場紀錄加總)。"""
+
+    SEASON = "season"
+    HOME = "home"
+    AWAY = "away"
+
+
+# 打席中體積較大的文字欄位，列表查詢僅在 detail=full 時讀取
+AT_BAT_HEAVY_COLUMNS = ("result_description_full", "pitch_sequence_details")
+
+
 # ==============================================================================
 # 1. SQLAlchemy ORM Models (資料庫表格定義)
 # ==============================================================================
 
 
+class TeamDB(Base):
+    """
+    [新增] 球隊維度表。
+
+    各事實表以整數 team_id 關聯球隊，取代以中文隊名字串進行 join 與索引；
+    隊名欄位仍保留於各表，維持以名稱為主的 API 回應。
+    """
+
+    __tablename__ = "teams"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class PlayerDB(Base):
+    """[新增] 球員維度表，各事實表以整數 player_id 關聯球員。"""
+
+    __tablename__ = "players"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class GameSchedule(Base):
     __tablename__ = "game_schedules"
 
@@ -56,6 +126,34 @@ class GameSchedule(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class SeasonScheduleGameDB(Base):
+    """
+    [新增] 由賽程頁解析出的整季賽程 (全聯盟、不限目標球隊)，供補爬計畫比對。
+
+    game_schedules 只保存今年目標球隊尚未開打的排程，無法作為歷史賽季的比對基準；
+    延賽的比賽以 cpbl_game_id 對應同一筆紀錄，日期更新為最新的補賽日期。
+    """
+
+    __tablename__ = "season_schedule_games"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season = Column(Integer, nullable=False)
+    cpbl_game_id = Column(String, nullable=False)
+    game_date = Column(Date, nullable=False)
+    game_time = Column(String)
+    home_team = Column(String)
+    away_team = Column(String)
+    status = Column(String)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("season", "cpbl_game_id", name="_season_schedule_game_uc"),
+        Index("ix_season_schedule_games_season_date", "season", "game_date"),
+    )
+
+
 class GameResultDB(Base):
     __tablename__ = "game_results"
 
@@ -65,6 +163,8 @@ class GameResultDB(Base):
     game_time = Column(String)
     home_team = Column(String, nullable=False)
     away_team = Column(String, nullable=False)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), index=True)
+    away_team_id = Column(Integer, ForeignKey("teams.id"), index=True)
     home_score = Column(Integer)
     away_score = Column(Integer)
     venue = Column(String)
@@ -75,12 +175,18 @@ class GameResultDB(Base):
     mvp = Column(String)
     game_duration = Column(String)
     attendance = Column(Integer)
+    # [新增] 已完成比賽的內容指紋 (賽程資訊 + Box Score 的 sha256)，重新爬取時內容未變動即略過
+    content_fingerprint = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # 【修正】新增 cascade="all, delete-orphan" 以確保級聯刪除正常運作
     player_summaries = relationship(
         "PlayerGameSummaryDB", back_populates="game", cascade="all, delete-orphan"
     )
+    # [新增] 預先渲染的比賽細節文件，隨比賽一併刪除
+    detail_documents = relationship(
+        "GameDetailDocumentDB", back_populates="game", cascade="all, delete-orphan"
+    )
 
     __table_args__ = (
         UniqueConstraint(
@@ -89,13 +195,41 @@ class GameResultDB(Base):
     )
 
 
+class GameDetailDocumentDB(Base):
+    """
+    [新增] 預先渲染的 /api/games/details 回應文件。
+
+    比賽爬取完成後即不再變動，因此在寫入時將完整的回應 JSON 渲染一次，
+    以 gzip 壓縮後存放，端點可直接回傳而不需重新查詢與驗證整個 ORM 物件圖。
+    """
+
+    __tablename__ = "game_detail_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("game_results.id"), nullable=False, index=True)
+    # 對應 AtBatDetailLevel (summary / full)
+    detail = Column(String, nullable=False)
+    # gzip 壓縮後的 JSON 位元組
+    document = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    game = relationship("GameResultDB", back_populates="detail_documents")
+
+    __table_args__ = (
+        UniqueConstraint("game_id", "detail", name="_game_detail_document_uc"),
+    )
+
+
 class PlayerGameSummaryDB(Base):
     __tablename__ = "player_game_summary"
 
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("game_results.id"), nullable=False)
-    player_name = Column(String, nullable=False, index=True)
+    # [修改] 以 player_id 建立索引，player_name 僅保留作為顯示用的反正規化欄位
+    player_name = Column(String, nullable=False)
     team_name = Column(String)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"))
     batting_order = Column(String)
     position = Column(String)
     plate_appearances = Column(Integer, default=0)
@@ -128,12 +262,51 @@ class PlayerGameSummaryDB(Base):
     at_bat_details = relationship(
         "AtBatDetailDB", back_populates="player_summary", cascade="all, delete-orphan"
     )
+    # [新增] 由 position 字串解析出的正規化守備位置出場紀錄
+    positions = relationship(
+        "PlayerGamePositionDB",
+        back_populates="player_summary",
+        cascade="all, delete-orphan",
+        order_by="PlayerGamePositionDB.position_order",
+    )
 
     __table_args__ = (
         UniqueConstraint("game_id", "player_name", "team_name", name="_game_player_uc"),
     )
 
 
+class PlayerGamePositionDB(Base):
+    """
+    [新增] 球員單場的守備位置出場紀錄。
+
+    由 Box Score 的 position 字串 (例如 'SS'、'(2B)'、'(PH)(C)'、'RF(CF)')
+    於寫入時解析而來，每個位置一筆，供守位分析以索引查詢取代 LIKE 全表掃描。
+    """
+
+    __tablename__ = "player_game_positions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("game_results.id"), nullable=False)
+    player_game_summary_id = Column(
+        Integer, ForeignKey("player_game_summary.id"), nullable=False, index=True
+    )
+    player_name = Column(String, nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"))
+    position = Column(String, nullable=False)
+    # 僅有 position 字串中第一個、且未加括號的位置視為先發
+    is_starter = Column(
+        Boolean, nullable=False, default=False, server_default=sa.false()
+    )
+    # 該位置在 position 字串中的順序 (從 0 開始)
+    position_order = Column(Integer, nullable=False, default=0)
+
+    player_summary = relationship("PlayerGameSummaryDB", back_populates="positions")
+
+    __table_args__ = (
+        Index("ix_player_game_positions_position_game", "position", "game_id"),
+    )
+
+
 class AtBatDetailDB(Base):
     __tablename__ = "at_bat_details"
 
@@ -172,6 +345,7 @@ class AtBatDetailDB(Base):
 
 class PlayerSeasonStatsMixin:
     team_name = Column(String)
+    team_id = Column(Integer, ForeignKey("teams.id"))
     data_retrieved_date = Column(String)
     games_played = Column(Integer, default=0)
     plate_appearances = Column(Integer, default=0)
@@ -209,6 +383,7 @@ class PlayerSeasonStatsDB(Base, PlayerSeasonStatsMixin):
 
     id = Column(Integer, primary_key=True, index=True)
     player_name = Column(String, unique=True, nullable=False, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
@@ -216,7 +391,9 @@ class PlayerSeasonStatsHistoryDB(Base, PlayerSeasonStatsMixin):
     __tablename__ = "player_season_stats_history"
 
     id = Column(Integer, primary_key=True, index=True)
-    player_name = Column(String, nullable=False, index=True)
+    # [修改] 以 player_id 建立索引，player_name 僅保留作為顯示用的反正規化欄位
+    player_name = Column(String, nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -273,6 +450,7 @@ class PlayerCareerStatsDB(Base, PlayerCareerStatsMixin):
 
     id = Column(Integer, primary_key=True, index=True)
     player_name = Column(String, unique=True, nullable=False, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -285,6 +463,8 @@ class PlayerFieldingStatsDB(Base):
     player_name = Column(String, nullable=False, index=True)
     position = Column(String, nullable=False, index=True)
     team_name = Column(String)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"))
 
     games_played = Column(Integer, default=0)
     total_chances = Column(Integer, default=0)
@@ -306,3 +486,262 @@ class PlayerFieldingStatsDB(Base):
             "player_name", "position", name="_player_position_fielding_uc"
         ),
     )
+
+
+# --- [新增] 首頁儀表板快照 ---
+class DashboardSnapshotDB(Base):
+    """
+    預先組合的 /api/dashboard/today 回應文件，由 worker 在每次爬蟲後寫入。
+
+    每個台北時間的日期一筆，status 記錄該日應呈現的儀表板型態
+    (HAS_TODAY_GAMES / NO_TODAY_GAMES)，端點只需依當日日期讀取一筆資料即可回應。
+    """
+
+    __tablename__ = "dashboard_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_date = Column(Date, nullable=False, unique=True, index=True)
+    status = Column(String, nullable=False)
+    # 已序列化的回應 JSON
+    document = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# --- [新增] 球隊戰績帳本 ---
+class TeamGameStandingDB(Base):
+    """
+    每支球隊每場已完成比賽一筆的戰績帳本。
+
+    除了單場結果外，也記錄「打完這場之後」的賽季累計戰績，
+    因此任一日期的戰績表只需讀取各隊在該日期前的最後一筆即可。
+    """
+
+    __tablename__ = "team_game_standings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cpbl_game_id = Column(String, nullable=False)
+    season = Column(Integer, nullable=False)
+    game_date = Column(Date, nullable=False)
+    team_name = Column(String, nullable=False)
+    opponent = Column(String, nullable=False)
+    is_home = Column(Boolean, nullable=False)
+
+    # 單場結果
+    runs_scored = Column(Integer, nullable=False)
+    runs_allowed = Column(Integer, nullable=False)
+    result = Column(String(1), nullable=False)  # W / L / T
+
+    # 打完本場後的賽季累計
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    ties = Column(Integer, nullable=False, default=0)
+    home_wins = Column(Integer, nullable=False, default=0)
+    home_losses = Column(Integer, nullable=False, default=0)
+    home_ties = Column(Integer, nullable=False, default=0)
+    away_wins = Column(Integer, nullable=False, default=0)
+    away_losses = Column(Integer, nullable=False, default=0)
+    away_ties = Column(Integer, nullable=False, default=0)
+    runs_scored_total = Column(Integer, nullable=False, default=0)
+    runs_allowed_total = Column(Integer, nullable=False, default=0)
+    # 正數為連勝、負數為連敗、0 表示上一場為和局
+    streak = Column(Integer, nullable=False, default=0)
+    # 最近十場結果 (由舊到新)，例如 "WWLTW"
+    last_10_results = Column(String(10), nullable=False, default="")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("cpbl_game_id", "team_name", name="_team_game_standing_uc"),
+        Index(
+            "ix_team_game_standings_season_team_date",
+            "season",
+            "team_name",
+            "game_date",
+        ),
+    )
+
+
+class PlayerLeaderboardDB(Base):
+    """
+    [新增] 全聯盟打擊排行榜。
+
+    每個 (賽季, 數據項目) 預先排序好名次，於球季累積數據寫入時整批重算；
+    查詢前 K 名只需沿著 (season, stat, rank) 索引讀取 K 筆，不必每次排序整張表。
+    """
+
+    __tablename__ = "player_leaderboards"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season = Column(Integer, nullable=False)
+    stat = Column(String, nullable=False)
+    # 全部球員中的名次，同值時依打席數多者在前、再依姓名排序，名次不重複
+    rank = Column(Integer, nullable=False)
+    # 僅在達規定打席的球員中的名次，未達規定打席者為 NULL
+    qualified_rank = Column(Integer, nullable=True)
+    player_name = Column(String, nullable=False)
+    team_name = Column(String, nullable=True)
+    value = Column(REAL, nullable=False)
+    plate_appearances = Column(Integer, nullable=False, default=0)
+    team_games = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_player_leaderboards_season_stat_rank", "season", "stat", "rank"),
+        Index(
+            "ix_player_leaderboards_season_stat_qualified_rank",
+            "season",
+            "stat",
+            "qualified_rank",
+        ),
+    )
+
+
+class PlayerAdvancedStatsDB(Base):
+    """
+    [新增] 由球季與分項計數數據推導出的進階數據 (wOBA、ISO、BABIP、K%、BB%、OPS+)。
+    每次重算時整季覆蓋。
+    """
+
+    __tablename__ = "player_advanced_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season = Column(Integer, nullable=False)
+    split = Column(String, nullable=False)
+    player_name = Column(String, nullable=False)
+    team_name = Column(String, nullable=True)
+    plate_appearances = Column(Integer, nullable=False, default=0)
+    avg = Column(REAL)
+    obp = Column(REAL)
+    slg = Column(REAL)
+    woba = Column(REAL)
+    iso = Column(REAL)
+    babip = Column(REAL)
+    k_percentage = Column(REAL)
+    bb_percentage = Column(REAL)
+    ops_plus = Column(REAL)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_player_advanced_stats_season_split_player",
+            "season",
+            "split",
+            "player_name",
+        ),
+    )
+
+
+class LeagueBattingConstantsDB(Base):
+    """[新增] 每季的聯盟打擊常數，作為 wOBA 權重縮放與 OPS+ 的基準。"""
+
+    __tablename__ = "league_batting_constants"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season = Column(Integer, unique=True, nullable=False, index=True)
+    plate_appearances = Column(Integer, nullable=False, default=0)
+    lg_avg = Column(REAL)
+    lg_obp = Column(REAL)
+    lg_slg = Column(REAL)
+    lg_woba = Column(REAL)
+    woba_scale = Column(REAL)
+    lg_babip = Column(REAL)
+    lg_k_percentage = Column(REAL)
+    lg_bb_percentage = Column(REAL)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# --- [新增] 原始頁面封存 ---
+class PageBlobDB(Base):
+    """
+    以內容雜湊 (sha256) 為主鍵、zstd 壓縮的原始頁面內容。
+
+    相同內容只會存放一份，例如未變動的賽程頁面重複抓取時不會增加儲存量。
+    """
+
+    __tablename__ = "page_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    # zstd 壓縮後的位元組，只在實際讀取內容時載入
+    content = deferred(Column(LargeBinary, nullable=False))
+    size = Column(Integer, nullable=False)
+    compressed_size = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class PageArchiveEntryDB(Base):
+    """
+    原始頁面封存的清單，每次抓取一個頁面 (或文字轉播的一個半局) 一筆。
+
+    archive_key 依頁面類型而定：比賽相關頁面為 "{比賽日期}/{cpbl_game_id}"，
+    賽程為 "{年}-{月}"，球隊成績為隊名，球員生涯為球員名稱；
+    part 用於同一頁面的多個片段 (例如文字轉播的 "3-top")。
+    """
+
+    __tablename__ = "page_archive_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    archive_key = Column(String, nullable=False)
+    page_type = Column(String, nullable=False)
+    part = Column(String, nullable=False, default="")
+    url = Column(String, nullable=True)
+    # "html" 或 "json" (瀏覽器內擷取或資料端點回傳的結構化資料)
+    content_format = Column(String, nullable=False, default="html")
+    sha256 = Column(String(64), ForeignKey("page_blobs.sha256"), nullable=False)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    blob = relationship("PageBlobDB")
+
+    __table_args__ = (
+        Index(
+            "ix_page_archive_entries_key_type",
+            "archive_key",
+            "page_type",
+        ),
+        Index("ix_page_archive_entries_type_fetched", "page_type", "fetched_at"),
+    )
+
+
+class AtBatColumnSnapshotDB(Base):
+    """
+    [新增] worker 發布的打席欄式快照 (各欄位 .npy 打包為壓縮的 .npz)。
+
+    存放於資料庫，web 與 worker 不需共用檔案系統；web 讀取時解壓縮至本機目錄再以 mmap 載入。
+    每個賽季保留目前與上一個版本。
+    """
+
+    __tablename__ = "at_bat_column_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season = Column(Integer, nullable=False)
+    version = Column(String, nullable=False)
+    rows = Column(Integer, nullable=False)
+    max_at_bat_id = Column(Integer, nullable=False)
+    # 結果與球員的字典編碼表 (JSON)
+    manifest = Column(Text, nullable=False)
+    # 只在 web 本機尚未解壓縮此版本時載入
+    content = deferred(Column(LargeBinary, nullable=False))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("season", "version", name="_at_bat_column_snapshot_uc"),
+    )
+
+
+class ReadSnapshotDB(Base):
+    """
+    [新增] worker 匯出的唯讀 SQLite 快照 (zstd 壓縮後的整個檔案)。
+
+    存放於資料庫，web 定期檢查最新版本，下載至本機後改由 SQLite 回應唯讀端點。
+    保留目前與上一個版本。
+    """
+
+    __tablename__ = "read_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(String, nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    # 只在 web 本機尚未下載此版本時載入
+    content = deferred(Column(LargeBinary, nullable=False))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,170 @@
+# app/page_archive.py
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import zstandard
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 頁面類型，對應 PageArchiveEntryDB.page_type
+SCHEDULE = "schedule"
+BOX_SCORE = "box_score"
+BOX_API = "box_api"
+LIVE = "live"
+TEAM_BATTING = "team_batting"
+TEAM_FIELDING = "team_fielding"
+PLAYER_CAREER = "player_career"
+
+
+def game_key(game_info: dict) -> str:
+    """比賽相關頁面的封存鍵："{比賽日期}/{cpbl_game_id}"。"""
+    return f"{game_info.get('game_date')}/{game_info.get('cpbl_game_id')}"
+
+
+def live_part(inning: int, half_inning_selector: str) -> str:
+    """文字轉播半局的片段名稱，例如 "3-top"、"3-bot"。"""
+    return f"{inning}-{'top' if half_inning_selector == 'section.top' else 'bot'}"
+
+
+def parse_live_part(part: str) -> Tuple[int, str]:
+    """[新增] live_part 的反向轉換，回傳 (局數, 半局選擇器)。"""
+    inning, half = part.split("-", 1)
+    return int(inning), "section.top" if half == "top" else "section.bot"
+
+
+def _serialize(content: Union[str, bytes, Any]) -> tuple:
+    """回傳 (原始位元組, 格式)；非字串的結構化資料以 JSON 封存。"""
+    if isinstance(content, bytes):
+        return content, "html"
+    if isinstance(content, str):
+        return content.encode("utf-8"), "html"
+    return json.dumps(content, ensure_ascii=False).encode("utf-8"), "json"
+
+
+def _store(
+    db: Session,
+    page_type: str,
+    archive_key: str,
+    raw: bytes,
+    content_format: str,
+    url: Optional[str],
+    part: str,
+) -> str:
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if db.get(models.PageBlobDB, sha256) is None:
+        compressed = zstandard.ZstdCompressor(
+            level=settings.PAGE_ARCHIVE_ZSTD_LEVEL
+        ).compress(raw)
+        db.add(
+            models.PageBlobDB(
+                sha256=sha256,
+                content=compressed,
+                size=len(raw),
+                compressed_size=len(compressed),
+            )
+        )
+    db.add(
+        models.PageArchiveEntryDB(
+            archive_key=archive_key,
+            page_type=page_type,
+            part=part,
+            url=url,
+            content_format=content_format,
+            sha256=sha256,
+        )
+    )
+    db.commit()
+    return sha256
+
+
+def archive_page(
+    page_type: str,
+    archive_key: str,
+    content: Union[str, bytes, Any],
+    url: Optional[str] = None,
+    part: str = "",
+) -> Optional[str]:
+    """
+    [新增] 封存一個抓取到的頁面 (或頁面片段)，回傳內容的 sha256。
+
+    使用獨立的資料庫 session 提交，不影響呼叫端的交易；
+    PAGE_ARCHIVE_ENABLED 關閉、內容為空或封存失敗時回傳 None，不中斷爬蟲流程。
+    """
+    if not settings.PAGE_ARCHIVE_ENABLED or not content:
+        return None
+    raw, content_format = _serialize(content)
+
+    db = None
+    try:
+        db = SessionLocal()
+        for attempt in range(2):
+            try:
+                return _store(
+                    db, page_type, archive_key, raw, content_format, url, part
+                )
+            except IntegrityError:
+                # 其他執行緒同時寫入了相同內容的 blob，重試時即視為已存在
+                db.rollback()
+                if attempt:
+                    raise
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        logger.warning(
+            f"封存頁面 [{page_type}] {archive_key} 失敗，略過封存: {e}",
+            exc_info=True,
+        )
+        return None
+    finally:
+        if db is not None:
+            db.close()
+
+
+def decode(compressed: bytes, content_format: str) -> Any:
+    """[新增] 解壓縮並依封存格式還原內容：HTML 回傳字串，JSON 回傳解碼後的物件。"""
+    text = zstandard.ZstdDecompressor().decompress(compressed).decode("utf-8")
+    return json.loads(text) if content_format == "json" else text
+
+
+def load_entry(db: Session, entry: models.PageArchiveEntryDB) -> Any:
+    """[新增] 讀取並還原一筆封存清單對應的內容。"""
+    blob = db.get(models.PageBlobDB, entry.sha256)
+    if blob is None:
+        raise KeyError(f"找不到封存內容 {entry.sha256}")
+    return decode(blob.content, entry.content_format)
+
+
+def latest_entries(
+    db: Session, archive_keys: Iterable[str], page_types: Iterable[str]
+) -> Dict[str, Dict[Tuple[str, str], models.PageArchiveEntryDB]]:
+    """
+    [新增] 回傳每個 archive_key 下，每個 (page_type, part) 最新一次封存的清單。
+
+    Returns:
+        Dict[str, Dict[Tuple[str, str], PageArchiveEntryDB]]: archive_key -> (page_type, part) -> 清單。
+    """
+    archive_keys = list(archive_keys)
+    if not archive_keys:
+        return {}
+    entries = (
+        db.query(models.PageArchiveEntryDB)
+        .filter(
+            models.PageArchiveEntryDB.archive_key.in_(archive_keys),
+            models.PageArchiveEntryDB.page_type.in_(list(page_types)),
+        )
+        .order_by(models.PageArchiveEntryDB.fetched_at, models.PageArchiveEntryDB.id)
+        .all()
+    )
+    latest: Dict[str, Dict[Tuple[str, str], models.PageArchiveEntryDB]] = {}
+    for entry in entries:
+        latest.setdefault(entry.archive_key, {})[(entry.page_type, entry.part)] = entry
+    return latest
@@ -0,0 +1,168 @@
+# app/parsers/box_data.py
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# 資料端點中 VisitingHomeType 的值與文字轉播頁面的半局選擇器對應
+HALF_INNING_SELECTORS = {"1": "section.top", "2": "section.bot"}
+
+# BattingJson 欄位 -> player_game_summary 欄位，對應 Box Score 頁面「打擊成績」表格的各欄
+BATTING_FIELD_MAP = {
+    "HittingCnt": "at_bats",
+    "ScoreCnt": "runs_scored",
+    "HitCnt": "hits",
+    "RunBattedINCnt": "rbi",
+    "TwoBaseHitCnt": "doubles",
+    "ThreeBaseHitCnt": "triples",
+    "HomeRunCnt": "homeruns",
+    "DoublePlayBatCnt": "gidp",
+    "BasesONBallsCnt": "walks",
+    "IntentionalBasesONBallsCnt": "intentional_walks",
+    "HitBYPitchCnt": "hit_by_pitch",
+    "StrikeOutCnt": "strikeouts",
+    "SacrificeHitCnt": "sacrifice_hits",
+    "SacrificeFlyCnt": "sacrifice_flies",
+    "StealBaseOKCnt": "stolen_bases",
+    "StealBaseFailCnt": "caught_stealing",
+    "ErrorCnt": "errors",
+}
+
+
+def _require_list(data: Dict[str, Any], key: str) -> List[dict]:
+    value = data.get(key)
+    if not isinstance(value, list):
+        raise ValueError(f"資料端點的回應缺少 {key} 列表。")
+    return value
+
+
+def _team_names(data: Dict[str, Any]) -> Dict[str, str]:
+    """回傳 VisitingHomeType -> 球隊名稱。"""
+    detail = data.get("GameDetailJson")
+    if isinstance(detail, list):
+        detail = detail[0] if detail else None
+    if not isinstance(detail, dict):
+        raise ValueError("資料端點的回應缺少 GameDetailJson。")
+    names = {
+        "1": detail.get("VisitingTeamName"),
+        "2": detail.get("HomeTeamName"),
+    }
+    if not all(names.values()):
+        raise ValueError("GameDetailJson 中缺少主客隊名稱。")
+    return names
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _half_type(entry: dict) -> str:
+    return str(entry.get("VisitingHomeType", ""))
+
+
+def parse_box_score_data(
+    data: Dict[str, Any], target_teams: Optional[List[str]] = None
+) -> List[dict]:
+    """
+    [新增] 從資料端點的回應中，解析出指定球隊的所有球員基本數據和簡易打席列表。
+
+    回傳格式與 box_score.parse_box_score_page 相同；簡易打席列表 (戰況表)
+    取自 LiveLogJson 中帶有打擊結果簡稱 (BattingActionName) 的事件。
+
+    Raises:
+        ValueError: 回應缺少必要的欄位，呼叫端應退回瀏覽器模式。
+    """
+    team_names = _team_names(data)
+    batting_rows = _require_list(data, "BattingJson")
+    live_log = _require_list(data, "LiveLogJson")
+
+    at_bats_by_player: Dict[Tuple[str, str], List[str]] = {}
+    for entry in live_log:
+        result_short = (entry.get("BattingActionName") or "").strip()
+        hitter_name = (entry.get("HitterName") or "").strip()
+        if result_short and hitter_name:
+            at_bats_by_player.setdefault((_half_type(entry), hitter_name), []).append(
+                result_short
+            )
+
+    all_players_data = []
+    for row in batting_rows:
+        team_name = team_names.get(_half_type(row))
+        player_name = (row.get("HitterName") or "").strip()
+        if not team_name or not player_name:
+            continue
+        if target_teams and team_name not in target_teams:
+            continue
+
+        summary_data = {
+            "player_name": player_name,
+            "team_name": team_name,
+            "batting_order": str(row.get("Lineup") or "").strip(),
+            "position": (row.get("DefendStationName") or "").strip(),
+        }
+        for source_field, field_name in BATTING_FIELD_MAP.items():
+            summary_data[field_name] = _to_int(row.get(source_field))
+        summary_data["avg_cumulative"] = _to_float(row.get("Avg"))
+
+        at_bat_summary_list = at_bats_by_player.get((_half_type(row), player_name), [])
+        summary_data["at_bat_results_summary"] = ",".join(at_bat_summary_list)
+        summary_data["plate_appearances"] = sum(
+            summary_data[k]
+            for k in [
+                "at_bats",
+                "walks",
+                "hit_by_pitch",
+                "sacrifice_hits",
+                "sacrifice_flies",
+            ]
+        )
+        all_players_data.append(
+            {"summary": summary_data, "at_bats_list": at_bat_summary_list}
+        )
+
+    logging.info(f"由資料端點解析出 {len(all_players_data)} 位球員的 Box Score 數據。")
+    return all_players_data
+
+
+def parse_live_log_data(data: Dict[str, Any]) -> List[Tuple[List[dict], int, str]]:
+    """
+    [新增] 將資料端點的 LiveLogJson 依半局分組，轉換為與
+    BrowserOperator.extract_live_events 相同的 (原始打席資料, 局數, 半局選擇器) 列表，
+    之後交由 live.parse_extracted_events 轉換為打席事件。
+
+    Raises:
+        ValueError: 回應缺少 LiveLogJson，呼叫端應退回瀏覽器模式。
+    """
+    half_innings: Dict[Tuple[int, str], List[dict]] = {}
+    for entry in _require_list(data, "LiveLogJson"):
+        selector = HALF_INNING_SELECTORS.get(_half_type(entry))
+        inning = _to_int(entry.get("InningSeq"))
+        if not selector or inning <= 0:
+            continue
+        hitter_name = (entry.get("HitterName") or "").strip()
+        description = (entry.get("Content") or "").strip()
+        half_innings.setdefault((inning, selector), []).append(
+            {
+                "hitter_name": hitter_name or None,
+                "description_text": description or None,
+                "pitcher_name": (entry.get("PitcherName") or "").strip() or None,
+                "pitches": None,
+            }
+        )
+
+    return [
+        (events, inning, selector)
+        for (inning, selector), events in sorted(
+            half_innings.items(),
+            key=lambda item: (item[0][0], item[0][1] != "section.top"),
+        )
+    ]
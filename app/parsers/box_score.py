@@ -4,6 +4,9 @@ import logging
 from bs4 import BeautifulSoup
 from typing import List, Optional
 
+# [新增] 解析所需的 DOM 子樹，瀏覽器層只需擷取這些元素的 HTML
+FRAGMENT_SELECTORS = ("div.GameBoxDetail",)
+
 
 def parse_box_score_page(html_content, target_teams: Optional[List[str]] = None):
     """從 Box Score 頁面 HTML 中，解析出指定球隊的所有球員基本數據和簡易打席列表。"""
@@ -3,6 +3,8 @@
 import json
 import logging
 import re
+from typing import List, Optional
+
 from bs4 import BeautifulSoup
 from app.models import AtBatResultType
 
@@ -59,6 +61,53 @@ def _determine_result_details(description: str) -> dict:
     return result
 
 
+def build_at_bat_event(raw_event: dict, inning: int) -> Optional[dict]:
+    """
+    [新增] 由擷取到的原始欄位建立打席事件，BeautifulSoup 與瀏覽器內擷取兩種路徑共用。
+
+    raw_event 包含:
+        hitter_name: 打者名稱標籤的文字，標籤不存在時為 None。
+        description_text: 描述區塊中所有文字節點去除空白後以空格串接，標籤不存在時為 None。
+        pitcher_name: 對戰投手名稱，沒有投球細節或投手標籤時為 None。
+        pitches: 投球紀錄列表 (num / desc / count)，沒有投球細節區塊時為 None。
+
+    Returns:
+        Optional[dict]: 打席事件；缺少打者或描述時回傳 None。
+    """
+    if (
+        raw_event.get("hitter_name") is None
+        or raw_event.get("description_text") is None
+    ):
+        logging.warning("跳過一個缺少打者或描述的 item。")
+        return None
+
+    event_data = {"inning": inning, "type": "at_bat"}
+    event_data["hitter_name"] = raw_event["hitter_name"]
+
+    clean_desc = re.sub(
+        r"^\s*第\d+棒\s+[A-Z0-9]+\s+[\w\s\.]+\s*：\s*",
+        "",
+        raw_event["description_text"],
+    ).strip()
+    event_data["description"] = clean_desc
+    event_data["result_description_full"] = clean_desc
+
+    result_details = _determine_result_details(event_data["result_description_full"])
+    event_data.update(result_details)
+
+    if raw_event.get("pitcher_name") is not None:
+        event_data["opposing_pitcher_name"] = raw_event["pitcher_name"]
+    if raw_event.get("pitches"):
+        event_data["pitch_sequence_details"] = json.dumps(
+            raw_event["pitches"], ensure_ascii=False
+        )
+    return event_data
+
+
+def _text_or_none(tag) -> Optional[str]:
+    return tag.text.strip() if tag else None
+
+
 def parse_active_inning_details(inning_html_content, inning):
     """從單一局數的 HTML 內容中，解析出所有事件。"""
     if not inning_html_content:
@@ -69,70 +118,54 @@ def parse_active_inning_details(inning_html_content, inning):
     event_items = soup.select("div.item.play")
     for item in event_items:
         try:
-            event_data = {"inning": inning}
-            event_data["type"] = "at_bat"
-
             hitter_name_tag = item.select_one("div.player > a > span")
             desc_tag = item.select_one("div.info > div.desc")
-
-            if not hitter_name_tag or not desc_tag:
-                logging.warning("跳過一個缺少打者或描述的 item。")
-                continue
-
-            event_data["hitter_name"] = hitter_name_tag.text.strip()
-
-            description_text = " ".join(desc_tag.stripped_strings)
-            clean_desc = re.sub(
-                r"^\s*第\d+棒\s+[A-Z0-9]+\s+[\w\s\.]+\s*：\s*",
-                "",
-                description_text,
-            ).strip()
-            event_data["description"] = clean_desc
-            event_data["result_description_full"] = clean_desc
-
-            result_details = _determine_result_details(
-                event_data["result_description_full"]
-            )
-            event_data.update(result_details)
+            raw_event = {
+                "hitter_name": _text_or_none(hitter_name_tag),
+                "description_text": (
+                    " ".join(desc_tag.stripped_strings) if desc_tag else None
+                ),
+                "pitcher_name": None,
+                "pitches": None,
+            }
 
             pitch_detail_block = item.find("div", class_="detail")
             if pitch_detail_block:
-                pitcher_name_tag = pitch_detail_block.select_one(
-                    "div.detail_item.pitcher a"
+                raw_event["pitcher_name"] = _text_or_none(
+                    pitch_detail_block.select_one("div.detail_item.pitcher a")
                 )
-                if pitcher_name_tag:
-                    event_data["opposing_pitcher_name"] = pitcher_name_tag.text.strip()
-
                 pitch_sequence_tags = pitch_detail_block.select(
                     "div.detail_item[class*='pitch-'], div.detail_item.no-pitch"
                 )
-                pitch_list = []
-                for tag in pitch_sequence_tags:
-                    pitch_num_tag = tag.select_one("div.pitch_num span")
-                    call_desc_tag = tag.select_one("div.call_desc")
-                    pitches_count_tag = tag.select_one("div.pitches_count")
-                    pitch_list.append(
-                        {
-                            "num": (
-                                pitch_num_tag.text.strip() if pitch_num_tag else None
-                            ),
-                            "desc": (
-                                call_desc_tag.text.strip() if call_desc_tag else None
-                            ),
-                            "count": (
-                                pitches_count_tag.text.strip()
-                                if pitches_count_tag
-                                else None
-                            ),
-                        }
-                    )
-                if pitch_list:
-                    event_data["pitch_sequence_details"] = json.dumps(
-                        pitch_list, ensure_ascii=False
-                    )
-
-            inning_events.append(event_data)
+                raw_event["pitches"] = [
+                    {
+                        "num": _text_or_none(tag.select_one("div.pitch_num span")),
+                        "desc": _text_or_none(tag.select_one("div.call_desc")),
+                        "count": _text_or_none(tag.select_one("div.pitches_count")),
+                    }
+                    for tag in pitch_sequence_tags
+                ]
+
+            event_data = build_at_bat_event(raw_event, inning)
+            if event_data:
+                inning_events.append(event_data)
         except Exception as e:
             logging.error(f"解析單一打席事件時出錯: {e}", exc_info=True)
 
     return inning_events
+
+
+def parse_extracted_events(raw_events: List[dict], inning: int) -> List[dict]:
+    """
+    [新增] 將瀏覽器內一次擷取的單一半局原始資料 (見 BrowserOperator.extract_live_events)
+    轉換為與 parse_active_inning_details 相同格式的事件列表。
+    """
+    inning_events = []
+    for raw_event in raw_events or []:
+        try:
+            event_data = build_at_bat_event(raw_event, inning)
+            if event_data:
+                inning_events.append(event_data)
+        except Exception as e:
+            logging.error(f"解析單一打席事件時出錯: {e}", exc_info=True)
+    return inning_events
@@ -8,6 +8,9 @@ from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger(__name__)
 
+# [新增] 解析所需的 DOM 子樹：球員基本資訊與生涯成績表格
+FRAGMENT_SELECTORS = ("div.PlayerBrief", "div.RecordTableWrap")
+
 
 def _safe_to_int(value: Optional[str]) -> int:
     """
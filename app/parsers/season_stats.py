@@ -5,10 +5,15 @@ from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from app.config import settings
 
+# [新增] 解析所需的 DOM 子樹 (打擊與守備頁面皆只需第一個成績表格)
+FRAGMENT_SELECTORS = ("div.RecordTable",)
 
-def parse_season_batting_stats_page(html_content):
+
+def parse_season_batting_stats_page(html_content, team_name=None):
     """
     從球隊成績頁面 HTML 中，解析出目標球員的球季累積數據，並包含球員個人頁面 URL。
+
+    [修改] team_name 為該頁面所屬的球隊，未指定時視為目標球隊。
     """
     if not html_content:
         return []
@@ -80,7 +85,7 @@ def parse_season_batting_stats_page(html_content):
             stats_data = {
                 "player_name": player_name,
                 "player_url": full_url,  # 新增 player_url
-                "team_name": settings.TARGET_TEAM_NAME,
+                "team_name": team_name or settings.TARGET_TEAM_NAME,
             }
             for i, header_text in enumerate(header_cells):
                 db_col_name = header_map.get(header_text)
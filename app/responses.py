@@ -0,0 +1,53 @@
+# app/responses.py
+
+# 【新增】此檔案存放全域使用的 JSON 回應類別與快速序列化輔助函式。
+
+import functools
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    以 orjson 進行序列化的 JSON 回應，作為整個應用程式的預設回應類別。
+    輸出格式與 FastAPI 預設的 JSONResponse 相同 (UTF-8、無多餘空白)。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_type_adapter(response_type: Any) -> TypeAdapter:
+    """每種回應型別只建立一次 TypeAdapter (建立成本較高)。"""
+    return TypeAdapter(response_type)
+
+
+def model_response(
+    response_type: Any,
+    content: Any,
+    from_attributes: bool = False,
+    context: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    將回應內容以 pydantic-core 一次序列化為 JSON 回應。
+
+    直接回傳 Response 時 FastAPI 不會再依 response_model 驗證與轉換一次；
+    端點仍應宣告相同的 response_model，以維持 OpenAPI 文件不變。
+
+    Args:
+        response_type: 與端點 response_model 相同的型別，例如 List[schemas.OnBaseStreak]。
+        content: 符合 response_type 的模型實例。
+        from_attributes: 內容為 ORM 物件 (或包含 ORM 物件的 dict) 時設為 True，
+            會先驗證一次再序列化。
+        context: 驗證 ORM 物件時傳給 validator 的 context，例如 {"detail": "summary"}。
+    """
+    adapter = _get_type_adapter(response_type)
+    if from_attributes:
+        content = adapter.validate_python(
+            content, from_attributes=True, context=context
+        )
+    return Response(content=adapter.dump_json(content), media_type="application/json")
@@ -1,10 +1,10 @@
 # app/schemas.py
 
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Literal, Optional, List, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, model_validator
+from typing import Dict, Literal, Optional, List, Union
 import datetime
 
-from app.models import AtBatResultType
+from app.models import AT_BAT_HEAVY_COLUMNS, AtBatDetailLevel, AtBatResultType
 
 # ==============================================================================
 # 2. Pydantic Models (API 資料驗證模型)
@@ -26,6 +26,25 @@ class AtBatDetail(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _omit_heavy_columns(cls, data, info: ValidationInfo):
+        """
+        [修正] 僅在呼叫端以 context={"detail": "summary"} 驗證 ORM 物件時，
+        將大型文字欄位以 None 回傳，不讀取 (可能設為 raiseload 的) 欄位本身。
+        未指定 context 時一律讀取實際內容，不會把未載入的資料當成 None。
+        """
+        context = info.context or {}
+        if context.get("detail") != AtBatDetailLevel.SUMMARY or isinstance(data, dict):
+            return data
+        return {
+            field_name: None
+            if field_name in AT_BAT_HEAVY_COLUMNS
+            else getattr(data, field_name)
+            for field_name in cls.model_fields
+            if field_name in AT_BAT_HEAVY_COLUMNS or hasattr(data, field_name)
+        }
+
 
 class SituationalAtBatDetail(AtBatDetail):
     """擴充 AtBatDetail，增加比賽日期與對戰對手資訊。"""
@@ -362,3 +381,214 @@ class PlayerStatsForPositionAnalysis(BaseModel):
 class PositionAnalysisResponse(BaseModel):
     calendar_data: List[CalendarDataItem]
     player_stats: List[PlayerStatsForPositionAnalysis]
+
+
+# ==============================================================================
+# 球員逐場紀錄 (Game Log) Schemas
+# ==============================================================================
+
+
+class RollingStatLine(BaseModel):
+    """一段區間 (球季累積或近 N 場) 的累積計數與比率數據。"""
+
+    games: int = Field(..., description="區間內的出賽場數")
+    plate_appearances: int
+    at_bats: int
+    hits: int
+    doubles: int
+    triples: int
+    homeruns: int
+    rbi: int
+    walks: int
+    hit_by_pitch: int
+    sacrifice_flies: int
+    strikeouts: int
+    avg: Optional[float] = None
+    obp: Optional[float] = None
+    slg: Optional[float] = None
+    ops: Optional[float] = None
+
+
+class PlayerGameLogEntry(BaseModel):
+    """球員單場紀錄，附帶截至該場的球季累積與滾動區間數據。"""
+
+    game_id: int = Field(..., description="比賽的唯一 ID")
+    game_date: datetime.date = Field(..., description="比賽日期")
+    team_name: Optional[str] = None
+    opponent_team: Optional[str] = Field(None, description="對戰球隊")
+    batting_order: Optional[str] = None
+    position: Optional[str] = None
+    plate_appearances: int
+    at_bats: int
+    hits: int
+    doubles: int
+    triples: int
+    homeruns: int
+    rbi: int
+    walks: int
+    hit_by_pitch: int
+    sacrifice_flies: int
+    strikeouts: int
+    season_to_date: RollingStatLine = Field(..., description="截至該場的球季累積")
+    rolling: Dict[str, RollingStatLine] = Field(
+        ..., description="近 N 場的滾動數據，key 格式為 last_{N}"
+    )
+
+
+# ==============================================================================
+# [新增] 戰績排行 (Standings) Schemas
+# ==============================================================================
+
+
+class TeamStanding(BaseModel):
+    """單一球隊截至指定日期的賽季戰績。"""
+
+    rank: int = Field(..., description="依勝率排序的名次")
+    team_name: str
+    games_played: int
+    wins: int
+    losses: int
+    ties: int
+    win_percentage: float = Field(..., description="勝率 (勝 / (勝 + 敗))")
+    games_behind: float = Field(..., description="與勝率第一球隊的勝差")
+    last_10_games_record: str = Field(
+        ..., description="近十場戰績 (勝-敗-和)", examples=["5-5-0"]
+    )
+    current_streak_description: str = Field(
+        ..., description="目前連勝/敗的文字描述", examples=["3連勝", "2連敗", "中止"]
+    )
+    home_record: str = Field(..., description="主場戰績 (勝-敗-和)")
+    away_record: str = Field(..., description="客場戰績 (勝-敗-和)")
+    runs_scored: int
+    runs_allowed: int
+    run_differential: int
+    last_game_date: datetime.date = Field(..., description="最後一場比賽日期")
+    is_complete: bool = Field(
+        ..., description="帳本是否涵蓋該隊自開季起所有已完成的比賽"
+    )
+
+
+class StandingsResponse(BaseModel):
+    season: int
+    as_of_date: Optional[datetime.date] = Field(
+        None, description="戰績計算的截止日期，未指定時為最新戰績"
+    )
+    is_complete: bool = Field(
+        ...,
+        description="所有球隊的戰績是否皆自開季起完整；為 false 時需回填戰績帳本",
+    )
+    standings: List[TeamStanding]
+
+
+# ==============================================================================
+# [新增] 打擊排行榜 (Leaderboards) Schemas
+# ==============================================================================
+
+
+class LeaderboardEntry(BaseModel):
+    """排行榜中的單一球員。"""
+
+    rank: int = Field(..., description="名次 (依查詢條件：全部球員或僅規定打席)")
+    player_name: str
+    team_name: Optional[str] = None
+    value: float = Field(..., description="該數據項目的數值")
+    plate_appearances: int
+    team_games: int = Field(..., description="計算規定打席時採用的球隊出賽數")
+    qualified: bool = Field(..., description="是否達規定打席 (每場球隊比賽 3.1 打席)")
+
+
+class LeaderboardResponse(BaseModel):
+    season: int
+    stat: str
+    qualified_only: bool = Field(..., description="是否只列入達規定打席的球員")
+    team_name: Optional[str] = Field(None, description="篩選的球隊，未指定時為全聯盟")
+    leaders: List[LeaderboardEntry]
+
+
+# ==============================================================================
+# [新增] 進階數據 (Advanced Metrics) Schemas
+# ==============================================================================
+
+
+class PlayerAdvancedStats(BaseModel):
+    """由計數數據推導出的球員進階數據；無法計算的項目為 null。"""
+
+    player_name: str
+    team_name: Optional[str] = None
+    split: str
+    plate_appearances: int
+    avg: Optional[float] = None
+    obp: Optional[float] = None
+    slg: Optional[float] = None
+    woba: Optional[float] = None
+    iso: Optional[float] = None
+    babip: Optional[float] = None
+    k_percentage: Optional[float] = None
+    bb_percentage: Optional[float] = None
+    ops_plus: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeagueBattingConstants(BaseModel):
+    """每季的聯盟打擊常數。"""
+
+    season: int
+    plate_appearances: int
+    lg_avg: Optional[float] = None
+    lg_obp: Optional[float] = None
+    lg_slg: Optional[float] = None
+    lg_woba: Optional[float] = None
+    woba_scale: Optional[float] = None
+    lg_babip: Optional[float] = None
+    lg_k_percentage: Optional[float] = None
+    lg_bb_percentage: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AdvancedStatsResponse(BaseModel):
+    season: int
+    split: str
+    league: Optional[LeagueBattingConstants] = Field(
+        None, description="該季的聯盟常數，尚未計算時為 null"
+    )
+    players: List[PlayerAdvancedStats]
+
+
+# ==============================================================================
+# [新增] 球員名稱搜尋 Schemas
+# ==============================================================================
+
+
+class PlayerSearchResult(BaseModel):
+    """球員名稱搜尋 (自動完成) 的單筆結果。"""
+
+    name: str
+
+
+# ==============================================================================
+# [新增] 補爬計畫 (Crawl Plan) Schemas
+# ==============================================================================
+
+
+class CrawlPlanGame(BaseModel):
+    """補爬計畫中需要重新抓取的單場比賽。"""
+
+    cpbl_game_id: str
+    game_date: datetime.date
+    game_time: Optional[str] = None
+    home_team: Optional[str] = None
+    away_team: Optional[str] = None
+    reason: Literal["missing", "not_final", "no_at_bats"] = Field(
+        ...,
+        description="缺少比賽紀錄 (missing)、狀態未完成 (not_final) 或目標球隊沒有打席紀錄 (no_at_bats)",
+    )
+
+
+class CrawlPlanResponse(BaseModel):
+    year: int
+    checked_games: int = Field(..., description="今天 (含) 以前已檢查的賽程場數")
+    planned_games: int = Field(..., description="需要重新抓取的比賽數")
+    reasons: Dict[str, int] = Field(..., description="各原因的比賽數")
+    games: List[CrawlPlanGame]
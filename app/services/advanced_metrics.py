@@ -0,0 +1,353 @@
+# app/services/advanced_metrics.py
+
+import logging
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, extract, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.crud import players
+
+logger = logging.getLogger(__name__)
+
+# 計算進階數據所需的計數欄位
+COUNTING_COLUMNS = (
+    "plate_appearances",
+    "at_bats",
+    "hits",
+    "doubles",
+    "triples",
+    "homeruns",
+    "walks",
+    "intentional_walks",
+    "hit_by_pitch",
+    "sacrifice_flies",
+    "strikeouts",
+)
+
+# wOBA 的基礎線性權重；每季再依聯盟上壘率縮放，使聯盟 wOBA 等於聯盟上壘率
+WOBA_BASE_WEIGHTS = {
+    "unintentional_walks": 0.69,
+    "hit_by_pitch": 0.72,
+    "singles": 0.89,
+    "doubles": 1.27,
+    "triples": 1.62,
+    "homeruns": 2.10,
+}
+
+# 寫入資料庫的進階數據欄位
+ADVANCED_METRIC_COLUMNS = (
+    "avg",
+    "obp",
+    "slg",
+    "woba",
+    "iso",
+    "babip",
+    "k_percentage",
+    "bb_percentage",
+    "ops_plus",
+)
+
+
+class CountingStats:
+    """
+    一組球員的計數數據。每個計數欄位為一個 numpy 陣列，
+    陣列索引與 player_names / team_names 一一對應。
+    """
+
+    def __init__(
+        self,
+        player_names: List[str],
+        team_names: List[str],
+        columns: Dict[str, np.ndarray],
+    ):
+        self.player_names = player_names
+        self.team_names = team_names
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.player_names)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "CountingStats":
+        """由 (player_name, team_name, *COUNTING_COLUMNS) 形式的查詢結果建立。"""
+        matrix = np.array([row[2:] for row in rows], dtype=np.float64).reshape(
+            -1, len(COUNTING_COLUMNS)
+        )
+        return cls(
+            player_names=[row[0] for row in rows],
+            team_names=[row[1] for row in rows],
+            columns={column: matrix[:, i] for i, column in enumerate(COUNTING_COLUMNS)},
+        )
+
+    @classmethod
+    def concat(cls, stats_list: Iterable["CountingStats"]) -> "CountingStats":
+        """將多組計數數據串接為一組。"""
+        stats_list = list(stats_list)
+        return cls(
+            player_names=[name for s in stats_list for name in s.player_names],
+            team_names=[team for s in stats_list for team in s.team_names],
+            columns={
+                column: np.concatenate([s[column] for s in stats_list] or [np.empty(0)])
+                for column in COUNTING_COLUMNS
+            },
+        )
+
+
+# --- 資料載入 ---
+
+
+def load_season_counting_stats(db: Session, season: int) -> CountingStats:
+    """載入指定賽季 player_season_stats 中打席數大於 0 的球員計數數據。"""
+    table = models.PlayerSeasonStatsDB
+    rows = db.execute(
+        select(
+            table.player_name,
+            table.team_name,
+            *(func.coalesce(getattr(table, column), 0) for column in COUNTING_COLUMNS),
+        ).where(
+            table.data_retrieved_date.like(f"{season}-%"),
+            table.plate_appearances > 0,
+        )
+    ).all()
+    return CountingStats.from_rows(rows)
+
+
+def load_split_counting_stats(
+    db: Session, season: int, target_teams: List[str]
+) -> Dict[models.StatSplit, CountingStats]:
+    """
+    以單一彙總查詢將指定賽季的逐場紀錄加總為主場 / 客場分項。
+
+    [修正] 逐場紀錄只爬取目標球隊的比賽，其他球隊球員的加總並非完整的主 / 客場數據，
+    因此分項只計算目標球隊的球員。
+    """
+    summary = models.PlayerGameSummaryDB
+    game = models.GameResultDB
+    is_home = case((summary.team_name == game.home_team, True), else_=False)
+    rows = db.execute(
+        select(
+            summary.player_name,
+            summary.team_name,
+            *(
+                func.coalesce(func.sum(getattr(summary, column)), 0)
+                for column in COUNTING_COLUMNS
+            ),
+            is_home.label("is_home"),
+        )
+        .join(game, summary.game_id == game.id)
+        .where(
+            extract("year", game.game_date) == season,
+            summary.team_name.in_(target_teams),
+        )
+        .group_by(summary.player_name, summary.team_name, is_home)
+        .having(func.sum(summary.plate_appearances) > 0)
+        .order_by(summary.player_name)
+    ).all()
+    return {
+        split: CountingStats.from_rows(
+            [row[:-1] for row in rows if bool(row.is_home) == home]
+        )
+        for split, home in (
+            (models.StatSplit.HOME, True),
+            (models.StatSplit.AWAY, False),
+        )
+    }
+
+
+# --- 向量化計算 ---
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """逐元素相除，分母為 0 時結果為 NaN。"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.full(np.broadcast(numerator, denominator).shape, np.nan),
+        where=denominator > 0,
+    )
+
+
+def _base_rates(stats: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """計算不需聯盟常數的比率數據，以及尚未縮放的 wOBA。"""
+    singles = stats["hits"] - stats["doubles"] - stats["triples"] - stats["homeruns"]
+    unintentional_walks = stats["walks"] - stats["intentional_walks"]
+    total_bases = (
+        singles + 2 * stats["doubles"] + 3 * stats["triples"] + 4 * stats["homeruns"]
+    )
+    weighted_events = (
+        WOBA_BASE_WEIGHTS["unintentional_walks"] * unintentional_walks
+        + WOBA_BASE_WEIGHTS["hit_by_pitch"] * stats["hit_by_pitch"]
+        + WOBA_BASE_WEIGHTS["singles"] * singles
+        + WOBA_BASE_WEIGHTS["doubles"] * stats["doubles"]
+        + WOBA_BASE_WEIGHTS["triples"] * stats["triples"]
+        + WOBA_BASE_WEIGHTS["homeruns"] * stats["homeruns"]
+    )
+    woba_denominator = (
+        stats["at_bats"]
+        + unintentional_walks
+        + stats["sacrifice_flies"]
+        + stats["hit_by_pitch"]
+    )
+
+    avg = _safe_divide(stats["hits"], stats["at_bats"])
+    slg = _safe_divide(total_bases, stats["at_bats"])
+    return {
+        "avg": avg,
+        "obp": _safe_divide(
+            stats["hits"] + stats["walks"] + stats["hit_by_pitch"],
+            stats["at_bats"]
+            + stats["walks"]
+            + stats["hit_by_pitch"]
+            + stats["sacrifice_flies"],
+        ),
+        "slg": slg,
+        "iso": slg - avg,
+        "raw_woba": _safe_divide(weighted_events, woba_denominator),
+        "babip": _safe_divide(
+            stats["hits"] - stats["homeruns"],
+            stats["at_bats"]
+            - stats["strikeouts"]
+            - stats["homeruns"]
+            + stats["sacrifice_flies"],
+        ),
+        "k_percentage": _safe_divide(stats["strikeouts"], stats["plate_appearances"]),
+        "bb_percentage": _safe_divide(stats["walks"], stats["plate_appearances"]),
+    }
+
+
+def derive_league_constants(stats: CountingStats) -> Dict[str, float]:
+    """
+    以所有球員的計數數據總和推導聯盟常數。
+
+    wOBA 縮放係數使聯盟 wOBA 等於聯盟上壘率 (lg_woba == lg_obp)。
+    """
+    totals = {column: stats[column].sum() for column in COUNTING_COLUMNS}
+    rates = {name: float(value) for name, value in _base_rates(totals).items()}
+    woba_scale = (
+        rates["obp"] / rates["raw_woba"]
+        if rates["raw_woba"] and not math.isnan(rates["raw_woba"])
+        else math.nan
+    )
+    return {
+        "plate_appearances": int(totals["plate_appearances"]),
+        "lg_avg": rates["avg"],
+        "lg_obp": rates["obp"],
+        "lg_slg": rates["slg"],
+        "lg_woba": rates["raw_woba"] * woba_scale,
+        "woba_scale": woba_scale,
+        "lg_babip": rates["babip"],
+        "lg_k_percentage": rates["k_percentage"],
+        "lg_bb_percentage": rates["bb_percentage"],
+    }
+
+
+def compute_advanced_metrics(
+    stats: CountingStats, constants: Dict[str, float]
+) -> Dict[str, np.ndarray]:
+    """
+    一次向量化計算所有球員的進階數據，回傳以欄位名稱為 key 的陣列。
+    無法計算的項目 (例如 0 打數的打擊率) 為 NaN。
+    """
+    rates = _base_rates(stats.columns)
+    rates["woba"] = rates.pop("raw_woba") * constants["woba_scale"]
+    rates["ops_plus"] = 100 * (
+        _safe_divide(rates["obp"], constants["lg_obp"])
+        + _safe_divide(rates["slg"], constants["lg_slg"])
+        - 1
+    )
+    return rates
+
+
+# --- 儲存 ---
+
+
+def _to_db_value(value: float, digits: int):
+    """將 NaN 轉為 None，其餘四捨五入至指定位數。"""
+    return None if math.isnan(value) else round(value, digits)
+
+
+def _to_rows(
+    season: int,
+    split: models.StatSplit,
+    stats: CountingStats,
+    metrics: Dict[str, np.ndarray],
+) -> List[Dict]:
+    columns = {
+        name: np.round(metrics[name], 0 if name == "ops_plus" else 3).tolist()
+        for name in ADVANCED_METRIC_COLUMNS
+    }
+    plate_appearances = stats["plate_appearances"].astype(int).tolist()
+    return [
+        {
+            "season": season,
+            "split": split.value,
+            "player_name": player_name,
+            "team_name": stats.team_names[i],
+            "plate_appearances": plate_appearances[i],
+            **{
+                name: None if math.isnan(values[i]) else values[i]
+                for name, values in columns.items()
+            },
+        }
+        for i, player_name in enumerate(stats.player_names)
+    ]
+
+
+def refresh_advanced_metrics(
+    db: Session, season: int, target_teams: Optional[List[str]] = None
+) -> int:
+    """
+    重新計算並儲存指定賽季的進階數據與聯盟常數，完成後 commit。
+
+    聯盟常數以整季累積數據推導；尚無整季數據時改用逐場紀錄加總。
+    主 / 客場分項與整季數據共用同一組聯盟常數，且只涵蓋目標球隊
+    (target_teams，預設為 TARGET_TEAMS) 的球員。
+
+    Returns:
+        int: 寫入的進階數據筆數。
+    """
+    season_stats = load_season_counting_stats(db, season)
+    split_stats = load_split_counting_stats(
+        db, season, settings.TARGET_TEAMS if target_teams is None else target_teams
+    )
+    league_source = (
+        season_stats
+        if len(season_stats)
+        else CountingStats.concat(split_stats.values())
+    )
+    if not len(league_source):
+        logger.info(f"{season} 年尚無打擊數據，略過進階數據計算。")
+        return 0
+
+    constants = derive_league_constants(league_source)
+    rows = []
+    for split, stats in ((models.StatSplit.SEASON, season_stats), *split_stats.items()):
+        if len(stats):
+            rows.extend(
+                _to_rows(
+                    season, split, stats, compute_advanced_metrics(stats, constants)
+                )
+            )
+
+    players.replace_player_advanced_stats(db, season, rows)
+    players.upsert_league_batting_constants(
+        db,
+        season,
+        {
+            name: value if isinstance(value, int) else _to_db_value(value, 4)
+            for name, value in constants.items()
+        },
+    )
+    db.commit()
+    logger.info(f"已重新計算 {season} 年 {len(rows)} 筆進階數據。")
+    return len(rows)
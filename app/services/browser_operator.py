@@ -1,13 +1,119 @@
 # app/services/browser_operator.py
 
 import logging
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 from playwright.sync_api import Page, expect, Locator
 
+from app.browser import get_subtree_html, measure_page_load
 from app.config import settings
+from app.parsers import box_score
+from app.utils.rate_limiter import wait_for_request_slot
 
 logger = logging.getLogger(__name__)
 
+# [新增] 在頁面內一次完成「切換各局、展開所有事件、擷取結構化資料」。
+# 擷取的欄位與 app.parsers.live.parse_active_inning_details 由 HTML 取得的欄位一致，
+# 之後交由 live.parse_extracted_events 建立打席事件。
+_EXTRACT_LIVE_EVENTS_JS = """
+async ({ tabTimeoutMs, expandTimeoutMs }) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const waitFor = async (predicate, timeoutMs) => {
+        const deadline = Date.now() + timeoutMs;
+        while (Date.now() < deadline) {
+            if (predicate()) return true;
+            await sleep(50);
+        }
+        return predicate();
+    };
+    const textOrNull = (el) => (el ? el.textContent.trim() : null);
+    // 對應 BeautifulSoup 的 " ".join(tag.stripped_strings)
+    const strippedStrings = (el) => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        const parts = [];
+        while (walker.nextNode()) {
+            const text = walker.currentNode.nodeValue.trim();
+            if (text) parts.push(text);
+        }
+        return parts.join(" ");
+    };
+    const isVisible = (el) => !!el && el.getClientRects().length > 0;
+    const activeContent = () =>
+        document.querySelector("div.InningPlaysGroup div.tab_cont.active");
+
+    const clickTarget = (item) => {
+        const eventButton = item.querySelector("div.batter_event");
+        const anchor = eventButton && eventButton.querySelector("a");
+        if (anchor && anchor.textContent.trim()) return eventButton;
+        return item.querySelector("div.no-pitch-action-remind");
+    };
+    const extractItem = (item) => {
+        const desc = item.querySelector("div.info > div.desc");
+        const detail = item.querySelector("div.detail");
+        return {
+            hitter_name: textOrNull(item.querySelector("div.player > a > span")),
+            description_text: desc ? strippedStrings(desc) : null,
+            pitcher_name: detail
+                ? textOrNull(detail.querySelector("div.detail_item.pitcher a"))
+                : null,
+            pitches: detail
+                ? Array.from(
+                      detail.querySelectorAll(
+                          "div.detail_item[class*='pitch-'], div.detail_item.no-pitch"
+                      )
+                  ).map((tag) => ({
+                      num: textOrNull(tag.querySelector("div.pitch_num span")),
+                      desc: textOrNull(tag.querySelector("div.call_desc")),
+                      count: textOrNull(tag.querySelector("div.pitches_count")),
+                  }))
+                : null,
+        };
+    };
+
+    const tabs = Array.from(
+        document.querySelectorAll("div.InningPlaysGroup div.tabs > ul > li")
+    );
+    const halfInnings = [];
+    for (let i = 0; i < tabs.length; i++) {
+        // [修正] 局數取自分頁標籤，而非分頁的順序
+        const label = tabs[i].textContent.trim();
+        const inning = parseInt(label, 10);
+        if (!Number.isInteger(inning)) {
+            throw new Error(`無法由分頁標籤 "${label}" 判斷局數`);
+        }
+        tabs[i].click();
+        // [修正] 任何等待逾時都直接拋出錯誤，讓呼叫端退回逐一點擊模式，
+        // 而不是回傳缺少半局或缺少投球細節的不完整結果
+        if (!(await waitFor(() => isVisible(activeContent()), tabTimeoutMs))) {
+            throw new Error(`第 ${inning} 局的分頁未能切換`);
+        }
+        const content = activeContent();
+        for (const selector of ["section.top", "section.bot"]) {
+            const section = content.querySelector(selector);
+            if (!section) continue;
+            const items = Array.from(section.querySelectorAll("div.item.play"));
+            const clicked = items.filter((item) => {
+                const target = clickTarget(item);
+                if (target) target.click();
+                return !!target;
+            });
+            const expanded = await waitFor(
+                () => clicked.every((item) => item.querySelector("div.detail")),
+                expandTimeoutMs
+            );
+            if (!expanded) {
+                throw new Error(`第 ${inning} 局 ${selector} 的事件未能全部展開`);
+            }
+            halfInnings.push({
+                inning: inning,
+                selector: selector,
+                events: items.map(extractItem),
+            });
+        }
+    }
+    return halfInnings;
+}
+"""
+
 
 class BrowserOperator:
     """封裝所有 Playwright 瀏覽器互動邏輯的類別。"""
@@ -24,13 +130,16 @@ class BrowserOperator:
     def navigate_and_get_box_score_content(self, box_score_url: str) -> str:
         """導航至 Box Score 頁面並回傳其 HTML 內容。"""
         logger.info(f"導航至 Box Score 頁面: {box_score_url}")
-        self.page.goto(box_score_url, timeout=settings.PLAYWRIGHT_TIMEOUT)
-        self.page.wait_for_selector(
-            "div.GameBoxDetail",
-            state="visible",
-            timeout=settings.PLAYWRIGHT_TIMEOUT,
-        )
-        return self.page.content()
+        wait_for_request_slot()
+        with measure_page_load(self.page, "box_score"):
+            self.page.goto(box_score_url, timeout=settings.PLAYWRIGHT_TIMEOUT)
+            self.page.wait_for_selector(
+                "div.GameBoxDetail",
+                state="visible",
+                timeout=settings.PLAYWRIGHT_TIMEOUT,
+            )
+        # [修改] 只擷取解析器需要的子樹，而非序列化整個頁面
+        return get_subtree_html(self.page, box_score.FRAGMENT_SELECTORS)
 
     def extract_live_events_html(self, live_url: str) -> List[Tuple[str, int, str]]:
         """
@@ -40,10 +149,14 @@ class BrowserOperator:
             List[Tuple[str, int, str]]: 一個元組列表，每個元組包含 (半局 HTML, 局數, 半局選擇器)。
         """
         logger.info(f"導航至 Live 頁面: {live_url}")
-        self.page.goto(live_url, wait_until="load", timeout=settings.PLAYWRIGHT_TIMEOUT)
-        self.page.wait_for_selector(
-            "div.InningPlaysGroup", timeout=settings.PLAYWRIGHT_TIMEOUT
-        )
+        wait_for_request_slot()
+        with measure_page_load(self.page, "live"):
+            self.page.goto(
+                live_url, wait_until="load", timeout=settings.PLAYWRIGHT_TIMEOUT
+            )
+            self.page.wait_for_selector(
+                "div.InningPlaysGroup", timeout=settings.PLAYWRIGHT_TIMEOUT
+            )
 
         logger.info("注入 CSS 以隱藏所有 iframe...")
         try:
@@ -90,6 +203,39 @@ class BrowserOperator:
 
         return all_half_innings_html
 
+    def extract_live_events(
+        self, live_url: str
+    ) -> List[Tuple[List[Dict[str, Any]], int, str]]:
+        """
+        [新增] 導航至 Live 頁面，以單次 page.evaluate 展開並擷取所有半局的打席資料。
+
+        取代逐一點擊與逐半局擷取 HTML 的大量往返；結果交由
+        live.parse_extracted_events 轉換為打席事件。
+        [修正] 分頁無法切換或事件未能全部展開時拋出例外，而非回傳不完整的結果。
+
+        Returns:
+            List[Tuple[List[dict], int, str]]: 一個元組列表，每個元組包含
+            (半局的原始打席資料, 局數, 半局選擇器)。
+        """
+        logger.info(f"導航至 Live 頁面 (單次擷取模式): {live_url}")
+        wait_for_request_slot()
+        with measure_page_load(self.page, "live"):
+            self.page.goto(
+                live_url, wait_until="load", timeout=settings.PLAYWRIGHT_TIMEOUT
+            )
+            self.page.wait_for_selector(
+                "div.InningPlaysGroup", timeout=settings.PLAYWRIGHT_TIMEOUT
+            )
+
+        half_innings = self.page.evaluate(
+            _EXTRACT_LIVE_EVENTS_JS,
+            {"tabTimeoutMs": 5000, "expandTimeoutMs": 3000},
+        )
+        return [
+            (half["events"], half["inning"], half["selector"])
+            for half in half_innings or []
+        ]
+
     def _expand_all_events_in_half_inning(self, half_inning_section: Locator):
         """展開指定半局區塊中的所有可點擊事件。"""
         event_containers = half_inning_section.locator("div.item.play")
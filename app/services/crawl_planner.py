@@ -0,0 +1,197 @@
+# app/services/crawl_planner.py
+
+import datetime
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import extract, or_
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+# 需要重新爬取的原因
+REASON_MISSING = "missing"  # 賽程中有此比賽，但 game_results 沒有紀錄
+REASON_NOT_FINAL = "not_final"  # 已儲存的比賽狀態不是「已完成」
+REASON_NO_AT_BATS = "no_at_bats"  # 已完成，但目標球隊沒有任何打席紀錄
+
+
+# [新增] 賽程頁上表示比賽不會在該日期進行的狀態，這類比賽不列入計畫
+NOT_PLAYED_STATUSES = ("延賽", "取消")
+# [新增] 賽程頁上不會再變動的狀態；其餘 (未開始、延賽等) 日期已過的比賽視為尚未確定
+RESOLVED_STATUSES = ("已完成", "取消")
+
+
+def schedule_is_stale(db: Session, year: int, max_age: datetime.timedelta) -> bool:
+    """
+    [新增] 判斷指定賽季的整季賽程是否需要重新抓取。
+
+    尚未寫入任何賽程，或最近一次更新早於 max_age 前時視為過期；
+    過去的賽季只要在該年結束後更新過一次即不再過期。
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    fresh_since = min(
+        now - max_age, datetime.datetime(year + 1, 1, 1, tzinfo=datetime.timezone.utc)
+    )
+    refreshed = db.query(
+        db.query(models.SeasonScheduleGameDB)
+        .filter(
+            models.SeasonScheduleGameDB.season == year,
+            models.SeasonScheduleGameDB.updated_at >= fresh_since,
+        )
+        .exists()
+    ).scalar()
+    return not refreshed
+
+
+def unresolved_months(db: Session, year: int, today: datetime.date) -> Set[int]:
+    """[新增] 回傳整季賽程中，含有日期已過但狀態尚未確定之比賽的月份。"""
+    rows = (
+        db.query(extract("month", models.SeasonScheduleGameDB.game_date))
+        .filter(
+            models.SeasonScheduleGameDB.season == year,
+            models.SeasonScheduleGameDB.game_date <= today,
+            or_(
+                models.SeasonScheduleGameDB.status.is_(None),
+                models.SeasonScheduleGameDB.status.notin_(RESOLVED_STATUSES),
+            ),
+        )
+        .distinct()
+    )
+    return {int(month) for (month,) in rows}
+
+
+def _schedule_games(db: Session, year: int, today: datetime.date) -> List[dict]:
+    """
+    [修正] 讀取整季賽程 (season_schedule_games) 中指定年份、今天 (含) 以前的比賽。
+
+    整季賽程由賽程頁寫入，涵蓋所有球隊與歷史賽季；延賽的比賽已更新為最新的補賽日期，
+    仍標示為延賽或取消的比賽則略過。
+    """
+    rows = (
+        db.query(models.SeasonScheduleGameDB)
+        .filter(
+            models.SeasonScheduleGameDB.season == year,
+            models.SeasonScheduleGameDB.game_date <= today,
+            or_(
+                models.SeasonScheduleGameDB.status.is_(None),
+                models.SeasonScheduleGameDB.status.notin_(NOT_PLAYED_STATUSES),
+            ),
+        )
+        .order_by(
+            models.SeasonScheduleGameDB.game_date,
+            models.SeasonScheduleGameDB.cpbl_game_id,
+        )
+        .all()
+    )
+    return [
+        {
+            "cpbl_game_id": row.cpbl_game_id,
+            "game_date": row.game_date.strftime("%Y-%m-%d"),
+            "game_time": row.game_time,
+            "away_team": row.away_team,
+            "home_team": row.home_team,
+        }
+        for row in rows
+    ]
+
+
+def plan_games(
+    db: Session,
+    year: int,
+    schedule_games: List[dict],
+    target_teams: Optional[List[str]],
+) -> List[dict]:
+    """
+    [新增] 比對賽程與 game_results，回傳需要重新爬取的比賽 (附上 reason 欄位)。
+
+    只考慮目標球隊的比賽；已儲存且已完成、目標球隊也有打席紀錄的比賽不需處理。
+    [修正] 以同一賽季的 cpbl_game_id 比對，不要求日期相同 (延賽後日期會改變)。
+    """
+    if target_teams:
+        schedule_games = [
+            game
+            for game in schedule_games
+            if game.get("home_team") in target_teams
+            or game.get("away_team") in target_teams
+        ]
+    if not schedule_games:
+        return []
+
+    stored: Dict[str, Tuple[int, Optional[str]]] = {
+        cpbl_game_id: (game_id, status)
+        for game_id, cpbl_game_id, status in db.query(
+            models.GameResultDB.id,
+            models.GameResultDB.cpbl_game_id,
+            models.GameResultDB.status,
+        ).filter(
+            models.GameResultDB.cpbl_game_id.in_(
+                {game["cpbl_game_id"] for game in schedule_games}
+            ),
+            models.GameResultDB.game_date.between(
+                datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+            ),
+        )
+    }
+
+    at_bat_query = (
+        db.query(models.AtBatDetailDB.game_id)
+        .join(
+            models.PlayerGameSummaryDB,
+            models.AtBatDetailDB.player_game_summary_id
+            == models.PlayerGameSummaryDB.id,
+        )
+        .filter(models.AtBatDetailDB.game_id.in_([v[0] for v in stored.values()]))
+        .distinct()
+    )
+    if target_teams:
+        at_bat_query = at_bat_query.filter(
+            models.PlayerGameSummaryDB.team_name.in_(target_teams)
+        )
+    games_with_at_bats: Set[int] = {game_id for (game_id,) in at_bat_query}
+
+    planned = []
+    for game in schedule_games:
+        stored_game = stored.get(game["cpbl_game_id"])
+        if stored_game is None:
+            reason = REASON_MISSING
+        elif stored_game[1] != "已完成":
+            reason = REASON_NOT_FINAL
+        elif stored_game[0] not in games_with_at_bats:
+            reason = REASON_NO_AT_BATS
+        else:
+            continue
+        planned.append({**game, "reason": reason})
+    return planned
+
+
+def build_crawl_plan(
+    db: Session,
+    year: int,
+    target_teams: Optional[List[str]],
+    today: datetime.date,
+) -> dict:
+    """
+    [新增] 依資料庫狀態產生指定年份的補爬計畫 (dry-run 報告)，不連線至 cpbl.com.tw。
+    賽程以最近一次由賽程頁寫入的整季賽程為準。
+
+    Returns:
+        dict: 包含檢查的賽程場數、各原因的場數與需要處理的比賽列表。
+    """
+    schedule_games = _schedule_games(db, year, today)
+    planned = plan_games(db, year, schedule_games, target_teams)
+    reasons = Counter(game["reason"] for game in planned)
+    logger.info(
+        f"{year} 年補爬計畫：檢查 {len(schedule_games)} 場賽程，需處理 {len(planned)} 場 "
+        f"(缺少 {reasons[REASON_MISSING]}、未完成 {reasons[REASON_NOT_FINAL]}、"
+        f"無打席 {reasons[REASON_NO_AT_BATS]})。"
+    )
+    return {
+        "year": year,
+        "checked_games": len(schedule_games),
+        "planned_games": len(planned),
+        "reasons": dict(reasons),
+        "games": planned,
+    }
@@ -1,17 +1,27 @@
 # app/services/dashboard.py
 
-from datetime import date
+from datetime import date, datetime, timedelta
 
+import pytz
 from sqlalchemy.orm import Session
 
-from app import schemas
-from app.crud import games
+from app import models, schemas
+from app.crud import games, standings
 from app.config import Settings
 from app.utils.parsing_helpers import (
     calculate_last_10_games_record,
     calculate_current_streak,
+    describe_streak,
+    summarize_results,
 )
 
+TAIPEI_TZ = pytz.timezone("Asia/Taipei")
+
+
+def taipei_today() -> date:
+    """[新增] 以台北時間取得今日日期，避免伺服器時區 (UTC) 造成跨日誤判。"""
+    return datetime.now(TAIPEI_TZ).date()
+
 
 class DashboardService:
     def __init__(self, db: Session, settings: Settings):
@@ -22,7 +32,39 @@ class DashboardService:
         """
         獲取今日儀表板的數據，根據是否有已完成的比賽決定回應的結構。
         """
-        today = date.today()
+        # [修正] 「今日」以台北時間為準
+        return self.build_dashboard_data(taipei_today())
+
+    def get_today_dashboard_snapshot(self) -> str | None:
+        """
+        [新增] 取得 worker 預先組合的今日儀表板 JSON。
+        快照以台北時間的日期為鍵，跨日後若尚未產生新一天的快照則回傳 None。
+        """
+        return games.get_dashboard_snapshot_document(self.db, taipei_today())
+
+    def refresh_dashboard_snapshots(self) -> None:
+        """
+        [新增] 重新產生今日與明日的儀表板快照並提交，同時清除過期快照。
+
+        明日尚無已完成的比賽，其快照即為 NO_TODAY_GAMES 型態；預先寫入後，
+        午夜跨日時端點不需等待下一次爬蟲即可回傳正確內容。
+        """
+        today = taipei_today()
+        for snapshot_date in (today, today + timedelta(days=1)):
+            dashboard_data = self.build_dashboard_data(snapshot_date)
+            games.upsert_dashboard_snapshot(
+                self.db,
+                snapshot_date=snapshot_date,
+                status=dashboard_data.status,
+                document=dashboard_data.model_dump_json(),
+            )
+        games.delete_dashboard_snapshots_before(self.db, today)
+        self.db.commit()
+
+    def build_dashboard_data(self, today: date) -> schemas.DashboardResponse:
+        """
+        以指定日期作為「今日」組合儀表板數據。
+        """
         completed_games_today = games.get_completed_games_by_date(
             self.db, game_date=today
         )
@@ -56,27 +98,56 @@ class DashboardService:
             # 確保設定檔中至少有一個目標球隊
             if self.settings.TARGET_TEAMS:
                 # 以第一個目標球隊為準
-                target_team_name = self.settings.TARGET_TEAMS[0]
-                recent_games = games.get_last_n_completed_games_for_team(
-                    self.db, team_name=target_team_name, limit=10
+                target_team_status = self._get_team_recent_status(
+                    self.settings.TARGET_TEAMS[0], today
                 )
 
-                if recent_games:
-                    last_10_record = calculate_last_10_games_record(
-                        games=list(recent_games), team_name=target_team_name
-                    )
-                    current_streak = calculate_current_streak(
-                        games=list(recent_games), team_name=target_team_name
-                    )
-                    target_team_status = schemas.TeamRecentStatus(
-                        team_name=target_team_name,
-                        last_10_games_record=last_10_record,
-                        current_streak_description=current_streak,
-                    )
-
             return schemas.DashboardNoGamesResponse(
                 status="NO_TODAY_GAMES",
                 next_game_status=next_game_status,
                 last_target_team_game=last_target_team_game,
                 target_team_status=target_team_status,
             )
+
+    def _get_team_recent_status(
+        self, team_name: str, today: date
+    ) -> schemas.TeamRecentStatus | None:
+        """
+        [修改] 優先讀取戰績帳本中已累計好的近十場與連勝敗；
+        帳本尚無該隊資料時，才由比賽紀錄即時計算。
+        [修正] 帳本只有在自開季起完整時才採用 (見 _ledger_is_complete)。
+        """
+        standing = standings.get_latest_team_standing(self.db, team_name, as_of=today)
+        if standing and self._ledger_is_complete(team_name, standing):
+            return schemas.TeamRecentStatus(
+                team_name=team_name,
+                last_10_games_record=summarize_results(standing.last_10_results),
+                current_streak_description=describe_streak(standing.streak),
+            )
+
+        recent_games = games.get_last_n_completed_games_for_team(
+            self.db, team_name=team_name, limit=10
+        )
+        if not recent_games:
+            return None
+
+        last_10_record = calculate_last_10_games_record(
+            games=list(recent_games), team_name=team_name
+        )
+        current_streak = calculate_current_streak(
+            games=list(recent_games), team_name=team_name
+        )
+        return schemas.TeamRecentStatus(
+            team_name=team_name,
+            last_10_games_record=last_10_record,
+            current_streak_description=current_streak,
+        )
+
+    def _ledger_is_complete(
+        self, team_name: str, standing: models.TeamGameStandingDB
+    ) -> bool:
+        """
+        [修正] 判斷帳本是否足以計算近況：需涵蓋整季賽程與比賽紀錄中該季截至同一天的
+        所有已完成比賽 (即自開季起皆有記錄)；只涵蓋部分賽季時，連勝敗可能始於帳本開始前而不可信。
+        """
+        return standings.is_ledger_complete(self.db, standing)
@@ -4,7 +4,7 @@ import logging
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
 
-from app.crud import games, players
+from app.crud import games, players, standings
 
 logger = logging.getLogger(__name__)
 
@@ -13,9 +13,14 @@ def prepare_game_storage(db: Session, game_info: Dict) -> Optional[int]:
     """
     準備儲存比賽資料的空間。
 
-    此函式會執行「先刪除後新增」的冪等性策略：
+    [修正] 呼叫前，_process_single_game 會先以 get_stored_fingerprint 比對內容指紋：
+    已完成且 Box Score 與目標球隊設定皆未變動的比賽直接略過，不會呼叫此函式，
+    資料庫中的比賽、球員總結與打席紀錄 (含原本的 game_id) 維持不變。
+    只有新比賽、內容有變動或強制重寫 (force) 的比賽才會進入此函式，
+    執行「先刪除後新增」的冪等性策略：
     1. 根據 cpbl_game_id 和 game_date 刪除可能已存在的舊比賽資料。
-    2. 建立新的比賽紀錄並回傳其在資料庫中的 ID。
+    2. 建立新的比賽紀錄 (包含 game_info 中的 content_fingerprint，供下次比對)
+       並回傳其在資料庫中的 ID。
 
     Args:
         db (Session): SQLAlchemy 的資料庫會話物件。
@@ -42,11 +47,38 @@ def prepare_game_storage(db: Session, game_info: Dict) -> Optional[int]:
         return None
 
 
+def get_stored_fingerprint(
+    db: Session, game_info: Dict, target_teams: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    [新增] 取得資料庫中同一場已完成比賽的內容指紋，供呼叫者判斷是否需要重寫。
+
+    Returns:
+        Optional[str]: 已儲存的指紋；比賽不存在、未完成、目標球隊沒有打席紀錄
+        或查詢失敗時回傳 None (一律重寫)。
+    """
+    cpbl_game_id = game_info.get("cpbl_game_id")
+    game_date = game_info.get("game_date_obj")
+    if not cpbl_game_id or not game_date:
+        return None
+    try:
+        return games.get_final_game_fingerprint(
+            db, cpbl_game_id, game_date, target_teams
+        )
+    except Exception as e:
+        db.rollback()
+        logger.warning(
+            f"查詢比賽內容指紋失敗 (Game ID: {cpbl_game_id})，將重寫此比賽: {e}",
+            exc_info=True,
+        )
+        return None
+
+
 def commit_player_game_data(
     db: Session, game_id: int, final_player_data_list: List[Dict]
 ):
     """
-    將處理完成的球員逐場比賽數據儲存至資料庫。
+    將處理完成的球員逐場比賽數據儲存至資料庫，並預先渲染比賽細節文件。
 
     Args:
         db (Session): SQLAlchemy 的資料庫會話物件。
@@ -60,3 +92,77 @@ def commit_player_game_data(
         logger.error(f"儲存球員數據時失敗 (Game ID: {game_id}): {e}", exc_info=True)
         # 讓呼叫者決定是否要 rollback
         raise
+
+    # [新增] 比賽資料寫入後即不再變動，於此時預先渲染比賽細節文件。
+    # 渲染失敗不影響比賽資料本身的提交，API 會退回 ORM 查詢路徑。
+    # [修正] 於 savepoint 中渲染，資料庫錯誤只復原文件本身，不會讓外層交易失效
+    db.flush()
+    try:
+        with db.begin_nested():
+            games.store_game_detail_documents(db, game_id)
+    except Exception as e:
+        logger.warning(
+            f"渲染比賽細節文件失敗 (Game ID: {game_id})，將於查詢時改用即時組合: {e}",
+            exc_info=True,
+        )
+
+
+def replace_player_game_data(
+    db: Session, game_id: int, final_player_data_list: List[Dict]
+):
+    """
+    [新增] 以重新解析的結果取代單場比賽既有的球員逐場數據 (不重建比賽本身)。
+
+    先刪除舊的總結與打席記錄，避免新結果的打席數較少時殘留多餘的舊紀錄；
+    是否提交由呼叫者決定。
+    """
+    deleted = players.delete_player_game_data(db, game_id)
+    logger.info(
+        f"已刪除 Game ID: {game_id} 的 {deleted} 筆舊球員總結，準備寫入新結果。"
+    )
+    commit_player_game_data(db, game_id, final_player_data_list)
+
+
+def record_team_standings(db: Session, games_list: List[Dict]) -> int:
+    """
+    [新增] 將比賽列表中所有已完成的比賽 (不限目標球隊) 寫入戰績帳本並提交。
+
+    戰績帳本只依賴賽程頁的比分，與逐場的球員資料無關，
+    因此獨立於單場比賽的交易之外提交，單場比賽處理失敗不會影響戰績。
+
+    Returns:
+        int: 寫入帳本的比賽場數。
+    """
+    try:
+        recorded = sum(
+            1 for game_info in games_list if standings.record_game_result(db, game_info)
+        )
+        db.commit()
+    except Exception as e:
+        logger.error(f"更新戰績帳本時失敗: {e}", exc_info=True)
+        db.rollback()
+        raise
+    logger.info(f"已將 {recorded} 場已完成的比賽寫入戰績帳本。")
+    return recorded
+
+
+def record_season_schedule(db: Session, games_list: List[Dict]) -> int:
+    """
+    [新增] 將賽程頁解析出的所有比賽 (不限目標球隊) 寫入整季賽程並提交，供補爬計畫比對。
+
+    Returns:
+        int: 新增或更新的比賽場數。
+    """
+    try:
+        recorded = sum(
+            1
+            for game_info in games_list
+            if games.record_season_schedule_game(db, game_info)
+        )
+        db.commit()
+    except Exception as e:
+        logger.error(f"更新整季賽程時失敗: {e}", exc_info=True)
+        db.rollback()
+        raise
+    logger.info(f"已將 {recorded} 場比賽寫入整季賽程。")
+    return recorded
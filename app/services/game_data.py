@@ -1,9 +1,16 @@
 # app/services/game_data.py
 
+import contextlib
 import datetime
+import hashlib
+import json
 import time
 import logging
-from typing import Dict, List, Optional
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
 
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 
@@ -11,12 +18,19 @@ from app.models import AtBatResultType
 from app.utils.parsing_helpers import is_formal_pa, map_result_short_to_type
 
 from app.config import settings
-from app.core import fetcher
-from app.parsers import box_score, live, schedule, season_stats
+from app import page_archive
+from app.core import box_api, fetcher
+from app.parsers import box_data, box_score, live, schedule, season_stats
 from app.db import SessionLocal
 from app.exceptions import ScraperError
-from app.browser import get_page
-from app.services import player as player_service, data_persistence
+from app.browser import (
+    get_browser,
+    get_page,
+    get_subtree_html,
+    measure_page_load,
+    new_context_page,
+)
+from app.services import crawl_planner, player as player_service, data_persistence
 from app.services.browser_operator import BrowserOperator
 from app.services.game_state_machine import GameStateMachine
 
@@ -33,12 +47,19 @@ def _scrape_and_store_batting_stats(
     """抓取並儲存球季打擊數據，並觸發生涯數據更新。"""
     logger.info("--- (1/2) 開始抓取球季累積打擊數據 ---")
     try:
-        page.goto(team_stats_url, wait_until="networkidle")
-        page.wait_for_selector("div.RecordTable", timeout=15000)
-        html_content = page.content()
+        with measure_page_load(page, "team_stats"):
+            page.goto(team_stats_url, wait_until="networkidle")
+            page.wait_for_selector("div.RecordTable", timeout=15000)
+        html_content = get_subtree_html(page, season_stats.FRAGMENT_SELECTORS)
     except PlaywrightTimeoutError:
         logger.error("等待打擊數據表格時超時，無法抓取打擊數據。")
         return
+    page_archive.archive_page(
+        page_archive.TEAM_BATTING,
+        settings.TARGET_TEAM_NAME,
+        html_content,
+        url=team_stats_url,
+    )
 
     season_stats_list = season_stats.parse_season_batting_stats_page(html_content)
     if not season_stats_list:
@@ -105,8 +126,9 @@ def _scrape_and_store_fielding_stats(
     logger.info("--- (2/2) 開始抓取球季累積守備數據--- ")
     try:
         # 1. 選擇「守備成績」
-        page.goto(team_stats_url, wait_until="networkidle")
-        page.wait_for_selector("div.RecordTable", timeout=15000)
+        with measure_page_load(page, "team_stats"):
+            page.goto(team_stats_url, wait_until="networkidle")
+            page.wait_for_selector("div.RecordTable", timeout=15000)
         page.select_option("#Position", "03")
         # 2. 點擊「查詢」按鈕
         page.click('input[value="查詢"]')
@@ -115,7 +137,7 @@ def _scrape_and_store_fielding_stats(
         #    當守備數據表格載入後，其標頭 "刺殺" 必定會出現。
         page.wait_for_selector('th:has-text("守備位置")', timeout=15000)
 
-        html_content = page.content()
+        html_content = get_subtree_html(page, season_stats.FRAGMENT_SELECTORS)
     except PlaywrightTimeoutError as e:
         logger.error(
             f"等待守備數據表格時超時或互動失敗，無法抓取守備數據。{e}", exc_info=True
@@ -124,6 +146,12 @@ def _scrape_and_store_fielding_stats(
     except Exception as e:
         logger.error(f"抓取守備數據時發生未預期的瀏覽器錯誤: {e}", exc_info=True)
         return
+    page_archive.archive_page(
+        page_archive.TEAM_FIELDING,
+        settings.TARGET_TEAM_NAME,
+        html_content,
+        url=team_stats_url,
+    )
 
     fielding_stats_list = season_stats.parse_season_fielding_stats_page(html_content)
     if not fielding_stats_list:
@@ -146,12 +174,65 @@ def _scrape_and_store_fielding_stats(
     logger.info("--- 球季累積守備數據抓取完畢 ---")
 
 
+def _scrape_and_store_league_batting_stats(page: Page):
+    """
+    [新增] 抓取目標球隊以外各隊的球季打擊數據，供全聯盟排行榜使用。
+
+    僅更新球季累積數據 (不觸發生涯數據更新)；各隊數據收集完畢後一次寫入，
+    排行榜也只需在這次寫入時重算一次。
+    """
+    logger.info("--- 開始抓取其他球隊的球季累積打擊數據 ---")
+    league_stats_list = []
+    for team_name, club_no in settings.TEAM_CLUB_CODES.items():
+        if team_name == settings.TARGET_TEAM_NAME:
+            continue
+        team_stats_url = f"{settings.TEAM_SCORE_URL}?ClubNo={club_no}"
+        try:
+            with measure_page_load(page, "team_stats"):
+                page.goto(team_stats_url, wait_until="networkidle")
+                page.wait_for_selector("div.RecordTable", timeout=15000)
+            html_content = get_subtree_html(page, season_stats.FRAGMENT_SELECTORS)
+        except PlaywrightTimeoutError:
+            logger.error(f"等待 [{team_name}] 打擊數據表格時超時，跳過此隊。")
+            continue
+        page_archive.archive_page(
+            page_archive.TEAM_BATTING, team_name, html_content, url=team_stats_url
+        )
+        league_stats_list.extend(
+            season_stats.parse_season_batting_stats_page(
+                html_content, team_name=team_name
+            )
+        )
+        time.sleep(settings.FRIENDLY_SCRAPING_DELAY)
+
+    if not league_stats_list:
+        logger.info("未解析到任何其他球隊的球季打擊數據。")
+        return
+
+    db = SessionLocal()
+    try:
+        from app.crud import players
+
+        players.store_player_season_stats_and_history(db, league_stats_list)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info(
+        f"--- 其他球隊的球季累積打擊數據抓取完畢，共 {len(league_stats_list)} 名球員 ---"
+    )
+
+
 # --- [T31-3 重構] 主要爬蟲協調函式 ---
 
 
 def scrape_and_store_season_stats(update_career_stats_for_all: bool = False):
     """
     [協調函式] 抓取並儲存目標球隊的球季累積數據 (包含打擊與守備)。
+    [修改] 另外抓取其他球隊的打擊數據，供全聯盟排行榜使用。
 
     Args:
         update_career_stats_for_all (bool):
@@ -178,6 +259,9 @@ def scrape_and_store_season_stats(update_career_stats_for_all: bool = False):
             # 任務二：在同一個 page 中，接續抓取守備數據
             _scrape_and_store_fielding_stats(page, team_stats_url)
 
+            # 任務三：[新增] 抓取其他球隊的打擊數據，讓排行榜涵蓋全聯盟
+            _scrape_and_store_league_batting_stats(page)
+
     except Exception as e:
         logger.error(f"執行球季數據抓取主流程時發生嚴重錯誤: {e}", exc_info=True)
         # 確保在發生不可預期的錯誤時，也能記錄下來
@@ -185,10 +269,38 @@ def scrape_and_store_season_stats(update_career_stats_for_all: bool = False):
     logger.info("--- 球季數據 (打擊與守備) 完整抓取流程結束 ---")
 
 
+def _record_team_standings(games_to_process: List[dict]):
+    """更新戰績帳本；失敗時只記錄警告，不影響後續的逐場資料處理。"""
+    db = SessionLocal()
+    try:
+        data_persistence.record_team_standings(db, games_to_process)
+    except Exception as e:
+        logger.warning(f"更新戰績帳本失敗，將於下次爬蟲時補上: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def _record_season_schedule(games_to_process: List[dict]):
+    """[新增] 更新整季賽程；失敗時只記錄警告，不影響後續的逐場資料處理。"""
+    db = SessionLocal()
+    try:
+        data_persistence.record_season_schedule(db, games_to_process)
+    except Exception as e:
+        logger.warning(f"更新整季賽程失敗，將於下次爬蟲時補上: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
 def _process_filtered_games(
-    games_to_process: List[dict], target_teams: Optional[List[str]] = None
+    games_to_process: List[dict],
+    target_teams: Optional[List[str]] = None,
+    force: bool = False,
 ):
-    """處理比賽列表，並可選擇性地只處理指定球隊的比賽。"""
+    """
+    處理比賽列表，並可選擇性地只處理指定球隊的比賽。
+
+    [新增] force 為 True 時不比對內容指紋，一律重寫。
+    """
     if not games_to_process:
         return
     logger.info(f"準備處理 {len(games_to_process)} 場比賽...")
@@ -250,134 +362,433 @@ def _process_filtered_games(
                 db.close()
         return
 
-    with get_page(headless=False) as page:
-        browser_operator = BrowserOperator(page)
+    # [新增] 賽程中所有已完成的比賽都寫入戰績帳本，包含非目標球隊的比賽
+    _record_team_standings(games_to_process)
+    # [新增] 所有比賽也寫入整季賽程，供補爬計畫比對
+    _record_season_schedule(games_to_process)
+
+    # [修改] 先篩選出目標球隊的比賽，再依設定逐場或平行處理
+    if target_teams:
+        games_to_process = [
+            game_info
+            for game_info in games_to_process
+            if any(
+                team in target_teams
+                for team in [game_info.get("home_team"), game_info.get("away_team")]
+            )
+        ]
 
+    concurrency = min(settings.GAME_PROCESSING_CONCURRENCY, len(games_to_process))
+    if concurrency > 1:
+        _log_game_outcomes(
+            _process_games_concurrently(
+                games_to_process, target_teams, concurrency, force
+            )
+        )
+        return
+
+    # [修改] 頁面延遲到第一次需要時才開啟，HTTP 模式全部成功時不會啟動瀏覽器
+    outcomes: Counter = Counter()
+    with contextlib.closing(
+        _LazyBrowserOperator(lambda: get_page(headless=False))
+    ) as browser_operator:
         for game_info in games_to_process:
-            db = SessionLocal()
+            outcomes[
+                _process_single_game(browser_operator, game_info, target_teams, force)
+            ] += 1
+    _log_game_outcomes(outcomes)
+
+
+def _log_game_outcomes(outcomes: Counter):
+    """[新增] 記錄本次重寫與因內容未變動而略過的比賽數。"""
+    logger.info(
+        f"比賽處理完成：重寫 {outcomes[GAME_REWRITTEN]} 場，"
+        f"內容未變動而略過 {outcomes[GAME_SKIPPED]} 場。"
+    )
+
+
+def _process_games_concurrently(
+    games_to_process: List[dict],
+    target_teams: Optional[List[str]],
+    concurrency: int,
+    force: bool = False,
+) -> Counter:
+    """
+    [新增] 以 concurrency 個執行緒平行處理比賽。
+
+    Playwright 的同步 API 不可跨執行緒共用，因此每個執行緒各自啟動一個瀏覽器，
+    並從共用佇列依序取出比賽；每場比賽使用獨立的瀏覽器 context 與資料庫 session，
+    維持逐場提交 / 復原的交易語意。對 cpbl.com.tw 的請求間隔由 rate_limiter 統一控管。
+    任一場比賽失敗時，其他執行緒處理完手上的比賽後即停止，並重新拋出第一個錯誤。
+    全部成功時回傳各處理結果的場數。
+    """
+    logger.info(f"以 {concurrency} 個瀏覽器平行處理 {len(games_to_process)} 場比賽...")
+    game_queue: "queue.SimpleQueue[dict]" = queue.SimpleQueue()
+    for game_info in games_to_process:
+        game_queue.put(game_info)
+    stop_event = threading.Event()
+
+    def worker() -> Counter:
+        outcomes: Counter = Counter()
+        with contextlib.ExitStack() as browser_stack:
+            browsers = []
+
+            def open_page():
+                # [修改] 瀏覽器延遲到此執行緒第一次需要頁面時才啟動
+                if not browsers:
+                    browsers.append(
+                        browser_stack.enter_context(get_browser(headless=False))
+                    )
+                return new_context_page(browsers[0])
+
+            while not stop_event.is_set():
+                try:
+                    game_info = game_queue.get_nowait()
+                except queue.Empty:
+                    break
+                with contextlib.closing(
+                    _LazyBrowserOperator(open_page)
+                ) as browser_operator:
+                    outcomes[
+                        _process_single_game(
+                            browser_operator, game_info, target_teams, force
+                        )
+                    ] += 1
+        return outcomes
+
+    errors = []
+    outcomes: Counter = Counter()
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="game-worker"
+    ) as executor:
+        futures = [executor.submit(worker) for _ in range(concurrency)]
+        for future in as_completed(futures):
             try:
-                if target_teams and not any(
-                    team in target_teams
-                    for team in [game_info.get("home_team"), game_info.get("away_team")]
-                ):
-                    continue
+                outcomes.update(future.result())
+            except Exception as e:
+                stop_event.set()
+                errors.append(e)
+    if errors:
+        raise errors[0]
+    return outcomes
 
-                logger.info(f"處理比賽 (CPBL ID: {game_info.get('cpbl_game_id')})...")
 
-                # 預先處理日期物件，供後續使用
-                game_info["game_date_obj"] = datetime.datetime.strptime(
-                    game_info["game_date"], "%Y-%m-%d"
-                ).date()
+class _LazyBrowserOperator:
+    """
+    [新增] 第一次使用時才開啟頁面的 BrowserOperator 代理。
 
-                # [重構] 透過 DataPersistence 服務處理資料庫準備
-                game_id_in_db = data_persistence.prepare_game_storage(db, game_info)
-                if not game_id_in_db:
-                    continue
+    GAME_DATA_FETCH_MODE 為 "http" 時，只有退回瀏覽器模式的比賽才需要頁面。
+    """
 
-                box_score_url = game_info.get("box_score_url")
-                if not box_score_url:
-                    continue
+    def __init__(self, open_page: Callable[[], ContextManager[Page]]):
+        self._open_page = open_page
+        self._stack = contextlib.ExitStack()
+        self._operator: Optional[BrowserOperator] = None
 
-                box_score_html = browser_operator.navigate_and_get_box_score_content(
-                    box_score_url
-                )
-                all_players_data = box_score.parse_box_score_page(
-                    box_score_html, target_teams=target_teams
-                )
-                if not all_players_data:
-                    continue
+    def __getattr__(self, name):
+        if self._operator is None:
+            page = self._stack.enter_context(self._open_page())
+            self._operator = BrowserOperator(page)
+        return getattr(self._operator, name)
 
-                live_url = box_score_url.replace("/box?", "/box/live?")
-                all_half_innings_html = browser_operator.extract_live_events_html(
-                    live_url
-                )
+    def close(self):
+        self._stack.close()
+        self._operator = None
+
+
+def _fetch_game_via_http(
+    box_score_url: str, target_teams: Optional[List[str]], archive_key: str
+) -> Optional[Tuple[Dict[str, Any], List[dict], List[Tuple[Any, int, str, Callable]]]]:
+    """
+    [新增] 直接呼叫資料端點取得 Box Score 與各半局的文字轉播資料。
+
+    Returns:
+        成功時回傳 (原始回應, 球員數據列表, 半局資料列表)，後兩者格式與瀏覽器模式相同；
+        任何錯誤或沒有取得球員數據時回傳 None，由呼叫端退回瀏覽器模式。
+    """
+    try:
+        data = box_api.fetch_game_data(box_score_url)
+        page_archive.archive_page(
+            page_archive.BOX_API, archive_key, data, url=box_score_url
+        )
+        all_players_data = box_data.parse_box_score_data(
+            data, target_teams=target_teams
+        )
+        if not all_players_data:
+            logger.warning("資料端點未取得任何球員數據，改用瀏覽器模式。")
+            return None
+        half_innings = [
+            (raw_events, inning_num, selector, live.parse_extracted_events)
+            for raw_events, inning_num, selector in box_data.parse_live_log_data(data)
+        ]
+        return data, all_players_data, half_innings
+    except Exception as e:
+        logger.warning(
+            f"透過資料端點取得比賽資料失敗，改用瀏覽器模式: {e}", exc_info=True
+        )
+        return None
+
+
+def _extract_live_half_innings(
+    browser_operator: BrowserOperator, live_url: str
+) -> List[Tuple[Any, int, str, Callable[[Any, int], List[dict]]]]:
+    """
+    [新增] 擷取文字轉播各半局的資料，並附上對應的解析函式。
+
+    LIVE_EVENTS_EXTRACTION 為 "evaluate" 時以單次 page.evaluate 擷取所有半局；
+    擷取失敗或沒有取得任何半局時，退回逐一點擊並擷取 HTML 的作法。
+    """
+    if settings.LIVE_EVENTS_EXTRACTION == "evaluate":
+        try:
+            extracted = browser_operator.extract_live_events(live_url)
+            if extracted:
+                return [
+                    (raw_events, inning_num, selector, live.parse_extracted_events)
+                    for raw_events, inning_num, selector in extracted
+                ]
+            logger.warning("單次擷取未取得任何半局資料，改用逐一點擊模式。")
+        except Exception as e:
+            logger.warning(
+                f"單次擷取文字轉播失敗，改用逐一點擊模式: {e}", exc_info=True
+            )
+
+    return [
+        (inning_html, inning_num, selector, live.parse_active_inning_details)
+        for inning_html, inning_num, selector in (
+            browser_operator.extract_live_events_html(live_url)
+        )
+    ]
+
+
+def build_player_game_data(
+    all_players_data: List[dict],
+    all_half_innings: List[Tuple[Any, int, str, Callable[[Any, int], List[dict]]]],
+    game_info: dict,
+    target_teams: Optional[List[str]],
+) -> List[dict]:
+    """
+    [重構] 解析各半局的文字轉播，經狀態機補上壘包與出局狀態後，
+    與 Box Score 的打席結果簡稱逐一對應，組成待寫入的球員逐場資料。
+
+    不涉及瀏覽器或資料庫，爬蟲與離線重新解析 (scripts/reparse.py) 共用。
+    """
+    full_game_events = []
+    for (
+        half_inning_payload,
+        inning_num,
+        half_inning_selector,
+        parse_half_inning,
+    ) in all_half_innings:
+        batting_team = (
+            game_info["away_team"]
+            if half_inning_selector == "section.top"
+            else game_info["home_team"]
+        )
 
-                full_game_events = []
-                for (
-                    inning_html,
-                    inning_num,
-                    half_inning_selector,
-                ) in all_half_innings_html:
-                    batting_team = (
-                        game_info["away_team"]
-                        if half_inning_selector == "section.top"
-                        else game_info["home_team"]
+        if not target_teams or batting_team in target_teams:
+            parsed_events = parse_half_inning(half_inning_payload, inning_num)
+            full_game_events.extend(parsed_events)
+
+    state_machine = GameStateMachine(all_players_data)
+    all_at_bats_details_enriched = state_machine.enrich_events_with_state(
+        full_game_events
+    )
+
+    player_data_map = {p["summary"]["player_name"]: p for p in all_players_data}
+
+    for player_name, p_data in player_data_map.items():
+        p_data["at_bats_details"] = []
+        p_data["box_score_iterator"] = iter(p_data.get("at_bats_list", []))
+
+    for live_event in all_at_bats_details_enriched:
+        hitter_name = live_event.get("hitter_name")
+
+        if hitter_name and hitter_name in player_data_map:
+            player_data = player_data_map[hitter_name]
+            description = live_event.get("description", "")
+
+            if is_formal_pa(description):
+                try:
+                    result_short_from_box = next(player_data["box_score_iterator"])
+                    live_event["result_short"] = result_short_from_box
+
+                    mapped_type = map_result_short_to_type(result_short_from_box)
+                    if mapped_type:
+                        live_event["result_type"] = mapped_type
+
+                except StopIteration:
+                    logger.warning(
+                        f"資料不一致：球員 [{hitter_name}] 的 Live Text 事件比 Box Score 打席數多。"
                     )
+                    live_event["result_short"] = "未知"
+            else:
+                live_event["result_short"] = "無"
+                live_event["result_type"] = AtBatResultType.INCOMPLETE_PA
 
-                    if not target_teams or batting_team in target_teams:
-                        parsed_events = live.parse_active_inning_details(
-                            inning_html, inning_num
-                        )
-                        full_game_events.extend(parsed_events)
+            player_data["at_bats_details"].append(live_event)
 
-                state_machine = GameStateMachine(all_players_data)
-                all_at_bats_details_enriched = state_machine.enrich_events_with_state(
-                    full_game_events
-                )
+    final_player_data_list = list(player_data_map.values())
+    for p_data in final_player_data_list:
+        if "box_score_iterator" in p_data:
+            del p_data["box_score_iterator"]
+    return final_player_data_list
 
-                player_data_map = {
-                    p["summary"]["player_name"]: p for p in all_players_data
-                }
-
-                for player_name, p_data in player_data_map.items():
-                    p_data["at_bats_details"] = []
-                    p_data["box_score_iterator"] = iter(p_data.get("at_bats_list", []))
-
-                for live_event in all_at_bats_details_enriched:
-                    hitter_name = live_event.get("hitter_name")
-
-                    if hitter_name and hitter_name in player_data_map:
-                        player_data = player_data_map[hitter_name]
-                        description = live_event.get("description", "")
-
-                        if is_formal_pa(description):
-                            try:
-                                result_short_from_box = next(
-                                    player_data["box_score_iterator"]
-                                )
-                                live_event["result_short"] = result_short_from_box
-
-                                mapped_type = map_result_short_to_type(
-                                    result_short_from_box
-                                )
-                                if mapped_type:
-                                    live_event["result_type"] = mapped_type
-
-                            except StopIteration:
-                                logger.warning(
-                                    f"資料不一致：球員 [{hitter_name}] 的 Live Text 事件比 Box Score 打席數多。"
-                                )
-                                live_event["result_short"] = "未知"
-                        else:
-                            live_event["result_short"] = "無"
-                            live_event["result_type"] = AtBatResultType.INCOMPLETE_PA
-
-                        player_data["at_bats_details"].append(live_event)
-
-                final_player_data_list = list(player_data_map.values())
-                for p_data in final_player_data_list:
-                    if "box_score_iterator" in p_data:
-                        del p_data["box_score_iterator"]
-
-                # [重構] 透過 DataPersistence 服務儲存最終資料
-                data_persistence.commit_player_game_data(
-                    db, game_id_in_db, final_player_data_list
-                )
-                db.commit()
-                logger.info(
-                    f"成功提交比賽 {game_info.get('cpbl_game_id')} 的所有資料到資料庫。"
-                )
 
-            except Exception:
-                logger.error(
-                    f"處理比賽 {game_info.get('cpbl_game_id')} 時發生錯誤，將復原此比賽的所有變更。",
-                    exc_info=True,
+# [新增] _process_single_game 的處理結果，供統計略過與重寫的比賽數
+GAME_REWRITTEN = "rewritten"
+GAME_SKIPPED = "skipped"
+
+# [新增] 納入內容指紋的賽程欄位，比分或狀態等變動時即使 Box Score 相同也會重寫
+_FINGERPRINT_SCHEDULE_FIELDS = (
+    "game_time",
+    "home_team",
+    "away_team",
+    "home_score",
+    "away_score",
+    "venue",
+    "status",
+)
+
+
+# [新增] 解析器與寫入格式的版本；修改解析器、GameStateMachine 或逐場資料的結構時
+# 請遞增此值，讓所有已完成比賽的指紋失效並在下次爬取時重寫
+GAME_DATA_PARSER_VERSION = 1
+
+
+def _content_fingerprint(
+    game_info: dict, box_content: Any, target_teams: Optional[List[str]] = None
+) -> str:
+    """
+    [新增] 以賽程資訊與 Box Score 內容 (頁面片段 HTML 或資料端點回應) 計算比賽的內容指紋。
+
+    資料端點的回應同時包含文字轉播，因此 HTTP 模式的指紋也涵蓋各半局的內容。
+    [修正] 指紋同時涵蓋目標球隊與 GAME_DATA_PARSER_VERSION，變更設定或解析器後會重寫。
+    """
+    fingerprint_fields = {
+        field: game_info.get(field) for field in _FINGERPRINT_SCHEDULE_FIELDS
+    }
+    fingerprint_fields["target_teams"] = sorted(target_teams or [])
+    fingerprint_fields["parser_version"] = GAME_DATA_PARSER_VERSION
+    digest = hashlib.sha256(
+        json.dumps(fingerprint_fields, ensure_ascii=False, sort_keys=True).encode(
+            "utf-8"
+        )
+    )
+    if isinstance(box_content, str):
+        digest.update(box_content.encode("utf-8"))
+    else:
+        digest.update(
+            json.dumps(box_content, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def _process_single_game(
+    browser_operator: BrowserOperator,
+    game_info: dict,
+    target_teams: Optional[List[str]],
+    force: bool = False,
+) -> Optional[str]:
+    """
+    [重構] 抓取並儲存單場比賽，使用獨立的資料庫 session，失敗時復原此場的所有變更。
+
+    [修改] 先取得 Box Score 並計算內容指紋；資料庫中已完成的同一場比賽指紋相同時，
+    略過文字轉播的擷取與資料庫重寫。force 為 True 時一律重寫。
+
+    Returns:
+        Optional[str]: GAME_REWRITTEN 或 GAME_SKIPPED；沒有可寫入的資料時回傳 None。
+    """
+    db = SessionLocal()
+    try:
+        logger.info(f"處理比賽 (CPBL ID: {game_info.get('cpbl_game_id')})...")
+
+        # 預先處理日期物件，供後續使用
+        game_info["game_date_obj"] = datetime.datetime.strptime(
+            game_info["game_date"], "%Y-%m-%d"
+        ).date()
+
+        box_score_url = game_info.get("box_score_url")
+        if not box_score_url:
+            return None
+
+        archive_key = page_archive.game_key(game_info)
+        fetched = (
+            _fetch_game_via_http(box_score_url, target_teams, archive_key)
+            if settings.GAME_DATA_FETCH_MODE == "http"
+            else None
+        )
+        if fetched:
+            box_content, all_players_data, all_half_innings = fetched
+        else:
+            box_content = browser_operator.navigate_and_get_box_score_content(
+                box_score_url
+            )
+            page_archive.archive_page(
+                page_archive.BOX_SCORE, archive_key, box_content, url=box_score_url
+            )
+
+        fingerprint = _content_fingerprint(game_info, box_content, target_teams)
+        if (
+            not force
+            and data_persistence.get_stored_fingerprint(db, game_info, target_teams)
+            == fingerprint
+        ):
+            logger.info(
+                f"比賽 {game_info.get('cpbl_game_id')} 已完成且內容未變動，略過重寫。"
+            )
+            return GAME_SKIPPED
+        # 只有已完成的比賽內容不再變動，才記錄指紋供下次比對
+        game_info["content_fingerprint"] = (
+            fingerprint if game_info.get("status") == "已完成" else None
+        )
+
+        # [重構] 透過 DataPersistence 服務處理資料庫準備
+        game_id_in_db = data_persistence.prepare_game_storage(db, game_info)
+        if not game_id_in_db:
+            return None
+
+        if not fetched:
+            all_players_data = box_score.parse_box_score_page(
+                box_content, target_teams=target_teams
+            )
+            if not all_players_data:
+                return None
+
+            live_url = box_score_url.replace("/box?", "/box/live?")
+            all_half_innings = _extract_live_half_innings(browser_operator, live_url)
+            for payload, inning_num, selector, _ in all_half_innings:
+                page_archive.archive_page(
+                    page_archive.LIVE,
+                    archive_key,
+                    payload,
+                    url=live_url,
+                    part=page_archive.live_part(inning_num, selector),
                 )
-                db.rollback()
-                raise
-            finally:
-                if db:
-                    db.close()
+
+        final_player_data_list = build_player_game_data(
+            all_players_data, all_half_innings, game_info, target_teams
+        )
+
+        # [重構] 透過 DataPersistence 服務儲存最終資料
+        data_persistence.commit_player_game_data(
+            db, game_id_in_db, final_player_data_list
+        )
+        db.commit()
+        logger.info(
+            f"成功提交比賽 {game_info.get('cpbl_game_id')} 的所有資料到資料庫。"
+        )
+        return GAME_REWRITTEN
+
+    except Exception:
+        logger.error(
+            f"處理比賽 {game_info.get('cpbl_game_id')} 時發生錯誤，將復原此比賽的所有變更。",
+            exc_info=True,
+        )
+        db.rollback()
+        raise
+    finally:
+        if db:
+            db.close()
 
 
 # --- 主功能函式 ---
@@ -482,3 +893,114 @@ def scrape_entire_year(year_str=None):
         logger.info(f"處理完 {year_to_scrape}-{month:02d}，稍作等待...")
         time.sleep(settings.FRIENDLY_SCRAPING_DELAY)
     logger.info("--- [逐年模式] 執行完畢 ---")
+
+
+def _fetch_schedule_months(year: int, months) -> List[dict]:
+    """[新增] 依序抓取並解析指定月份的賽程頁；單月失敗時略過該月份。"""
+    season_games: List[dict] = []
+    for month in sorted(months):
+        try:
+            html_content = fetcher.fetch_schedule_page(year, month)
+            season_games.extend(schedule.parse_schedule_page(html_content, year))
+        except ScraperError:
+            logger.error(
+                f"抓取月份 {year}-{month:02d} 的賽程時發生爬蟲錯誤，已跳過此月份。",
+                exc_info=True,
+            )
+        time.sleep(settings.FRIENDLY_SCRAPING_DELAY)
+    return season_games
+
+
+def scrape_planned_games(year_str=None) -> int:
+    """
+    【功能四】依補爬計畫只抓取缺少、狀態未完成或目標球隊沒有打席紀錄的比賽。
+
+    [修正] 以資料庫中的整季賽程 (season_schedule_games) 產生計畫 (crawl_planner)，
+    只抓取含有計畫中或狀態尚未確定之比賽的月份賽程頁；整季賽程過期
+    (超過 SEASON_SCHEDULE_REFRESH_HOURS 未更新) 時才重新抓取整季。
+    計畫中的比賽一律重寫、不比對內容指紋。
+
+    Returns:
+        int: 計畫中需要處理的比賽數。
+    """
+    today = datetime.date.today()
+    year = int(year_str) if year_str else today.year
+    target_teams = settings.get_target_teams_as_list()
+    logger.info(f"--- 開始執行 [補爬計畫模式]，目標年份: {year} ---")
+
+    if year > today.year:
+        logger.warning(f"目標年份 {year} 是未來年份，任務中止。")
+        return 0
+
+    end_month = today.month if year == today.year else settings.CPBL_SEASON_END_MONTH
+    db = SessionLocal()
+    try:
+        if crawl_planner.schedule_is_stale(
+            db, year, datetime.timedelta(hours=settings.SEASON_SCHEDULE_REFRESH_HOURS)
+        ):
+            logger.info(f"{year} 年的整季賽程已過期，重新抓取整季賽程頁。")
+            months = set(range(settings.CPBL_SEASON_START_MONTH, end_month + 1))
+        else:
+            plan = crawl_planner.build_crawl_plan(db, year, target_teams, today)
+            months = {
+                int(game["game_date"][5:7]) for game in plan["games"]
+            } | crawl_planner.unresolved_months(db, year, today)
+    finally:
+        db.close()
+
+    season_games = _fetch_schedule_months(year, months)
+    if season_games:
+        _record_season_schedule(season_games)
+
+    db = SessionLocal()
+    try:
+        plan = crawl_planner.build_crawl_plan(db, year, target_teams, today)
+    finally:
+        db.close()
+
+    if not plan["games"]:
+        logger.info(f"--- [補爬計畫模式] {year} 年沒有需要處理的比賽，任務結束 ---")
+        return 0
+
+    # 延賽的比賽可能出現在多個日期，只處理計畫中 (最新) 日期的那一場
+    planned_keys = {(game["cpbl_game_id"], game["game_date"]) for game in plan["games"]}
+    _process_filtered_games(
+        [
+            game_info
+            for game_info in season_games
+            if (game_info.get("cpbl_game_id"), game_info.get("game_date"))
+            in planned_keys
+        ],
+        target_teams=target_teams,
+        force=True,
+    )
+    logger.info("--- [補爬計畫模式] 執行完畢 ---")
+    return plan["planned_games"]
+
+
+def backfill_season_standings(year: int) -> int:
+    """
+    [新增] 重新抓取指定賽季所有月份的賽程頁，回填整季賽程與戰績帳本 (全聯盟)。
+
+    戰績帳本只從開始記錄後的爬蟲累計，開始前的比賽需以此函式補上；
+    帳本寫入時會依日期重新累計，可重複執行。不處理逐場的球員資料。
+
+    Returns:
+        int: 賽程頁解析出的比賽場數。
+    """
+    today = datetime.date.today()
+    end_month = today.month if year == today.year else settings.CPBL_SEASON_END_MONTH
+    season_games = _fetch_schedule_months(
+        year, range(settings.CPBL_SEASON_START_MONTH, end_month + 1)
+    )
+    if not season_games:
+        logger.warning(f"{year} 年的賽程頁沒有解析到任何比賽，未回填戰績帳本。")
+        return 0
+
+    db = SessionLocal()
+    try:
+        data_persistence.record_season_schedule(db, season_games)
+        data_persistence.record_team_standings(db, season_games)
+    finally:
+        db.close()
+    return len(season_games)
@@ -5,6 +5,8 @@ from typing import Optional
 
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 
+from app import page_archive
+from app.browser import get_subtree_html, measure_page_load
 from app.db import SessionLocal
 from app.crud import players
 from app.parsers import player_career
@@ -32,12 +34,16 @@ def scrape_and_store_player_career_stats(
 
     try:
         # 使用傳入的 page 物件進行操作，而不是建立新的 fetcher
-        page.goto(player_url, wait_until="networkidle")
-        page.wait_for_selector("div.RecordTableWrap", timeout=15000)
-        html_content = page.content()
+        with measure_page_load(page, "player"):
+            page.goto(player_url, wait_until="networkidle")
+            page.wait_for_selector("div.RecordTableWrap", timeout=15000)
+        html_content = get_subtree_html(page, player_career.FRAGMENT_SELECTORS)
 
         if not html_content:
             raise FatalScraperError(f"無法從 {player_url} 獲取 HTML 內容。")
+        page_archive.archive_page(
+            page_archive.PLAYER_CAREER, player_name, html_content, url=player_url
+        )
 
         # 解析生涯數據
         career_stats = player_career.parse_player_career_page(html_content)
@@ -0,0 +1,152 @@
+# app/services/player_index.py
+
+import bisect
+import itertools
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+from pypinyin import Style, pinyin
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 注音聲調符號，比對時忽略
+_ZHUYIN_TONES = str.maketrans("", "", "ˊˇˋ˙")
+# 多音字的讀音組合上限，避免長名稱產生過多索引鍵
+MAX_READING_COMBINATIONS = 8
+
+
+def normalize_query(text: str) -> str:
+    """正規化搜尋字串：轉小寫、移除空白與注音聲調。"""
+    return "".join(text.lower().split()).translate(_ZHUYIN_TONES)
+
+
+def _readings(name: str, style: Style) -> List[Tuple[str, ...]]:
+    """回傳名稱每個字的讀音組合 (含多音字)，不帶聲調。"""
+    per_char = pinyin(name, style=style, heteronym=True, errors="default")
+    combos = itertools.islice(itertools.product(*per_char), MAX_READING_COMBINATIONS)
+    return [
+        tuple(syllable.lower().translate(_ZHUYIN_TONES) for syllable in combo)
+        for combo in combos
+    ]
+
+
+def search_keys(name: str) -> Set[str]:
+    """
+    產生一個球員名稱的所有搜尋鍵。
+
+    包含名稱本身及其後綴 (可用名字搜尋)、全拼、首字母與注音，
+    拼音與注音同樣取各音節起始的後綴，因此「bairong」、「br」、「ㄅㄞㄖㄨㄥ」皆可命中。
+    """
+    keys = set()
+    for style in (Style.NORMAL, Style.FIRST_LETTER, Style.BOPOMOFO):
+        for syllables in _readings(name, style):
+            keys.update("".join(syllables[i:]) for i in range(len(syllables)))
+    keys.update(normalize_query(name[i:]) for i in range(len(name)))
+    keys.discard("")
+    return keys
+
+
+class PlayerNameIndex:
+    """以排序陣列儲存「搜尋鍵 -> 球員名稱」，透過二分搜尋做前綴比對。"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names = frozenset(name for name in names if name)
+        entries = sorted(
+            (key, name) for name in self.names for key in search_keys(name)
+        )
+        self._keys = [key for key, _ in entries]
+        self._entry_names = [name for _, name in entries]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        回傳搜尋鍵以查詢字串開頭的球員名稱。
+
+        完全相符者優先，其次為名稱以查詢字串開頭者，其餘依名稱長度與字典序排列。
+        """
+        key = normalize_query(query)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_left(self._keys, key + "\U0010ffff")
+        matches = set(self._entry_names[start:end])
+        ranked = sorted(
+            matches,
+            key=lambda name: (
+                name != query,
+                not name.startswith(query),
+                len(name),
+                name,
+            ),
+        )
+        return ranked[:limit]
+
+
+# 行程內的索引與其對應的資料版本 (players 表的筆數與最大 id)
+_index: Optional[PlayerNameIndex] = None
+_version: Optional[Tuple[int, Optional[int]]] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def invalidate() -> None:
+    """捨棄目前的索引，下一次使用時重新載入。"""
+    global _index, _version, _checked_at
+    with _lock:
+        _index, _version, _checked_at = None, None, 0.0
+
+
+def _data_version(db: Session) -> Tuple[int, Optional[int]]:
+    row = db.execute(
+        select(func.count(models.PlayerDB.id), func.max(models.PlayerDB.id))
+    ).one()
+    return (row[0], row[1])
+
+
+def get_player_index(db: Session, force_check: bool = False) -> PlayerNameIndex:
+    """
+    取得行程內的球員名稱索引。
+
+    每隔 PLAYER_INDEX_REFRESH_SECONDS 秒 (或 force_check 時) 檢查一次資料版本，
+    版本改變才重新從 players 表載入名稱。
+    """
+    global _index, _version, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if (
+            _index is not None
+            and not force_check
+            and now - _checked_at < settings.PLAYER_INDEX_REFRESH_SECONDS
+        ):
+            return _index
+        version = _data_version(db)
+        if _index is None or version != _version:
+            names = db.scalars(select(models.PlayerDB.name)).all()
+            _index = PlayerNameIndex(names)
+            _version = version
+            logger.info(f"已重新載入球員名稱索引，共 {len(_index)} 位球員。")
+        _checked_at = now
+        return _index
+
+
+def is_known_player(db: Session, name: str) -> bool:
+    """
+    檢查球員名稱是否存在。
+
+    索引中查無時會強制檢查一次資料版本，確保剛寫入的新球員不會被誤判為不存在。
+    """
+    if name in get_player_index(db):
+        return True
+    return name in get_player_index(db, force_check=True)
@@ -0,0 +1,240 @@
+# app/services/read_snapshot.py
+
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import zstandard
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app import models
+from app.config import settings
+from app.db import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 匯出至唯讀快照的資料表，依外鍵相依順序排列
+READ_MODEL_TABLES = tuple(
+    model.__table__
+    for model in (
+        models.TeamDB,
+        models.PlayerDB,
+        models.GameSchedule,
+        # [修正] 戰績排行以整季賽程判斷帳本是否完整
+        models.SeasonScheduleGameDB,
+        models.GameResultDB,
+        models.GameDetailDocumentDB,
+        models.PlayerGameSummaryDB,
+        models.PlayerGamePositionDB,
+        models.AtBatDetailDB,
+        models.PlayerSeasonStatsDB,
+        models.PlayerSeasonStatsHistoryDB,
+        models.PlayerCareerStatsDB,
+        models.PlayerFieldingStatsDB,
+        models.DashboardSnapshotDB,
+        models.TeamGameStandingDB,
+        models.PlayerLeaderboardDB,
+        models.PlayerAdvancedStatsDB,
+        models.LeagueBattingConstantsDB,
+        # [修正] 「連線」分析會讀取打席欄式快照，唯讀模式下也必須能查到
+        models.AtBatColumnSnapshotDB,
+    )
+)
+
+# 從 PostgreSQL 串流讀取與寫入 SQLite 的批次大小
+EXPORT_BATCH_SIZE = 5000
+
+
+def _local_path(version: str) -> Path:
+    """版本對應的本機快照檔：<READ_SNAPSHOT_PATH 主檔名>.<版本><副檔名>。"""
+    base = Path(settings.READ_SNAPSHOT_PATH)
+    return base.with_name(f"{base.stem}.{version}{base.suffix}")
+
+
+def _build_sqlite(db: Session, target: Path) -> dict:
+    """將唯讀端點使用的資料表寫入一個含索引的 SQLite 檔案，回傳各表筆數。"""
+    snapshot_engine = create_engine(f"sqlite:///{target}", poolclass=NullPool)
+    try:
+        Base.metadata.create_all(snapshot_engine, tables=READ_MODEL_TABLES)
+        row_counts = {}
+        with snapshot_engine.begin() as conn:
+            for table in READ_MODEL_TABLES:
+                result = db.execute(
+                    select(table).execution_options(yield_per=EXPORT_BATCH_SIZE)
+                ).mappings()
+                row_counts[table.name] = 0
+                for batch in result.partitions():
+                    conn.execute(table.insert(), [dict(row) for row in batch])
+                    row_counts[table.name] += len(batch)
+        with snapshot_engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("VACUUM")
+    finally:
+        snapshot_engine.dispose()
+    return row_counts
+
+
+def export_read_snapshot(db: Session) -> str:
+    """
+    將唯讀端點使用的資料表匯出為 SQLite 快照，壓縮後寫入資料庫並提交，回傳版本名稱。
+
+    [修正] 快照改存放於資料庫 (read_snapshots)，web 與 worker 不需共用檔案系統；
+    web 端以 sync_read_snapshot 下載。讀取端可能仍在使用的上一個版本會保留。
+    """
+    version = str(time.time_ns())
+    temp = _local_path(version).with_suffix(f".{os.getpid()}.tmp")
+    temp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        row_counts = _build_sqlite(db, temp)
+        raw = temp.read_bytes()
+    finally:
+        temp.unlink(missing_ok=True)
+
+    compressed = zstandard.ZstdCompressor().compress(raw)
+    db.add(models.ReadSnapshotDB(version=version, size=len(raw), content=compressed))
+    db.flush()
+    keep_ids = db.scalars(
+        select(models.ReadSnapshotDB.id)
+        .order_by(models.ReadSnapshotDB.id.desc())
+        .limit(2)
+    ).all()
+    db.query(models.ReadSnapshotDB).filter(
+        models.ReadSnapshotDB.id.not_in(keep_ids)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    logger.info(
+        f"已匯出唯讀 SQLite 快照 ({version})，共 {sum(row_counts.values())} 筆資料，"
+        f"壓縮後 {len(compressed) / 1024:.0f} KB。"
+    )
+    return version
+
+
+# --- 下載 (web) ---
+
+# 行程內目前使用的本機快照；由背景執行緒更新，請求路徑只讀取此值，不會連線 PostgreSQL
+_current_path: Optional[Path] = None
+_sync_lock = threading.Lock()
+_refresh_requested = threading.Event()
+_stop_requested = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def current_snapshot_path() -> Optional[Path]:
+    """
+    [新增] 回傳目前可用的本機快照檔；尚未取得快照或檔案已被移除時回傳 None。
+
+    只讀取行程內的狀態與本機檔案，不會連線資料庫或下載快照。
+    """
+    path = _current_path
+    if path is None or not path.exists():
+        return None
+    return path
+
+
+def invalidate() -> None:
+    """請背景執行緒立即檢查資料庫中的快照版本。"""
+    _refresh_requested.set()
+
+
+def _local_versions() -> List[Path]:
+    """本機已下載的快照檔，依版本由新到舊排列。"""
+    base = Path(settings.READ_SNAPSHOT_PATH)
+    if not base.parent.is_dir():
+        return []
+    versions = []
+    for path in base.parent.glob(f"{base.stem}.*{base.suffix}"):
+        version = path.name[len(base.stem) + 1 : -len(base.suffix) or None]
+        if version.isdigit():
+            versions.append((int(version), path))
+    return [path for _, path in sorted(versions, reverse=True)]
+
+
+def _download(db: Session, snapshot_id: int, target: Path) -> None:
+    """下載並解壓縮快照；先寫入暫存檔再原子替換，讀取端只會看到完整的檔案。"""
+    content = db.scalar(
+        select(models.ReadSnapshotDB.content).where(
+            models.ReadSnapshotDB.id == snapshot_id
+        )
+    )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp, "wb") as output:
+            zstandard.ZstdDecompressor().copy_stream(io.BytesIO(content), output)
+        os.replace(temp, target)
+    finally:
+        temp.unlink(missing_ok=True)
+
+    # 其他 web 行程可能仍在使用上一個版本，只清除更早的版本
+    for path in _local_versions()[2:]:
+        path.unlink(missing_ok=True)
+
+
+def sync_read_snapshot() -> Optional[Path]:
+    """
+    [新增] 檢查資料庫中的最新快照，本機尚未下載時下載後切換，回傳目前使用的快照檔。
+
+    由背景執行緒呼叫；下載完成前請求繼續使用本機現有的快照，
+    檢查或下載失敗時也保留目前的快照。
+    """
+    global _current_path
+    with _sync_lock:
+        db = SessionLocal()
+        try:
+            latest = db.execute(
+                select(models.ReadSnapshotDB.id, models.ReadSnapshotDB.version)
+                .order_by(models.ReadSnapshotDB.id.desc())
+                .limit(1)
+            ).first()
+            if latest is not None:
+                target = _local_path(latest.version)
+                if not target.exists():
+                    _download(db, latest.id, target)
+                    logger.info(f"已下載唯讀 SQLite 快照 ({latest.version})。")
+                _current_path = target
+        except Exception as e:
+            logger.warning(f"同步唯讀 SQLite 快照時發生錯誤: {e}", exc_info=True)
+        finally:
+            db.close()
+        return _current_path
+
+
+def _refresh_loop() -> None:
+    while not _stop_requested.is_set():
+        sync_read_snapshot()
+        _refresh_requested.wait(settings.READ_SNAPSHOT_REFRESH_SECONDS)
+        _refresh_requested.clear()
+
+
+def start_refresher() -> None:
+    """
+    [新增] web 啟動時呼叫：立即採用本機已有的最新快照 (例如保存在 volume 中的檔案)，
+    並啟動背景執行緒定期同步，冷啟動的第一個請求不需等待下載。
+    """
+    global _current_path, _refresher
+    local_versions = _local_versions()
+    _current_path = local_versions[0] if local_versions else None
+    _stop_requested.clear()
+    _refresher = threading.Thread(
+        target=_refresh_loop, name="read-snapshot-refresher", daemon=True
+    )
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """[新增] web 關閉時停止背景同步執行緒。"""
+    global _refresher
+    _stop_requested.set()
+    _refresh_requested.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+        _refresher = None
@@ -0,0 +1,194 @@
+# app/services/reparse.py
+
+import datetime
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models, page_archive
+from app.parsers import box_data, box_score, live
+from app.services import data_persistence
+from app.services.game_data import build_player_game_data
+
+logger = logging.getLogger(__name__)
+
+_GAME_PAGE_TYPES = (page_archive.BOX_SCORE, page_archive.BOX_API, page_archive.LIVE)
+
+
+# 每次從 page_blobs 載入內容的比賽數，避免一次將整個區間的封存讀入記憶體
+REPARSE_CHUNK_SIZE = 50
+
+
+def _load_blobs(db: Session, sha256s: Set[str]) -> Dict[str, bytes]:
+    if not sha256s:
+        return {}
+    return dict(
+        db.query(models.PageBlobDB.sha256, models.PageBlobDB.content)
+        .filter(models.PageBlobDB.sha256.in_(sha256s))
+        .all()
+    )
+
+
+def iter_reparse_jobs(
+    db: Session,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    chunk_size: int = REPARSE_CHUNK_SIZE,
+) -> Iterator[List[dict]]:
+    """
+    [新增] 讀取日期區間內每場比賽最新封存的 Box Score 與文字轉播，組成可交給子行程的工作。
+
+    同一場比賽同時有瀏覽器頁面 (box_score) 與資料端點 (box_api) 的封存時，
+    以較晚抓取的一方為準；沒有任何封存的比賽會被略過。
+    每個工作只包含基本型別與壓縮後的位元組，可直接序列化傳給子行程。
+    [修正] 依 chunk_size 場比賽分批產生工作，每批才載入該批的封存內容，
+    記憶體用量不隨日期區間增加。
+    """
+    games = (
+        db.query(models.GameResultDB)
+        .filter(models.GameResultDB.game_date.between(start_date, end_date))
+        .order_by(models.GameResultDB.game_date, models.GameResultDB.id)
+        .all()
+    )
+    games_by_key = {
+        page_archive.game_key(
+            {"game_date": game.game_date.isoformat(), "cpbl_game_id": game.cpbl_game_id}
+        ): game
+        for game in games
+    }
+    latest = page_archive.latest_entries(db, games_by_key, _GAME_PAGE_TYPES)
+
+    selected: List[Tuple[models.GameResultDB, List[models.PageArchiveEntryDB]]] = []
+    for key, game in games_by_key.items():
+        entries = latest.get(key, {})
+        box_entry = entries.get((page_archive.BOX_SCORE, ""))
+        api_entry = entries.get((page_archive.BOX_API, ""))
+        if api_entry and (
+            box_entry is None or api_entry.fetched_at >= box_entry.fetched_at
+        ):
+            selected.append((game, [api_entry]))
+        elif box_entry:
+            selected.append(
+                (
+                    game,
+                    [box_entry]
+                    + [
+                        entry
+                        for (page_type, _), entry in entries.items()
+                        if page_type == page_archive.LIVE
+                    ],
+                )
+            )
+        else:
+            logger.warning(f"比賽 {key} 沒有可用的 Box Score 封存，略過重新解析。")
+
+    for chunk_start in range(0, len(selected), chunk_size):
+        chunk = selected[chunk_start : chunk_start + chunk_size]
+        blobs = _load_blobs(
+            db, {entry.sha256 for _, entries in chunk for entry in entries}
+        )
+        jobs = []
+        for game, entries in chunk:
+            main_entry, live_entries = entries[0], entries[1:]
+            jobs.append(
+                {
+                    "game_id": game.id,
+                    "archive_key": main_entry.archive_key,
+                    "game_info": {
+                        "home_team": game.home_team,
+                        "away_team": game.away_team,
+                    },
+                    "source": main_entry.page_type,
+                    "box": (main_entry.content_format, blobs[main_entry.sha256]),
+                    "live": [
+                        (entry.part, entry.content_format, blobs[entry.sha256])
+                        for entry in live_entries
+                    ],
+                }
+            )
+        yield jobs
+
+
+def _live_half_innings(
+    live_parts: List[Tuple[str, str, bytes]],
+) -> List[Tuple[Any, int, str, Callable[[Any, int], List[dict]]]]:
+    """將封存的文字轉播半局還原為 build_player_game_data 需要的格式，並依局數排序。"""
+    half_innings = []
+    for part, content_format, compressed in live_parts:
+        inning_num, selector = page_archive.parse_live_part(part)
+        parse_fn = (
+            live.parse_extracted_events
+            if content_format == "json"
+            else live.parse_active_inning_details
+        )
+        half_innings.append(
+            (
+                page_archive.decode(compressed, content_format),
+                inning_num,
+                selector,
+                parse_fn,
+            )
+        )
+    half_innings.sort(key=lambda h: (h[1], h[2] != "section.top"))
+    return half_innings
+
+
+def reparse_game(
+    job: dict, target_teams: Optional[List[str]] = None
+) -> Tuple[int, List[dict]]:
+    """
+    [新增] 在子行程中解析單場比賽的封存內容，不需網路與資料庫。
+
+    Returns:
+        Tuple[int, List[dict]]: (比賽的資料庫 ID, 待寫入的球員逐場資料)；
+        解析不到任何球員時回傳空列表。
+    """
+    box_payload = page_archive.decode(job["box"][1], job["box"][0])
+    if job["source"] == page_archive.BOX_API:
+        all_players_data = box_data.parse_box_score_data(
+            box_payload, target_teams=target_teams
+        )
+        half_innings = [
+            (raw_events, inning_num, selector, live.parse_extracted_events)
+            for raw_events, inning_num, selector in box_data.parse_live_log_data(
+                box_payload
+            )
+        ]
+    else:
+        all_players_data = box_score.parse_box_score_page(
+            box_payload, target_teams=target_teams
+        )
+        half_innings = _live_half_innings(job["live"])
+
+    if not all_players_data:
+        return job["game_id"], []
+    return job["game_id"], build_player_game_data(
+        all_players_data, half_innings, job["game_info"], target_teams
+    )
+
+
+def write_reparsed_games(db: Session, results: List[Tuple[int, List[dict]]]) -> int:
+    """
+    [新增] 以重新解析的結果取代資料庫中各場比賽的球員逐場數據，並一次提交。
+
+    Returns:
+        int: 實際寫入的比賽數 (沒有解析結果的比賽保留原資料)。
+    """
+    written = 0
+    try:
+        for game_id, final_player_data_list in results:
+            if not final_player_data_list:
+                logger.warning(
+                    f"Game ID: {game_id} 沒有重新解析出任何球員，保留原資料。"
+                )
+                continue
+            data_persistence.replace_player_game_data(
+                db, game_id, final_player_data_list
+            )
+            written += 1
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return written
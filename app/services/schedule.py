@@ -6,10 +6,11 @@ from typing import List, Dict, Optional
 
 from bs4 import BeautifulSoup
 
+from app import page_archive
 from app.config import settings
 from app.crud import games
 from app.db import SessionLocal
-from app.browser import get_page  # [重構] 使用統一的 browser manager
+from app.browser import get_page, measure_page_load  # [重構] 使用統一的 browser manager
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +29,14 @@ def scrape_cpbl_schedule(
     # [重構] 使用統一的 browser manager
     with get_page(headless=True) as page:
         logger.info(f"正在啟動瀏覽器並前往 {schedule_page_url}...")
-        page.goto(schedule_page_url, timeout=60000)
+        with measure_page_load(page, "schedule"):
+            page.goto(schedule_page_url, timeout=60000)
 
-        try:
-            page.wait_for_selector(".ScheduleSearch .month select", timeout=20000)
-        except Exception as e:
-            logger.error(f"錯誤：頁面載入超時或找不到關鍵元件。 {e}")
-            return []
+            try:
+                page.wait_for_selector(".ScheduleSearch .month select", timeout=20000)
+            except Exception as e:
+                logger.error(f"錯誤：頁面載入超時或找不到關鍵元件。 {e}")
+                return []
 
         logger.info("頁面載入完成。")
 
@@ -51,6 +53,12 @@ def scrape_cpbl_schedule(
                 logger.info(f"取得 {year} 年 {month} 月的資料成功。")
 
                 html_content = page.content()
+                page_archive.archive_page(
+                    page_archive.SCHEDULE,
+                    f"{year}-{month:02d}",
+                    html_content,
+                    url=schedule_page_url,
+                )
                 soup = BeautifulSoup(html_content, "html.parser")
 
                 schedule_table = soup.find("div", class_="ScheduleTableList")
@@ -2,7 +2,8 @@
 
 # 【新增】此檔案用於存放通用的、無狀態的解析輔助函式。
 
-from typing import Optional, List
+import re
+from typing import Optional, List, Tuple
 from app.models import AtBatResultType  # 確保導入 Enum
 from app.core.constants import (  # 導入 Box Score 結果分類
     HITS,
@@ -84,6 +85,34 @@ def map_result_short_to_type(result_short: str) -> Optional[AtBatResultType]:
     return None
 
 
+# 位置字串中的單一位置：括號包住的替補/換位 (例如 '(PH)')，或未加括號的位置代號
+_POSITION_TOKEN_PATTERN = re.compile(r"\(([^()]+)\)|([^(),\s]+)")
+
+
+def parse_position_appearances(position_str: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    [新增] 將 Box Score 的守備位置字串解析為 (位置, 是否先發) 的列表。
+
+    - 'SS'       -> [('SS', True)]
+    - '(2B)'     -> [('2B', False)]
+    - '(PH)(C)'  -> [('PH', False), ('C', False)]
+    - 'RF(CF)'   -> [('RF', True), ('CF', False)]
+    - '2B,SS'    -> [('2B', True), ('SS', False)]
+
+    只有字串中第一個、且未加括號的位置視為先發，其餘皆為替補或比賽中換位。
+    """
+    if not position_str:
+        return []
+
+    appearances = []
+    for index, match in enumerate(_POSITION_TOKEN_PATTERN.finditer(position_str)):
+        substitute_token, starter_token = match.groups()
+        position = (substitute_token or starter_token).strip().upper()
+        if position:
+            appearances.append((position, index == 0 and starter_token is not None))
+    return appearances
+
+
 def calculate_last_10_games_record(games: List[GameResult], team_name: str) -> str:
     """
     從最近的比賽列表中計算指定球隊的近十場戰績。
@@ -184,3 +213,24 @@ def calculate_current_streak(games: List[GameResult], team_name: str) -> str:
         return f"{streak_length}連勝"
     else:
         return f"{streak_length}連敗"
+
+
+def describe_streak(streak: int) -> str:
+    """
+    [新增] 將戰績帳本中的連勝/敗數值轉為與 calculate_current_streak 相同格式的描述。
+
+    :param streak: 正數為連勝、負數為連敗、0 表示上一場為和局。
+    :return: "X連勝"、"X連敗" 或 "中止"。
+    """
+    if streak > 0:
+        return f"{streak}連勝"
+    if streak < 0:
+        return f"{-streak}連敗"
+    return "中止"
+
+
+def summarize_results(results: str) -> str:
+    """
+    [新增] 將 W / L / T 組成的結果字串彙總為 "勝-敗-和" 格式，例如 "WWLT" -> "2-1-1"。
+    """
+    return f"{results.count('W')}-{results.count('L')}-{results.count('T')}"
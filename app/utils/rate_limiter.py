@@ -0,0 +1,42 @@
+# app/utils/rate_limiter.py
+
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+
+# 下一個請求可發出的時間點 (time.monotonic)，所有執行緒共用
+_next_request_at = 0.0
+_lock = threading.Lock()
+
+
+def wait_for_request_slot(min_interval: Optional[float] = None) -> float:
+    """
+    在對 cpbl.com.tw 發出頁面請求前呼叫，確保同一行程內所有爬蟲執行緒的
+    請求之間至少間隔 min_interval 秒 (預設為 SCRAPER_MIN_REQUEST_INTERVAL)。
+
+    每個呼叫者在鎖內預約自己的時間點，並於鎖外等待，不會阻塞其他執行緒預約。
+
+    Returns:
+        float: 實際等待的秒數。
+    """
+    global _next_request_at
+    interval = (
+        settings.SCRAPER_MIN_REQUEST_INTERVAL if min_interval is None else min_interval
+    )
+    with _lock:
+        now = time.monotonic()
+        scheduled_at = max(now, _next_request_at)
+        _next_request_at = scheduled_at + interval
+    delay = scheduled_at - now
+    if delay > 0:
+        time.sleep(delay)
+    return delay
+
+
+def reset() -> None:
+    """清除已預約的請求時間點。"""
+    global _next_request_at
+    with _lock:
+        _next_request_at = 0.0
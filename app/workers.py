@@ -2,7 +2,7 @@
 
 import logging
 import dramatiq
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable
 import requests
 from datetime import datetime
 import pytz
@@ -11,6 +11,7 @@ import redis
 
 # [修正] 從我們建立的設定檔中匯入 broker 實例
 from app.broker_setup import broker
+from app.browser import BrowserReuseMiddleware
 from app.db import SessionLocal
 from app.crud import games as crud_games
 from app.core import fetcher
@@ -19,10 +20,16 @@ from app.config import settings
 
 # [重構] 匯入新的 services 模組
 from app.services import game_data, schedule as schedule_service
+from app.services.dashboard import DashboardService
+from app.services import advanced_metrics, read_snapshot
+from app import at_bat_columns
 from app.exceptions import RetryableScraperError, FatalScraperError, GameNotFinalError
 
 logger = logging.getLogger(__name__)
 
+# [新增] 每個 worker 執行緒在多個任務之間重複使用自己的瀏覽器
+broker.add_middleware(BrowserReuseMiddleware())
+
 
 # --- CI/CD 信號 ---
 # [新增] 在 Dramatiq worker 啟動時，此模組會被載入，這段程式碼會被執行。
@@ -56,6 +63,81 @@ def _trigger_cache_clear():
         logger.error(f"呼叫快取清除 API 時發生錯誤: {e}", exc_info=True)
 
 
+def _refresh_dashboard_snapshot():
+    """
+    [新增] 重新產生首頁儀表板快照。
+    失敗時 API 會退回即時查詢，因此只記錄警告而不影響任務結果。
+    """
+    db = SessionLocal()
+    try:
+        DashboardService(db=db, settings=settings).refresh_dashboard_snapshots()
+        logger.info("首頁儀表板快照已更新。")
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"更新首頁儀表板快照時發生錯誤: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def _refresh_advanced_metrics(season: int):
+    """
+    [新增] 重新計算指定賽季的球員進階數據。
+    失敗時保留上一次的計算結果，只記錄警告而不影響任務結果。
+    """
+    db = SessionLocal()
+    try:
+        advanced_metrics.refresh_advanced_metrics(db, season)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"計算 {season} 年進階數據時發生錯誤: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def _publish_at_bat_columns(season: int):
+    """
+    [新增] 發布指定賽季的打席欄式快照至資料庫，供 web 行程解壓縮後以 mmap 共用。
+    失敗時 web 端會繼續使用上一版快照 (並從資料庫補讀增量)，只記錄警告。
+    """
+    db = SessionLocal()
+    try:
+        at_bat_columns.publish_season_columns(db, season)
+    except Exception as e:
+        logger.warning(f"發布 {season} 年打席欄式快照時發生錯誤: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def _export_read_snapshot():
+    """
+    [新增] 匯出唯讀 SQLite 快照至資料庫，web 下載後由本機 SQLite 回應唯讀端點。
+    失敗時 web 會繼續使用上一版快照，只記錄警告。
+    [修正] 未啟用 SERVE_READ_SNAPSHOT 時沒有讀取端，略過匯出。
+    """
+    if not settings.SERVE_READ_SNAPSHOT:
+        return
+    db = SessionLocal()
+    try:
+        read_snapshot.export_read_snapshot(db)
+    except Exception as e:
+        logger.warning(f"匯出唯讀 SQLite 快照時發生錯誤: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def refresh_derived_data(seasons: Iterable[int]):
+    """
+    [新增] 在比賽數據整批更新後 (例如離線重新解析)，重建所有衍生資料：
+    各賽季的進階數據與打席欄式快照、首頁儀表板快照、唯讀 SQLite 快照，最後清除快取。
+    """
+    for season in sorted(set(seasons)):
+        _refresh_advanced_metrics(season)
+        _publish_at_bat_columns(season)
+    _refresh_dashboard_snapshot()
+    _export_read_snapshot()
+    _trigger_cache_clear()
+
+
 def should_retry_scraper_task(retries_so_far: int, exception: Exception) -> bool:
     """Dramatiq 的重試判斷函式。"""
     return isinstance(exception, RetryableScraperError)
@@ -124,6 +206,8 @@ def task_update_schedule_and_reschedule():
             settings.CPBL_SEASON_END_MONTH,
             include_past_games=True,
         )
+        _refresh_dashboard_snapshot()
+        _export_read_snapshot()
         _trigger_cache_clear()
         logger.info("--- Dramatiq Worker: 賽程更新任務執行完畢 ---")
     except FatalScraperError as e:
@@ -177,6 +261,10 @@ def task_scrape_single_day(
 
         # [重構] 使用新的 service 函式
         game_data.scrape_single_day(target_date_str, games_for_day)
+        _refresh_advanced_metrics(target_date_obj.year)
+        _publish_at_bat_columns(target_date_obj.year)
+        _refresh_dashboard_snapshot()
+        _export_read_snapshot()
         _trigger_cache_clear()
         logger.info(
             f"--- Dramatiq Worker: 單日爬蟲任務 for {target_date_str} 執行完畢 ---"
@@ -200,6 +288,14 @@ def task_scrape_entire_month(month_str: Optional[str] = None):
     try:
         # [重構] 使用新的 service 函式
         game_data.scrape_entire_month(month_str)
+        season = (
+            int(month_str[:4])
+            if month_str
+            else datetime.now(pytz.timezone("Asia/Taipei")).year
+        )
+        _refresh_advanced_metrics(season)
+        _publish_at_bat_columns(season)
+        _export_read_snapshot()
         _trigger_cache_clear()
         logger.info(
             f"--- Dramatiq Worker: 逐月爬蟲任務 for {month_str or '本月'} 執行完畢 ---"
@@ -217,6 +313,14 @@ def task_scrape_entire_year(year_str: Optional[str] = None):
     try:
         # [重構] 使用新的 service 函式
         game_data.scrape_entire_year(year_str)
+        season = (
+            int(year_str)
+            if year_str
+            else datetime.now(pytz.timezone("Asia/Taipei")).year
+        )
+        _refresh_advanced_metrics(season)
+        _publish_at_bat_columns(season)
+        _export_read_snapshot()
         _trigger_cache_clear()
         logger.info(
             f"--- Dramatiq Worker: 逐年爬蟲任務 for {year_str or '今年'} 執行完畢 ---"
@@ -227,6 +331,31 @@ def task_scrape_entire_year(year_str: Optional[str] = None):
         )
 
 
+@dramatiq.actor(broker=broker)
+def task_run_crawl_plan(year_str: Optional[str] = None):
+    """[新增] 依資料庫狀態產生補爬計畫，只抓取缺少或不完整比賽的任務。"""
+    logger.info(f"--- Dramatiq Worker: 執行補爬計畫任務 for {year_str or '今年'} ---")
+    try:
+        planned_games = game_data.scrape_planned_games(year_str)
+        if planned_games:
+            season = (
+                int(year_str)
+                if year_str
+                else datetime.now(pytz.timezone("Asia/Taipei")).year
+            )
+            _refresh_advanced_metrics(season)
+            _publish_at_bat_columns(season)
+            _export_read_snapshot()
+            _trigger_cache_clear()
+        logger.info(
+            f"--- Dramatiq Worker: 補爬計畫任務 for {year_str or '今年'} 執行完畢 ---"
+        )
+    except Exception as e:
+        logger.error(
+            f"Dramatiq Worker 在執行補爬計畫任務時發生嚴重錯誤: {e}", exc_info=True
+        )
+
+
 @dramatiq.actor(broker=broker, max_retries=0, time_limit=60 * 1000, store_results=True)
 def task_e2e_workflow_test():
     """
@@ -0,0 +1,55 @@
+# scripts/backfill_standings.py
+#
+# 重新抓取指定賽季所有月份的賽程頁，回填整季賽程 (season_schedule_games) 與
+# 戰績帳本 (team_game_standings)：
+#   1. 帳本只從開始記錄後的爬蟲累計，開始前的比賽不會出現在 /api/standings
+#   2. 回填後帳本依日期重新累計，近十場與連勝敗也會從開季起計算
+#   3. 完成後重建儀表板與唯讀快照並清除快取
+#
+# 帳本不完整時，/api/standings 會回傳 is_complete = false。可重複執行。
+#
+# 使用方法:
+# python -m scripts.backfill_standings --season 2025
+# 回填多個賽季:
+# python -m scripts.backfill_standings --season 2024 --season 2025
+
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from app.logging_config import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="重新抓取賽程頁，回填整季賽程與戰績帳本。"
+    )
+    parser.add_argument(
+        "--season",
+        required=True,
+        type=int,
+        action="append",
+        help="回填的賽季年份，可指定多次",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    from app.services.game_data import backfill_season_standings
+    from app.workers import refresh_derived_data
+
+    for season in sorted(set(args.season)):
+        logger.info(f"開始回填 {season} 年的戰績帳本...")
+        games = backfill_season_standings(season)
+        logger.info(f"{season} 年回填完成，共處理 {games} 場賽程。")
+
+    logger.info("正在重建衍生資料...")
+    refresh_derived_data(args.season)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# scripts/benchmark_advanced_metrics.py
+#
+# 比較進階數據 (wOBA、ISO、BABIP、K%、BB%、OPS+) 的兩種計算方式：
+#   - loop : 逐球員以 Python 迴圈計算，每位球員各自做一次除法與縮放。
+#   - numpy: app.services.advanced_metrics 的作法，將計數數據載入陣列後一次向量化計算。
+#
+# 兩種方式使用相同的合成計數數據與聯盟常數，並驗證結果一致，只比較計算本身的耗時。
+# 腳本不會連線資料庫。
+#
+# 使用方法:
+# python -m scripts.benchmark_advanced_metrics --players 5000 --repeat 5
+
+import argparse
+import logging
+import math
+import random
+import time
+
+from dotenv import load_dotenv
+
+from app.logging_config import setup_logging
+
+
+def build_synthetic_rows(num_players: int, columns) -> list:
+    """產生 (player_name, team_name, *計數欄位) 形式的合成資料。"""
+    rng = random.Random(42)
+    rows = []
+    for i in range(num_players):
+        plate_appearances = rng.randint(0, 600)
+        walks = rng.randint(0, plate_appearances // 8)
+        hit_by_pitch = rng.randint(0, 10) if plate_appearances > 50 else 0
+        sacrifice_flies = rng.randint(0, 5) if plate_appearances > 50 else 0
+        at_bats = max(plate_appearances - walks - hit_by_pitch - sacrifice_flies, 0)
+        hits = rng.randint(0, at_bats // 3) if at_bats else 0
+        doubles = rng.randint(0, hits // 4) if hits else 0
+        triples = rng.randint(0, 3) if hits > 10 else 0
+        homeruns = rng.randint(0, max(hits - doubles - triples, 0) // 5)
+        counts = {
+            "plate_appearances": plate_appearances,
+            "at_bats": at_bats,
+            "hits": hits,
+            "doubles": doubles,
+            "triples": triples,
+            "homeruns": homeruns,
+            "walks": walks,
+            "intentional_walks": rng.randint(0, walks // 5) if walks else 0,
+            "hit_by_pitch": hit_by_pitch,
+            "sacrifice_flies": sacrifice_flies,
+            "strikeouts": rng.randint(0, max(at_bats - hits, 0) // 3),
+        }
+        rows.append((f"球員{i}", "測試隊", *(counts[c] for c in columns)))
+    return rows
+
+
+def compute_with_loop(rows, columns, weights, constants) -> dict:
+    """逐球員計算進階數據的舊式寫法，作為比較基準。"""
+
+    def divide(numerator, denominator):
+        return numerator / denominator if denominator > 0 else math.nan
+
+    results = {name: [] for name in ("woba", "iso", "babip", "ops_plus")}
+    for row in rows:
+        c = dict(zip(columns, row[2:]))
+        singles = c["hits"] - c["doubles"] - c["triples"] - c["homeruns"]
+        unintentional_walks = c["walks"] - c["intentional_walks"]
+        total_bases = singles + 2 * c["doubles"] + 3 * c["triples"] + 4 * c["homeruns"]
+        avg = divide(c["hits"], c["at_bats"])
+        slg = divide(total_bases, c["at_bats"])
+        obp = divide(
+            c["hits"] + c["walks"] + c["hit_by_pitch"],
+            c["at_bats"] + c["walks"] + c["hit_by_pitch"] + c["sacrifice_flies"],
+        )
+        raw_woba = divide(
+            weights["unintentional_walks"] * unintentional_walks
+            + weights["hit_by_pitch"] * c["hit_by_pitch"]
+            + weights["singles"] * singles
+            + weights["doubles"] * c["doubles"]
+            + weights["triples"] * c["triples"]
+            + weights["homeruns"] * c["homeruns"],
+            c["at_bats"]
+            + unintentional_walks
+            + c["sacrifice_flies"]
+            + c["hit_by_pitch"],
+        )
+        results["woba"].append(raw_woba * constants["woba_scale"])
+        results["iso"].append(slg - avg)
+        results["babip"].append(
+            divide(
+                c["hits"] - c["homeruns"],
+                c["at_bats"] - c["strikeouts"] - c["homeruns"] + c["sacrifice_flies"],
+            )
+        )
+        results["ops_plus"].append(
+            100 * (obp / constants["lg_obp"] + slg / constants["lg_slg"] - 1)
+        )
+    return results
+
+
+def best_of(repeat: int, func):
+    """回傳 (最佳耗時秒數, 最後一次的結果)。"""
+    best_seconds, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best_seconds = min(best_seconds, time.perf_counter() - started)
+    return best_seconds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較進階數據計算方式的效能。")
+    parser.add_argument("--players", type=int, default=5000, help="合成球員數")
+    parser.add_argument("--repeat", type=int, default=5, help="每種方式的執行次數")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    import numpy as np
+
+    from app.services import advanced_metrics
+
+    columns = advanced_metrics.COUNTING_COLUMNS
+    rows = build_synthetic_rows(args.players, columns)
+    stats = advanced_metrics.CountingStats.from_rows(rows)
+    constants = advanced_metrics.derive_league_constants(stats)
+    logger.info(f"已產生 {args.players} 名球員的合成計數數據。")
+
+    loop_seconds, loop_result = best_of(
+        args.repeat,
+        lambda: compute_with_loop(
+            rows, columns, advanced_metrics.WOBA_BASE_WEIGHTS, constants
+        ),
+    )
+    numpy_seconds, numpy_result = best_of(
+        args.repeat,
+        lambda: advanced_metrics.compute_advanced_metrics(stats, constants),
+    )
+    for name, values in loop_result.items():
+        if not np.allclose(values, numpy_result[name], equal_nan=True):
+            raise SystemExit(f"兩種方式計算的 {name} 不一致。")
+
+    print(f"loop   {loop_seconds * 1000:8.2f} ms")
+    print(f"numpy  {numpy_seconds * 1000:8.2f} ms")
+    print(f"speedup x{loop_seconds / numpy_seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
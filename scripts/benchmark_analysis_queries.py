@@ -0,0 +1,212 @@
+# scripts/benchmark_analysis_queries.py
+#
+# 比較列表型分析查詢的兩種取數方式：
+#   - orm : 舊作法，載入完整的 AtBatDetailDB ORM 物件 (joinedload summary/game)，
+#           再以 **ab.__dict__ 複製到 Pydantic 模型。
+#   - core: 新作法，以 Core select() 只取回應所需欄位的 Row，直接建構 Pydantic 模型。
+#
+# 腳本會在一個獨立的 SQLite 資料庫中產生合成資料，不會動到 .env 中設定的資料庫。
+#
+# 使用方法:
+# python -m scripts.benchmark_analysis_queries --games 1000 --repeat 3
+
+import argparse
+import datetime
+import gc
+import logging
+import random
+import time
+import tracemalloc
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.logging_config import setup_logging
+
+TEAMS = ["台鋼雄鷹", "中信兄弟", "統一7-ELEVEn獅", "樂天桃猿", "富邦悍將", "味全龍"]
+RESULTS = ["一安", "二安", "全打", "四壞", "三振", "游滾", "中飛", "二滾", "左飛"]
+
+
+def seed_synthetic_data(engine, models, num_games: int) -> int:
+    """產生 num_games 場比賽，每場兩隊各 9 名打者、每人 4~5 個打席。"""
+    rng = random.Random(42)
+    game_rows, summary_rows, at_bat_rows = [], [], []
+    summary_id = 0
+    at_bat_id = 0
+    start_date = datetime.date(2024, 3, 1)
+    team_ids = {team: i for i, team in enumerate(TEAMS, start=1)}
+    player_ids = {}
+    for game_id in range(1, num_games + 1):
+        home, away = rng.sample(TEAMS, 2)
+        game_rows.append(
+            {
+                "id": game_id,
+                "cpbl_game_id": f"BENCH{game_id:05d}",
+                "game_date": start_date + datetime.timedelta(days=game_id),
+                "home_team": home,
+                "away_team": away,
+                "home_team_id": team_ids[home],
+                "away_team_id": team_ids[away],
+                "status": "已完成",
+            }
+        )
+        sequence = 0
+        for team in (away, home):
+            for order in range(1, 10):
+                summary_id += 1
+                player_name = f"{team}{order}號"
+                player_ids.setdefault(player_name, len(player_ids) + 1)
+                summary_rows.append(
+                    {
+                        "id": summary_id,
+                        "game_id": game_id,
+                        "player_name": player_name,
+                        "team_name": team,
+                        "player_id": player_ids[player_name],
+                        "team_id": team_ids[team],
+                        "batting_order": str(order),
+                        "position": "DH",
+                    }
+                )
+                for inning in range(1, rng.randint(5, 6)):
+                    sequence += 1
+                    at_bat_id += 1
+                    at_bat_rows.append(
+                        {
+                            "id": at_bat_id,
+                            "game_id": game_id,
+                            "player_game_summary_id": summary_id,
+                            "inning": inning,
+                            "sequence_in_game": sequence,
+                            "result_short": rng.choice(RESULTS),
+                            "result_description_full": "擊出中外野方向高飛球。" * 4,
+                            "opposing_pitcher_name": "對手投手",
+                            # 模擬實際資料中較長的逐球紀錄文字
+                            "pitch_sequence_details": "1-好球,2-壞球,3-界外," * 20,
+                            "runners_on_base_before": "壘上無人",
+                            "outs_before": rng.randint(0, 2),
+                            "runs_scored_on_play": rng.choice([0, 0, 0, 1]),
+                        }
+                    )
+    with engine.begin() as connection:
+        connection.execute(
+            insert(models.TeamDB),
+            [{"id": i, "name": team} for team, i in team_ids.items()],
+        )
+        connection.execute(
+            insert(models.PlayerDB),
+            [{"id": i, "name": name} for name, i in player_ids.items()],
+        )
+        connection.execute(insert(models.GameResultDB), game_rows)
+        connection.execute(insert(models.PlayerGameSummaryDB), summary_rows)
+        connection.execute(insert(models.AtBatDetailDB), at_bat_rows)
+    return len(at_bat_rows)
+
+
+def fetch_with_orm(db, models, schemas):
+    """舊作法：完整 ORM 物件 + **__dict__ 複製。"""
+    at_bats = (
+        db.query(models.AtBatDetailDB)
+        .join(models.PlayerGameSummaryDB)
+        .options(
+            joinedload(models.AtBatDetailDB.player_summary).joinedload(
+                models.PlayerGameSummaryDB.game
+            )
+        )
+        .order_by(
+            models.AtBatDetailDB.game_id,
+            models.AtBatDetailDB.inning,
+            models.AtBatDetailDB.sequence_in_game,
+        )
+        .all()
+    )
+    return [
+        schemas.AtBatDetailForStreak(
+            player_name=ab.player_summary.player_name,
+            batting_order=ab.player_summary.batting_order,
+            **ab.__dict__,
+        )
+        for ab in at_bats
+    ]
+
+
+def fetch_with_core(db, models, analysis):
+    """新作法：Core select() Row + 直接建構 Pydantic 模型。"""
+    at_bat_rows = db.execute(
+        analysis._select_at_bat_rows().order_by(
+            models.AtBatDetailDB.game_id,
+            models.AtBatDetailDB.inning,
+            models.AtBatDetailDB.sequence_in_game,
+        )
+    ).all()
+    return [analysis._streak_at_bat_from_row(row) for row in at_bat_rows]
+
+
+def measure(session_factory, func, repeat: int):
+    """
+    回傳 (最佳耗時秒數, 記憶體峰值 MiB, 結果筆數)。
+    tracemalloc 本身會大幅拖慢執行，因此計時與記憶體量測分開進行。
+    """
+    best_seconds, count = float("inf"), 0
+    for _ in range(repeat):
+        gc.collect()
+        db = session_factory()
+        started = time.perf_counter()
+        results = func(db)
+        best_seconds = min(best_seconds, time.perf_counter() - started)
+        count = len(results)
+        db.close()
+        del results
+
+    gc.collect()
+    db = session_factory()
+    tracemalloc.start()
+    results = func(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    del results
+    return best_seconds, peak / 1024 / 1024, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 ORM 與 Core 列表查詢的效能。")
+    parser.add_argument("--games", type=int, default=1000, help="合成資料的比賽場數")
+    parser.add_argument("--repeat", type=int, default=3, help="每種方式的執行次數")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    from app import models, schemas
+    from app.crud import analysis
+    from app.db import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    num_at_bats = seed_synthetic_data(engine, models, args.games)
+    session_factory = sessionmaker(bind=engine)
+    logger.info(f"已產生 {args.games} 場比賽、{num_at_bats} 個打席的合成資料。")
+
+    for label, func in (
+        ("orm", lambda db: fetch_with_orm(db, models, schemas)),
+        ("core", lambda db: fetch_with_core(db, models, analysis)),
+        (
+            "core: find_on_base_streaks",
+            lambda db: analysis.find_on_base_streaks(
+                db, "consecutive_on_base", 2, None, None, limit=10**9
+            ),
+        ),
+    ):
+        seconds, peak_mib, count = measure(session_factory, func, args.repeat)
+        print(
+            f"{label:<28} {seconds * 1000:9.1f} ms  peak {peak_mib:8.1f} MiB  "
+            f"({count} 筆)"
+        )
+
+
+if __name__ == "__main__":
+    main()
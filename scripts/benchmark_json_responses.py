@@ -0,0 +1,134 @@
+# scripts/benchmark_json_responses.py
+#
+# 比較 API 回應的兩種序列化路徑：
+#   - legacy: 舊作法，端點回傳 ORM 物件 / Pydantic 模型，由 FastAPI 依 response_model
+#             再驗證一次，並以標準函式庫 json 輸出 (JSONResponse)。
+#   - fast  : 新作法，端點以 model_response 一次序列化為 JSON 位元組，
+#             其餘端點預設使用 ORJSONResponse。
+#
+# 兩種路徑使用相同的路由與合成資料，並停用 Redis 快取，只比較回應建構的差異。
+# 腳本不會動到 .env 中設定的資料庫。
+#
+# 使用方法:
+# python -m scripts.benchmark_json_responses --games 300 --repeat 20
+
+import argparse
+import logging
+import time
+from unittest import mock
+
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.logging_config import setup_logging
+from scripts.benchmark_analysis_queries import seed_synthetic_data
+
+
+def build_app(default_response_class, routers) -> FastAPI:
+    """建立只包含指定路由的 FastAPI 應用程式。"""
+    app = FastAPI(default_response_class=default_response_class)
+    for router in routers:
+        app.include_router(router)
+    return app
+
+
+def measure(client: TestClient, url: str, repeat: int):
+    """回傳 (最佳耗時秒數, 回應位元組數)。"""
+    client.get(url).raise_for_status()  # 暖機，建立 TypeAdapter 等快取
+    best_seconds, size = float("inf"), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        best_seconds = min(best_seconds, time.perf_counter() - started)
+        response.raise_for_status()
+        size = len(response.content)
+    return best_seconds, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 API 回應序列化路徑的效能。")
+    parser.add_argument("--games", type=int, default=300, help="合成資料的比賽場數")
+    parser.add_argument("--repeat", type=int, default=20, help="每個端點的執行次數")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    # TestClient 每個請求都會記錄一行日誌，避免干擾輸出
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    from app import models
+    from app.api import analysis, games
+    from app.db import Base, get_db
+    from app.responses import ORJSONResponse
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    num_at_bats = seed_synthetic_data(engine, models, args.games)
+    session_factory = sessionmaker(bind=engine)
+    logger.info(f"已產生 {args.games} 場比賽、{num_at_bats} 個打席的合成資料。")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    player_name = "台鋼雄鷹1號"
+    urls = [
+        "/api/games/details/1?detail=full",
+        "/api/analysis/streaks?min_length=2&limit=200&detail=full",
+        f"/api/analysis/players/{player_name}/situational-at-bats"
+        "?situation=bases_empty&limit=200&detail=full",
+        f"/api/analysis/games-with-players?players={player_name}&limit=200",
+    ]
+
+    def legacy_model_response(response_type, content, from_attributes=False):
+        # 模擬舊作法：直接回傳內容，交由 FastAPI 依 response_model 驗證與序列化
+        return content
+
+    routers = (games.router, analysis.router)
+    with mock.patch("app.cache.redis_client", None):
+        for label, response_class, patches in (
+            (
+                "legacy",
+                JSONResponse,
+                [
+                    mock.patch.object(
+                        analysis, "model_response", legacy_model_response
+                    ),
+                    mock.patch.object(games, "model_response", legacy_model_response),
+                ],
+            ),
+            ("fast", ORJSONResponse, []),
+        ):
+            app = build_app(response_class, routers)
+            app.dependency_overrides[get_db] = override_get_db
+            client = TestClient(app)
+            for patcher in patches:
+                patcher.start()
+            try:
+                for url in urls:
+                    seconds, size = measure(client, url, args.repeat)
+                    print(
+                        f"{label:<7} {url.split('?')[0]:<58} "
+                        f"{seconds * 1000:8.2f} ms  {size / 1024:8.1f} KiB"
+                    )
+            finally:
+                for patcher in patches:
+                    patcher.stop()
+
+
+if __name__ == "__main__":
+    main()
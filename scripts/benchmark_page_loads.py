@@ -0,0 +1,71 @@
+# scripts/benchmark_page_loads.py
+#
+# 比較啟用與關閉請求攔截 (SCRAPER_BLOCK_RESOURCES) 時，各類頁面的載入耗時與傳輸量：
+#   - box_score: Box Score 頁面
+#   - live     : 文字轉播頁面 (只量測導航與等待，不展開各局事件)
+#   - schedule : 賽程頁面
+#
+# 此腳本會實際連線至 cpbl.com.tw，請勿設定過多的執行次數。
+#
+# 使用方法:
+# python -m scripts.benchmark_page_loads --box-score-url "https://www.cpbl.com.tw/box?year=2025&kindCode=A&gameSno=1" --repeat 3
+
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from app.logging_config import setup_logging
+
+
+def load_pages(box_score_url: str, repeat: int):
+    """依序載入各類頁面 repeat 次，統計由 measure_page_load 記錄。"""
+    from app.browser import get_page, measure_page_load
+    from app.config import settings
+    from app.services.browser_operator import BrowserOperator
+
+    live_url = box_score_url.replace("/box?", "/box/live?")
+    for _ in range(repeat):
+        with get_page(headless=True) as page:
+            BrowserOperator(page).navigate_and_get_box_score_content(box_score_url)
+        with get_page(headless=True) as page:
+            with measure_page_load(page, "live"):
+                page.goto(live_url, wait_until="load")
+                page.wait_for_selector("div.InningPlaysGroup")
+        with get_page(headless=True) as page:
+            with measure_page_load(page, "schedule"):
+                page.goto(settings.SCHEDULE_URL)
+                page.wait_for_selector("div.item.year > select")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較請求攔截前後的頁面載入效能。")
+    parser.add_argument(
+        "--box-score-url", required=True, help="用於測試的 Box Score 頁面 URL"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="每種模式的執行次數")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    from app.browser import page_load_stats
+    from app.config import settings
+
+    for enabled in (False, True):
+        settings.SCRAPER_BLOCK_RESOURCES = enabled
+        logger.info(f"開始量測 (SCRAPER_BLOCK_RESOURCES={enabled})...")
+        load_pages(args.box_score_url, args.repeat)
+
+    for key, load in page_load_stats.snapshot().items():
+        print(
+            f"{key:<24} {load['avg_seconds'] * 1000:9.1f} ms  "
+            f"{load['avg_kb']:9.1f} KB  ({load['loads']} 次)"
+        )
+    print(f"共攔截 {page_load_stats.blocked_requests} 個請求。")
+
+
+if __name__ == "__main__":
+    main()
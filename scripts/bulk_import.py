@@ -57,6 +57,8 @@ from app.parsers import schedule
 from app.services.game_data import scrape_single_day, scrape_and_store_season_stats
 from app.db import Base
 from app.models import (
+    TeamDB,
+    PlayerDB,
     GameResultDB,
     PlayerGameSummaryDB,
     AtBatDetailDB,
@@ -221,7 +223,10 @@ def run_upload(settings: Settings):
 
     Base.metadata.create_all(bind=production_engine)
 
+    # [修改] 維度表需先同步，事實表的 player_id / team_id 才能對應
     MODELS_TO_SYNC = [
+        TeamDB,
+        PlayerDB,
         GameResultDB,
         PlayerGameSummaryDB,
         AtBatDetailDB,
@@ -0,0 +1,121 @@
+# scripts/reparse.py
+#
+# 以封存的原始頁面 (PAGE_ARCHIVE_ENABLED) 離線重建指定日期區間的
+# player_game_summary 與 at_bat_details，全程不連線至 cpbl.com.tw：
+#   1. 讀取區間內每場比賽最新封存的 Box Score / 資料端點回應與文字轉播
+#   2. 以多行程平行執行解析器與 GameStateMachine
+#   3. 依批次刪除舊的球員逐場數據並寫入新結果
+#   4. 重建衍生資料 (進階數據、打席欄式快照、儀表板快照、唯讀快照) 並清除快取
+#
+# 修正解析器後，可用此腳本套用到已抓取過的比賽，不必重新爬取。
+# 封存內容依批次從資料庫載入，記憶體用量不隨日期區間增加。
+#
+# 使用方法:
+# python -m scripts.reparse --start 2025-03-29 --end 2025-09-30 --workers 4
+# 只解析、不寫入資料庫:
+# python -m scripts.reparse --start 2025-08-01 --end 2025-08-31 --dry-run
+# 寫入後不重建衍生資料 (之後再由例行任務更新):
+# python -m scripts.reparse --start 2025-08-01 --end 2025-08-31 --skip-refresh
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from dotenv import load_dotenv
+
+from app.logging_config import setup_logging
+
+
+def _parse_date(value: str):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="以封存頁面離線重建球員逐場數據與打席記錄。"
+    )
+    parser.add_argument(
+        "--start", required=True, type=_parse_date, help="起始日期 (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--end", required=True, type=_parse_date, help="結束日期 (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="平行解析的行程數 (預設為 CPU 核心數)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=20, help="每次提交寫入的比賽數"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="只解析並回報結果，不寫入資料庫"
+    )
+    parser.add_argument(
+        "--skip-refresh",
+        action="store_true",
+        help="寫入後不重建進階數據、打席欄式快照、儀表板與唯讀快照",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+
+    # 必須在環境變數載入後才能匯入 app 相關模組
+    from app.config import settings
+    from app.db import SessionLocal
+    from app.services.reparse import (
+        iter_reparse_jobs,
+        reparse_game,
+        write_reparsed_games,
+    )
+    from app.workers import refresh_derived_data
+
+    db = SessionLocal()
+    try:
+        logger.info(
+            f"開始重新解析 {args.start} ~ {args.end} 的比賽，使用 {args.workers} 個行程。"
+        )
+
+        parsed_games = written_games = 0
+        batch = []
+        worker = partial(reparse_game, target_teams=settings.TARGET_TEAMS)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for jobs in iter_reparse_jobs(db, args.start, args.end):
+                for game_id, final_player_data_list in pool.map(
+                    worker, jobs, chunksize=max(1, len(jobs) // (args.workers * 4))
+                ):
+                    parsed_games += 1
+                    if args.dry_run:
+                        at_bats = sum(
+                            len(p.get("at_bats_details", []))
+                            for p in final_player_data_list
+                        )
+                        logger.info(
+                            f"Game ID: {game_id} 解析出 {len(final_player_data_list)} 名球員、"
+                            f"{at_bats} 個打席。"
+                        )
+                        continue
+                    batch.append((game_id, final_player_data_list))
+                    if len(batch) >= args.batch_size:
+                        written_games += write_reparsed_games(db, batch)
+                        batch = []
+            if batch:
+                written_games += write_reparsed_games(db, batch)
+
+        logger.info(f"重新解析完成：解析 {parsed_games} 場，寫入 {written_games} 場。")
+    finally:
+        db.close()
+
+    if written_games and not args.skip_refresh:
+        logger.info("正在重建衍生資料...")
+        refresh_derived_data(range(args.start.year, args.end.year + 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@ import datetime
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app import models
+from app.crud.players import build_position_appearances
 from app.cache import redis_client
+from app.config import settings
+from tests.factories import add_with_dimension_ids
 
 # --- 測試資料設定 Fixture ---
 
@@ -25,7 +28,7 @@ def setup_streak_test_data(db_session: Session):
         home_team="台鋼雄鷹",
         away_team="樂天桃猿",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summaries = {}
@@ -37,11 +40,12 @@ def setup_streak_test_data(db_session: Session):
             batting_order=int(order),
             team_name="台鋼雄鷹",
         )
-        db_session.add(summary)
+        add_with_dimension_ids(db_session, summary)
         summaries[name] = summary
     db_session.flush()
 
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.AtBatDetailDB(
                 player_game_summary_id=summaries["A"].id,
@@ -85,7 +89,7 @@ def setup_streak_test_data(db_session: Session):
                 sequence_in_game=6,
                 result_short="一安",
             ),
-        ]
+        ],
     )
     db_session.commit()
     return game
@@ -100,7 +104,7 @@ def setup_ibb_impact_test_data(db_session: Session):
         home_team="味全龍",
         away_team="中信兄弟",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summaries = {}
@@ -112,11 +116,12 @@ def setup_ibb_impact_test_data(db_session: Session):
             batting_order=int(order),
             team_name="味全龍",
         )
-        db_session.add(summary)
+        add_with_dimension_ids(db_session, summary)
         summaries[name] = summary
     db_session.flush()
 
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.AtBatDetailDB(
                 player_game_summary_id=summaries["A"].id,
@@ -164,7 +169,7 @@ def setup_ibb_impact_test_data(db_session: Session):
                 inning=2,
                 result_short="三振",
             ),
-        ]
+        ],
     )
     db_session.commit()
     return game
@@ -179,16 +184,17 @@ def setup_situational_at_bats_data(db_session: Session):
         home_team="富邦悍將",
         away_team="統一7-ELEVEn獅",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summary = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="情境打者", team_name="富邦悍將"
     )
-    db_session.add(summary)
+    add_with_dimension_ids(db_session, summary)
     db_session.flush()
 
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.AtBatDetailDB(
                 player_game_summary_id=summary.id,
@@ -218,7 +224,7 @@ def setup_situational_at_bats_data(db_session: Session):
                 runners_on_base_before="二壘有人",
                 result_short="滾地",  # 符合 (得點圈)
             ),
-        ]
+        ],
     )
     db_session.commit()
 
@@ -244,59 +250,62 @@ def setup_position_analysis_data(db_session: Session):
         home_team="中信兄弟",
         away_team="味全龍",
     )
-    db_session.add_all([game1, game2, game_other_year])
+    add_with_dimension_ids(db_session, [game1, game2, game_other_year])
     db_session.flush()
 
-    db_session.add_all(
-        [
-            # 2024 年 SS 的相關紀錄
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-                at_bats=4,
-                hits=2,
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="工具人",
-                team_name="中信兄弟",
-                position="2B,SS",
-                at_bats=3,
-                hits=1,
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game2.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-                at_bats=5,
-                hits=1,
-            ),
-            # 應被忽略的紀錄 (不同年份)
-            models.PlayerGameSummaryDB(
-                game_id=game_other_year.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-                at_bats=3,
-                hits=3,
-            ),
-            # 應被忽略的紀錄 (不同位置)
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="角落砲",
-                team_name="中信兄弟",
-                position="LF",
-                at_bats=4,
-                hits=1,
-            ),
-        ]
-    )
+    summaries = [
+        # 2024 年 SS 的相關紀錄
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+            at_bats=4,
+            hits=2,
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="工具人",
+            team_name="中信兄弟",
+            position="2B,SS",
+            at_bats=3,
+            hits=1,
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game2.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+            at_bats=5,
+            hits=1,
+        ),
+        # 應被忽略的紀錄 (不同年份)
+        models.PlayerGameSummaryDB(
+            game_id=game_other_year.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+            at_bats=3,
+            hits=3,
+        ),
+        # 應被忽略的紀錄 (不同位置)
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="角落砲",
+            team_name="中信兄弟",
+            position="LF",
+            at_bats=4,
+            hits=1,
+        ),
+    ]
+    # [新增] 同步建立正規化的守備位置出場紀錄，與寫入流程一致
+    for summary in summaries:
+        summary.positions = build_position_appearances(summary)
+    add_with_dimension_ids(db_session, summaries)
 
     # [修正] 新增球員年度數據，以供 API 查詢
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.PlayerSeasonStatsDB(
                 player_name="游擊大師", at_bats=9, hits=3, avg=(3 / 9)
@@ -304,7 +313,7 @@ def setup_position_analysis_data(db_session: Session):
             models.PlayerSeasonStatsDB(
                 player_name="工具人", at_bats=3, hits=1, avg=(1 / 3)
             ),
-        ]
+        ],
     )
     db_session.commit()
 
@@ -322,11 +331,11 @@ def test_get_games_with_players_includes_summaries(
         home_team="H",
         away_team="A",
     )
-    db_session.add(g1)
+    add_with_dimension_ids(db_session, g1)
     db_session.flush()
     s1a = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員A", position="RF")
     s1b = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員B", position="PH")
-    db_session.add_all([s1a, s1b])
+    add_with_dimension_ids(db_session, [s1a, s1b])
     db_session.commit()
 
     response = client.get(
@@ -351,18 +360,18 @@ def test_get_last_homerun_includes_career_stats(
         home_team="H",
         away_team="A",
     )
-    db_session.add(g1)
+    add_with_dimension_ids(db_session, g1)
     db_session.flush()
     s1 = models.PlayerGameSummaryDB(game_id=g1.id, player_name="轟炸基", at_bats=4)
-    db_session.add(s1)
+    add_with_dimension_ids(db_session, s1)
     db_session.flush()
     hr1 = models.AtBatDetailDB(
         player_game_summary_id=s1.id, game_id=g1.id, result_description_full="全壘打"
     )
-    db_session.add(hr1)
+    add_with_dimension_ids(db_session, hr1)
     # [新增] 加入生涯數據
     career = models.PlayerCareerStatsDB(player_name="轟炸基", homeruns=100, avg=0.300)
-    db_session.add(career)
+    add_with_dimension_ids(db_session, career)
     db_session.commit()
 
     response = client.get("/api/analysis/players/轟炸基/last-homerun")
@@ -435,6 +444,28 @@ def test_get_situational_at_bats(client: TestClient, setup_situational_at_bats_d
     assert data[0]["opponent_team"] == "統一7-ELEVEn獅"
 
 
+def test_get_situational_at_bats_detail_levels(
+    client: TestClient, db_session: Session, setup_situational_at_bats_data
+):
+    """[新增] 測試 /situational-at-bats 的 detail 參數控制大型文字欄位是否回傳。"""
+    for at_bat in db_session.query(models.AtBatDetailDB).all():
+        at_bat.result_description_full = "完整描述"
+        at_bat.pitch_sequence_details = "逐球紀錄"
+    db_session.commit()
+
+    url = (
+        "/api/analysis/players/情境打者/situational-at-bats?situation=scoring_position"
+    )
+    summary_data = client.get(url).json()
+    full_data = client.get(f"{url}&detail=full").json()
+
+    assert len(summary_data) == len(full_data) == 3
+    assert all(d["pitch_sequence_details"] is None for d in summary_data)
+    assert all(d["result_description_full"] is None for d in summary_data)
+    assert all(d["pitch_sequence_details"] == "逐球紀錄" for d in full_data)
+    assert all(d["result_description_full"] == "完整描述" for d in full_data)
+
+
 def test_get_position_records(client: TestClient, setup_position_analysis_data):
     """[新增] 測試 /positions/{year}/{position} 端點能回傳正確的年度守位分析。"""
     response = client.get("/api/analysis/positions/2024/SS")
@@ -466,3 +497,78 @@ def test_get_position_records(client: TestClient, setup_position_analysis_data):
     stats_utility = player_stats_map["工具人"]["batting_stats"]
     assert stats_utility["at_bats"] == 3
     assert stats_utility["hits"] == 1
+
+
+def test_get_last_homerun_for_players(client: TestClient, db_session: Session):
+    """[新增] 測試批次 /players/last-homerun 端點，無全壘打紀錄的球員回傳 null。"""
+    game = models.GameResultDB(
+        cpbl_game_id="G_BATCH_HR",
+        game_date=datetime.date(2025, 8, 1),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db_session, game)
+    db_session.flush()
+    summary = models.PlayerGameSummaryDB(
+        game_id=game.id, player_name="轟炸基", at_bats=4
+    )
+    add_with_dimension_ids(db_session, summary)
+    db_session.flush()
+    hr = models.AtBatDetailDB(
+        player_game_summary_id=summary.id,
+        game_id=game.id,
+        result_description_full="全壘打",
+    )
+    add_with_dimension_ids(db_session, hr)
+    db_session.commit()
+
+    response = client.get(
+        "/api/analysis/players/last-homerun?player_name=轟炸基&player_name=沒轟過"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data.keys()) == ["轟炸基", "沒轟過"]
+    assert data["轟炸基"]["last_homerun"]["id"] == hr.id
+    assert data["沒轟過"] is None
+
+
+def test_get_last_homerun_for_players_defaults_to_target_players(
+    client: TestClient,
+):
+    """[新增] 測試未指定球員時，批次端點預設查詢設定檔中的目標球員。"""
+    response = client.get("/api/analysis/players/last-homerun")
+
+    assert response.status_code == 200
+    assert list(response.json().keys()) == settings.TARGET_PLAYER_NAMES
+
+
+def test_get_situational_at_bats_for_players(
+    client: TestClient, setup_situational_at_bats_data
+):
+    """[新增] 測試批次 /players/situational-at-bats 端點。"""
+    response = client.get(
+        "/api/analysis/players/situational-at-bats"
+        "?situation=scoring_position&player_name=情境打者&player_name=路人"
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert {d["result_short"] for d in data["情境打者"]} == {"一安", "高犧", "滾地"}
+    assert data["情境打者"][0]["opponent_team"] == "統一7-ELEVEn獅"
+    assert data["路人"] == []
+
+
+def test_get_ibb_impact_analysis_for_players(
+    client: TestClient, setup_ibb_impact_test_data
+):
+    """[新增] 測試批次 /players/ibb-impact 端點與單一球員端點結果一致。"""
+    response = client.get(
+        "/api/analysis/players/ibb-impact?player_name=影響者B&player_name=影響者C"
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    single = client.get("/api/analysis/players/影響者B/ibb-impact").json()
+    assert data["影響者B"] == single
+    assert data["影響者C"] == []
@@ -35,6 +35,9 @@ def test_get_today_dashboard_has_games(client: TestClient):
     def override_get_dashboard_service():
         # 這個假的 Service 不需要任何參數，它只做一件事：回傳我們準備好的資料
         class MockDashboardService:
+            def get_today_dashboard_snapshot(self):
+                return None
+
             def get_today_dashboard_data(self):
                 return mock_response_data
 
@@ -95,6 +98,9 @@ def test_get_today_dashboard_no_games(client: TestClient):
     # 2. 定義依賴覆寫
     def override_get_dashboard_service():
         class MockDashboardService:
+            def get_today_dashboard_snapshot(self):
+                return None
+
             def get_today_dashboard_data(self):
                 return mock_response_data
 
@@ -123,3 +129,32 @@ def test_get_today_dashboard_no_games(client: TestClient):
         "target_team_status": None,
     }
     assert response.json() == expected_json
+
+
+def test_get_today_dashboard_serves_snapshot(client: TestClient):
+    """
+    【新增】測試當日快照存在時，端點直接回傳快照內容而不進行即時查詢。
+    """
+    snapshot = '{"status":"NO_TODAY_GAMES","next_game_status":null,"last_target_team_game":null,"target_team_status":null}'
+
+    class MockDashboardService:
+        def get_today_dashboard_snapshot(self):
+            return snapshot
+
+        def get_today_dashboard_data(self):
+            raise AssertionError("快照存在時不應進行即時查詢")
+
+    app.dependency_overrides[get_dashboard_service] = lambda: MockDashboardService()
+
+    response = client.get("/api/dashboard/today")
+
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "status": "NO_TODAY_GAMES",
+        "next_game_status": None,
+        "last_target_team_game": None,
+        "target_team_status": None,
+    }
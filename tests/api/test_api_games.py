@@ -4,9 +4,11 @@ import datetime
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
+from app.api import games as games_api
 from app.crud import games
 from app import models
 from app.exceptions import APIErrorCode
+from tests.factories import add_with_dimension_ids
 
 
 def test_get_games_by_date_success(client: TestClient, db_session: Session):
@@ -87,29 +89,38 @@ def setup_game_detail_data(db_session: Session) -> models.GameResultDB:
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summary1 = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="測試員API_1", team_name="測試隊"
     )
-    db_session.add(summary1)
+    add_with_dimension_ids(db_session, summary1)
     db_session.flush()
     detail1_1 = models.AtBatDetailDB(
-        player_game_summary_id=summary1.id, sequence_in_game=1, result_short="全壘打"
+        player_game_summary_id=summary1.id,
+        game_id=game.id,
+        sequence_in_game=1,
+        result_short="全壘打",
     )
     detail1_2 = models.AtBatDetailDB(
-        player_game_summary_id=summary1.id, sequence_in_game=2, result_short="三振"
+        player_game_summary_id=summary1.id,
+        game_id=game.id,
+        sequence_in_game=2,
+        result_short="三振",
     )
     db_session.add_all([detail1_1, detail1_2])
 
     summary2 = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="測試員API_2", team_name="測試隊"
     )
-    db_session.add(summary2)
+    add_with_dimension_ids(db_session, summary2)
     db_session.flush()
     detail2_1 = models.AtBatDetailDB(
-        player_game_summary_id=summary2.id, sequence_in_game=1, result_short="一壘安打"
+        player_game_summary_id=summary2.id,
+        game_id=game.id,
+        sequence_in_game=1,
+        result_short="一壘安打",
     )
     db_session.add(detail2_1)
 
@@ -140,6 +151,88 @@ def test_get_game_details_success(client: TestClient, db_session: Session):
     assert player2_summary["at_bat_details"][0]["result_short"] == "一壘安打"
 
 
+def test_get_game_details_detail_levels(client: TestClient, db_session: Session):
+    """[新增] 測試 /details 預設不回傳打席大型文字欄位，detail=full 時才包含。"""
+    game = setup_game_detail_data(db_session)
+    detail = db_session.query(models.AtBatDetailDB).first()
+    detail.result_description_full = "擊出左外野全壘打。"
+    detail.pitch_sequence_details = '[{"num": 1, "desc": "好球"}]'
+    db_session.commit()
+
+    summary_response = client.get(f"/api/games/details/{game.id}")
+    full_response = client.get(f"/api/games/details/{game.id}?detail=full")
+
+    assert summary_response.status_code == 200
+    assert full_response.status_code == 200
+    summary_at_bats = [
+        ab
+        for p in summary_response.json()["player_summaries"]
+        for ab in p["at_bat_details"]
+    ]
+    full_at_bats = {
+        ab["id"]: ab
+        for p in full_response.json()["player_summaries"]
+        for ab in p["at_bat_details"]
+    }
+    assert all(ab["pitch_sequence_details"] is None for ab in summary_at_bats)
+    assert all(ab["result_description_full"] is None for ab in summary_at_bats)
+    assert full_at_bats[detail.id]["result_description_full"] == "擊出左外野全壘打。"
+    assert full_at_bats[detail.id]["pitch_sequence_details"] == (
+        '[{"num": 1, "desc": "好球"}]'
+    )
+
+
+def test_get_game_details_serves_precomputed_document(
+    client: TestClient, db_session: Session
+):
+    """[新增] 測試 /details 優先回傳預先渲染的文件，且內容與即時組合的結果一致。"""
+    game = setup_game_detail_data(db_session)
+    orm_summary = client.get(f"/api/games/details/{game.id}").json()
+    orm_full = client.get(f"/api/games/details/{game.id}?detail=full").json()
+
+    assert games.store_game_detail_documents(db_session, game.id) is True
+    db_session.commit()
+
+    response = client.get(f"/api/games/details/{game.id}")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == orm_summary
+    assert client.get(f"/api/games/details/{game.id}?detail=full").json() == orm_full
+
+    # 客戶端不支援 gzip 時，回傳解壓縮後的 JSON
+    plain_response = client.get(
+        f"/api/games/details/{game.id}", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in plain_response.headers
+    assert plain_response.json() == orm_summary
+
+    refused = client.get(
+        f"/api/games/details/{game.id}", headers={"Accept-Encoding": "gzip;q=0"}
+    )
+    assert "content-encoding" not in refused.headers
+    assert refused.json() == orm_summary
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.5", True),
+        ("GZIP", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, *;q=1", False),
+        ("*;q=0", False),
+        ("deflate, br", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_respects_q_values(accept_encoding, expected):
+    """[新增] 測試依 Accept-Encoding 的 q 值判斷是否回傳 gzip 內容。"""
+    assert games_api._accepts_gzip(accept_encoding) is expected
+
+
 def test_get_game_details_not_found(client: TestClient):
     """測試查詢不存在的比賽 ID 時返回 404"""
     response = client.get("/api/games/details/9999")
@@ -157,7 +250,7 @@ def test_get_game_details_no_player_data(client: TestClient, db_session: Session
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.commit()
 
     response = client.get(f"/api/games/details/{game.id}")
@@ -177,12 +270,12 @@ def test_get_game_details_player_with_no_at_bats(
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
     summary = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="代跑哥", team_name="測試隊"
     )
-    db_session.add(summary)
+    add_with_dimension_ids(db_session, summary)
     db_session.commit()
 
     response = client.get(f"/api/games/details/{game.id}")
@@ -229,7 +322,7 @@ def setup_season_games(db_session: Session):
             status="已完成",
         ),
     ]
-    db_session.add_all(games_to_create)
+    add_with_dimension_ids(db_session, games_to_create)
     db_session.commit()
     # 使用 yield 將控制權交還給測試函式
     yield
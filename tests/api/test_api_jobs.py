@@ -85,6 +85,49 @@ def test_update_schedule_manually(authenticated_client: TestClient, mocker):
     mock_task.send.assert_called_once()
 
 
+def test_get_crawl_plan_returns_dry_run_report(
+    authenticated_client: TestClient, mocker
+):
+    """[新增] 測試 /api/crawl_plan 回傳補爬計畫報告，且不分派任何任務。"""
+    mock_build = mocker.patch("app.api.jobs.crawl_planner.build_crawl_plan")
+    mock_build.return_value = {
+        "year": 2025,
+        "checked_games": 2,
+        "planned_games": 1,
+        "reasons": {"missing": 1},
+        "games": [
+            {
+                "cpbl_game_id": "176",
+                "game_date": "2025-08-12",
+                "game_time": "18:35",
+                "home_team": "台鋼雄鷹",
+                "away_team": "樂天桃猿",
+                "reason": "missing",
+            }
+        ],
+    }
+    mock_task = mocker.patch("app.api.jobs.task_run_crawl_plan")
+
+    response = authenticated_client.get("/api/crawl_plan?year=2025")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["planned_games"], data["reasons"]) == (1, {"missing": 1})
+    assert data["games"][0]["cpbl_game_id"] == "176"
+    assert mock_build.call_args.args[1] == 2025
+    mock_task.send.assert_not_called()
+
+
+def test_run_crawl_plan(authenticated_client: TestClient, mocker):
+    """[新增] 測試 POST /api/crawl_plan 分派補爬計畫任務。"""
+    mock_task = mocker.patch("app.api.jobs.task_run_crawl_plan")
+
+    response = authenticated_client.post("/api/crawl_plan?year=2025")
+
+    assert response.status_code == 202
+    mock_task.send.assert_called_once_with("2025")
+
+
 # --- API 金鑰保護 ---
 
 
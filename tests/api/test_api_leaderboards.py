@@ -0,0 +1,58 @@
+# tests/api/test_api_leaderboards.py
+
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+
+from app.crud import players
+
+
+@freeze_time("2025-06-01")
+def test_get_leaderboard_defaults(client: TestClient, db_session: Session):
+    """測試 /api/leaderboards 預設為今年的 OPS 規定打席排行。"""
+    players.store_player_season_stats_and_history(
+        db_session,
+        [
+            {
+                "player_name": "規定打席球員",
+                "team_name": "測試隊",
+                "games_played": 20,
+                "plate_appearances": 80,
+                "ops": 0.850,
+                "homeruns": 2,
+            },
+            {
+                "player_name": "替補球員",
+                "team_name": "測試隊",
+                "games_played": 5,
+                "plate_appearances": 10,
+                "ops": 1.500,
+                "homeruns": 3,
+            },
+        ],
+    )
+    db_session.commit()
+
+    response = client.get("/api/leaderboards")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["season"] == 2025
+    assert data["stat"] == "ops"
+    assert data["qualified_only"] is True
+    assert [row["player_name"] for row in data["leaders"]] == ["規定打席球員"]
+    assert data["leaders"][0]["team_games"] == 20
+
+    # 計數數據預設不限規定打席
+    homeruns = client.get("/api/leaderboards?stat=homeruns&limit=5").json()
+    assert homeruns["qualified_only"] is False
+    assert [row["player_name"] for row in homeruns["leaders"]] == [
+        "替補球員",
+        "規定打席球員",
+    ]
+
+
+def test_get_leaderboard_invalid_stat(client: TestClient):
+    """測試不支援的數據項目會回傳 422。"""
+    response = client.get("/api/leaderboards?stat=era")
+    assert response.status_code == 422
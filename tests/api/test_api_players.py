@@ -4,6 +4,8 @@ import datetime
 from fastapi.testclient import TestClient
 
 from app import models
+from app.crud import dimensions
+from tests.factories import add_with_dimension_ids
 
 
 def test_get_player_stats_history_single_player(client: TestClient, db_session):
@@ -12,12 +14,13 @@ def test_get_player_stats_history_single_player(client: TestClient, db_session):
     """
     # 準備資料
     player_name = "測試球員A"
-    db_session.add(
+    add_with_dimension_ids(
+        db_session,
         models.PlayerSeasonStatsHistoryDB(
             player_name=player_name,
             created_at=datetime.datetime(2025, 8, 1, 10, 0, 0),
             hits=10,
-        )
+        ),
     )
     db_session.commit()
 
@@ -57,7 +60,7 @@ def test_get_player_stats_history_multiple_players(client: TestClient, db_sessio
             avg=0.310,
         ),
     ]
-    db_session.add_all(records)
+    add_with_dimension_ids(db_session, records)
     db_session.commit()
 
     # 執行 API 請求
@@ -100,7 +103,7 @@ def test_get_player_stats_history_with_date_filter(client: TestClient, db_sessio
             hits=52,
         ),
     ]
-    db_session.add_all(records)
+    add_with_dimension_ids(db_session, records)
     db_session.commit()
 
     # 執行 API 請求 (只查詢 8/1 當天)
@@ -125,3 +128,160 @@ def test_get_player_stats_history_player_not_found(client: TestClient):
 
     assert response.status_code == 404
     assert response.json()["code"] == "PLAYER_NOT_FOUND"
+
+
+def _create_game_log_data(db_session):
+    """建立逐場紀錄 API 測試所需的比賽與球員資料。"""
+    for i, player_hits in enumerate([(1, 2), (3, 0)]):
+        game = models.GameResultDB(
+            cpbl_game_id=f"API_LOG_{i}",
+            game_date=datetime.date(2025, 5, 1 + i),
+            home_team="中信兄弟",
+            away_team="台鋼雄鷹",
+        )
+        add_with_dimension_ids(db_session, game)
+        db_session.flush()
+        for player_name, hits in zip(["王柏融", "陳傑憲"], player_hits):
+            add_with_dimension_ids(
+                db_session,
+                models.PlayerGameSummaryDB(
+                    game_id=game.id,
+                    player_name=player_name,
+                    team_name="台鋼雄鷹",
+                    plate_appearances=4,
+                    at_bats=4,
+                    hits=hits,
+                ),
+            )
+    db_session.commit()
+
+
+def test_get_player_game_log(client: TestClient, db_session):
+    """測試單一球員的逐場紀錄端點回傳球季累積與滾動數據。"""
+    _create_game_log_data(db_session)
+
+    response = client.get("/api/players/王柏融/game-log?year=2025&windows=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["opponent_team"] == "中信兄弟"
+    assert data[1]["season_to_date"]["hits"] == 4
+    assert data[1]["rolling"]["last_1"]["hits"] == 3
+    assert data[1]["rolling"]["last_1"]["avg"] == 0.75
+
+
+def test_get_players_game_logs_batch(client: TestClient, db_session):
+    """測試批次逐場紀錄端點一次回傳多位球員，並依球員姓名分組。"""
+    _create_game_log_data(db_session)
+
+    response = client.get(
+        "/api/players/game-log?player_name=王柏融&player_name=陳傑憲&year=2025"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data.keys()) == {"王柏融", "陳傑憲"}
+    assert set(data["陳傑憲"][-1]["rolling"].keys()) == {"last_7", "last_15"}
+    assert data["陳傑憲"][-1]["season_to_date"]["hits"] == 2
+
+
+def test_get_player_game_log_invalid_window(client: TestClient, db_session):
+    """測試滾動區間超出範圍時應回傳 400。"""
+    response = client.get("/api/players/王柏融/game-log?year=2025&windows=0")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "INVALID_INPUT"
+
+
+def test_get_player_game_log_not_found(client: TestClient):
+    """測試查詢沒有任何逐場紀錄的球員時應回傳 404。"""
+    response = client.get("/api/players/不存在的球員/game-log?year=2025")
+
+    assert response.status_code == 404
+    assert response.json()["code"] == "PLAYER_NOT_FOUND"
+
+
+def test_get_player_game_log_unknown_player_skips_query(client: TestClient, mocker):
+    """測試球員名稱不在索引中時直接回傳 404，不執行逐場紀錄查詢。"""
+    mock_game_logs = mocker.patch("app.api.players.crud_players.get_player_game_logs")
+
+    response = client.get("/api/players/不存在的球員/game-log?year=2025")
+
+    assert response.status_code == 404
+    mock_game_logs.assert_not_called()
+
+
+# --- [新增] 球員名稱搜尋 ---
+
+
+def test_search_players(client: TestClient, db_session):
+    """測試球員搜尋端點支援名稱與拼音前綴，並套用筆數上限。"""
+    dimensions.get_or_create_player_ids(db_session, ["王柏融", "王博玄", "魔鷹"])
+    db_session.commit()
+
+    response = client.get("/api/players/search", params={"q": "wang"})
+    assert response.status_code == 200
+    assert response.json() == [{"name": "王博玄"}, {"name": "王柏融"}]
+
+    response = client.get("/api/players/search", params={"q": "魔", "limit": 1})
+    assert response.json() == [{"name": "魔鷹"}]
+
+    response = client.get("/api/players/search", params={"q": ""})
+    assert response.status_code == 422
+
+
+# --- [新增] 進階數據 ---
+
+
+def test_get_players_advanced_stats(client: TestClient, db_session):
+    """測試進階數據端點依分項與最少打席篩選，並附上聯盟常數。"""
+    add_with_dimension_ids(
+        db_session,
+        [
+            models.LeagueBattingConstantsDB(
+                season=2025, plate_appearances=300, lg_obp=0.33, woba_scale=1.2
+            ),
+            models.PlayerAdvancedStatsDB(
+                season=2025,
+                split="season",
+                player_name="主力打者",
+                plate_appearances=200,
+                woba=0.380,
+                ops_plus=135.0,
+            ),
+            models.PlayerAdvancedStatsDB(
+                season=2025,
+                split="season",
+                player_name="替補打者",
+                plate_appearances=20,
+                woba=0.410,
+            ),
+            models.PlayerAdvancedStatsDB(
+                season=2025,
+                split="home",
+                player_name="主力打者",
+                plate_appearances=100,
+                woba=0.400,
+            ),
+        ],
+    )
+    db_session.commit()
+
+    response = client.get("/api/players/advanced-stats?season=2025")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["league"]["lg_obp"] == 0.33
+    # 依 wOBA 由高至低排序
+    assert [p["player_name"] for p in data["players"]] == ["替補打者", "主力打者"]
+
+    filtered = client.get(
+        "/api/players/advanced-stats?season=2025&split=home&min_pa=50"
+    ).json()
+    assert filtered["split"] == "home"
+    assert [(p["player_name"], p["woba"]) for p in filtered["players"]] == [
+        ("主力打者", 0.4)
+    ]
+
+    empty = client.get("/api/players/advanced-stats?season=2020").json()
+    assert empty == {"season": 2020, "split": "season", "league": None, "players": []}
@@ -0,0 +1,96 @@
+# tests/api/test_api_standings.py
+
+import datetime
+
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud import standings
+
+
+def _record(db_session: Session, game_id, game_date, home_score, away_score):
+    standings.record_game_result(
+        db_session,
+        {
+            "cpbl_game_id": game_id,
+            "game_date": game_date,
+            "home_team": "測試主隊",
+            "away_team": "測試客隊",
+            "home_score": home_score,
+            "away_score": away_score,
+            "status": "已完成",
+        },
+    )
+    db_session.commit()
+
+
+def test_get_standings_with_as_of(client: TestClient, db_session: Session):
+    """測試 /api/standings 依賽季與截止日期回傳戰績排行。"""
+    _record(db_session, "S1", "2025-05-01", 5, 2)
+    _record(db_session, "S2", "2025-05-02", 1, 3)
+    _record(db_session, "S3", "2025-05-03", 1, 3)
+
+    response = client.get("/api/standings?season=2025&as_of=2025-05-02")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["season"] == 2025
+    assert data["as_of_date"] == "2025-05-02"
+    assert [row["team_name"] for row in data["standings"]] == ["測試主隊", "測試客隊"]
+    home_team = data["standings"][0]
+    assert home_team["wins"] == 1 and home_team["losses"] == 1
+    assert home_team["games_behind"] == 0
+    assert home_team["run_differential"] == 1
+    assert home_team["current_streak_description"] == "1連敗"
+
+    latest = client.get("/api/standings?season=2025").json()
+    assert latest["as_of_date"] is None
+    assert latest["standings"][0]["team_name"] == "測試客隊"
+    assert latest["standings"][0]["current_streak_description"] == "2連勝"
+
+
+@freeze_time("2025-06-01")
+def test_get_standings_defaults_to_current_season(
+    client: TestClient, db_session: Session
+):
+    """測試未指定賽季時預設為今年，沒有資料時回傳空的排行。"""
+    _record(db_session, "OLD", "2024-05-01", 5, 2)
+
+    response = client.get("/api/standings")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "season": 2025,
+        "as_of_date": None,
+        "is_complete": False,
+        "standings": [],
+    }
+
+
+def test_get_standings_flags_incomplete_ledger(client: TestClient, db_session: Session):
+    """[新增] 測試帳本少於整季賽程的已完成場數 (尚未回填) 時，標示為不完整。"""
+    _record(db_session, "S2", "2025-05-02", 1, 3)
+    for game_id, day in [("S1", 1), ("S2", 2)]:
+        db_session.add(
+            models.SeasonScheduleGameDB(
+                season=2025,
+                cpbl_game_id=game_id,
+                game_date=datetime.date(2025, 5, day),
+                home_team="測試主隊",
+                away_team="測試客隊",
+                status="已完成",
+            )
+        )
+    db_session.commit()
+
+    data = client.get("/api/standings?season=2025").json()
+    assert data["is_complete"] is False
+    assert [row["is_complete"] for row in data["standings"]] == [False, False]
+
+    _record(db_session, "S1", "2025-05-01", 5, 2)
+
+    data = client.get("/api/standings?season=2025").json()
+    assert data["is_complete"] is True
+    assert [row["is_complete"] for row in data["standings"]] == [True, True]
@@ -2,7 +2,7 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import logging.config
 from sqlalchemy.pool import StaticPool
@@ -19,7 +19,7 @@ def pytest_collection_modifyitems(config, items):
 
 
 @pytest.fixture(scope="function", autouse=True)
-def apply_test_settings(monkeypatch, request):
+def apply_test_settings(monkeypatch, request, tmp_path):
     """
     為每個測試函式設定必要的環境變數。
     此 fixture 會檢查測試是否有 'e2e' 標記。
@@ -33,6 +33,17 @@ def apply_test_settings(monkeypatch, request):
         monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
         monkeypatch.setenv("DRAMATIQ_BROKER_URL", "redis://localhost:6379/0")
         monkeypatch.setenv("API_KEY", "test-api-key-for-pytest")
+        # [新增] 打席欄式快照一律寫入暫存目錄，避免讀到本機已發布的快照
+        from app.config import settings
+
+        monkeypatch.setattr(
+            settings, "AT_BAT_COLUMNS_DIR", str(tmp_path / "at_bat_columns")
+        )
+        monkeypatch.setattr(
+            settings, "READ_SNAPSHOT_PATH", str(tmp_path / "read_snapshot.sqlite3")
+        )
+        # [新增] 單元測試不需等待爬蟲請求間隔
+        monkeypatch.setattr(settings, "SCRAPER_MIN_REQUEST_INTERVAL", 0.0)
         yield
 
 
@@ -48,32 +59,8 @@ def engine():
 
 @pytest.fixture(scope="session")
 def TestingSessionLocal(engine):
-    """
-    根據測試 engine 建立 sessionmaker。
-    為了讓未重構的測試通過，暫時還原事件監聽器。
-    """
-    from app.models import AtBatDetailDB, PlayerGameSummaryDB
-
-    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    def before_flush_listener(session, flush_context, instances):
-        """
-        在 session flush 到資料庫前，自動為新的 AtBatDetailDB 物件
-        回填 denormalized 的 game_id，以修復因模型變更導致的單元測試失效。
-        """
-        for instance in session.new:
-            if isinstance(instance, AtBatDetailDB) and not instance.game_id:
-                if instance.player_summary:
-                    instance.game_id = instance.player_summary.game_id
-                elif instance.player_game_summary_id:
-                    summary = session.get(
-                        PlayerGameSummaryDB, instance.player_game_summary_id
-                    )
-                    if summary:
-                        instance.game_id = summary.game_id
-
-    event.listen(Session, "before_flush", before_flush_listener)
-    return Session
+    """根據測試 engine 建立 sessionmaker。"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture
@@ -98,10 +85,17 @@ def setup_database(engine):
     在每個測試函式執行前後，自動建立和銷毀所有資料庫資料表。
     """
     from app.db import Base
+    from app.crud import dimensions
+    from app.services import player_index
 
+    # 每個測試重建資料表後維度 id 會改變，需清除名稱 -> id 快取與球員名稱索引
+    dimensions.clear_cache()
+    player_index.invalidate()
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    dimensions.clear_cache()
+    player_index.invalidate()
 
 
 @pytest.fixture(scope="function")
@@ -125,7 +119,7 @@ def client(monkeypatch, TestingSessionLocal, setup_database):
     提供一個 FastAPI TestClient。
     """
     from app.main import app
-    from app.db import get_db
+    from app.db import get_db, get_read_db
 
     monkeypatch.setattr(logging.config, "dictConfig", lambda *args, **kwargs: None)
 
@@ -137,6 +131,7 @@ def client(monkeypatch, TestingSessionLocal, setup_database):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,132 @@
+# tests/core/test_box_api.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.core import box_api
+from app.exceptions import FatalScraperError, RetryableScraperError
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """以錄製的 fixture 模擬網站：GET /box 回傳含 token 的頁面，POST /box/getlive 回傳比賽資料。"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        site = self.server.site
+        site["requests"].append(("GET", self.path))
+        page = (FIXTURES_DIR / "box_token_page.html").read_text(encoding="utf-8")
+        self._send(
+            200,
+            page.replace("fixture-token-123", site["token"]).encode("utf-8"),
+            "text/html; charset=utf-8",
+            {
+                "Set-Cookie": f"__RequestVerificationToken_Cookie={site['token']}; Path=/"
+            },
+        )
+
+    def do_POST(self):
+        site = self.server.site
+        length = int(self.headers.get("Content-Length", 0))
+        form = {
+            key: values[0]
+            for key, values in parse_qs(self.rfile.read(length).decode()).items()
+        }
+        site["requests"].append(("POST", self.path, form))
+        if site["status"] != 200:
+            self._send(site["status"], b"error", "text/plain")
+            return
+        cookie = self.headers.get("Cookie", "")
+        if (
+            form.get("__RequestVerificationToken") != site["token"]
+            or site["token"] not in cookie
+        ):
+            self._send(400, b"bad token", "text/plain")
+            return
+        body = (FIXTURES_DIR / "box_getlive.json").read_bytes()
+        self._send(200, body, "application/json; charset=utf-8")
+
+
+@pytest.fixture
+def stand_in_site():
+    """在本機背景執行緒啟動替身伺服器，回傳其狀態 (token / status / 請求紀錄) 與網址。"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.site = {"token": "token-1", "status": 200, "requests": []}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    box_api.close_sessions()
+    host, port = server.server_address
+    yield server.site, f"http://{host}:{port}/box?year=2025&kindCode=A&gameSno=1"
+    box_api.close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_game_data_performs_token_handshake(stand_in_site):
+    """測試先取得頁面的驗證 token 與 cookie，再 POST 至資料端點，並解碼 *Json 欄位。"""
+    site, box_score_url = stand_in_site
+
+    data = box_api.fetch_game_data(box_score_url)
+
+    assert data["Success"] is True
+    assert data["GameDetailJson"][0]["HomeTeamName"] == "台鋼雄鷹"
+    assert isinstance(data["LiveLogJson"], list)
+    assert [request[0] for request in site["requests"]] == ["GET", "POST"]
+    assert site["requests"][1][2] == {
+        "__RequestVerificationToken": "token-1",
+        "GameSno": "1",
+        "KindCode": "A",
+        "Year": "2025",
+    }
+
+    # 同一執行緒的下一場比賽沿用已取得的 token，不需再載入頁面
+    box_api.fetch_game_data(box_score_url.replace("gameSno=1", "gameSno=2"))
+    assert [request[0] for request in site["requests"]] == ["GET", "POST", "POST"]
+
+
+def test_fetch_game_data_refreshes_expired_token(stand_in_site):
+    """測試 token 過期被拒絕時，會重新取得 token 後重試一次。"""
+    site, box_score_url = stand_in_site
+    box_api.fetch_game_data(box_score_url)
+    site["token"] = "token-2"
+    site["requests"].clear()
+
+    data = box_api.fetch_game_data(box_score_url)
+
+    assert data["Success"] is True
+    assert [request[0] for request in site["requests"]] == ["POST", "GET", "POST"]
+    assert site["requests"][2][2]["__RequestVerificationToken"] == "token-2"
+
+
+@pytest.mark.parametrize(
+    "status, error", [(503, RetryableScraperError), (404, FatalScraperError)]
+)
+def test_fetch_game_data_maps_http_errors(stand_in_site, status, error):
+    """測試資料端點的 5xx 錯誤可重試，其他錯誤不可重試。"""
+    site, box_score_url = stand_in_site
+    site["status"] = status
+
+    with pytest.raises(error):
+        box_api.fetch_game_data(box_score_url)
+
+
+def test_fetch_game_data_requires_game_params():
+    """測試 Box Score URL 缺少比賽參數時直接拋出 FatalScraperError。"""
+    with pytest.raises(FatalScraperError, match="gamesno"):
+        box_api.fetch_game_data("http://127.0.0.1/box?year=2025&kindCode=A")
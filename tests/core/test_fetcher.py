@@ -71,8 +71,8 @@ def test_get_static_page_content_raises_retryable_on_request_exception(mocker):
 
 def test_get_dynamic_page_content_raises_retryable_on_timeout(mocker):
     """測試 get_dynamic_page_content 在遇到 Playwright 超時錯誤時拋出 RetryableScraperError。"""
-    mock_playwright_context = mocker.patch("app.core.fetcher.sync_playwright")
-    mock_page = mock_playwright_context.return_value.__enter__.return_value.chromium.launch.return_value.new_page.return_value
+    mock_get_page = mocker.patch("app.core.fetcher.get_page")
+    mock_page = mock_get_page.return_value.__enter__.return_value
     mock_page.goto.side_effect = PlaywrightTimeoutError("Page load timed out")
 
     with pytest.raises(RetryableScraperError, match="發生超時"):
@@ -81,8 +81,8 @@ def test_get_dynamic_page_content_raises_retryable_on_timeout(mocker):
 
 def test_fetch_schedule_page_raises_fatal_on_playwright_error(mocker):
     """測試 fetch_schedule_page 在遇到 Playwright 嚴重錯誤時拋出 FatalScraperError。"""
-    mock_playwright_context = mocker.patch("app.core.fetcher.sync_playwright")
-    mock_playwright_context.return_value.__enter__.return_value.chromium.launch.side_effect = PlaywrightError(
+    mock_get_page = mocker.patch("app.core.fetcher.get_page")
+    mock_get_page.return_value.__enter__.side_effect = PlaywrightError(
         "Browser could not be started"
     )
 
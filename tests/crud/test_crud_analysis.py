@@ -6,7 +6,9 @@ import pytest
 from sqlalchemy.orm import Session
 
 from app import models
+from app.crud.players import build_position_appearances
 from app.crud import analysis
+from tests.factories import add_with_dimension_ids
 
 
 # --- 測試資料設定 Fixture ---
@@ -21,7 +23,7 @@ def setup_streak_test_data(db_session: Session):
         home_team="台鋼雄鷹",
         away_team="樂天桃猿",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summaries = {}
@@ -33,12 +35,13 @@ def setup_streak_test_data(db_session: Session):
             batting_order=order,
             team_name="台鋼雄鷹",
         )
-        db_session.add(summary)
+        add_with_dimension_ids(db_session, summary)
         summaries[name] = summary
     db_session.flush()
 
     # [修正] 補上球員 E 和 F 的打席紀錄
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.AtBatDetailDB(
                 player_game_summary_id=summaries["A"].id,
@@ -82,7 +85,7 @@ def setup_streak_test_data(db_session: Session):
                 sequence_in_game=6,
                 result_short="一安",
             ),
-        ]
+        ],
     )
     db_session.commit()
     return game
@@ -97,7 +100,7 @@ def setup_ibb_impact_test_data(db_session: Session):
         home_team="味全龍",
         away_team="中信兄弟",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summaries = {}
@@ -109,12 +112,13 @@ def setup_ibb_impact_test_data(db_session: Session):
             batting_order=order,
             team_name="味全龍",
         )
-        db_session.add(summary)
+        add_with_dimension_ids(db_session, summary)
         summaries[name] = summary
     db_session.flush()
 
     # [修正] 補上第 2 局的 IBB 事件，使其與 API 測試資料一致
-    db_session.add_all(
+    add_with_dimension_ids(
+        db_session,
         [
             models.AtBatDetailDB(
                 player_game_summary_id=summaries["A"].id,
@@ -159,7 +163,7 @@ def setup_ibb_impact_test_data(db_session: Session):
                 inning=2,
                 result_short="三振",
             ),
-        ]
+        ],
     )
     db_session.commit()
     return game
@@ -186,45 +190,48 @@ def setup_position_analysis_data(db_session: Session):
         home_team="中信兄弟",
         away_team="味全龍",
     )
-    db_session.add_all([game1, game2, game_other_year])
+    add_with_dimension_ids(db_session, [game1, game2, game_other_year])
     db_session.flush()
 
-    db_session.add_all(
-        [
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="工具人",
-                team_name="中信兄弟",
-                position="2B,SS",
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game2.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game_other_year.id,
-                player_name="游擊大師",
-                team_name="中信兄弟",
-                position="SS",
-            ),
-            models.PlayerGameSummaryDB(
-                game_id=game1.id,
-                player_name="角落砲",
-                team_name="中信兄弟",
-                position="LF",
-            ),
-        ]
-    )
-
-    db_session.add_all(
+    summaries = [
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="工具人",
+            team_name="中信兄弟",
+            position="2B,SS",
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game2.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game_other_year.id,
+            player_name="游擊大師",
+            team_name="中信兄弟",
+            position="SS",
+        ),
+        models.PlayerGameSummaryDB(
+            game_id=game1.id,
+            player_name="角落砲",
+            team_name="中信兄弟",
+            position="LF",
+        ),
+    ]
+    # [新增] 同步建立正規化的守備位置出場紀錄，與寫入流程一致
+    for summary in summaries:
+        summary.positions = build_position_appearances(summary)
+    add_with_dimension_ids(db_session, summaries)
+
+    add_with_dimension_ids(
+        db_session,
         [
             models.PlayerSeasonStatsDB(player_name="游擊大師", at_bats=100, hits=30),
             models.PlayerSeasonStatsDB(player_name="工具人", at_bats=50, hits=15),
@@ -232,7 +239,7 @@ def setup_position_analysis_data(db_session: Session):
                 player_name="游擊大師", position="SS", errors=2
             ),
             models.PlayerFieldingStatsDB(player_name="工具人", position="2B", errors=1),
-        ]
+        ],
     )
     db_session.commit()
 
@@ -254,13 +261,13 @@ def test_find_games_with_players(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add_all([g1, g2])
+    add_with_dimension_ids(db_session, [g1, g2])
     db_session.flush()
     s1a = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員A", position="RF")
     s1b = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員B", position="PH")
     s2a = models.PlayerGameSummaryDB(game_id=g2.id, player_name="球員A", position="RF")
     s2c = models.PlayerGameSummaryDB(game_id=g2.id, player_name="球員C", position="LF")
-    db_session.add_all([s1a, s1b, s2a, s2c])
+    add_with_dimension_ids(db_session, [s1a, s1b, s2a, s2c])
     db_session.commit()
 
     games1 = analysis.find_games_with_players(db_session, ["球員A", "球員B"])
@@ -294,7 +301,7 @@ def test_get_stats_since_last_homerun(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add_all([g1, g2_hr, g3_after])
+    add_with_dimension_ids(db_session, [g1, g2_hr, g3_after])
     db_session.flush()
     s1 = models.PlayerGameSummaryDB(game_id=g1.id, player_name="轟炸基", at_bats=4)
     s2_hr = models.PlayerGameSummaryDB(
@@ -303,7 +310,7 @@ def test_get_stats_since_last_homerun(db_session: Session):
     s3_after = models.PlayerGameSummaryDB(
         game_id=g3_after.id, player_name="轟炸基", at_bats=3
     )
-    db_session.add_all([s1, s2_hr, s3_after])
+    add_with_dimension_ids(db_session, [s1, s2_hr, s3_after])
     db_session.flush()
     hr1 = models.AtBatDetailDB(
         player_game_summary_id=s1.id, game_id=g1.id, result_description_full="全壘打"
@@ -313,7 +320,7 @@ def test_get_stats_since_last_homerun(db_session: Session):
         game_id=g2_hr.id,
         result_description_full="關鍵全壘打",
     )
-    db_session.add_all([hr1, hr2])
+    add_with_dimension_ids(db_session, [hr1, hr2])
     db_session.commit()
 
     with patch("app.crud.analysis.datetime.date") as mock_date:
@@ -341,11 +348,11 @@ def test_get_last_homerun_multiple_in_same_game(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     summary = models.PlayerGameSummaryDB(game_id=game.id, player_name=player_name)
-    db_session.add(summary)
+    add_with_dimension_ids(db_session, summary)
     db_session.flush()
 
     # 同場比賽的三個打席
@@ -367,7 +374,7 @@ def test_get_last_homerun_multiple_in_same_game(db_session: Session):
         sequence_in_game=3,
         result_description_full="再見全壘打",
     )
-    db_session.add_all([ab1_hr, ab2_out, ab3_hr_last])
+    add_with_dimension_ids(db_session, [ab1_hr, ab2_out, ab3_hr_last])
     db_session.commit()
 
     # 執行查詢
@@ -395,33 +402,35 @@ def test_get_last_homerun_no_data(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
 
     # 球員 A (Homerun King)
     summary_a = models.PlayerGameSummaryDB(game_id=game.id, player_name="Homerun King")
-    db_session.add(summary_a)
+    add_with_dimension_ids(db_session, summary_a)
     db_session.flush()
-    db_session.add(
+    add_with_dimension_ids(
+        db_session,
         models.AtBatDetailDB(
             player_game_summary_id=summary_a.id,
             game_id=game.id,
             result_description_full="石破天驚的滿貫全壘打",
-        )
+        ),
     )
 
     # 球員 B (No Homerun Guy)
     summary_b = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="No Homerun Guy"
     )
-    db_session.add(summary_b)
+    add_with_dimension_ids(db_session, summary_b)
     db_session.flush()
-    db_session.add(
+    add_with_dimension_ids(
+        db_session,
         models.AtBatDetailDB(
             player_game_summary_id=summary_b.id,
             game_id=game.id,
             result_description_full="一個平凡的滾地球",
-        )
+        ),
     )
     db_session.commit()
 
@@ -444,10 +453,10 @@ def test_find_at_bats_in_situation(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
     summary = models.PlayerGameSummaryDB(game_id=game.id, player_name="情境男")
-    db_session.add(summary)
+    add_with_dimension_ids(db_session, summary)
     db_session.flush()
     ab1 = models.AtBatDetailDB(
         player_game_summary_id=summary.id,
@@ -464,7 +473,7 @@ def test_find_at_bats_in_situation(db_session: Session):
         game_id=game.id,
         runners_on_base_before="二壘有人",
     )
-    db_session.add_all([ab1, ab2, ab3])
+    add_with_dimension_ids(db_session, [ab1, ab2, ab3])
     db_session.commit()
 
     results_bl = analysis.find_at_bats_in_situation(
@@ -479,6 +488,47 @@ def test_find_at_bats_in_situation(db_session: Session):
     assert len(results_sp) == 2
 
 
+def test_find_at_bats_in_situation_summary_projection(db_session: Session):
+    """[新增] 測試 summary 模式下，SQL 投影不包含打席的大型文字欄位。"""
+    game = models.GameResultDB(
+        cpbl_game_id="G_SIT_PROJ",
+        game_date=datetime.date(2025, 8, 8),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db_session, game)
+    db_session.flush()
+    summary = models.PlayerGameSummaryDB(game_id=game.id, player_name="情境男")
+    add_with_dimension_ids(db_session, summary)
+    db_session.flush()
+    add_with_dimension_ids(
+        db_session,
+        models.AtBatDetailDB(
+            player_game_summary_id=summary.id,
+            game_id=game.id,
+            runners_on_base_before="壘上無人",
+            result_description_full="完整描述",
+            pitch_sequence_details="逐球紀錄",
+        ),
+    )
+    db_session.commit()
+
+    summary_rows = analysis.find_at_bats_in_situation(
+        db_session, "情境男", models.RunnersSituation.BASES_EMPTY
+    )
+    full_rows = analysis.find_at_bats_in_situation(
+        db_session,
+        "情境男",
+        models.RunnersSituation.BASES_EMPTY,
+        detail=models.AtBatDetailLevel.FULL,
+    )
+
+    for column in models.AT_BAT_HEAVY_COLUMNS:
+        assert column not in summary_rows[0]._mapping
+    assert full_rows[0].result_description_full == "完整描述"
+    assert full_rows[0].pitch_sequence_details == "逐球紀錄"
+
+
 def test_get_position_analysis_by_year(
     db_session: Session, setup_position_analysis_data
 ):
@@ -526,12 +576,12 @@ def test_find_next_at_bats_after_ibb(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add(game)
+    add_with_dimension_ids(db_session, game)
     db_session.flush()
     s_A = models.PlayerGameSummaryDB(game_id=game.id, player_name="球員A")
     s_B = models.PlayerGameSummaryDB(game_id=game.id, player_name="球員B")
     s_C = models.PlayerGameSummaryDB(game_id=game.id, player_name="球員C")
-    db_session.add_all([s_A, s_B, s_C])
+    add_with_dimension_ids(db_session, [s_A, s_B, s_C])
     db_session.flush()
     ab1 = models.AtBatDetailDB(
         player_game_summary_id=s_A.id, game_id=game.id, inning=1, result_short="一安"
@@ -554,7 +604,9 @@ def test_find_next_at_bats_after_ibb(db_session: Session):
         inning=2,
         result_description_full="故意四壞",
     )
-    db_session.add_all([ab1, ab2_ibb, ab3_next, ab4_new_inning, ab5_last_ibb])
+    add_with_dimension_ids(
+        db_session, [ab1, ab2_ibb, ab3_next, ab4_new_inning, ab5_last_ibb]
+    )
     db_session.commit()
 
     results = analysis.find_next_at_bats_after_ibb(db_session, "球員B")
@@ -625,11 +677,11 @@ def test_find_games_with_players_eager_loads_summaries(db_session: Session):
         home_team="H",
         away_team="A",
     )
-    db_session.add(g1)
+    add_with_dimension_ids(db_session, g1)
     db_session.flush()
     s1a = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員A")
     s1b = models.PlayerGameSummaryDB(game_id=g1.id, player_name="球員B")
-    db_session.add_all([s1a, s1b])
+    add_with_dimension_ids(db_session, [s1a, s1b])
     db_session.commit()
 
     games = analysis.find_games_with_players(db_session, ["球員A", "球員B"])
@@ -648,17 +700,17 @@ def test_get_stats_since_last_homerun_includes_career_stats(db_session: Session)
         home_team="H",
         away_team="A",
     )
-    db_session.add(g1)
+    add_with_dimension_ids(db_session, g1)
     db_session.flush()
     s1 = models.PlayerGameSummaryDB(game_id=g1.id, player_name="轟炸基", at_bats=4)
-    db_session.add(s1)
+    add_with_dimension_ids(db_session, s1)
     db_session.flush()
     hr1 = models.AtBatDetailDB(
         player_game_summary_id=s1.id, game_id=g1.id, result_description_full="全壘打"
     )
-    db_session.add(hr1)
+    add_with_dimension_ids(db_session, hr1)
     career = models.PlayerCareerStatsDB(player_name="轟炸基", homeruns=100, avg=0.300)
-    db_session.add(career)
+    add_with_dimension_ids(db_session, career)
     db_session.commit()
 
     stats = analysis.get_stats_since_last_homerun(db_session, "轟炸基")
@@ -761,3 +813,155 @@ def test_analyze_ibb_impact_includes_opponent_team(
     results = analysis.analyze_ibb_impact(db=db_session, player_name="影響者B")
     assert len(results) > 0
     assert results[0].opponent_team == "中信兄弟"
+
+
+def test_get_stats_since_last_homerun_for_players(db_session: Session):
+    """[新增] 測試批次查詢多位球員的最後一轟，結果需與單一球員查詢一致。"""
+    freezed_today = datetime.date(2025, 8, 10)
+    g1 = models.GameResultDB(
+        cpbl_game_id="G_BATCH_HR1",
+        game_date=datetime.date(2025, 8, 1),
+        home_team="H",
+        away_team="A",
+    )
+    g2 = models.GameResultDB(
+        cpbl_game_id="G_BATCH_HR2",
+        game_date=datetime.date(2025, 8, 5),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db_session, [g1, g2])
+    db_session.flush()
+    s1_a = models.PlayerGameSummaryDB(game_id=g1.id, player_name="轟炸基", at_bats=4)
+    s2_a = models.PlayerGameSummaryDB(game_id=g2.id, player_name="轟炸基", at_bats=3)
+    s1_b = models.PlayerGameSummaryDB(game_id=g1.id, player_name="長打王", at_bats=4)
+    s2_b = models.PlayerGameSummaryDB(game_id=g2.id, player_name="長打王", at_bats=5)
+    add_with_dimension_ids(db_session, [s1_a, s2_a, s1_b, s2_b])
+    db_session.flush()
+    add_with_dimension_ids(
+        db_session,
+        [
+            models.AtBatDetailDB(
+                player_game_summary_id=s1_a.id,
+                game_id=g1.id,
+                result_description_full="全壘打",
+            ),
+            models.AtBatDetailDB(
+                player_game_summary_id=s2_b.id,
+                game_id=g2.id,
+                sequence_in_game=1,
+                result_description_full="陽春全壘打",
+            ),
+            models.AtBatDetailDB(
+                player_game_summary_id=s2_b.id,
+                game_id=g2.id,
+                sequence_in_game=5,
+                result_description_full="兩分全壘打",
+            ),
+        ],
+    )
+    add_with_dimension_ids(
+        db_session, models.PlayerCareerStatsDB(player_name="長打王", homeruns=30)
+    )
+    db_session.commit()
+
+    with patch("app.crud.analysis.datetime.date") as mock_date:
+        mock_date.today.return_value = freezed_today
+        results = analysis.get_stats_since_last_homerun_for_players(
+            db_session, ["轟炸基", "長打王", "沒轟過"]
+        )
+
+    assert set(results.keys()) == {"轟炸基", "長打王", "沒轟過"}
+    assert results["沒轟過"] is None
+
+    assert results["轟炸基"]["game_date"] == datetime.date(2025, 8, 1)
+    assert results["轟炸基"]["days_since"] == 9
+    assert results["轟炸基"]["games_since"] == 1
+    assert results["轟炸基"]["at_bats_since"] == 3
+    assert results["轟炸基"]["career_stats"] is None
+
+    # 同一場比賽中有多發全壘打時，應取順序最後的一發
+    assert results["長打王"]["last_homerun"].result_description_full == "兩分全壘打"
+    assert results["長打王"]["games_since"] == 0
+    assert results["長打王"]["at_bats_since"] == 0
+    assert results["長打王"]["career_stats"].homeruns == 30
+
+
+def test_find_at_bats_in_situation_for_players(db_session: Session):
+    """[新增] 測試批次情境打席查詢，分頁需分別套用於每位球員。"""
+    game = models.GameResultDB(
+        cpbl_game_id="G_BATCH_SIT",
+        game_date=datetime.date(2025, 8, 8),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db_session, game)
+    db_session.flush()
+    summary_a = models.PlayerGameSummaryDB(game_id=game.id, player_name="情境男")
+    summary_b = models.PlayerGameSummaryDB(game_id=game.id, player_name="情境女")
+    add_with_dimension_ids(db_session, [summary_a, summary_b])
+    db_session.flush()
+    add_with_dimension_ids(
+        db_session,
+        [
+            models.AtBatDetailDB(
+                player_game_summary_id=summary_a.id,
+                game_id=game.id,
+                sequence_in_game=1,
+                runners_on_base_before="二壘有人",
+            ),
+            models.AtBatDetailDB(
+                player_game_summary_id=summary_a.id,
+                game_id=game.id,
+                sequence_in_game=3,
+                runners_on_base_before="一壘、二壘、三壘有人",
+            ),
+            models.AtBatDetailDB(
+                player_game_summary_id=summary_a.id,
+                game_id=game.id,
+                sequence_in_game=5,
+                runners_on_base_before="壘上無人",
+            ),
+            models.AtBatDetailDB(
+                player_game_summary_id=summary_b.id,
+                game_id=game.id,
+                sequence_in_game=2,
+                runners_on_base_before="三壘有人",
+            ),
+        ],
+    )
+    db_session.commit()
+
+    results = analysis.find_at_bats_in_situation_for_players(
+        db_session,
+        ["情境男", "情境女", "路人"],
+        models.RunnersSituation.SCORING_POSITION,
+    )
+    assert [ab.sequence_in_game for ab in results["情境男"]] == [3, 1]
+    assert [ab.sequence_in_game for ab in results["情境女"]] == [2]
+    assert results["路人"] == []
+
+    paged = analysis.find_at_bats_in_situation_for_players(
+        db_session,
+        ["情境男", "情境女"],
+        models.RunnersSituation.SCORING_POSITION,
+        skip=1,
+        limit=1,
+    )
+    assert [ab.sequence_in_game for ab in paged["情境男"]] == [1]
+    assert paged["情境女"] == []
+
+
+def test_analyze_ibb_impact_for_players(
+    db_session: Session, setup_ibb_impact_test_data
+):
+    """[新增] 測試批次故意四壞影響分析，結果需與單一球員查詢一致。"""
+    results = analysis.analyze_ibb_impact_for_players(
+        db=db_session, player_names=["影響者B", "影響者A"]
+    )
+    single = analysis.analyze_ibb_impact(db=db_session, player_name="影響者B")
+
+    assert [r.model_dump() for r in results["影響者B"]] == [
+        r.model_dump() for r in single
+    ]
+    assert results["影響者A"] == []
@@ -0,0 +1,177 @@
+# tests/crud/test_crud_dimensions.py
+
+import datetime
+
+from app import models
+from app.crud import dimensions, games, players
+from app.services import data_persistence
+
+
+def test_get_or_create_player_ids_creates_each_name_once(db_session):
+    """測試寫入時的名稱解析只會為新名稱建立一次維度資料。"""
+    first = dimensions.get_or_create_player_ids(db_session, ["王柏融", "魔鷹", None])
+    second = dimensions.get_or_create_player_ids(db_session, ["魔鷹", "吳念庭"])
+    db_session.commit()
+
+    assert set(first) == {"王柏融", "魔鷹"}
+    assert second["魔鷹"] == first["魔鷹"]
+    assert db_session.query(models.PlayerDB).count() == 3
+
+
+def test_resolve_player_ids_caches_known_names_only(db_session):
+    """測試查詢時的名稱解析會快取已知名稱，查無的名稱不快取也不建立。"""
+    ids = dimensions.get_or_create_player_ids(db_session, ["王柏融"])
+    db_session.commit()
+
+    assert dimensions.resolve_player_ids(db_session, ["王柏融", "不存在"]) == [
+        ids["王柏融"]
+    ]
+    assert db_session.query(models.PlayerDB).count() == 1
+
+    # 之後新增的球員仍可被查到
+    dimensions.get_or_create_player_ids(db_session, ["不存在"])
+    db_session.commit()
+    assert len(dimensions.resolve_player_ids(db_session, ["不存在"])) == 1
+
+    # 已快取的名稱不需再查詢資料庫
+    db_session.query(models.PlayerDB).delete()
+    db_session.commit()
+    assert dimensions.resolve_player_ids(db_session, ["王柏融"]) == [ids["王柏融"]]
+
+
+def test_writers_resolve_dimension_ids_at_ingest(db_session, monkeypatch):
+    """測試比賽與球員數據的寫入函式會在寫入時解析球員與球隊 id。"""
+    resolved = {"players": set(), "teams": set()}
+    original_players = dimensions.get_or_create_player_ids
+    original_teams = dimensions.get_or_create_team_ids
+
+    def record_players(db, names):
+        names = list(names)
+        resolved["players"].update(names)
+        return original_players(db, names)
+
+    def record_teams(db, names):
+        names = list(names)
+        resolved["teams"].update(name for name in names if name)
+        return original_teams(db, names)
+
+    monkeypatch.setattr(dimensions, "get_or_create_player_ids", record_players)
+    monkeypatch.setattr(dimensions, "get_or_create_team_ids", record_teams)
+
+    game_id = games.create_game_and_get_id(
+        db_session,
+        {
+            "cpbl_game_id": "DIM01",
+            "game_date": "2025-08-15",
+            "home_team": "台鋼雄鷹",
+            "away_team": "樂天桃猿",
+        },
+    )
+    players.store_player_game_data(
+        db_session,
+        game_id,
+        [
+            {
+                "summary": {
+                    "player_name": "王柏融",
+                    "team_name": "台鋼雄鷹",
+                    "position": "LF",
+                },
+                "at_bats_details": [],
+            }
+        ],
+    )
+    db_session.commit()
+
+    assert resolved == {"players": {"王柏融"}, "teams": {"台鋼雄鷹", "樂天桃猿"}}
+    game = db_session.get(models.GameResultDB, game_id)
+    summary = game.player_summaries[0]
+    player = db_session.get(models.PlayerDB, summary.player_id)
+    assert player.name == "王柏融"
+    assert summary.team_id == game.home_team_id
+    assert summary.positions[0].player_id == player.id
+    assert db_session.get(models.TeamDB, game.away_team_id).name == "樂天桃猿"
+
+
+def test_stats_writers_populate_dimension_ids(db_session):
+    """測試球季、生涯與守備數據的寫入函式會填入球員與球隊 id。"""
+    players.store_player_season_stats_and_history(
+        db_session,
+        [{"player_name": "王柏融", "team_name": "台鋼雄鷹", "games_played": 10}],
+    )
+    players.create_or_update_player_career_stats(
+        db_session, {"player_name": "王柏融", "games_played": 500}
+    )
+    players.store_player_fielding_stats(
+        db_session,
+        [{"player_name": "王柏融", "team_name": "台鋼雄鷹", "position": "LF"}],
+    )
+    db_session.commit()
+
+    player_id = dimensions.resolve_player_id(db_session, "王柏融")
+    team_id = dimensions.resolve_team_ids(db_session, ["台鋼雄鷹"])[0]
+    for model in (
+        models.PlayerSeasonStatsDB,
+        models.PlayerSeasonStatsHistoryDB,
+        models.PlayerFieldingStatsDB,
+    ):
+        row = db_session.query(model).one()
+        assert (row.player_id, row.team_id) == (player_id, team_id)
+    assert db_session.query(models.PlayerCareerStatsDB).one().player_id == player_id
+
+
+def test_replace_player_game_data_populates_dimension_ids(db_session):
+    """測試以重新解析結果取代逐場數據時，新寫入的總結與守位也會填入 id。"""
+    game_id = games.create_game_and_get_id(
+        db_session,
+        {
+            "cpbl_game_id": "DIM04",
+            "game_date": "2025-08-17",
+            "home_team": "台鋼雄鷹",
+            "away_team": "樂天桃猿",
+        },
+    )
+    player_data = {
+        "summary": {"player_name": "魔鷹", "team_name": "台鋼雄鷹", "position": "RF"},
+        "at_bats_details": [
+            {"inning": 1, "sequence_in_game": 1, "result_short": "全打"}
+        ],
+    }
+    data_persistence.replace_player_game_data(db_session, game_id, [player_data])
+    db_session.commit()
+
+    summary = db_session.query(models.PlayerGameSummaryDB).one()
+    assert summary.player_id == dimensions.resolve_player_id(db_session, "魔鷹")
+    assert summary.team_id == db_session.get(models.GameResultDB, game_id).home_team_id
+    assert [p.player_id for p in summary.positions] == [summary.player_id]
+    assert summary.at_bat_details[0].game_id == game_id
+
+
+def test_name_based_queries_use_dimension_ids(db_session):
+    """測試以隊名查詢的比賽函式透過維度 id 比對，仍維持以名稱為主的介面。"""
+    for cpbl_game_id, home, away in (
+        ("DIM02", "台鋼雄鷹", "樂天桃猿"),
+        ("DIM03", "中信兄弟", "味全龍"),
+    ):
+        games.create_game_and_get_id(
+            db_session,
+            {
+                "cpbl_game_id": cpbl_game_id,
+                "game_date": "2025-08-16",
+                "home_team": home,
+                "away_team": away,
+                "status": "已完成",
+            },
+        )
+    db_session.commit()
+
+    found = games.get_games_by_year_and_team(
+        db_session, year=2025, team_name="樂天桃猿", completed_only=True
+    )
+    assert [game.cpbl_game_id for game in found] == ["DIM02"]
+    assert (
+        games.get_last_completed_game_for_teams(
+            db_session, teams=["不存在"], before_date=datetime.date(2025, 9, 1)
+        )
+        is None
+    )
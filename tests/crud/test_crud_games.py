@@ -1,8 +1,12 @@
 # tests/crud/test_crud_games.py
 
 import datetime
-from app import models
+import gzip
+import json
+
+from app import models, schemas
 from app.crud import games
+from tests.factories import add_with_dimension_ids
 
 
 def test_create_game_and_get_id(db_session):
@@ -39,17 +43,17 @@ def test_delete_game_if_exists(db_session):
         home_team="H",
         away_team="A",
     )
-    db.add(game)
+    add_with_dimension_ids(db, game)
     db.flush()
     summary = models.PlayerGameSummaryDB(game_id=game.id, player_name="測試員")
-    db.add(summary)
+    add_with_dimension_ids(db, summary)
     db.flush()
     at_bat = models.AtBatDetailDB(
         player_game_summary_id=summary.id,
         game_id=game.id,
         result_short="一安",
     )
-    db.add(at_bat)
+    add_with_dimension_ids(db, at_bat)
     db.commit()
 
     assert db.query(models.GameResultDB).count() == 1
@@ -112,6 +116,81 @@ def test_idempotency_delete_then_create(db_session):
     assert game_v2.status == "已完成"
 
 
+def test_record_season_schedule_game_keeps_latest_date(db_session):
+    """[新增] 測試整季賽程以 cpbl_game_id 對應同一場比賽，延賽後保留最新的補賽日期。"""
+    db = db_session
+    postponed = {
+        "cpbl_game_id": "55",
+        "game_date": "2025-04-01",
+        "home_team": "主隊",
+        "away_team": "客隊",
+        "status": "延賽",
+    }
+    replayed = {**postponed, "game_date": "2025-04-20", "status": "已完成"}
+
+    assert games.record_season_schedule_game(db, postponed) is True
+    assert games.record_season_schedule_game(db, replayed) is True
+    # 之後重新抓取原日期的月份時，不會把日期改回延賽前
+    assert games.record_season_schedule_game(db, postponed) is False
+    assert games.record_season_schedule_game(db, {"game_date": "2025-04-01"}) is False
+    db.commit()
+
+    rows = db.query(models.SeasonScheduleGameDB).all()
+    assert [(r.season, r.cpbl_game_id, r.game_date, r.status) for r in rows] == [
+        (2025, "55", datetime.date(2025, 4, 20), "已完成")
+    ]
+
+
+def test_get_final_game_fingerprint(db_session):
+    """
+    [新增] 測試只有已完成的比賽會回傳建立時記錄的內容指紋。
+    [修正] 目標球隊沒有打席紀錄的比賽不回傳指紋。
+    """
+    db = db_session
+    game_ids = {}
+    for cpbl_game_id, status in [
+        ("FP01", "已完成"),
+        ("FP02", "比賽中"),
+        ("FP04", "已完成"),
+    ]:
+        game_ids[cpbl_game_id] = games.create_game_and_get_id(
+            db,
+            {
+                "cpbl_game_id": cpbl_game_id,
+                "game_date": "2025-09-01",
+                "home_team": f"主隊{cpbl_game_id}",
+                "away_team": "客隊",
+                "status": status,
+                "content_fingerprint": "a" * 64,
+            },
+        )
+    for cpbl_game_id in ("FP01", "FP02"):
+        summary = models.PlayerGameSummaryDB(
+            game_id=game_ids[cpbl_game_id], player_name="指紋員", team_name="客隊"
+        )
+        add_with_dimension_ids(db, summary)
+        db.flush()
+        add_with_dimension_ids(
+            db,
+            models.AtBatDetailDB(
+                game_id=game_ids[cpbl_game_id],
+                player_game_summary_id=summary.id,
+                result_short="一安",
+            ),
+        )
+    db.commit()
+
+    game_date = datetime.date(2025, 9, 1)
+    assert games.get_final_game_fingerprint(db, "FP01", game_date) == "a" * 64
+    assert games.get_final_game_fingerprint(db, "FP01", game_date, ["客隊"]) == (
+        "a" * 64
+    )
+    assert games.get_final_game_fingerprint(db, "FP01", game_date, ["主隊FP01"]) is None
+    assert games.get_final_game_fingerprint(db, "FP02", game_date) is None
+    assert games.get_final_game_fingerprint(db, "FP03", game_date) is None
+    assert games.get_final_game_fingerprint(db, "FP04", game_date) is None
+
+
 def test_update_and_get_game_schedules(db_session):
     """測試 update_game_schedules 和 get_all_schedules 函式"""
     db = db_session
@@ -178,7 +257,7 @@ def test_get_games_by_date(db_session):
         game_time="17:05",
         matchup="E vs F",
     )
-    db.add_all([schedule1, schedule2, schedule3])
+    add_with_dimension_ids(db, [schedule1, schedule2, schedule3])
     db.commit()
 
     # 執行函式
@@ -204,13 +283,13 @@ def test_get_game_with_details(db_session):
         home_team="H",
         away_team="A",
     )
-    db.add(game)
+    add_with_dimension_ids(db, game)
     db.flush()
 
     summary = models.PlayerGameSummaryDB(
         game_id=game.id, player_name="測試員D", team_name="測試隊"
     )
-    db.add(summary)
+    add_with_dimension_ids(db, summary)
     db.flush()
 
     detail1 = models.AtBatDetailDB(
@@ -225,7 +304,7 @@ def test_get_game_with_details(db_session):
         sequence_in_game=2,
         result_short="保送",
     )
-    db.add_all([detail1, detail2])
+    add_with_dimension_ids(db, [detail1, detail2])
     db.commit()
 
     game_with_details = games.get_game_with_details(db, game.id)
@@ -240,6 +319,68 @@ def test_get_game_with_details(db_session):
     assert player_summary.at_bat_details[1].result_short == "保送"
 
 
+def test_store_game_detail_documents(db_session):
+    """[新增] 測試預先渲染的比賽細節文件：summary 不含大型欄位、full 包含，且隨比賽刪除。"""
+    db = db_session
+    game = models.GameResultDB(
+        cpbl_game_id="TEST_DOC",
+        game_date=datetime.date(2025, 7, 22),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db, game)
+    db.flush()
+    summary = models.PlayerGameSummaryDB(
+        game_id=game.id, player_name="測試員E", team_name="測試隊"
+    )
+    add_with_dimension_ids(db, summary)
+    db.flush()
+    add_with_dimension_ids(
+        db,
+        models.AtBatDetailDB(
+            player_game_summary_id=summary.id,
+            game_id=game.id,
+            sequence_in_game=1,
+            result_short="全壘打",
+            result_description_full="擊出全壘打。",
+            pitch_sequence_details="逐球紀錄",
+        ),
+    )
+    db.flush()
+
+    assert games.store_game_detail_documents(db, game.id) is True
+    db.commit()
+
+    full = json.loads(
+        gzip.decompress(
+            games.get_game_detail_document(
+                db, game.id, detail=models.AtBatDetailLevel.FULL
+            )
+        )
+    )
+    summary_doc = json.loads(
+        gzip.decompress(games.get_game_detail_document(db, game.id))
+    )
+    full_at_bat = full["player_summaries"][0]["at_bat_details"][0]
+    summary_at_bat = summary_doc["player_summaries"][0]["at_bat_details"][0]
+    assert full["cpbl_game_id"] == "TEST_DOC"
+    assert full_at_bat["pitch_sequence_details"] == "逐球紀錄"
+    assert full_at_bat["result_description_full"] == "擊出全壘打。"
+    assert summary_at_bat["result_short"] == "全壘打"
+    assert summary_at_bat["pitch_sequence_details"] is None
+    assert summary_at_bat["result_description_full"] is None
+
+    # 重新渲染時應覆寫而非新增
+    games.store_game_detail_documents(db, game.id)
+    db.commit()
+    assert db.query(models.GameDetailDocumentDB).count() == 2
+
+    games.delete_game_if_exists(db, "TEST_DOC", datetime.date(2025, 7, 22))
+    db.commit()
+    assert games.get_game_detail_document(db, game.id) is None
+    assert games.store_game_detail_documents(db, game.id) is False
+
+
 # === ▼▼▼ 新增 Dashboard CRUD Functions 的測試 ▼▼▼ ===
 
 
@@ -274,7 +415,7 @@ def test_get_completed_games_by_date(db_session):
         home_team="H3",
         away_team="A3",
     )
-    db.add_all([game1, game2, game3])
+    add_with_dimension_ids(db, [game1, game2, game3])
     db.commit()
 
     # 執行函式
@@ -302,13 +443,14 @@ def test_get_next_game_schedule_after(db_session):
     schedule_future_far = models.GameSchedule(
         game_id="SCHED_FAR", game_date=datetime.date(2025, 8, 20), matchup="C vs D"
     )
-    db.add_all(
+    add_with_dimension_ids(
+        db,
         [
             schedule_past,
             schedule_today,
             schedule_future_near,
             schedule_future_far,
-        ]
+        ],
     )
     db.commit()
 
@@ -380,7 +522,7 @@ def test_get_last_completed_game_for_teams(db_session):
         home_team="目標A隊",
         away_team="其他隊",
     )
-    db.add_all([game1, game2, game3, game4, game5])
+    add_with_dimension_ids(db, [game1, game2, game3, game4, game5])
     db.commit()
 
     # 執行函式
@@ -439,7 +581,7 @@ def test_get_last_n_completed_games_for_team(db_session):
         home_team="F隊",
         away_team="G隊",
     )
-    db.add_all([game1, game2, game3, game4, game5])
+    add_with_dimension_ids(db, [game1, game2, game3, game4, game5])
     db.commit()
 
     # 情境 1: 查詢最近 2 場
@@ -496,7 +638,7 @@ def test_get_games_by_year_and_team(db_session):
         away_team="測試龍",
         status="已完成",
     )
-    db.add_all([game1, game2, game3, game4, game5])
+    add_with_dimension_ids(db, [game1, game2, game3, game4, game5])
     db.commit()
 
     # 測試情境 1: 取得 2025 年該隊伍的所有賽果
@@ -529,3 +671,52 @@ def test_get_games_by_year_and_team(db_session):
         db, year=2025, team_name="不存在的隊伍", completed_only=False
     )
     assert len(results_no_team) == 0
+
+
+def test_at_bat_heavy_columns_only_omitted_in_summary_context(db_session):
+    """[新增] 測試只有 summary context 會省略打席大型欄位，其他 ORM 路徑照常回傳內容。"""
+    db = db_session
+    game = models.GameResultDB(
+        cpbl_game_id="TEST_HEAVY",
+        game_date=datetime.date(2025, 7, 23),
+        home_team="H",
+        away_team="A",
+    )
+    add_with_dimension_ids(db, game)
+    db.flush()
+    summary = models.PlayerGameSummaryDB(
+        game_id=game.id, player_name="測試員F", team_name="測試隊"
+    )
+    add_with_dimension_ids(db, summary)
+    db.flush()
+    add_with_dimension_ids(
+        db,
+        models.AtBatDetailDB(
+            player_game_summary_id=summary.id,
+            game_id=game.id,
+            sequence_in_game=1,
+            result_short="全壘打",
+            result_description_full="擊出全壘打。",
+            pitch_sequence_details="逐球紀錄",
+        ),
+    )
+    db.commit()
+    game_id = game.id
+    db.expunge_all()
+
+    # 以關聯延遲載入的打席 (例如儀表板) 應包含完整內容
+    lazy_game = db.get(models.GameResultDB, game_id)
+    lazy_at_bat = schemas.GameResultWithDetails.model_validate(lazy_game).model_dump()[
+        "player_summaries"
+    ][0]["at_bat_details"][0]
+    assert lazy_at_bat["result_description_full"] == "擊出全壘打。"
+    assert lazy_at_bat["pitch_sequence_details"] == "逐球紀錄"
+    db.expunge_all()
+
+    summary_game = games.get_game_with_details(db, game_id)
+    summary_at_bat = schemas.GameResultWithDetails.model_validate(
+        summary_game, context={"detail": models.AtBatDetailLevel.SUMMARY}
+    ).model_dump()["player_summaries"][0]["at_bat_details"][0]
+    assert summary_at_bat["result_short"] == "全壘打"
+    assert summary_at_bat["result_description_full"] is None
+    assert summary_at_bat["pitch_sequence_details"] is None
@@ -0,0 +1,119 @@
+# tests/crud/test_crud_leaderboards.py
+
+from freezegun import freeze_time
+
+from app import models
+from app.crud import leaderboards, players, standings
+
+
+def _season_stats(player_name, team_name, plate_appearances, ops, homeruns):
+    return {
+        "player_name": player_name,
+        "team_name": team_name,
+        "games_played": 10,
+        "plate_appearances": plate_appearances,
+        "at_bats": plate_appearances,
+        "homeruns": homeruns,
+        "ops": ops,
+        "avg": 0.3,
+    }
+
+
+@freeze_time("2025-04-20")
+def test_store_season_stats_refreshes_leaderboards(db_session):
+    """測試寫入球季數據時，會重算全聯盟排行榜並依規定打席分別給予名次。"""
+    db = db_session
+    # A隊打了 10 場 (戰績帳本)；B隊尚無帳本，以球員最多出賽數 (10) 近似
+    for day in range(1, 11):
+        standings.record_game_result(
+            db,
+            {
+                "cpbl_game_id": f"G{day}",
+                "game_date": f"2025-04-{day:02d}",
+                "home_team": "A隊",
+                "away_team": "C隊",
+                "home_score": 3,
+                "away_score": 1,
+                "status": "已完成",
+            },
+        )
+    players.store_player_season_stats_and_history(
+        db,
+        [
+            _season_stats("打者甲", "A隊", 40, 0.900, 3),
+            _season_stats("打者乙", "A隊", 12, 1.200, 1),
+            _season_stats("打者丙", "B隊", 31, 0.800, 5),
+            _season_stats("投手丁", "B隊", 0, 0.0, 0),
+        ],
+    )
+    db.commit()
+
+    ops_rows = (
+        db.query(models.PlayerLeaderboardDB)
+        .filter_by(season=2025, stat="ops")
+        .order_by(models.PlayerLeaderboardDB.rank)
+        .all()
+    )
+    # 打席為 0 的球員不列入排行
+    assert [row.player_name for row in ops_rows] == ["打者乙", "打者甲", "打者丙"]
+    assert [row.qualified_rank for row in ops_rows] == [None, 1, 2]
+    assert [row.team_games for row in ops_rows] == [10, 10, 10]
+
+    # 重新寫入時整季重算，不會留下重複的名次
+    players.store_player_season_stats_and_history(
+        db, [_season_stats("打者乙", "A隊", 12, 0.500, 1)]
+    )
+    db.commit()
+    leaderboard = leaderboards.get_leaderboard(
+        db,
+        season=2025,
+        stat=models.LeaderboardStat.OPS,
+        limit=10,
+        qualified_only=False,
+    )
+    assert [(e.rank, e.player_name) for e in leaderboard.leaders] == [
+        (1, "打者甲"),
+        (2, "打者丙"),
+        (3, "打者乙"),
+    ]
+
+
+@freeze_time("2025-04-20")
+def test_get_leaderboard_qualified_and_team_filters(db_session):
+    """測試排行榜查詢的規定打席、球隊篩選與筆數限制。"""
+    db = db_session
+    players.store_player_season_stats_and_history(
+        db,
+        [
+            _season_stats("打者甲", "A隊", 40, 0.900, 3),
+            _season_stats("打者乙", "A隊", 12, 1.200, 1),
+            _season_stats("打者丙", "B隊", 31, 0.800, 5),
+        ],
+    )
+    db.commit()
+
+    qualified = leaderboards.get_leaderboard(
+        db,
+        season=2025,
+        stat=models.LeaderboardStat.OPS,
+        limit=1,
+        qualified_only=True,
+    )
+    assert [(e.rank, e.player_name, e.qualified) for e in qualified.leaders] == [
+        (1, "打者甲", True)
+    ]
+
+    team_homeruns = leaderboards.get_leaderboard(
+        db,
+        season=2025,
+        stat=models.LeaderboardStat.HOMERUNS,
+        limit=10,
+        qualified_only=False,
+        team_name="A隊",
+    )
+    # 篩選球隊時仍顯示全聯盟名次
+    assert [(e.rank, e.player_name) for e in team_homeruns.leaders] == [
+        (2, "打者甲"),
+        (3, "打者乙"),
+    ]
+    assert team_homeruns.leaders[1].qualified is False
@@ -3,6 +3,7 @@
 import datetime
 from app import models
 from app.crud import games, players
+from tests.factories import add_with_dimension_ids
 
 
 def test_create_or_update_player_career_stats(db_session):
@@ -127,7 +128,8 @@ def test_store_player_fielding_stats(db_session):
     db = db_session
 
     # 1. 準備初始資料
-    db.add_all(
+    add_with_dimension_ids(
+        db,
         [
             models.PlayerFieldingStatsDB(
                 player_name="守備員A", position="SS", errors=5
@@ -135,7 +137,7 @@ def test_store_player_fielding_stats(db_session):
             models.PlayerFieldingStatsDB(
                 player_name="守備員B", position="2B", errors=3
             ),
-        ]
+        ],
     )
     db.commit()
     assert db.query(models.PlayerFieldingStatsDB).count() == 2
@@ -223,6 +225,54 @@ def test_store_player_game_data_with_details(db_session):
     assert details[1].inning == 3
 
 
+def test_store_player_game_data_creates_position_appearances(db_session):
+    """[新增] 測試 store_player_game_data 會同步建立正規化的守備位置出場紀錄。"""
+    db = db_session
+    game_info = {
+        "cpbl_game_id": "TEST_POS",
+        "game_date": "2025-06-22",
+        "home_team": "H",
+        "away_team": "A",
+    }
+    game_id = games.create_game_and_get_id(db, game_info)
+    db.commit()
+
+    player_data_list = [
+        {"summary": {"player_name": "先發游擊", "position": "SS"}},
+        {"summary": {"player_name": "代打捕手", "position": "(PH)(C)"}},
+    ]
+    players.store_player_game_data(db, game_id, player_data_list)
+    db.commit()
+
+    appearances = (
+        db.query(models.PlayerGamePositionDB)
+        .filter_by(game_id=game_id)
+        .order_by(
+            models.PlayerGamePositionDB.player_name,
+            models.PlayerGamePositionDB.position_order,
+        )
+        .all()
+    )
+    assert [(a.player_name, a.position, a.is_starter) for a in appearances] == [
+        ("代打捕手", "PH", False),
+        ("代打捕手", "C", False),
+        ("先發游擊", "SS", True),
+    ]
+
+    # 重新寫入時，位置變更應取代舊的出場紀錄
+    players.store_player_game_data(
+        db, game_id, [{"summary": {"player_name": "先發游擊", "position": "SS(2B)"}}]
+    )
+    db.commit()
+    summary = (
+        db.query(models.PlayerGameSummaryDB).filter_by(player_name="先發游擊").one()
+    )
+    assert [(a.position, a.is_starter) for a in summary.positions] == [
+        ("SS", True),
+        ("2B", False),
+    ]
+
+
 def test_store_player_game_data_empty_list(db_session):
     """測試當傳入空的 all_players_data 列表時，函式能優雅地處理。"""
     db = db_session
@@ -246,3 +296,83 @@ def test_store_player_game_data_empty_list(db_session):
     # 驗證資料庫沒有任何變動
     assert db.query(models.PlayerGameSummaryDB).count() == initial_summary_count
     assert db.query(models.AtBatDetailDB).count() == initial_detail_count
+
+
+def test_get_player_game_logs_rolling_windows(db_session):
+    """測試 get_player_game_logs 能在單一查詢中計算球季累積與近 N 場滾動數據。"""
+    db = db_session
+    hits_per_game = [1, 0, 2, 1]
+    for i, hits in enumerate(hits_per_game):
+        game = models.GameResultDB(
+            cpbl_game_id=f"LOG_{i}",
+            game_date=datetime.date(2025, 4, 1 + i),
+            home_team="台鋼雄鷹",
+            away_team="樂天桃猿",
+        )
+        add_with_dimension_ids(db, game)
+        db.flush()
+        add_with_dimension_ids(
+            db,
+            [
+                models.PlayerGameSummaryDB(
+                    game_id=game.id,
+                    player_name="滾動打者",
+                    team_name="台鋼雄鷹",
+                    plate_appearances=4,
+                    at_bats=4,
+                    hits=hits,
+                    homeruns=1 if i == 3 else 0,
+                ),
+                models.PlayerGameSummaryDB(
+                    game_id=game.id,
+                    player_name="對照打者",
+                    team_name="台鋼雄鷹",
+                    plate_appearances=4,
+                    at_bats=3,
+                    hits=1,
+                    walks=1,
+                ),
+            ],
+        )
+    # 其他年份的比賽不應被計入
+    other_year_game = models.GameResultDB(
+        cpbl_game_id="LOG_2024",
+        game_date=datetime.date(2024, 9, 1),
+        home_team="台鋼雄鷹",
+        away_team="樂天桃猿",
+    )
+    add_with_dimension_ids(db, other_year_game)
+    db.flush()
+    add_with_dimension_ids(
+        db,
+        models.PlayerGameSummaryDB(
+            game_id=other_year_game.id,
+            player_name="滾動打者",
+            team_name="台鋼雄鷹",
+            at_bats=4,
+            hits=4,
+        ),
+    )
+    db.commit()
+
+    logs = players.get_player_game_logs(
+        db, player_names=["滾動打者", "對照打者"], year=2025, windows=[2]
+    )
+
+    assert set(logs.keys()) == {"滾動打者", "對照打者"}
+    target_log = logs["滾動打者"]
+    assert [entry["hits"] for entry in target_log] == hits_per_game
+    assert all(entry["opponent_team"] == "樂天桃猿" for entry in target_log)
+
+    last_entry = target_log[-1]
+    assert last_entry["season_to_date"]["games"] == 4
+    assert last_entry["season_to_date"]["hits"] == 4
+    assert last_entry["season_to_date"]["avg"] == 0.25
+    # 近 2 場: 2 安 + 1 安 / 8 打數，含一支全壘打
+    assert last_entry["rolling"]["last_2"]["games"] == 2
+    assert last_entry["rolling"]["last_2"]["hits"] == 3
+    assert last_entry["rolling"]["last_2"]["avg"] == 0.375
+    assert last_entry["rolling"]["last_2"]["slg"] == 0.75
+
+    control_last = logs["對照打者"][-1]
+    assert control_last["season_to_date"]["obp"] == 0.5
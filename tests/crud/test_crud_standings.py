@@ -0,0 +1,132 @@
+# tests/crud/test_crud_standings.py
+
+import datetime
+
+from app import models
+from app.crud import standings
+
+
+def _game(game_id, game_date, home_team, away_team, home_score, away_score):
+    return {
+        "cpbl_game_id": game_id,
+        "game_date": game_date,
+        "home_team": home_team,
+        "away_team": away_team,
+        "home_score": home_score,
+        "away_score": away_score,
+        "status": "已完成",
+    }
+
+
+def _ledger(db, team_name):
+    return (
+        db.query(models.TeamGameStandingDB)
+        .filter_by(team_name=team_name)
+        .order_by(
+            models.TeamGameStandingDB.game_date,
+            models.TeamGameStandingDB.cpbl_game_id,
+        )
+        .all()
+    )
+
+
+def test_record_game_result_accumulates_both_teams(db_session):
+    """測試寫入比賽後，雙方球隊的累計戰績、主客場、得失分與連勝敗皆正確。"""
+    db = db_session
+    for game_info in [
+        _game("G1", "2025-04-01", "A隊", "B隊", 5, 3),
+        _game("G2", "2025-04-02", "B隊", "A隊", 2, 4),
+        _game("G3", "2025-04-03", "A隊", "B隊", 1, 1),
+    ]:
+        assert standings.record_game_result(db, game_info) is True
+    db.commit()
+
+    latest_a = _ledger(db, "A隊")[-1]
+    assert (latest_a.wins, latest_a.losses, latest_a.ties) == (2, 0, 1)
+    assert (latest_a.home_wins, latest_a.home_ties, latest_a.away_wins) == (1, 1, 1)
+    assert (latest_a.runs_scored_total, latest_a.runs_allowed_total) == (10, 6)
+    assert latest_a.streak == 0
+    assert latest_a.last_10_results == "WWT"
+
+    latest_b = _ledger(db, "B隊")[-1]
+    assert (latest_b.wins, latest_b.losses, latest_b.ties) == (0, 2, 1)
+    assert _ledger(db, "B隊")[1].streak == -2
+
+
+def test_record_game_result_skips_unfinished_and_unchanged_games(db_session):
+    """測試未完成的比賽不寫入，重複寫入相同比分時不會重複累計。"""
+    db = db_session
+    unfinished = _game("G0", "2025-04-01", "A隊", "B隊", None, None)
+    unfinished["status"] = "延賽"
+    assert standings.record_game_result(db, unfinished) is False
+
+    game_info = _game("G1", "2025-04-01", "A隊", "B隊", 5, 3)
+    standings.record_game_result(db, game_info)
+    standings.record_game_result(db, game_info)
+    db.commit()
+
+    ledger = _ledger(db, "A隊")
+    assert len(ledger) == 1
+    assert ledger[0].wins == 1
+
+
+def test_record_game_result_recalculates_later_games(db_session):
+    """測試補登較早的比賽或更正比分時，會重新計算之後場次的累計戰績。"""
+    db = db_session
+    standings.record_game_result(db, _game("G2", "2025-04-02", "A隊", "B隊", 3, 1))
+    standings.record_game_result(db, _game("G3", "2025-04-03", "A隊", "B隊", 4, 2))
+    # 補登較早的一場敗戰
+    standings.record_game_result(db, _game("G1", "2025-04-01", "A隊", "B隊", 0, 2))
+    db.commit()
+
+    ledger = _ledger(db, "A隊")
+    assert [row.cpbl_game_id for row in ledger] == ["G1", "G2", "G3"]
+    assert [(row.wins, row.losses) for row in ledger] == [(0, 1), (1, 1), (2, 1)]
+    assert ledger[-1].streak == 2
+    assert ledger[-1].last_10_results == "LWW"
+
+    # 更正 G2 的比分為敗戰
+    standings.record_game_result(db, _game("G2", "2025-04-02", "A隊", "B隊", 1, 3))
+    db.commit()
+
+    ledger = _ledger(db, "A隊")
+    assert [(row.wins, row.losses) for row in ledger] == [(0, 1), (0, 2), (1, 2)]
+    assert ledger[-1].last_10_results == "LLW"
+
+
+def test_get_standings_ranks_teams_with_games_behind(db_session):
+    """測試戰績排行的名次、勝率、勝差與截止日期。"""
+    db = db_session
+    for game_info in [
+        _game("G1", "2025-04-01", "A隊", "B隊", 5, 3),
+        _game("G2", "2025-04-01", "C隊", "D隊", 2, 7),
+        _game("G3", "2025-04-02", "A隊", "C隊", 6, 0),
+        _game("G4", "2025-04-02", "B隊", "D隊", 1, 1),
+        _game("G5", "2025-04-03", "D隊", "A隊", 9, 1),
+        # 其他賽季的比賽不應被計入
+        _game("G6", "2024-09-01", "A隊", "B隊", 0, 10),
+    ]:
+        standings.record_game_result(db, game_info)
+    db.commit()
+
+    result = standings.get_standings(db, season=2025)
+
+    assert [row.team_name for row in result.standings] == ["D隊", "A隊", "B隊", "C隊"]
+    d_team, a_team, b_team, c_team = result.standings
+    assert (d_team.wins, d_team.losses, d_team.ties) == (2, 0, 1)
+    assert d_team.games_behind == 0
+    assert (a_team.wins, a_team.losses, a_team.win_percentage) == (2, 1, 0.667)
+    assert a_team.games_behind == 0.5
+    assert a_team.home_record == "2-0-0"
+    assert a_team.away_record == "0-1-0"
+    assert a_team.run_differential == 12 - 12
+    assert a_team.current_streak_description == "1連敗"
+    assert b_team.last_10_games_record == "0-1-1"
+    assert c_team.games_behind == 2.0
+
+    as_of = standings.get_standings(db, season=2025, as_of=datetime.date(2025, 4, 2))
+    assert as_of.as_of_date == datetime.date(2025, 4, 2)
+    a_team_as_of = next(row for row in as_of.standings if row.team_name == "A隊")
+    assert (a_team_as_of.wins, a_team_as_of.losses) == (2, 0)
+    assert a_team_as_of.current_streak_description == "2連勝"
+    assert a_team_as_of.last_game_date == datetime.date(2025, 4, 2)
@@ -5,6 +5,39 @@ from factory.alchemy import SQLAlchemyModelFactory
 import datetime
 
 from app import models
+from app.crud import dimensions
+
+# [新增] 各模型的 (名稱欄位, 維度 id 欄位, 取得 id 的函式)
+_PLAYER_FIELDS = ("player_name", "player_id", dimensions.get_or_create_player_ids)
+_TEAM_FIELDS = ("team_name", "team_id", dimensions.get_or_create_team_ids)
+_DIMENSION_FIELDS = {
+    models.GameResultDB: (
+        ("home_team", "home_team_id", dimensions.get_or_create_team_ids),
+        ("away_team", "away_team_id", dimensions.get_or_create_team_ids),
+    ),
+    models.PlayerGameSummaryDB: (_PLAYER_FIELDS, _TEAM_FIELDS),
+    models.PlayerGamePositionDB: (_PLAYER_FIELDS,),
+    models.PlayerSeasonStatsDB: (_PLAYER_FIELDS, _TEAM_FIELDS),
+    models.PlayerSeasonStatsHistoryDB: (_PLAYER_FIELDS, _TEAM_FIELDS),
+    models.PlayerCareerStatsDB: (_PLAYER_FIELDS,),
+    models.PlayerFieldingStatsDB: (_PLAYER_FIELDS, _TEAM_FIELDS),
+}
+
+
+def add_with_dimension_ids(db, instances):
+    """
+    [新增] 依名稱欄位為直接建立的 ORM 測試資料設定球員 / 球隊 id，再加入 session。
+
+    正式的寫入函式須自行解析 id，因此 session 不會自動回填；測試資料需明確呼叫此函式。
+    """
+    if isinstance(instances, models.Base):
+        instances = [instances]
+    for instance in instances:
+        for name_field, id_field, get_ids in _DIMENSION_FIELDS.get(type(instance), ()):
+            name = getattr(instance, name_field)
+            if name and getattr(instance, id_field) is None:
+                setattr(instance, id_field, get_ids(db, [name])[name])
+        db.add(instance)
 
 
 # 建立一個基礎工廠類別，用於設定共用的資料庫 session
@@ -15,6 +48,11 @@ class BaseFactory(SQLAlchemyModelFactory):
         sqlalchemy_session_persistence = "flush"
 
 
+def _dimension_id(get_ids, name):
+    """以工廠目前的 session 取得名稱對應的維度 id。"""
+    return get_ids(BaseFactory._meta.sqlalchemy_session, [name])[name]
+
+
 class GameResultFactory(BaseFactory):
     class Meta:
         model = models.GameResultDB
@@ -23,6 +61,12 @@ class GameResultFactory(BaseFactory):
     game_date = factory.LazyFunction(datetime.date.today)
     home_team = "主隊"
     away_team = "客隊"
+    home_team_id = factory.LazyAttribute(
+        lambda o: _dimension_id(dimensions.get_or_create_team_ids, o.home_team)
+    )
+    away_team_id = factory.LazyAttribute(
+        lambda o: _dimension_id(dimensions.get_or_create_team_ids, o.away_team)
+    )
 
 
 class PlayerGameSummaryFactory(BaseFactory):
@@ -33,6 +77,12 @@ class PlayerGameSummaryFactory(BaseFactory):
     game = factory.SubFactory(GameResultFactory)
     player_name = factory.Faker("name", locale="zh_TW")
     team_name = "測試隊"
+    player_id = factory.LazyAttribute(
+        lambda o: _dimension_id(dimensions.get_or_create_player_ids, o.player_name)
+    )
+    team_id = factory.LazyAttribute(
+        lambda o: _dimension_id(dimensions.get_or_create_team_ids, o.team_name)
+    )
     batting_order = factory.Iterator(["1", "2", "3", "4", "5", "6", "7", "8", "9"])
 
 
@@ -0,0 +1,62 @@
+# tests/parsers/test_box_data.py
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.parsers import box_data, live
+
+
+@pytest.fixture
+def game_data():
+    """讀取錄製的資料端點回應，並如同 box_api 一樣解碼 *Json 欄位。"""
+    fixture_path = Path(__file__).parent.parent / "fixtures" / "box_getlive.json"
+    payload = json.loads(fixture_path.read_text(encoding="utf-8"))
+    return {
+        key: json.loads(value) if key.endswith("Json") else value
+        for key, value in payload.items()
+    }
+
+
+def test_parse_box_score_data_matches_page_parser_format(game_data):
+    """測試資料端點的 Box Score 解析結果與頁面解析器的格式相同，並依目標球隊篩選。"""
+    result = box_data.parse_box_score_data(game_data, target_teams=["台鋼雄鷹"])
+
+    assert [p["summary"]["player_name"] for p in result] == ["王柏融", "吳念庭"]
+    summary = result[0]["summary"]
+    assert summary["team_name"] == "台鋼雄鷹"
+    assert summary["batting_order"] == "1"
+    assert summary["position"] == "LF"
+    assert summary["homeruns"] == 1
+    assert summary["avg_cumulative"] == 0.31
+    assert summary["plate_appearances"] == 2
+    assert summary["at_bat_results_summary"] == "右全,中飛"
+    assert result[0]["at_bats_list"] == ["右全", "中飛"]
+    assert result[1]["summary"]["walks"] == 1
+
+
+def test_parse_box_score_data_rejects_unexpected_payload(game_data):
+    """測試回應缺少必要欄位時拋出 ValueError，讓呼叫端退回瀏覽器模式。"""
+    del game_data["BattingJson"]
+    with pytest.raises(ValueError):
+        box_data.parse_box_score_data(game_data)
+
+
+def test_parse_live_log_data_groups_half_innings(game_data):
+    """測試文字轉播依局數與上下半局分組，並可交由 parse_extracted_events 轉換為打席事件。"""
+    half_innings = box_data.parse_live_log_data(game_data)
+
+    assert [(inning, selector) for _, inning, selector in half_innings] == [
+        (1, "section.top"),
+        (1, "section.bot"),
+        (2, "section.top"),
+        (2, "section.bot"),
+    ]
+
+    events = live.parse_extracted_events(half_innings[1][0], 1)
+    # 投手更換的項目沒有打者，會被略過
+    assert [event["hitter_name"] for event in events] == ["王柏融", "吳念庭"]
+    assert events[0]["description"] == "擊出右外野全壘打，1分打點"
+    assert events[0]["runs_scored_on_play"] == 1
+    assert events[0]["opposing_pitcher_name"] == "陳冠宇"
@@ -1,5 +1,7 @@
 # tests/parsers/test_box_score.py
 
+from bs4 import BeautifulSoup
+
 from app.parsers import box_score
 from app.config import settings
 from pathlib import Path
@@ -34,3 +36,16 @@ def test_parse_box_score_page(box_score_html_content):
     assert isinstance(result_filtered, list)
     assert len(result_filtered) > 0
     assert all(p["summary"]["team_name"] == target_team for p in result_filtered)
+
+
+def test_parse_box_score_fragment_matches_full_page(box_score_html_content):
+    """[新增] 驗證只傳入 FRAGMENT_SELECTORS 子樹的 HTML 時，解析結果與完整頁面相同。"""
+    soup = BeautifulSoup(box_score_html_content, "lxml")
+    fragment = "\n".join(
+        str(soup.select_one(selector)) for selector in box_score.FRAGMENT_SELECTORS
+    )
+
+    assert len(fragment) < len(box_score_html_content)
+    assert box_score.parse_box_score_page(fragment) == box_score.parse_box_score_page(
+        box_score_html_content
+    )
@@ -4,6 +4,8 @@ import pytest
 from pathlib import Path
 import datetime
 
+from bs4 import BeautifulSoup
+
 from app.parsers import player_career
 
 FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
@@ -77,3 +79,16 @@ def test_parse_player_career_page_with_minimal_data(player_career_html_content_m
     assert "handedness" not in result
     # 應不包含任何表格數據
     assert "games_played" not in result
+
+
+def test_parse_player_career_fragment_matches_full_page(player_career_html_content):
+    """[新增] 驗證只傳入 FRAGMENT_SELECTORS 子樹的 HTML 時，解析結果與完整頁面相同。"""
+    soup = BeautifulSoup(player_career_html_content, "lxml")
+    fragment = "\n".join(
+        str(soup.select_one(selector)) for selector in player_career.FRAGMENT_SELECTORS
+    )
+
+    assert len(fragment) < len(player_career_html_content)
+    assert player_career.parse_player_career_page(
+        fragment
+    ) == player_career.parse_player_career_page(player_career_html_content)
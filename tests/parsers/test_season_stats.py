@@ -1,5 +1,7 @@
 # tests/parsers/test_season_stats.py
 
+from bs4 import BeautifulSoup
+
 from app.parsers import season_stats
 from app.config import settings
 import pytest
@@ -92,6 +94,19 @@ def test_parse_season_batting_stats_page(team_score_html_content):
         assert set(settings.TARGET_PLAYER_NAMES).issubset(parsed_player_names)
 
 
+def test_parse_season_batting_stats_page_with_team_name(team_score_html_content):
+    """[新增] 驗證指定 team_name 時，解析結果會標上該球隊，未指定則為目標球隊。"""
+    result = season_stats.parse_season_batting_stats_page(
+        team_score_html_content, team_name="中信兄弟"
+    )
+    assert result and {p["team_name"] for p in result} == {"中信兄弟"}
+
+    default_result = season_stats.parse_season_batting_stats_page(
+        team_score_html_content
+    )
+    assert {p["team_name"] for p in default_result} == {settings.TARGET_TEAM_NAME}
+
+
 def test_parse_season_fielding_stats_page(team_fielding_html_content):
     """[新增] 測試 parse_season_fielding_stats_page 函式的正確性。"""
     result = season_stats.parse_season_fielding_stats_page(team_fielding_html_content)
@@ -120,3 +135,18 @@ def test_parse_season_fielding_stats_page(team_fielding_html_content):
     stats_dh = next(p for p in result if p["player_name"] == "無名氏")
     assert stats_dh is not None
     assert stats_dh["position"] == "指定打擊"  # 應保留原文
+
+
+def test_parse_season_batting_stats_fragment_matches_full_page(
+    team_score_html_content,
+):
+    """[新增] 驗證只傳入 FRAGMENT_SELECTORS 子樹的 HTML 時，解析結果與完整頁面相同。"""
+    soup = BeautifulSoup(team_score_html_content, "lxml")
+    fragment = "\n".join(
+        str(soup.select_one(selector)) for selector in season_stats.FRAGMENT_SELECTORS
+    )
+
+    assert len(fragment) < len(team_score_html_content)
+    assert season_stats.parse_season_batting_stats_page(
+        fragment
+    ) == season_stats.parse_season_batting_stats_page(team_score_html_content)
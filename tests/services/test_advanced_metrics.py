@@ -0,0 +1,149 @@
+# tests/services/test_advanced_metrics.py
+
+import datetime
+import math
+
+import numpy as np
+import pytest
+from freezegun import freeze_time
+
+from app import models
+from app.crud import players
+from app.services import advanced_metrics
+
+
+def _counting(**overrides):
+    row = dict.fromkeys(advanced_metrics.COUNTING_COLUMNS, 0)
+    row.update(overrides)
+    return row
+
+
+# 打者甲：8 打數 3 安 (一安、二安、全壘打各 1)、2 保送、2 三振
+HITTER_A = _counting(
+    plate_appearances=10,
+    at_bats=8,
+    hits=3,
+    doubles=1,
+    homeruns=1,
+    walks=2,
+    strikeouts=2,
+)
+# 打者乙：9 打數 2 安 (皆為一安)、1 觸身、3 三振
+HITTER_B = _counting(
+    plate_appearances=10, at_bats=9, hits=2, hit_by_pitch=1, strikeouts=3
+)
+
+
+def _stats(*rows):
+    return advanced_metrics.CountingStats.from_rows(
+        [
+            (f"打者{i}", "測試隊", *(row[c] for c in advanced_metrics.COUNTING_COLUMNS))
+            for i, row in enumerate(rows)
+        ]
+    )
+
+
+def test_derive_league_constants_scales_woba_to_league_obp():
+    """測試聯盟常數：wOBA 經縮放後等於聯盟上壘率。"""
+    constants = advanced_metrics.derive_league_constants(_stats(HITTER_A, HITTER_B))
+
+    assert constants["plate_appearances"] == 20
+    assert constants["lg_obp"] == pytest.approx(8 / 20)
+    assert constants["lg_slg"] == pytest.approx(9 / 17)
+    assert constants["woba_scale"] == pytest.approx(0.4 / (8.14 / 20))
+    assert constants["lg_woba"] == pytest.approx(constants["lg_obp"])
+
+
+def test_compute_advanced_metrics_vectorized():
+    """測試一次計算所有球員的進階數據，並與手算結果一致。"""
+    stats = _stats(HITTER_A, HITTER_B, _counting(plate_appearances=1, walks=1))
+    constants = advanced_metrics.derive_league_constants(stats)
+
+    metrics = advanced_metrics.compute_advanced_metrics(stats, constants)
+
+    assert metrics["avg"][0] == pytest.approx(0.375)
+    assert metrics["obp"][0] == pytest.approx(0.5)
+    assert metrics["iso"][0] == pytest.approx(0.875 - 0.375)
+    assert metrics["babip"][0] == pytest.approx(2 / 5)
+    assert metrics["k_percentage"][0] == pytest.approx(0.2)
+    assert metrics["bb_percentage"][0] == pytest.approx(0.2)
+    assert metrics["woba"][0] == pytest.approx(0.564 * constants["woba_scale"])
+    assert metrics["ops_plus"][0] == pytest.approx(
+        100 * (0.5 / constants["lg_obp"] + 0.875 / constants["lg_slg"] - 1)
+    )
+    # 只有保送、沒有打數的球員：打擊率等無法計算的項目為 NaN
+    assert math.isnan(metrics["avg"][2])
+    assert metrics["obp"][2] == pytest.approx(1.0)
+    assert isinstance(metrics["woba"], np.ndarray) and metrics["woba"].shape == (3,)
+
+
+@freeze_time("2025-05-10")
+def test_refresh_advanced_metrics_stores_season_and_splits(db_session):
+    """測試重算後寫入整季與主 / 客場分項的進階數據，以及聯盟常數。"""
+    db = db_session
+    players.store_player_season_stats_and_history(
+        db,
+        [
+            {"player_name": "打者甲", "team_name": "主隊", **HITTER_A},
+            {"player_name": "打者乙", "team_name": "客隊", **HITTER_B},
+        ],
+    )
+    game = models.GameResultDB(
+        cpbl_game_id="ADV1",
+        game_date=datetime.date(2025, 5, 1),
+        home_team="主隊",
+        away_team="客隊",
+    )
+    db.add(game)
+    db.flush()
+    db.add_all(
+        [
+            models.PlayerGameSummaryDB(
+                game_id=game.id,
+                player_name="打者甲",
+                team_name="主隊",
+                plate_appearances=4,
+                at_bats=4,
+                hits=2,
+                homeruns=1,
+            ),
+            models.PlayerGameSummaryDB(
+                game_id=game.id,
+                player_name="打者乙",
+                team_name="客隊",
+                plate_appearances=4,
+                at_bats=3,
+                walks=1,
+            ),
+        ]
+    )
+    db.commit()
+
+    assert advanced_metrics.refresh_advanced_metrics(db, 2025, ["主隊", "客隊"]) == 4
+
+    constants = players.get_league_batting_constants(db, 2025)
+    assert constants.lg_obp == pytest.approx(0.4)
+    season_rows = players.get_player_advanced_stats(db, 2025, models.StatSplit.SEASON)
+    assert [row.player_name for row in season_rows] == ["打者甲", "打者乙"]
+    assert season_rows[0].babip == pytest.approx(0.4)
+
+    home = players.get_player_advanced_stats(db, 2025, models.StatSplit.HOME)
+    away = players.get_player_advanced_stats(db, 2025, models.StatSplit.AWAY)
+    assert [(row.player_name, row.avg, row.iso) for row in home] == [
+        ("打者甲", 0.5, 0.75)
+    ]
+    assert [(row.player_name, row.avg, row.k_percentage) for row in away] == [
+        ("打者乙", 0.0, 0.0)
+    ]
+
+    # 重算時整季覆蓋，不會重複寫入
+    advanced_metrics.refresh_advanced_metrics(db, 2025, ["主隊", "客隊"])
+    assert db.query(models.PlayerAdvancedStatsDB).count() == 4
+
+    # 非目標球隊的球員只有整季數據，沒有主 / 客場分項
+    advanced_metrics.refresh_advanced_metrics(db, 2025, ["主隊"])
+    assert players.get_player_advanced_stats(db, 2025, models.StatSplit.AWAY) == []
+    assert [
+        row.player_name
+        for row in players.get_player_advanced_stats(db, 2025, models.StatSplit.SEASON)
+    ] == ["打者甲", "打者乙"]
@@ -1,10 +1,18 @@
 # tests/services/test_browser_operator.py
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch, ANY
+
 import pytest
+from bs4 import BeautifulSoup
+from playwright.sync_api import Page
 
+from app.parsers import live
+from app.services import browser_operator
 from app.services.browser_operator import BrowserOperator
 
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
 
 @pytest.fixture(autouse=True)
 def mock_browser_operator_dependencies(monkeypatch):
@@ -28,7 +36,7 @@ def mock_page():
 def test_navigate_and_get_box_score_content(mock_page):
     """測試導航至 Box Score 頁面並取得內容的流程。"""
     operator = BrowserOperator(mock_page)
-    mock_page.content.return_value = "<html>Box Score</html>"
+    mock_page.evaluate.return_value = '<div class="GameBoxDetail">Box Score</div>'
 
     content = operator.navigate_and_get_box_score_content("http://fake.url/box")
 
@@ -36,7 +44,10 @@ def test_navigate_and_get_box_score_content(mock_page):
     mock_page.wait_for_selector.assert_called_once_with(
         "div.GameBoxDetail", state="visible", timeout=ANY
     )
-    assert content == "<html>Box Score</html>"
+    # [修改] 只擷取 Box Score 區塊的 HTML，不序列化整個頁面
+    assert content == '<div class="GameBoxDetail">Box Score</div>'
+    assert mock_page.evaluate.call_args.args[1] == ["div.GameBoxDetail"]
+    mock_page.content.assert_not_called()
 
 
 def test_extract_live_events_html(mock_page):
@@ -107,3 +118,114 @@ def test_extract_live_events_html_handles_timeout(mock_logger, mock_page):
 
     assert results == []
     mock_logger.error.assert_called_once()
+
+
+# --- [新增] 單次 page.evaluate 擷取模式 ---
+
+
+def test_extract_live_events(mock_page):
+    """測試單次擷取模式只呼叫一次 evaluate，並轉換為 (原始資料, 局數, 選擇器)。"""
+    raw_events = [{"hitter_name": "王柏融", "description_text": "一壘安打"}]
+    mock_page.evaluate.return_value = [
+        {"inning": 1, "selector": "section.top", "events": raw_events},
+        {"inning": 1, "selector": "section.bot", "events": []},
+    ]
+
+    results = BrowserOperator(mock_page).extract_live_events("http://fake.url/live")
+
+    mock_page.goto.assert_called_once_with(
+        "http://fake.url/live", wait_until="load", timeout=ANY
+    )
+    mock_page.evaluate.assert_called_once()
+    mock_page.locator.assert_not_called()
+    assert results == [(raw_events, 1, "section.top"), ([], 1, "section.bot")]
+
+
+def test_extract_live_events_parity_with_parser(page: Page):
+    """
+    以文字轉播測試頁驗證：瀏覽器內一次擷取的資料經 parse_extracted_events 轉換後，
+    與逐半局擷取 HTML 再由 parse_active_inning_details 解析的結果完全一致。
+    """
+    html = (FIXTURES_DIR / "live_page.html").read_text(encoding="utf-8")
+    page.set_content(html)
+
+    half_innings = page.evaluate(
+        browser_operator._EXTRACT_LIVE_EVENTS_JS,
+        {"tabTimeoutMs": 2000, "expandTimeoutMs": 1000},
+    )
+
+    soup = BeautifulSoup(html, "lxml")
+    tab_contents = soup.select("div.InningPlaysGroup div.tab_cont")
+    expected = [
+        (inning, selector, live.parse_active_inning_details(str(section), inning))
+        for inning, content in enumerate(tab_contents, start=1)
+        for selector in ("section.top", "section.bot")
+        for section in content.select(selector)[:1]
+    ]
+    actual = [
+        (
+            half["inning"],
+            half["selector"],
+            live.parse_extracted_events(half["events"], half["inning"]),
+        )
+        for half in half_innings
+    ]
+
+    assert [(inning, selector) for inning, selector, _ in actual] == [
+        (1, "section.top"),
+        (1, "section.bot"),
+        (2, "section.top"),
+    ]
+    assert actual == expected
+    # 確認投球細節確實被擷取
+    assert "pitch_sequence_details" in actual[0][2][0]
+
+
+def test_extract_live_events_takes_inning_from_tab_label(page: Page):
+    """[新增] 測試局數取自分頁標籤，而非分頁的順序。"""
+    html = (FIXTURES_DIR / "live_page.html").read_text(encoding="utf-8")
+    page.set_content(
+        html.replace(
+            '<li class="active"><a href="#">1</a></li>',
+            '<li class="active"><a href="#">8</a></li>',
+        ).replace('<li><a href="#">2</a></li>', '<li><a href="#">9</a></li>')
+    )
+
+    half_innings = page.evaluate(
+        browser_operator._EXTRACT_LIVE_EVENTS_JS,
+        {"tabTimeoutMs": 2000, "expandTimeoutMs": 1000},
+    )
+
+    assert [(half["inning"], half["selector"]) for half in half_innings] == [
+        (8, "section.top"),
+        (8, "section.bot"),
+        (9, "section.top"),
+    ]
+
+
+def test_extract_live_events_raises_when_events_do_not_expand(page: Page):
+    """[新增] 測試事件展開逾時時拋出錯誤，讓呼叫端退回逐一點擊模式，而非回傳缺少投球細節的結果。"""
+    page.set_content(
+        """
+        <div class="InningPlaysGroup">
+            <div class="tabs"><ul><li class="active"><a href="#">1</a></li></ul></div>
+            <div class="tab_cont active">
+                <section class="top">
+                    <div class="item play">
+                        <div class="player"><a href="#"><span>吳念庭</span></a></div>
+                        <div class="info">
+                            <div class="desc">第3棒 3B 吳念庭： 二壘安打。</div>
+                            <div class="batter_event"><a href="#">二壘安打</a></div>
+                        </div>
+                    </div>
+                </section>
+            </div>
+        </div>
+        """
+    )
+
+    with pytest.raises(Exception, match="未能全部展開"):
+        page.evaluate(
+            browser_operator._EXTRACT_LIVE_EVENTS_JS,
+            {"tabTimeoutMs": 500, "expandTimeoutMs": 200},
+        )
@@ -0,0 +1,143 @@
+# tests/services/test_crawl_planner.py
+
+import datetime
+
+from app import models
+from app.services import crawl_planner
+
+TARGET = "台鋼雄鷹"
+
+
+def _schedule(
+    db_session,
+    game_id,
+    game_date,
+    home_team=TARGET,
+    away_team="樂天桃猿",
+    status="已完成",
+):
+    db_session.add(
+        models.SeasonScheduleGameDB(
+            season=game_date.year,
+            cpbl_game_id=game_id,
+            game_date=game_date,
+            home_team=home_team,
+            away_team=away_team,
+            status=status,
+        )
+    )
+
+
+def _result(db_session, game_id, game_date, status="已完成", at_bat_team=None):
+    game = models.GameResultDB(
+        cpbl_game_id=game_id,
+        game_date=game_date,
+        home_team=TARGET,
+        away_team=f"客隊{game_id}",
+        status=status,
+    )
+    db_session.add(game)
+    db_session.flush()
+    if at_bat_team:
+        summary = models.PlayerGameSummaryDB(
+            game_id=game.id, player_name=f"球員{game_id}", team_name=at_bat_team
+        )
+        db_session.add(summary)
+        db_session.flush()
+        db_session.add(
+            models.AtBatDetailDB(
+                player_game_summary_id=summary.id, game_id=game.id, result_short="一安"
+            )
+        )
+
+
+def test_build_crawl_plan_reports_missing_unfinished_and_empty_games(db_session):
+    """測試補爬計畫只列出缺少、未完成或目標球隊沒有打席紀錄的過去比賽。"""
+    day = datetime.date(2025, 8, 1)
+    _schedule(db_session, "1", day)  # 完整，不需處理
+    _result(db_session, "1", day, at_bat_team=TARGET)
+    _schedule(db_session, "2", day + datetime.timedelta(days=1))  # 缺少
+    _schedule(db_session, "3", day + datetime.timedelta(days=2))  # 未完成
+    _result(db_session, "3", day + datetime.timedelta(days=2), status="延賽")
+    _schedule(db_session, "4", day + datetime.timedelta(days=3))  # 只有對手的打席
+    _result(db_session, "4", day + datetime.timedelta(days=3), at_bat_team="樂天桃猿")
+    _schedule(db_session, "5", day, "中信兄弟", "味全龍")  # 非目標球隊
+    _schedule(db_session, "6", datetime.date(2025, 8, 20))  # 尚未開打
+    _schedule(db_session, "7", day, status="延賽")  # 延賽且尚無補賽日期
+    _schedule(db_session, "8", datetime.date(2024, 8, 2))  # 其他賽季
+    db_session.commit()
+
+    plan = crawl_planner.build_crawl_plan(
+        db_session, 2025, [TARGET], today=datetime.date(2025, 8, 10)
+    )
+
+    assert plan["checked_games"] == 5
+    assert [(g["cpbl_game_id"], g["reason"]) for g in plan["games"]] == [
+        ("2", crawl_planner.REASON_MISSING),
+        ("3", crawl_planner.REASON_NOT_FINAL),
+        ("4", crawl_planner.REASON_NO_AT_BATS),
+    ]
+    assert plan["games"][0]["home_team"] == TARGET
+    assert plan["reasons"] == {"missing": 1, "not_final": 1, "no_at_bats": 1}
+
+
+def test_build_crawl_plan_without_schedule(db_session):
+    """測試沒有賽程資料時回傳空計畫。"""
+    plan = crawl_planner.build_crawl_plan(
+        db_session, 2025, [TARGET], today=datetime.date(2025, 8, 10)
+    )
+
+    assert (plan["checked_games"], plan["planned_games"], plan["games"]) == (0, 0, [])
+
+
+def test_build_crawl_plan_matches_rescheduled_games_by_cpbl_game_id(db_session):
+    """[新增] 測試延賽後日期改變的比賽以 cpbl_game_id 比對，且其他目標球隊的比賽也會列入。"""
+    _schedule(db_session, "10", datetime.date(2024, 5, 3))
+    _result(db_session, "10", datetime.date(2024, 5, 1), at_bat_team=TARGET)
+    _schedule(db_session, "11", datetime.date(2024, 5, 4), "味全龍", "中信兄弟")
+    db_session.commit()
+
+    plan = crawl_planner.build_crawl_plan(
+        db_session, 2024, [TARGET, "味全龍"], today=datetime.date(2025, 8, 10)
+    )
+
+    assert plan["checked_games"] == 2
+    assert [(g["cpbl_game_id"], g["reason"]) for g in plan["games"]] == [
+        ("11", crawl_planner.REASON_MISSING)
+    ]
+
+
+def test_schedule_is_stale_by_last_update(db_session):
+    """[新增] 測試整季賽程未寫入或超過期限未更新時視為過期，過去賽季在年底後更新過即不過期。"""
+    max_age = datetime.timedelta(hours=24)
+    year = datetime.date.today().year
+    assert crawl_planner.schedule_is_stale(db_session, year, max_age)
+
+    _schedule(db_session, "1", datetime.date(year, 4, 1))
+    db_session.commit()
+    assert not crawl_planner.schedule_is_stale(db_session, year, max_age)
+    assert crawl_planner.schedule_is_stale(
+        db_session, year, datetime.timedelta(hours=-1)
+    )
+
+    _schedule(db_session, "1", datetime.date(2020, 4, 1))
+    db_session.commit()
+    assert not crawl_planner.schedule_is_stale(
+        db_session, 2020, datetime.timedelta(hours=-1)
+    )
+
+
+def test_unresolved_months_lists_past_games_without_final_status(db_session):
+    """[新增] 測試只回傳日期已過、狀態不是已完成或取消之比賽所在的月份。"""
+    _schedule(db_session, "1", datetime.date(2025, 4, 1))
+    _schedule(db_session, "2", datetime.date(2025, 5, 1), status="延賽")
+    _schedule(db_session, "3", datetime.date(2025, 6, 1), status="取消")
+    _schedule(db_session, "4", datetime.date(2025, 7, 1), status="未開始")
+    _schedule(db_session, "5", datetime.date(2025, 9, 1), status="未開始")
+    db_session.commit()
+
+    months = crawl_planner.unresolved_months(
+        db_session, 2025, datetime.date(2025, 8, 1)
+    )
+
+    assert months == {5, 7}
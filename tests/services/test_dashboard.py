@@ -1,12 +1,15 @@
 # tests/services/test_dashboard.py
 
 import datetime
+import json
 
 from freezegun import freeze_time
 
 from app import models, schemas
 from app.config import Settings
+from app.crud import standings
 from app.services.dashboard import DashboardService
+from tests.factories import add_with_dimension_ids
 
 
 @freeze_time("2025-08-15")
@@ -42,7 +45,7 @@ def test_get_today_dashboard_data_with_games(db_session):
         game_time="17:05",
         matchup="E vs F",
     )
-    db.add_all([game1, game2, next_schedule])
+    add_with_dimension_ids(db, [game1, game2, next_schedule])
     db.commit()
 
     # 準備 Service
@@ -117,14 +120,15 @@ def test_get_today_dashboard_data_no_games(db_session):
         home_team="其他隊",
         away_team="F",
     )
-    db.add_all(
+    add_with_dimension_ids(
+        db,
         [
             next_schedule_1,
             last_game_target,
             recent_game_1,
             recent_game_2,
             other_team_game,
-        ]
+        ],
     )
     db.commit()
 
@@ -170,7 +174,7 @@ def test_get_today_dashboard_data_no_games_and_no_data(db_session):
         home_team="其他隊",
         away_team="無關隊",
     )
-    db.add(other_game)
+    add_with_dimension_ids(db, other_game)
     db.commit()
 
     # 準備 Service
@@ -186,3 +190,218 @@ def test_get_today_dashboard_data_no_games_and_no_data(db_session):
     assert result.next_game_status is None
     assert result.last_target_team_game is None
     assert result.target_team_status is None
+
+
+# --- [新增] 測試儀表板快照 ---
+
+
+def _add_snapshot_fixture_data(db):
+    """建立 2025-08-15 已完成比賽與 2025-08-17 賽程，供快照測試使用。"""
+    add_with_dimension_ids(
+        db,
+        [
+            models.GameResultDB(
+                cpbl_game_id="G01",
+                game_date=datetime.date(2025, 8, 15),
+                status="已完成",
+                home_team="目標A隊",
+                away_team="B",
+                home_score=3,
+                away_score=1,
+            ),
+            models.GameSchedule(
+                game_id="NEXT01",
+                game_date=datetime.date(2025, 8, 17),
+                game_time="17:05",
+                matchup="目標A隊 vs C",
+            ),
+        ],
+    )
+    db.commit()
+
+
+@freeze_time("2025-08-15 12:00:00")
+def test_refresh_dashboard_snapshots_writes_today_and_tomorrow(db_session):
+    """
+    測試 worker 產生快照時，今日為 HAS_TODAY_GAMES，明日預先寫入 NO_TODAY_GAMES，
+    且過期的快照會被清除。
+    """
+    db = db_session
+    _add_snapshot_fixture_data(db)
+    add_with_dimension_ids(
+        db,
+        models.DashboardSnapshotDB(
+            snapshot_date=datetime.date(2025, 8, 14),
+            status="NO_TODAY_GAMES",
+            document="{}",
+        ),
+    )
+    db.commit()
+    service = DashboardService(db=db, settings=Settings(TARGET_TEAMS=["目標A隊"]))
+
+    service.refresh_dashboard_snapshots()
+
+    snapshots = {
+        snapshot.snapshot_date: snapshot
+        for snapshot in db.query(models.DashboardSnapshotDB).all()
+    }
+    assert set(snapshots) == {datetime.date(2025, 8, 15), datetime.date(2025, 8, 16)}
+    assert snapshots[datetime.date(2025, 8, 15)].status == "HAS_TODAY_GAMES"
+    assert snapshots[datetime.date(2025, 8, 16)].status == "NO_TODAY_GAMES"
+
+    tomorrow = json.loads(snapshots[datetime.date(2025, 8, 16)].document)
+    assert tomorrow["last_target_team_game"]["cpbl_game_id"] == "G01"
+    assert tomorrow["next_game_status"]["game_date"] == "2025-08-17"
+
+    # 快照內容應與即時查詢的結果一致
+    assert json.loads(service.get_today_dashboard_snapshot()) == json.loads(
+        service.get_today_dashboard_data().model_dump_json()
+    )
+
+
+def test_get_today_dashboard_snapshot_follows_taipei_date(db_session):
+    """
+    測試快照以台北時間的日期為準：UTC 16:30 已是台北隔日，應改讀隔日的快照；
+    隔日快照不存在時回傳 None，由端點退回即時查詢。
+    """
+    db = db_session
+    _add_snapshot_fixture_data(db)
+    service = DashboardService(db=db, settings=Settings(TARGET_TEAMS=["目標A隊"]))
+
+    with freeze_time("2025-08-15 12:00:00"):
+        service.refresh_dashboard_snapshots()
+        assert json.loads(service.get_today_dashboard_snapshot())["status"] == (
+            "HAS_TODAY_GAMES"
+        )
+
+    with freeze_time("2025-08-15 16:30:00"):  # 台北時間 2025-08-16 00:30
+        assert json.loads(service.get_today_dashboard_snapshot())["status"] == (
+            "NO_TODAY_GAMES"
+        )
+
+    with freeze_time("2025-08-16 16:30:00"):  # 台北時間 2025-08-17 00:30
+        assert service.get_today_dashboard_snapshot() is None
+
+
+@freeze_time("2025-08-15")
+def test_dashboard_reads_team_status_from_standings_ledger(db_session):
+    """[新增] 測試戰績帳本已有資料時，目標球隊近況直接讀取帳本的累計結果。"""
+    db = db_session
+    for game_id, game_date, home_score, away_score in [
+        ("L1", "2025-08-12", 1, 4),
+        ("L2", "2025-08-13", 5, 2),
+        ("L3", "2025-08-14", 6, 3),
+    ]:
+        standings.record_game_result(
+            db,
+            {
+                "cpbl_game_id": game_id,
+                "game_date": game_date,
+                "home_team": "目標A隊",
+                "away_team": "B",
+                "home_score": home_score,
+                "away_score": away_score,
+                "status": "已完成",
+            },
+        )
+    db.commit()
+    service = DashboardService(db=db, settings=Settings(TARGET_TEAMS=["目標A隊"]))
+
+    result = service.get_today_dashboard_data()
+
+    assert result.target_team_status.last_10_games_record == "2-1-0"
+    assert result.target_team_status.current_streak_description == "2連勝"
+
+
+@freeze_time("2025-08-15")
+def test_dashboard_falls_back_when_standings_ledger_is_incomplete(db_session):
+    """[新增] 測試帳本只涵蓋部分比賽 (尚未補齊) 時，改由比賽紀錄計算目標球隊近況。"""
+    db = db_session
+    results = [
+        ("F1", datetime.date(2025, 8, 10), 1, 4),
+        ("F2", datetime.date(2025, 8, 11), 2, 3),
+        ("F3", datetime.date(2025, 8, 12), 0, 5),
+        ("F4", datetime.date(2025, 8, 13), 6, 3),
+    ]
+    for game_id, game_date, home_score, away_score in results:
+        add_with_dimension_ids(
+            db,
+            models.GameResultDB(
+                cpbl_game_id=game_id,
+                game_date=game_date,
+                status="已完成",
+                home_team="目標A隊",
+                away_team="B",
+                home_score=home_score,
+                away_score=away_score,
+            ),
+        )
+    # 帳本只記錄了最後一場
+    game_id, game_date, home_score, away_score = results[-1]
+    standings.record_game_result(
+        db,
+        {
+            "cpbl_game_id": game_id,
+            "game_date": game_date.isoformat(),
+            "home_team": "目標A隊",
+            "away_team": "B",
+            "home_score": home_score,
+            "away_score": away_score,
+            "status": "已完成",
+        },
+    )
+    db.commit()
+    service = DashboardService(db=db, settings=Settings(TARGET_TEAMS=["目標A隊"]))
+
+    result = service.get_today_dashboard_data()
+
+    assert result.target_team_status.last_10_games_record == "1-3-0"
+    assert result.target_team_status.current_streak_description == "1連勝"
+
+
+@freeze_time("2025-08-15")
+def test_dashboard_ignores_ledger_started_mid_season(db_session):
+    """[新增] 測試帳本雖已累計十場以上，但少於整季賽程的已完成場數 (開季後才開始記錄) 時不採用。"""
+    db = db_session
+    for day in range(1, 11):
+        standings.record_game_result(
+            db,
+            {
+                "cpbl_game_id": f"L{day}",
+                "game_date": f"2025-08-{day:02d}",
+                "home_team": "目標A隊",
+                "away_team": "B",
+                "home_score": 5,
+                "away_score": 1,
+                "status": "已完成",
+            },
+        )
+    for day in range(1, 13):
+        db.add(
+            models.SeasonScheduleGameDB(
+                season=2025,
+                cpbl_game_id=f"S{day}",
+                game_date=datetime.date(2025, 7 if day > 10 else 8, day),
+                home_team="目標A隊",
+                away_team="B",
+                status="已完成",
+            )
+        )
+    add_with_dimension_ids(
+        db,
+        models.GameResultDB(
+            cpbl_game_id="L10",
+            game_date=datetime.date(2025, 8, 10),
+            status="已完成",
+            home_team="目標A隊",
+            away_team="B",
+            home_score=1,
+            away_score=2,
+        ),
+    )
+    db.commit()
+    service = DashboardService(db=db, settings=Settings(TARGET_TEAMS=["目標A隊"]))
+
+    result = service.get_today_dashboard_data()
+
+    assert result.target_team_status.current_streak_description == "1連敗"
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import datetime
 
+from app import models
 from app.services import data_persistence
 
 
@@ -61,6 +62,76 @@ def test_commit_player_game_data_success(mock_logger, mock_players_crud):
     mock_logger.error.assert_not_called()
 
 
+@patch("app.services.data_persistence.games")
+@patch("app.services.data_persistence.players")
+@patch("app.services.data_persistence.logger")
+def test_commit_player_game_data_renders_detail_documents(
+    mock_logger, mock_players_crud, mock_games_crud
+):
+    """[新增] 測試 commit_player_game_data 會在寫入球員數據後預先渲染比賽細節文件。"""
+    mock_db = MagicMock(spec=Session)
+    player_data = [{"player_name": "Player A"}]
+
+    data_persistence.commit_player_game_data(mock_db, 123, player_data)
+
+    mock_db.flush.assert_called_once()
+    mock_games_crud.store_game_detail_documents.assert_called_once_with(mock_db, 123)
+    mock_logger.warning.assert_not_called()
+
+
+@patch("app.services.data_persistence.games")
+@patch("app.services.data_persistence.players")
+@patch("app.services.data_persistence.logger")
+def test_commit_player_game_data_document_failure_is_not_fatal(
+    mock_logger, mock_players_crud, mock_games_crud
+):
+    """[新增] 測試渲染比賽細節文件失敗時只記錄警告，不影響比賽資料的寫入。"""
+    mock_db = MagicMock(spec=Session)
+    mock_games_crud.store_game_detail_documents.side_effect = ValueError("boom")
+
+    data_persistence.commit_player_game_data(mock_db, 123, [])
+
+    mock_players_crud.store_player_game_data.assert_called_once()
+    mock_logger.warning.assert_called_once()
+
+
+def test_commit_player_game_data_document_db_error_keeps_transaction(db_session):
+    """[新增] 測試渲染文件時發生資料庫錯誤，外層交易仍可提交比賽資料。"""
+    game = models.GameResultDB(
+        cpbl_game_id="DOC01",
+        game_date=datetime.date(2025, 8, 12),
+        home_team="主隊",
+        away_team="客隊",
+    )
+    db_session.add(game)
+    db_session.flush()
+
+    def duplicate_documents(db, game_id):
+        # 同一場比賽寫入兩份相同 detail 的文件，flush 時違反唯一性限制
+        for _ in range(2):
+            db.add(
+                models.GameDetailDocumentDB(
+                    game_id=game_id, detail="summary", document=b"{}"
+                )
+            )
+        db.flush()
+
+    with patch.object(
+        data_persistence.games,
+        "store_game_detail_documents",
+        side_effect=duplicate_documents,
+    ):
+        data_persistence.commit_player_game_data(
+            db_session,
+            game.id,
+            [{"summary": {"player_name": "測試員", "team_name": "主隊"}}],
+        )
+    db_session.commit()
+
+    assert db_session.query(models.PlayerGameSummaryDB).count() == 1
+    assert db_session.query(models.GameDetailDocumentDB).count() == 0
+
+
 @patch("app.services.data_persistence.players")
 def test_commit_player_game_data_propagates_error(mock_players_crud):
     """測試 commit_player_game_data 會將底層的異常向上傳遞。"""
@@ -73,3 +144,29 @@ def test_commit_player_game_data_propagates_error(mock_players_crud):
 
     with pytest.raises(ValueError, match="Invalid data format"):
         data_persistence.commit_player_game_data(mock_db, game_id, player_data)
+
+
+@patch("app.services.data_persistence.standings")
+def test_record_team_standings_commits_finished_games(mock_standings_crud):
+    """[新增] 測試戰績帳本會寫入所有比賽並提交，回傳實際寫入的場數。"""
+    mock_db = MagicMock(spec=Session)
+    mock_standings_crud.record_game_result.side_effect = [True, False, True]
+
+    recorded = data_persistence.record_team_standings(mock_db, [{}, {}, {}])
+
+    assert recorded == 2
+    assert mock_standings_crud.record_game_result.call_count == 3
+    mock_db.commit.assert_called_once()
+
+
+@patch("app.services.data_persistence.standings")
+def test_record_team_standings_rolls_back_on_error(mock_standings_crud):
+    """[新增] 測試寫入戰績帳本失敗時會復原並向上傳遞異常。"""
+    mock_db = MagicMock(spec=Session)
+    mock_standings_crud.record_game_result.side_effect = SQLAlchemyError("DB down")
+
+    with pytest.raises(SQLAlchemyError):
+        data_persistence.record_team_standings(mock_db, [{}])
+
+    mock_db.rollback.assert_called_once()
+    mock_db.commit.assert_not_called()
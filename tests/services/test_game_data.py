@@ -1,10 +1,13 @@
 # tests/services/test_game_data.py
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 import pytest
 import datetime
 
+from freezegun import freeze_time
+
 from app.config import settings
+from app.crud import standings
 from app.services import game_data
 from app.exceptions import ScraperError
 
@@ -29,6 +32,8 @@ def mock_orchestration_dependencies(monkeypatch):
     mock_browser_operator_class = patch(
         "app.services.game_data.BrowserOperator"
     ).start()
+    mock_operator = mock_browser_operator_class.return_value
+    mock_operator.navigate_and_get_box_score_content.return_value = "<html>box</html>"
     mock_game_state_machine_class = patch(
         "app.services.game_data.GameStateMachine"
     ).start()
@@ -93,6 +98,9 @@ def test_scrape_and_store_season_stats_orchestration(mocker):
     mock_scrape_fielding = mocker.patch(
         "app.services.game_data._scrape_and_store_fielding_stats"
     )
+    mock_scrape_league = mocker.patch(
+        "app.services.game_data._scrape_and_store_league_batting_stats"
+    )
 
     # 2. Act
     game_data.scrape_and_store_season_stats(update_career_stats_for_all=True)
@@ -112,6 +120,40 @@ def test_scrape_and_store_season_stats_orchestration(mocker):
     assert mock_scrape_fielding.call_args[0][0] is mock_page
     assert "ClubNo=" in mock_scrape_fielding.call_args[0][1]
 
+    # 驗證其他球隊的打擊數據也在同一個 page 中抓取
+    mock_scrape_league.assert_called_once_with(mock_page)
+
+
+def test__scrape_and_store_league_batting_stats(mocker, monkeypatch):
+    """測試其他球隊的打擊數據會標上各自隊名、一次寫入，且不觸發生涯數據更新。"""
+    monkeypatch.setattr("app.config.settings.TARGET_TEAM_NAME", "台鋼雄鷹")
+    monkeypatch.setattr(
+        "app.config.settings.TEAM_CLUB_CODES",
+        {"台鋼雄鷹": "AKP", "中信兄弟": "ACN", "味全龍": "AAA"},
+    )
+    monkeypatch.setattr("app.config.settings.FRIENDLY_SCRAPING_DELAY", 0)
+    mock_page = MagicMock()
+    mock_page.content.return_value = "<html>batting page</html>"
+    mock_parser = mocker.patch(
+        "app.services.game_data.season_stats.parse_season_batting_stats_page",
+        side_effect=lambda html, team_name: [{"player_name": f"{team_name}球員"}],
+    )
+    mock_store_stats = mocker.patch(
+        "app.crud.players.store_player_season_stats_and_history"
+    )
+    mock_player_service = mocker.patch("app.services.game_data.player_service")
+    mocker.patch("app.services.game_data.SessionLocal")
+
+    game_data._scrape_and_store_league_batting_stats(mock_page)
+
+    visited = [call.args[0] for call in mock_page.goto.call_args_list]
+    assert [url.split("ClubNo=")[1] for url in visited] == ["ACN", "AAA"]
+    assert mock_parser.call_count == 2
+    mock_store_stats.assert_called_once_with(
+        mocker.ANY, [{"player_name": "中信兄弟球員"}, {"player_name": "味全龍球員"}]
+    )
+    mock_player_service.scrape_and_store_player_career_stats.assert_not_called()
+
 
 def test__scrape_and_store_batting_stats_default(mocker, monkeypatch):
     """測試 _scrape_and_store_batting_stats 在預設模式下只更新目標球員。"""
@@ -186,8 +228,12 @@ def test__scrape_and_store_fielding_stats_success(mocker):
 # --- 測試 _process_filtered_games (重構後) ---
 
 
-def test_process_filtered_games_orchestration(mock_orchestration_dependencies):
-    """測試 _process_filtered_games 作為協調者的主要成功路徑。"""
+def test_process_filtered_games_orchestration(
+    mock_orchestration_dependencies, monkeypatch
+):
+    """測試 _process_filtered_games 作為協調者的主要成功路徑 (逐一點擊擷取模式)。"""
+    monkeypatch.setattr(settings, "LIVE_EVENTS_EXTRACTION", "click")
+    mock_archive = patch("app.services.game_data.page_archive.archive_page").start()
     mock_dp = mock_orchestration_dependencies["data_persistence"]
     mock_browser_op_instance = mock_orchestration_dependencies[
         "BrowserOperator"
@@ -223,6 +269,8 @@ def test_process_filtered_games_orchestration(mock_orchestration_dependencies):
 
     game_data._process_filtered_games(game_to_process, target_teams=["Team A"])
 
+    # [新增] 所有比賽都會先寫入戰績帳本
+    mock_dp.record_team_standings.assert_called_once_with(ANY, game_to_process)
     mock_dp.prepare_game_storage.assert_called_once()
     mock_browser_op_instance.navigate_and_get_box_score_content.assert_called_once()
     mock_browser_op_instance.extract_live_events_html.assert_called_once()
@@ -231,6 +279,159 @@ def test_process_filtered_games_orchestration(mock_orchestration_dependencies):
     mock_dp.commit_player_game_data.assert_called_once()
     mock_session_instance.commit.assert_called_once()
     mock_session_instance.rollback.assert_not_called()
+    # [新增] Box Score 與各半局文字轉播皆以比賽為鍵封存
+    assert [
+        (call.args[:2], call.kwargs.get("part", "")) for call in mock_archive.mock_calls
+    ] == [
+        (("box_score", "2025-08-12/G01"), ""),
+        (("live", "2025-08-12/G01"), "1-top"),
+    ]
+
+
+@pytest.mark.parametrize("evaluate_fails", [False, True])
+def test_extract_live_half_innings_prefers_single_evaluate(evaluate_fails):
+    """測試預設以單次 evaluate 擷取文字轉播，失敗時退回逐一點擊並解析 HTML。"""
+    operator = MagicMock()
+    raw_events = [{"hitter_name": "P1", "description_text": "一壘安打"}]
+    if evaluate_fails:
+        operator.extract_live_events.side_effect = Exception("evaluate failed")
+    else:
+        operator.extract_live_events.return_value = [(raw_events, 1, "section.top")]
+    operator.extract_live_events_html.return_value = [("<html/>", 1, "section.top")]
+
+    half_innings = game_data._extract_live_half_innings(operator, "http://fake/live")
+
+    if evaluate_fails:
+        assert half_innings == [
+            ("<html/>", 1, "section.top", game_data.live.parse_active_inning_details)
+        ]
+    else:
+        assert half_innings == [
+            (raw_events, 1, "section.top", game_data.live.parse_extracted_events)
+        ]
+        operator.extract_live_events_html.assert_not_called()
+
+
+@pytest.mark.parametrize("http_fails", [False, True])
+def test_process_filtered_games_http_mode(
+    mock_orchestration_dependencies, monkeypatch, http_fails
+):
+    """測試 HTTP 模式成功時不開啟瀏覽器，資料端點失敗時自動退回瀏覽器模式。"""
+    monkeypatch.setattr(settings, "GAME_DATA_FETCH_MODE", "http")
+    mock_box_api = patch("app.services.game_data.box_api").start()
+    mock_box_data = patch("app.services.game_data.box_data").start()
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.return_value = 123
+    mock_operator_class = mock_orchestration_dependencies["BrowserOperator"]
+    mock_orchestration_dependencies[
+        "box_score_parser"
+    ].parse_box_score_page.return_value = [
+        {"summary": {"player_name": "P1"}, "at_bats_list": []}
+    ]
+    mock_box_api.fetch_game_data.return_value = {"Success": True}
+    if http_fails:
+        mock_box_api.fetch_game_data.side_effect = Exception("token rejected")
+    mock_box_data.parse_box_score_data.return_value = [
+        {"summary": {"player_name": "P1"}, "at_bats_list": ["安打"]}
+    ]
+    mock_box_data.parse_live_log_data.return_value = [([], 1, "section.top")]
+
+    game_data._process_filtered_games(_make_games("G01"), target_teams=["Team A"])
+
+    mock_box_api.fetch_game_data.assert_called_once_with(
+        "http://fake.url/box?gameSno=G01"
+    )
+    assert mock_operator_class.called is http_fails
+    mock_dp.commit_player_game_data.assert_called_once()
+
+
+@pytest.mark.parametrize("unchanged", [True, False])
+def test_process_filtered_games_skips_unchanged_final_game(
+    mock_orchestration_dependencies, unchanged
+):
+    """測試已完成比賽的內容指紋相同時略過文字轉播與資料庫重寫，不同時重寫並記錄新指紋。"""
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.return_value = 123
+    mock_operator = mock_orchestration_dependencies["BrowserOperator"].return_value
+    mock_orchestration_dependencies[
+        "box_score_parser"
+    ].parse_box_score_page.return_value = [
+        {"summary": {"player_name": "P1"}, "at_bats_list": []}
+    ]
+    games = [{**_make_games("G01")[0], "status": "已完成"}]
+    fingerprint = game_data._content_fingerprint(
+        games[0], "<html>box</html>", ["Team A"]
+    )
+    mock_dp.get_stored_fingerprint.return_value = fingerprint if unchanged else "0" * 64
+
+    with patch("app.services.game_data.logger") as mock_logger:
+        game_data._process_filtered_games(games, target_teams=["Team A"])
+
+    mock_operator.navigate_and_get_box_score_content.assert_called_once()
+    summary = mock_logger.info.mock_calls[-1].args[0]
+    if unchanged:
+        mock_dp.prepare_game_storage.assert_not_called()
+        mock_operator.extract_live_events.assert_not_called()
+        mock_operator.extract_live_events_html.assert_not_called()
+        mock_dp.commit_player_game_data.assert_not_called()
+        assert "重寫 0 場" in summary and "略過 1 場" in summary
+    else:
+        stored_info = mock_dp.prepare_game_storage.call_args.args[1]
+        assert stored_info["content_fingerprint"] == fingerprint
+        mock_dp.commit_player_game_data.assert_called_once()
+        assert "重寫 1 場" in summary and "略過 0 場" in summary
+
+
+def test_content_fingerprint_covers_schedule_fields():
+    """測試比分等賽程資訊變動時，即使 Box Score 相同指紋也不同。"""
+    game_info = {**_make_games("G01")[0], "home_score": 3, "away_score": 2}
+
+    assert game_data._content_fingerprint(
+        game_info, {"Success": True}
+    ) == game_data._content_fingerprint(dict(game_info), {"Success": True})
+    assert game_data._content_fingerprint(
+        game_info, "<html>box</html>"
+    ) != game_data._content_fingerprint(
+        {**game_info, "home_score": 4}, "<html>box</html>"
+    )
+
+
+def test_content_fingerprint_covers_target_teams_and_parser_version():
+    """[新增] 測試目標球隊或解析器版本變更時，相同內容的指紋也會不同。"""
+    game_info = _make_games("G01")[0]
+    fingerprint = game_data._content_fingerprint(game_info, "<html>box</html>", ["A"])
+
+    assert fingerprint != game_data._content_fingerprint(
+        game_info, "<html>box</html>", ["A", "B"]
+    )
+    with patch.object(
+        game_data, "GAME_DATA_PARSER_VERSION", game_data.GAME_DATA_PARSER_VERSION + 1
+    ):
+        assert fingerprint != game_data._content_fingerprint(
+            game_info, "<html>box</html>", ["A"]
+        )
+
+
+def test_process_filtered_games_force_rewrites_unchanged_game(
+    mock_orchestration_dependencies,
+):
+    """[新增] 測試 force=True 時不比對內容指紋，一律重寫。"""
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.return_value = 123
+    mock_orchestration_dependencies[
+        "box_score_parser"
+    ].parse_box_score_page.return_value = [
+        {"summary": {"player_name": "P1"}, "at_bats_list": []}
+    ]
+    games = [{**_make_games("G01")[0], "status": "已完成"}]
+    mock_dp.get_stored_fingerprint.return_value = game_data._content_fingerprint(
+        games[0], "<html>box</html>", ["Team A"]
+    )
+
+    game_data._process_filtered_games(games, target_teams=["Team A"], force=True)
+
+    mock_dp.get_stored_fingerprint.assert_not_called()
+    mock_dp.commit_player_game_data.assert_called_once()
 
 
 def test_process_filtered_games_rolls_back_on_error(mock_orchestration_dependencies):
@@ -256,6 +457,92 @@ def test_process_filtered_games_rolls_back_on_error(mock_orchestration_dependenc
     mock_session_instance.rollback.assert_called_once()
 
 
+def _make_games(*game_ids):
+    return [
+        {
+            "home_team": "Team A",
+            "away_team": "Team B",
+            "cpbl_game_id": game_id,
+            "game_date": "2025-08-12",
+            "box_score_url": f"http://fake.url/box?gameSno={game_id}",
+        }
+        for game_id in game_ids
+    ]
+
+
+def test_process_filtered_games_concurrently(
+    mock_orchestration_dependencies, monkeypatch
+):
+    """測試平行模式下每個執行緒各自啟動瀏覽器，每場比賽使用獨立的 context 與 session。"""
+    monkeypatch.setattr(settings, "GAME_PROCESSING_CONCURRENCY", 2)
+    mock_get_browser = patch("app.services.game_data.get_browser").start()
+    mock_new_context_page = patch("app.services.game_data.new_context_page").start()
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.return_value = 123
+    mock_orchestration_dependencies[
+        "box_score_parser"
+    ].parse_box_score_page.return_value = [
+        {"summary": {"player_name": "P1"}, "at_bats_list": []}
+    ]
+    mock_session = mock_orchestration_dependencies["session"]
+
+    games = _make_games("G01", "G02", "G03")
+    games.append({**_make_games("G04")[0], "home_team": "Team C", "away_team": "D"})
+    game_data._process_filtered_games(games, target_teams=["Team A"])
+
+    # 非目標球隊的比賽不處理；3 場比賽由 2 個執行緒分擔，瀏覽器於執行緒第一次需要時才啟動
+    assert 1 <= mock_get_browser.call_count <= 2
+    assert mock_new_context_page.call_count == 3
+    assert (
+        mock_session.call_count == 2 + 3
+    )  # 戰績帳本、整季賽程 + 每場比賽各一個 session
+    assert mock_session.return_value.commit.call_count == 3
+    assert mock_dp.commit_player_game_data.call_count == 3
+    assert {
+        call.args[1]["cpbl_game_id"] for call in mock_dp.prepare_game_storage.mock_calls
+    } == {"G01", "G02", "G03"}
+
+
+def test_process_filtered_games_concurrently_raises_first_error(
+    mock_orchestration_dependencies, monkeypatch
+):
+    """測試平行模式下任一場比賽失敗時會復原該場變更、停止取用新比賽並重新拋出錯誤。"""
+    monkeypatch.setattr(settings, "GAME_PROCESSING_CONCURRENCY", 2)
+    patch("app.services.game_data.get_browser").start()
+    patch("app.services.game_data.new_context_page").start()
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.side_effect = ValueError("DB Error")
+
+    with pytest.raises(ValueError, match="DB Error"):
+        game_data._process_filtered_games(
+            _make_games("G01", "G02", "G03", "G04", "G05"), target_teams=None
+        )
+
+    # 每個執行緒在第一場比賽失敗後即停止，其餘比賽不再處理
+    attempted = mock_dp.prepare_game_storage.call_count
+    assert 1 <= attempted <= 2
+    mock_session_instance = mock_orchestration_dependencies["session"].return_value
+    assert mock_session_instance.rollback.call_count == attempted
+    mock_session_instance.commit.assert_not_called()
+
+
+def test_process_filtered_games_records_season_schedule(
+    mock_orchestration_dependencies,
+):
+    """[新增] 測試賽程中的所有比賽都會寫入整季賽程，包含非目標球隊的比賽。"""
+    mock_dp = mock_orchestration_dependencies["data_persistence"]
+    mock_dp.prepare_game_storage.return_value = None
+    games = _make_games("G01")
+    games.append({**_make_games("G02")[0], "home_team": "Team C", "away_team": "D"})
+
+    game_data._process_filtered_games(games, target_teams=["Team A"])
+
+    mock_dp.record_season_schedule.assert_called_once_with(ANY, games)
+    assert [
+        call.args[1]["cpbl_game_id"] for call in mock_dp.prepare_game_storage.mock_calls
+    ] == ["G01"]
+
+
 # --- 測試高層級協調函式 ---
 
 
@@ -291,6 +578,147 @@ def test_scrape_entire_year_skips_month_on_scraper_error(
         assert mock_process_games.call_count == 2
 
 
+def test_scrape_planned_games_records_season_and_processes_planned_games(
+    mock_high_level_dependencies, monkeypatch
+):
+    """
+    [修正] 測試補爬計畫模式在整季賽程過期時先抓取整季賽程並寫入資料庫，再只重寫計畫中的比賽；
+    延賽的比賽只處理計畫中 (最新) 日期的那一場。
+    """
+    mock_fetcher = mock_high_level_dependencies["fetcher"]
+    mock_schedule_parser = mock_high_level_dependencies["schedule_parser"]
+    monkeypatch.setattr(settings, "CPBL_SEASON_START_MONTH", 3)
+    monkeypatch.setattr(settings, "CPBL_SEASON_END_MONTH", 5)
+    postponed = {"cpbl_game_id": "12", "game_date": "2025-03-30", "status": "延賽"}
+    replayed = {"cpbl_game_id": "12", "game_date": "2025-04-02", "status": "已完成"}
+    finished = {"cpbl_game_id": "13", "game_date": "2025-04-03", "status": "已完成"}
+    mock_schedule_parser.parse_schedule_page.side_effect = [
+        [postponed],
+        [replayed, finished],
+        [],
+    ]
+
+    with (
+        patch("app.services.game_data.crawl_planner") as mock_planner,
+        patch("app.services.game_data._record_season_schedule") as mock_record,
+        patch("app.services.game_data._process_filtered_games") as mock_process_games,
+    ):
+        mock_planner.schedule_is_stale.return_value = True
+        mock_planner.build_crawl_plan.return_value = {
+            "planned_games": 1,
+            "games": [
+                {"cpbl_game_id": "12", "game_date": "2025-04-02", "reason": "missing"}
+            ],
+        }
+        assert game_data.scrape_planned_games("2024") == 1
+
+    assert [call.args for call in mock_fetcher.fetch_schedule_page.mock_calls] == [
+        (2024, 3),
+        (2024, 4),
+        (2024, 5),
+    ]
+    mock_record.assert_called_once_with([postponed, replayed, finished])
+    assert mock_planner.build_crawl_plan.call_args.args[1] == 2024
+    mock_process_games.assert_called_once_with(
+        [replayed], target_teams=settings.get_target_teams_as_list(), force=True
+    )
+
+
+def test_scrape_planned_games_fetches_only_needed_months_when_fresh(
+    mock_high_level_dependencies, monkeypatch
+):
+    """[新增] 測試整季賽程未過期時，只抓取含有計畫中或狀態未確定之比賽的月份。"""
+    mock_fetcher = mock_high_level_dependencies["fetcher"]
+    mock_schedule_parser = mock_high_level_dependencies["schedule_parser"]
+    monkeypatch.setattr(settings, "CPBL_SEASON_START_MONTH", 3)
+    monkeypatch.setattr(settings, "CPBL_SEASON_END_MONTH", 10)
+    missing = {"cpbl_game_id": "20", "game_date": "2024-06-10", "status": "已完成"}
+    mock_schedule_parser.parse_schedule_page.side_effect = [[missing], []]
+    plan = {
+        "planned_games": 1,
+        "games": [
+            {"cpbl_game_id": "20", "game_date": "2024-06-10", "reason": "missing"}
+        ],
+    }
+
+    with (
+        patch("app.services.game_data.crawl_planner") as mock_planner,
+        patch("app.services.game_data._record_season_schedule") as mock_record,
+        patch("app.services.game_data._process_filtered_games") as mock_process_games,
+    ):
+        mock_planner.schedule_is_stale.return_value = False
+        mock_planner.unresolved_months.return_value = {8}
+        mock_planner.build_crawl_plan.return_value = plan
+        assert game_data.scrape_planned_games("2024") == 1
+
+    assert [call.args for call in mock_fetcher.fetch_schedule_page.mock_calls] == [
+        (2024, 6),
+        (2024, 8),
+    ]
+    mock_record.assert_called_once_with([missing])
+    mock_process_games.assert_called_once_with(
+        [missing], target_teams=settings.get_target_teams_as_list(), force=True
+    )
+
+
+def test_scrape_planned_games_skips_fetch_when_nothing_to_do(
+    mock_high_level_dependencies,
+):
+    """[新增] 測試整季賽程未過期且沒有需要處理的比賽時，不抓取任何賽程頁。"""
+    with (
+        patch("app.services.game_data.crawl_planner") as mock_planner,
+        patch("app.services.game_data._process_filtered_games") as mock_process_games,
+    ):
+        mock_planner.schedule_is_stale.return_value = False
+        mock_planner.unresolved_months.return_value = set()
+        mock_planner.build_crawl_plan.return_value = {"planned_games": 0, "games": []}
+        assert game_data.scrape_planned_games("2024") == 0
+
+    mock_high_level_dependencies["fetcher"].fetch_schedule_page.assert_not_called()
+    mock_process_games.assert_not_called()
+
+
+@freeze_time("2025-05-20")
+def test_backfill_season_standings_replays_schedule_pages(
+    monkeypatch, TestingSessionLocal, db_session
+):
+    """[新增] 測試回填會抓取整季的賽程頁，並將已完成的比賽依日期寫入整季賽程與戰績帳本。"""
+    monkeypatch.setattr(game_data, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "CPBL_SEASON_START_MONTH", 4)
+    monkeypatch.setattr(settings, "FRIENDLY_SCRAPING_DELAY", 0)
+
+    def game(cpbl_game_id, game_date, home_score, away_score):
+        return {
+            "cpbl_game_id": cpbl_game_id,
+            "game_date": game_date,
+            "home_team": "主隊",
+            "away_team": "客隊",
+            "home_score": home_score,
+            "away_score": away_score,
+            "status": "已完成",
+        }
+
+    pages = {
+        4: [game("1", "2025-04-01", 3, 1)],
+        5: [game("2", "2025-05-01", 0, 2), game("3", "2025-05-02", 4, 2)],
+    }
+    with (
+        patch("app.services.game_data.fetcher") as mock_fetcher,
+        patch("app.services.game_data.schedule") as mock_schedule_parser,
+    ):
+        mock_fetcher.fetch_schedule_page.side_effect = lambda year, month: month
+        mock_schedule_parser.parse_schedule_page.side_effect = (
+            lambda month, year: pages[month]
+        )
+        assert game_data.backfill_season_standings(2025) == 3
+
+    result = standings.get_standings(db_session, 2025)
+    home = next(row for row in result.standings if row.team_name == "主隊")
+    assert (home.wins, home.losses) == (2, 1)
+    assert home.current_streak_description == "1連勝"
+    assert result.is_complete
+
+
 def test_scrape_single_day_flow(mock_high_level_dependencies):
     """測試 scrape_single_day 是否使用傳入的參數正確呼叫 _process_filtered_games。"""
     with (
@@ -0,0 +1,59 @@
+# tests/services/test_player_index.py
+
+import pytest
+
+from app.config import settings
+from app.crud import dimensions
+from app.services import player_index
+from app.services.player_index import PlayerNameIndex
+
+
+@pytest.fixture
+def index():
+    return PlayerNameIndex(["王柏融", "王博玄", "魔鷹", "吳念庭"])
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("王", ["王博玄", "王柏融"]),
+        ("柏融", ["王柏融"]),
+        ("bairong", ["王柏融"]),
+        ("Bo Rong", ["王柏融"]),  # 多音字與大小寫、空白
+        ("wbr", ["王柏融"]),
+        ("ㄨㄤˊㄅㄞˇ", ["王柏融"]),  # 注音忽略聲調
+        ("ㄇㄛ", ["魔鷹"]),
+        ("nian", ["吳念庭"]),
+        ("不存在", []),
+        ("  ", []),
+    ],
+)
+def test_search_matches_name_pinyin_and_zhuyin(index, query, expected):
+    """測試搜尋可依名稱、名字、拼音、首字母與注音做前綴比對。"""
+    assert index.search(query) == expected
+
+
+def test_search_ranks_exact_match_first_and_applies_limit():
+    """測試完全相符的名稱排在最前，並套用筆數上限。"""
+    index = PlayerNameIndex(["王柏融", "王", "王威晨"])
+
+    assert index.search("王") == ["王", "王威晨", "王柏融"]
+    assert index.search("王", limit=2) == ["王", "王威晨"]
+
+
+def test_index_reloads_when_player_table_changes(db_session, monkeypatch):
+    """測試資料版本未改變時沿用索引，查無名稱時會重新檢查並載入新球員。"""
+    monkeypatch.setattr(settings, "PLAYER_INDEX_REFRESH_SECONDS", 3600)
+    dimensions.get_or_create_player_ids(db_session, ["王柏融"])
+    db_session.commit()
+
+    first = player_index.get_player_index(db_session)
+    assert "王柏融" in first
+    assert player_index.get_player_index(db_session) is first
+
+    dimensions.get_or_create_player_ids(db_session, ["新人球員"])
+    db_session.commit()
+
+    assert player_index.is_known_player(db_session, "新人球員")
+    assert not player_index.is_known_player(db_session, "不存在")
+    assert player_index.get_player_index(db_session) is not first
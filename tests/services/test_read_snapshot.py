@@ -0,0 +1,183 @@
+# tests/services/test_read_snapshot.py
+
+import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import at_bat_columns, models
+from app.config import settings
+from app.crud import games
+from app.db import SessionLocal, open_read_db
+from app.services import read_snapshot
+
+
+@pytest.fixture(autouse=True)
+def snapshot_source(monkeypatch, TestingSessionLocal, setup_database):
+    """讓 web 端的快照同步使用測試資料庫，並清除行程內的快照狀態。"""
+    monkeypatch.setattr(read_snapshot, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(read_snapshot, "_current_path", None)
+
+
+@pytest.fixture
+def game_with_at_bats(db_session: Session):
+    game = models.GameResultDB(
+        cpbl_game_id="SNAPSHOT_GAME",
+        game_date=datetime.date(2025, 8, 15),
+        home_team="台鋼雄鷹",
+        away_team="樂天桃猿",
+        status="已完成",
+    )
+    db_session.add(game)
+    db_session.flush()
+    summary = models.PlayerGameSummaryDB(
+        game_id=game.id, player_name="王柏融", team_name="台鋼雄鷹"
+    )
+    db_session.add(summary)
+    db_session.flush()
+    db_session.add(
+        models.AtBatDetailDB(
+            player_game_summary_id=summary.id,
+            game_id=game.id,
+            inning=1,
+            sequence_in_game=1,
+            result_short="全打",
+            result_type=models.AtBatResultType.ON_BASE,
+        )
+    )
+    db_session.commit()
+    return game
+
+
+def test_export_read_snapshot_copies_tables_and_indexes(
+    db_session: Session, game_with_at_bats, monkeypatch
+):
+    """測試匯出的快照寫入資料庫，web 端下載後包含唯讀資料表的資料與索引。"""
+    version = read_snapshot.export_read_snapshot(db_session)
+
+    assert db_session.query(models.ReadSnapshotDB.version).one() == (version,)
+    # worker 端不留下本機檔案
+    snapshot_dir = Path(settings.READ_SNAPSHOT_PATH).parent
+    assert list(snapshot_dir.glob("read_snapshot*")) == []
+
+    with open_read_db() as snapshot:
+        # 未啟用 SERVE_READ_SNAPSHOT 時仍使用 PostgreSQL
+        assert snapshot.get_bind() is SessionLocal.kw["bind"]
+
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    read_snapshot.sync_read_snapshot()
+    with open_read_db() as snapshot:
+        inspector = inspect(snapshot.get_bind())
+        assert "ix_at_bat_details_game_id" in {
+            index["name"] for index in inspector.get_indexes("at_bat_details")
+        }
+        completed = games.get_completed_games_by_date(
+            snapshot, datetime.date(2025, 8, 15)
+        )
+        assert [game.cpbl_game_id for game in completed] == ["SNAPSHOT_GAME"]
+        at_bat = snapshot.query(models.AtBatDetailDB).one()
+        assert at_bat.result_type == models.AtBatResultType.ON_BASE
+        assert at_bat.player_summary.player_name == "王柏融"
+
+
+def test_read_snapshot_is_read_only(
+    db_session: Session, game_with_at_bats, monkeypatch
+):
+    """測試快照以唯讀模式開啟，寫入會失敗。"""
+    read_snapshot.export_read_snapshot(db_session)
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    read_snapshot.sync_read_snapshot()
+
+    with open_read_db() as snapshot:
+        snapshot.add(
+            models.GameSchedule(
+                game_id="1", game_date=datetime.date(2025, 8, 16), matchup="x"
+            )
+        )
+        with pytest.raises(OperationalError):
+            snapshot.commit()
+
+
+def test_re_export_is_served_after_background_sync(
+    db_session: Session, game_with_at_bats, monkeypatch
+):
+    """測試重新匯出後，請求在同步完成前沿用舊快照，同步後改用新版本並只保留最近兩版。"""
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    read_snapshot.export_read_snapshot(db_session)
+    first_path = read_snapshot.sync_read_snapshot()
+    db_session.delete(game_with_at_bats)
+    db_session.commit()
+    for _ in range(2):
+        read_snapshot.export_read_snapshot(db_session)
+
+    # 請求路徑不會自行下載，繼續使用目前的快照
+    with open_read_db() as snapshot:
+        assert snapshot.query(models.GameResultDB).count() == 1
+
+    latest_path = read_snapshot.sync_read_snapshot()
+    with open_read_db() as snapshot:
+        assert snapshot.query(models.GameResultDB).count() == 0
+
+    assert db_session.query(models.ReadSnapshotDB).count() == 2
+    assert read_snapshot._local_versions() == [latest_path, first_path]
+
+
+def test_start_refresher_serves_existing_local_copy(
+    db_session: Session, game_with_at_bats, monkeypatch
+):
+    """測試啟動時直接採用本機既有的快照 (例如保存在 volume 中)，不需等待同步。"""
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    read_snapshot.export_read_snapshot(db_session)
+    local_path = read_snapshot.sync_read_snapshot()
+    monkeypatch.setattr(read_snapshot, "_current_path", None)
+    monkeypatch.setattr(read_snapshot, "sync_read_snapshot", lambda: None)
+
+    read_snapshot.start_refresher()
+    try:
+        assert read_snapshot.current_snapshot_path() == local_path
+        with open_read_db() as snapshot:
+            assert snapshot.get_bind() is not SessionLocal.kw["bind"]
+    finally:
+        read_snapshot.stop_refresher()
+
+
+def test_streaks_endpoint_in_snapshot_mode(
+    client, db_session: Session, game_with_at_bats, monkeypatch
+):
+    """測試唯讀快照模式下，「連線」端點可讀取快照中的打席欄式快照。"""
+    from app.db import get_read_db
+    from app.main import app
+
+    summary = db_session.query(models.PlayerGameSummaryDB).one()
+    db_session.add(
+        models.AtBatDetailDB(
+            player_game_summary_id=summary.id,
+            game_id=game_with_at_bats.id,
+            inning=1,
+            sequence_in_game=2,
+            result_short="一安",
+            result_type=models.AtBatResultType.ON_BASE,
+        )
+    )
+    db_session.commit()
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    read_snapshot.export_read_snapshot(db_session)
+    read_snapshot.sync_read_snapshot()
+    app.dependency_overrides.pop(get_read_db)
+
+    response = client.get("/api/analysis/streaks?definition_name=consecutive_hits")
+
+    assert response.status_code == 200
+    assert [streak["streak_length"] for streak in response.json()] == [2]
+
+
+def test_open_read_db_falls_back_without_snapshot(monkeypatch):
+    """測試啟用快照模式但資料庫中尚無快照時，退回使用 PostgreSQL。"""
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+
+    with open_read_db() as db:
+        assert db.get_bind() is SessionLocal.kw["bind"]
@@ -0,0 +1,138 @@
+# tests/services/test_reparse.py
+
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from app import models, page_archive
+from app.config import settings
+from app.services import reparse
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture
+def archive_enabled(monkeypatch, TestingSessionLocal, setup_database):
+    """啟用頁面封存，並讓封存模組使用測試資料庫。"""
+    monkeypatch.setattr(settings, "PAGE_ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(page_archive, "SessionLocal", TestingSessionLocal)
+
+
+@pytest.fixture
+def box_api_payload():
+    """錄製的資料端點回應，*Json 欄位已如同 box_api 一樣解碼。"""
+    payload = json.loads((FIXTURES_DIR / "box_getlive.json").read_text("utf-8"))
+    return {
+        key: json.loads(value) if key.endswith("Json") else value
+        for key, value in payload.items()
+    }
+
+
+def _create_game(db_session, cpbl_game_id="176", game_date=datetime.date(2025, 8, 12)):
+    game = models.GameResultDB(
+        cpbl_game_id=cpbl_game_id,
+        game_date=game_date,
+        home_team="台鋼雄鷹",
+        away_team="樂天桃猿",
+    )
+    db_session.add(game)
+    db_session.commit()
+    return game
+
+
+def _set_fetched_at(db_session, page_type, fetched_at):
+    db_session.query(models.PageArchiveEntryDB).filter_by(page_type=page_type).update(
+        {"fetched_at": fetched_at}
+    )
+    db_session.commit()
+
+
+def test_iter_reparse_jobs_uses_latest_box_source(archive_enabled, db_session):
+    """測試同時有頁面與資料端點封存時採用較晚抓取者，沒有封存的比賽則略過。"""
+    game = _create_game(db_session)
+    _create_game(db_session, "177", datetime.date(2025, 8, 13))
+    key = "2025-08-12/176"
+    page_archive.archive_page(page_archive.BOX_API, key, {"Success": True})
+    page_archive.archive_page(page_archive.BOX_SCORE, key, "<div>box</div>")
+    page_archive.archive_page(
+        page_archive.LIVE, key, [{"hitter_name": "王柏融"}], part="1-bot"
+    )
+    _set_fetched_at(db_session, page_archive.BOX_API, datetime.datetime(2025, 8, 12))
+    _set_fetched_at(db_session, page_archive.BOX_SCORE, datetime.datetime(2025, 8, 13))
+
+    jobs = [
+        job
+        for chunk in reparse.iter_reparse_jobs(
+            db_session, datetime.date(2025, 8, 1), datetime.date(2025, 8, 31)
+        )
+        for job in chunk
+    ]
+
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert (job["game_id"], job["source"]) == (game.id, page_archive.BOX_SCORE)
+    assert page_archive.decode(job["box"][1], job["box"][0]) == "<div>box</div>"
+    assert [(part, fmt) for part, fmt, _ in job["live"]] == [("1-bot", "json")]
+
+
+def test_iter_reparse_jobs_loads_blobs_per_chunk(archive_enabled, db_session):
+    """測試工作依批次產生，每批只載入該批比賽的封存內容。"""
+    for day in range(1, 4):
+        _create_game(db_session, str(day), datetime.date(2025, 8, day))
+        page_archive.archive_page(
+            page_archive.BOX_API, f"2025-08-0{day}/{day}", {"game": day}
+        )
+
+    loaded = []
+    original_load_blobs = reparse._load_blobs
+
+    def record_load_blobs(db, sha256s):
+        loaded.append(len(sha256s))
+        return original_load_blobs(db, sha256s)
+
+    with patch.object(reparse, "_load_blobs", record_load_blobs):
+        chunks = list(
+            reparse.iter_reparse_jobs(
+                db_session,
+                datetime.date(2025, 8, 1),
+                datetime.date(2025, 8, 31),
+                chunk_size=2,
+            )
+        )
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert loaded == [2, 1]
+    assert page_archive.decode(chunks[1][0]["box"][1], "json") == {"game": 3}
+
+
+def test_reparse_game_and_write_replaces_existing_data(
+    archive_enabled, db_session, box_api_payload
+):
+    """測試由資料端點封存重新解析並寫入，重複執行時取代舊資料而非累加。"""
+    game = _create_game(db_session)
+    page_archive.archive_page(page_archive.BOX_API, "2025-08-12/176", box_api_payload)
+    (jobs,) = reparse.iter_reparse_jobs(
+        db_session, datetime.date(2025, 8, 12), datetime.date(2025, 8, 12)
+    )
+
+    for _ in range(2):
+        results = [reparse.reparse_game(job, ["台鋼雄鷹"]) for job in jobs]
+        assert reparse.write_reparsed_games(db_session, results) == 1
+
+    summaries = (
+        db_session.query(models.PlayerGameSummaryDB).filter_by(game_id=game.id).all()
+    )
+    assert sorted(s.player_name for s in summaries) == ["吳念庭", "王柏融"]
+    at_bats = db_session.query(models.AtBatDetailDB).count()
+    assert at_bats == sum(len(s.at_bat_details) for s in summaries)
+    assert at_bats > 0
+
+
+def test_write_reparsed_games_keeps_data_without_results(db_session):
+    """測試沒有解析結果的比賽不會刪除原有資料。"""
+    game = _create_game(db_session)
+
+    assert reparse.write_reparsed_games(db_session, [(game.id, [])]) == 0
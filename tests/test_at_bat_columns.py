@@ -0,0 +1,261 @@
+# tests/test_at_bat_columns.py
+
+import datetime
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app import at_bat_columns, models
+from app.config import settings
+from app.crud import analysis
+
+
+def _add_game(db: Session, cpbl_game_id: str, game_date: datetime.date, results):
+    """建立一場比賽，results 為 (球員, 局數, 結果) 的列表，依序作為打席順序。"""
+    game = models.GameResultDB(
+        cpbl_game_id=cpbl_game_id,
+        game_date=game_date,
+        home_team="台鋼雄鷹",
+        away_team="樂天桃猿",
+    )
+    db.add(game)
+    db.flush()
+    summaries = {}
+    for sequence, (player_name, inning, result) in enumerate(results, start=1):
+        if player_name not in summaries:
+            summaries[player_name] = models.PlayerGameSummaryDB(
+                game_id=game.id, player_name=player_name, team_name="台鋼雄鷹"
+            )
+            db.add(summaries[player_name])
+            db.flush()
+        db.add(
+            models.AtBatDetailDB(
+                player_game_summary_id=summaries[player_name].id,
+                game_id=game.id,
+                inning=inning,
+                sequence_in_game=sequence,
+                result_short=result,
+                outs_before=0,
+                runners_on_base_before="一壘、三壘有人",
+                runs_scored_on_play=1 if result == "全打" else 0,
+            )
+        )
+    db.commit()
+    return game
+
+
+@pytest.fixture
+def two_games(db_session: Session):
+    _add_game(
+        db_session,
+        "G1",
+        datetime.date(2025, 8, 15),
+        [
+            ("球員A", 1, "一安"),
+            ("球員B", 1, "四壞"),
+            ("球員C", 1, "二安"),
+            ("球員D", 1, "三振"),
+            ("球員E", 2, "全打"),
+            ("球員F", 2, "四壞"),
+        ],
+    )
+    _add_game(
+        db_session,
+        "G2",
+        datetime.date(2025, 8, 16),
+        [
+            ("球員A", 3, "一安"),
+            ("球員B", 3, "一安"),
+            ("球員C", 4, "一安"),
+        ],
+    )
+
+
+def test_encode_base_state():
+    assert at_bat_columns.encode_base_state("壘上無人") == 0
+    assert at_bat_columns.encode_base_state("一壘、三壘有人") == 5
+    assert at_bat_columns.encode_base_state("滿壘") == -1
+    assert at_bat_columns.encode_base_state(None) == -1
+
+
+def test_publish_and_load_season_columns_as_memmap(db_session: Session, two_games):
+    """測試發布後的快照以 mmap 唯讀載入，且欄位內容正確。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+
+    columns = at_bat_columns.load_season_columns(db_session, 2025)
+
+    assert len(columns) == 9
+    assert isinstance(columns["game_id"], np.memmap)
+    assert columns.result_vocabulary[columns["result_code"][0]] == "一安"
+    assert columns.player_vocabulary[columns["player_idx"][1]] == "球員B"
+    assert columns["is_bottom"].all()
+    assert (columns["base_state"] == 5).all()
+    assert columns["runs_scored"].sum() == 1
+    assert at_bat_columns.load_season_columns(db_session, 2024) is None
+
+
+def test_republish_keeps_current_and_previous_versions(db_session: Session, two_games):
+    """測試重新發布時資料庫只保留目前與上一個版本，本機只保留載入中的版本。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    at_bat_columns.load_season_columns(db_session, 2025)
+    second = at_bat_columns.publish_season_columns(db_session, 2025)
+    third = at_bat_columns.publish_season_columns(db_session, 2025)
+
+    versions = db_session.query(models.AtBatColumnSnapshotDB.version).all()
+    assert sorted(v for (v,) in versions) == [second, third]
+    assert at_bat_columns.load_season_columns(db_session, 2025) is not None
+    season_dir = Path(settings.AT_BAT_COLUMNS_DIR) / "2025"
+    assert [path.name for path in season_dir.iterdir()] == [third]
+
+
+def test_snapshot_is_extracted_from_database_without_local_files(
+    db_session: Session, two_games, tmp_path
+):
+    """測試 web 端沒有 worker 的本機檔案時，仍可從資料庫取得並解壓縮快照。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    other_dir = tmp_path / "web_cache"
+
+    columns = at_bat_columns.load_season_columns(db_session, 2025, str(other_dir))
+
+    assert at_bat_columns.published_seasons(db_session) == [2025]
+    assert len(columns) == 9
+    assert (other_dir / "2025").is_dir()
+
+
+@pytest.mark.parametrize(
+    "definition_name, min_length",
+    [("consecutive_on_base", 2), ("consecutive_on_base", 3), ("consecutive_hits", 2)],
+)
+def test_streaks_from_snapshot_match_database_scan(
+    db_session: Session, two_games, definition_name, min_length
+):
+    """測試以快照向量化掃描的連線結果，與直接掃描資料庫的結果一致。"""
+    expected = analysis.find_on_base_streaks(
+        db_session, definition_name, min_length, None, None
+    )
+    at_bat_columns.publish_season_columns(db_session, 2025)
+
+    actual = analysis.find_on_base_streaks(
+        db_session, definition_name, min_length, None, None
+    )
+
+    assert expected
+    assert [s.model_dump() for s in actual] == [s.model_dump() for s in expected]
+
+
+def test_streaks_include_at_bats_added_after_publish(db_session: Session, two_games):
+    """測試快照發布後新增的打席 (當日增量) 與未發布賽季的比賽會從資料庫補讀。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    _add_game(
+        db_session,
+        "G3",
+        datetime.date(2025, 8, 17),
+        [("球員D", 1, "二安"), ("球員E", 1, "全打")],
+    )
+    _add_game(
+        db_session,
+        "G_OLD",
+        datetime.date(2024, 8, 17),
+        [("球員D", 1, "一安"), ("球員E", 1, "一安")],
+    )
+
+    streaks = analysis.find_on_base_streaks(
+        db_session, "consecutive_hits", 2, None, None
+    )
+
+    assert [s.game_date for s in streaks] == [
+        datetime.date(2024, 8, 17),
+        datetime.date(2025, 8, 17),
+        datetime.date(2025, 8, 16),
+    ]
+    assert streaks[1].runs_scored_during_streak == 1
+
+
+def test_streaks_fall_back_to_database_without_snapshot(db_session: Session, two_games):
+    """測試尚未發布任何快照時，改以資料庫查詢計算連線。"""
+    assert at_bat_columns.published_seasons(db_session) == []
+    assert settings.AT_BAT_COLUMNS_DIR.endswith("at_bat_columns")
+
+    streaks = analysis.find_on_base_streaks(
+        db_session, "consecutive_on_base", 2, None, None
+    )
+
+    assert len(streaks) == 3
+
+
+def test_streaks_exclude_snapshot_games_no_longer_stored(
+    db_session: Session, two_games
+):
+    """測試快照中已被刪除 (例如重新爬取後換了 game_id) 的比賽不會出現在結果中。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    game = db_session.query(models.GameResultDB).filter_by(cpbl_game_id="G2").one()
+    db_session.query(models.AtBatDetailDB).filter_by(game_id=game.id).delete()
+    db_session.query(models.PlayerGameSummaryDB).filter_by(game_id=game.id).delete()
+    db_session.delete(game)
+    db_session.commit()
+
+    streaks = analysis.find_on_base_streaks(
+        db_session, "consecutive_hits", 2, None, None
+    )
+
+    assert streaks == []
+
+
+def test_streaks_replace_reparsed_snapshot_game(db_session: Session, two_games):
+    """[新增] 測試重新爬取 (刪除後以新的 game_id 寫入) 的比賽只以資料庫中的新版本計算。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    game = db_session.query(models.GameResultDB).filter_by(cpbl_game_id="G2").one()
+    db_session.query(models.AtBatDetailDB).filter_by(game_id=game.id).delete()
+    db_session.query(models.PlayerGameSummaryDB).filter_by(game_id=game.id).delete()
+    db_session.delete(game)
+    db_session.commit()
+    _add_game(
+        db_session,
+        "G2",
+        datetime.date(2025, 8, 16),
+        [("球員A", 3, "一安"), ("球員B", 3, "二安")],
+    )
+
+    streak_ids = at_bat_columns.find_streak_at_bat_ids(db_session, {"一安", "二安"}, 2)
+
+    new_game = db_session.query(models.GameResultDB).filter_by(cpbl_game_id="G2").one()
+    new_ids = [
+        at_bat.id
+        for at_bat in db_session.query(models.AtBatDetailDB).filter_by(
+            game_id=new_game.id
+        )
+    ]
+    assert streak_ids == [sorted(new_ids)]
+
+
+def test_outside_seasons_uses_game_date_ranges(db_session: Session):
+    """[新增] 測試「不屬於已發布賽季」以 game_date 範圍表示，並正確涵蓋賽季之間的空檔。"""
+    for cpbl_game_id, year in [("A", 2022), ("B", 2023), ("C", 2024), ("D", 2026)]:
+        _add_game(db_session, cpbl_game_id, datetime.date(year, 6, 1), [])
+
+    condition = at_bat_columns._outside_seasons([2023, 2025])
+    game_ids = db_session.query(models.GameResultDB.cpbl_game_id).filter(condition)
+
+    assert sorted(row.cpbl_game_id for row in game_ids) == ["A", "C", "D"]
+    assert "extract" not in str(condition).lower()
+
+
+def test_load_legacy_snapshot_with_player_id_file(db_session: Session, two_games):
+    """[新增] 測試 player_idx 更名前發布的快照 (檔名為 player_id.npy) 仍可載入。"""
+    at_bat_columns.publish_season_columns(db_session, 2025)
+    snapshot = db_session.query(models.AtBatColumnSnapshotDB).one()
+    with np.load(io.BytesIO(snapshot.content)) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    arrays["player_id"] = arrays.pop("player_idx")
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    snapshot.content = buffer.getvalue()
+    snapshot.version = "legacy"
+    db_session.commit()
+
+    columns = at_bat_columns.load_season_columns(db_session, 2025)
+
+    assert columns.player_vocabulary[columns["player_idx"][1]] == "球員B"
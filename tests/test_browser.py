@@ -0,0 +1,286 @@
+# tests/test_browser.py
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import browser
+from app.browser import BrowserManager, browser_stats, page_load_stats
+from app.config import settings
+
+# autouse fixture 會替換此函式，保留原本的實作供單元測試使用
+_process_tree_rss_mb = browser._process_tree_rss_mb
+
+
+@pytest.fixture(autouse=True)
+def mock_playwright():
+    """模擬 Playwright，每次啟動都回傳新的 mock 瀏覽器。"""
+    browser_stats.reset()
+    page_load_stats.reset()
+    with (
+        patch("app.browser.sync_playwright") as mock_sync_playwright,
+        patch(
+            "app.browser._start_playwright",
+            side_effect=lambda: (browser.sync_playwright().start(), 4321),
+        ),
+        patch("app.browser._process_tree_rss_mb", return_value=100.0),
+    ):
+        yield mock_sync_playwright
+    browser.close_thread_browsers()
+    browser_stats.reset()
+
+
+def _launch_mock(mock_sync_playwright):
+    return mock_sync_playwright.return_value.start.return_value.chromium.launch
+
+
+def test_get_page_reuses_browser_when_enabled(mock_playwright):
+    """測試啟用重複使用後，多次 get_page 共用同一個瀏覽器，且每次都是新的 context。"""
+    browser.enable_browser_reuse()
+    launch = _launch_mock(mock_playwright)
+
+    for _ in range(3):
+        with browser.get_page(headless=True):
+            pass
+
+    launch.assert_called_once()
+    mock_browser = launch.return_value
+    assert mock_browser.new_context.call_count == 3
+    assert mock_browser.new_context.return_value.close.call_count == 3
+
+    browser.close_thread_browsers()
+    mock_browser.close.assert_called_once()
+    mock_playwright.return_value.start.return_value.stop.assert_called_once()
+
+    stats = browser_stats.snapshot()
+    assert stats["launches"] == 1
+    assert stats["pages"] == 3
+
+
+def test_get_page_launches_per_call_without_reuse(mock_playwright):
+    """測試未啟用重複使用時 (非 worker 執行緒)，每次 get_page 都啟動並關閉瀏覽器。"""
+    for _ in range(2):
+        with browser.get_page(headless=True):
+            pass
+
+    entered = mock_playwright.return_value.__enter__.return_value
+    assert entered.chromium.launch.call_count == 2
+    assert entered.chromium.launch.return_value.close.call_count == 2
+
+
+def test_browser_manager_recycles_after_max_pages(mock_playwright):
+    """測試處理的頁面數達上限後回收瀏覽器，下一次取用時重新啟動。"""
+    manager = BrowserManager(max_pages=2, max_memory_mb=1024)
+    launch = _launch_mock(mock_playwright)
+
+    for _ in range(5):
+        with manager.new_page():
+            pass
+
+    assert launch.call_count == 3
+    assert launch.return_value.close.call_count == 2
+
+
+def test_browser_manager_recycles_past_memory_watermark(mock_playwright):
+    """測試瀏覽器相關行程的記憶體超過上限時回收瀏覽器。"""
+    manager = BrowserManager(max_pages=50, max_memory_mb=512)
+    launch = _launch_mock(mock_playwright)
+
+    with patch("app.browser._process_tree_rss_mb", return_value=600.0) as rss:
+        with manager.new_page():
+            pass
+    with manager.new_page():
+        pass
+
+    # [修正] 只量測此瀏覽器的 driver 行程樹
+    rss.assert_called_once_with(4321)
+    assert launch.call_count == 2
+    launch.return_value.close.assert_called_once()
+
+
+def test_process_tree_rss_mb_counts_only_given_tree():
+    """[新增] 測試記憶體只加總指定行程與其子孫，不含同一行程中其他瀏覽器的行程樹。"""
+    children = {1: [10, 20], 10: [11], 20: [21]}
+    rss_kb = {10: 1024, 11: 2048, 20: 4096, 21: 4096}
+
+    def fake_open(path):
+        pid = int(path.split("/")[2])
+        return io.StringIO(f"Name:\tchrome\nVmRSS:\t{rss_kb[pid]} kB\n")
+
+    with (
+        patch("app.browser._children_by_ppid", return_value=children),
+        patch("builtins.open", side_effect=fake_open),
+    ):
+        assert browser._process_tree_pids(10) == [10, 11]
+        assert _process_tree_rss_mb(10) == 3.0
+
+
+def test_browser_manager_closes_idle_browser(mock_playwright):
+    """[新增] 測試閒置逾時後結束瀏覽器行程，下一次取用頁面時清理並重新啟動。"""
+    manager = BrowserManager(idle_timeout_seconds=60)
+    launch = _launch_mock(mock_playwright)
+
+    with patch("app.browser._terminate_process_tree") as terminate:
+        with manager.new_page():
+            # 使用中不會因閒置而關閉
+            manager._close_if_idle()
+            terminate.assert_not_called()
+        assert manager._idle_timer is not None
+        manager._idle_timer.cancel()
+        manager._close_if_idle()
+        terminate.assert_called_once_with(4321)
+
+    with manager.new_page():
+        pass
+
+    assert launch.call_count == 2
+    # 行程已結束，不再對舊瀏覽器呼叫 close，但仍停止 Playwright
+    launch.return_value.close.assert_not_called()
+    mock_playwright.return_value.start.return_value.stop.assert_called_once()
+    manager.close()
+
+
+def test_browser_manager_idle_timeout_disabled(mock_playwright):
+    """[新增] 測試閒置逾時設為 0 時不排程關閉。"""
+    manager = BrowserManager(idle_timeout_seconds=0)
+
+    with manager.new_page():
+        pass
+
+    assert manager._idle_timer is None
+    manager.close()
+
+
+def test_browser_stats_estimates_time_saved():
+    """測試以平均啟動耗時估算重複使用瀏覽器省下的時間。"""
+    browser_stats.record_launch(2.0)
+    browser_stats.record_launch(4.0)
+    for _ in range(5):
+        browser_stats.record_page()
+
+    assert browser_stats.snapshot() == {
+        "launches": 2,
+        "pages": 5,
+        "launch_seconds": 6.0,
+        "estimated_seconds_saved": 9.0,
+    }
+
+
+# --- [新增] 請求攔截與頁面載入統計 ---
+
+
+@pytest.mark.parametrize(
+    "url, resource_type, expected",
+    [
+        ("https://www.cpbl.com.tw/box?gameSno=1", "document", False),
+        ("https://www.cpbl.com.tw/files/logo.png", "image", True),
+        ("https://www.cpbl.com.tw/static/app.js", "script", False),
+        ("https://www.googletagmanager.com/gtag/js", "script", True),
+        ("https://stats.g.doubleclick.net/collect", "xhr", True),
+        ("https://www.youtube.com/embed/abc", "subframe", True),
+        ("https://cdn.example.com/font.woff2", "font", True),
+    ],
+)
+def test_should_block_request_uses_default_deny_lists(url, resource_type, expected):
+    """測試預設政策攔截圖片、字型、iframe 與廣告 / 分析網域，放行頁面與腳本。"""
+    assert browser.should_block_request(url, resource_type) is expected
+
+
+def test_should_block_request_allow_lists_take_precedence(monkeypatch):
+    """測試允許清單優先於封鎖清單。"""
+    monkeypatch.setattr(settings, "SCRAPER_ALLOWED_DOMAINS", ["cpbl.com.tw"])
+    monkeypatch.setattr(settings, "SCRAPER_ALLOWED_RESOURCE_TYPES", ["font"])
+
+    assert not browser.should_block_request("https://www.cpbl.com.tw/a.png", "image")
+    assert not browser.should_block_request("https://cdn.example.com/a.woff", "font")
+    assert browser.should_block_request("https://cdn.example.com/a.png", "image")
+
+
+@pytest.mark.parametrize("parent_frame, aborted", [(None, False), (object(), True)])
+def test_handle_route_treats_iframe_documents_as_subframe(parent_frame, aborted):
+    """測試 iframe 內的頁面以 subframe 類型判斷，主頁面則放行。"""
+    route = MagicMock()
+    route.request.url = "https://www.cpbl.com.tw/box/live?gameSno=1"
+    route.request.resource_type = "document"
+    route.request.frame.parent_frame = parent_frame
+
+    browser._handle_route(route)
+
+    assert route.abort.called is aborted
+    assert route.continue_.called is not aborted
+    assert page_load_stats.blocked_requests == int(aborted)
+
+
+def test_request_blocking_applied_to_new_contexts(mock_playwright, monkeypatch):
+    """測試共用的瀏覽器輔助函式會在每個新 context 套用攔截政策，關閉時則不套用。"""
+    manager = BrowserManager()
+    context = _launch_mock(mock_playwright).return_value.new_context.return_value
+
+    with manager.new_page():
+        pass
+    context.route.assert_called_once_with("**/*", browser._handle_route)
+
+    monkeypatch.setattr(settings, "SCRAPER_BLOCK_RESOURCES", False)
+    with manager.new_page():
+        pass
+    context.route.assert_called_once()
+
+
+def test_measure_page_load_records_bytes_by_page_type_and_mode(monkeypatch):
+    """測試頁面載入統計依頁面類型與攔截模式分別記錄耗時與傳輸量。"""
+    page = MagicMock()
+
+    def load(mode_enabled, sizes):
+        monkeypatch.setattr(settings, "SCRAPER_BLOCK_RESOURCES", mode_enabled)
+        with browser.measure_page_load(page, "box_score"):
+            on_response = page.on.call_args.args[1]
+            for size in sizes:
+                on_response(MagicMock(headers={"content-length": size}))
+        page.remove_listener.assert_called_with("response", on_response)
+
+    load(False, ["1024", "2048", ""])
+    load(True, ["1024"])
+
+    stats = page_load_stats.snapshot()
+    assert set(stats) == {"box_score:blocking", "box_score:no_blocking"}
+    assert stats["box_score:no_blocking"]["avg_kb"] == 3.0
+    assert stats["box_score:blocking"]["avg_kb"] == 1.0
+    assert stats["box_score:blocking"]["loads"] == 1
+
+
+@pytest.mark.parametrize(
+    "evaluated, expected",
+    [
+        ('<div class="RecordTable"></div>', '<div class="RecordTable"></div>'),
+        ("\n", "<html>full</html>"),
+    ],
+)
+def test_get_subtree_html_falls_back_to_full_content(evaluated, expected):
+    """測試只回傳選擇器對應的子樹 HTML，沒有任何元素符合時退回完整頁面。"""
+    page = MagicMock()
+    page.evaluate.return_value = evaluated
+    page.content.return_value = "<html>full</html>"
+
+    assert browser.get_subtree_html(page, ("div.RecordTable",)) == expected
+    assert page.evaluate.call_args.args[1] == ["div.RecordTable"]
+
+
+def test_reuse_middleware_keeps_browser_between_messages(mock_playwright):
+    """[修正] 測試訊息處理完後保留瀏覽器，後續訊息沿用同一個瀏覽器。"""
+    middleware = browser.BrowserReuseMiddleware()
+    middleware.after_worker_thread_boot(MagicMock(), MagicMock())
+    launch = _launch_mock(mock_playwright)
+
+    for _ in range(2):
+        for _ in range(2):
+            with browser.get_page(headless=True):
+                pass
+        middleware.after_process_message(MagicMock(), MagicMock())
+
+    launch.assert_called_once()
+    launch.return_value.close.assert_not_called()
+    assert browser_stats.snapshot()["pages"] == 4
+
+    middleware.before_worker_thread_shutdown(MagicMock(), MagicMock())
+    launch.return_value.close.assert_called_once()
@@ -5,6 +5,7 @@ import pytest
 from unittest.mock import MagicMock
 
 import redis.exceptions
+from fastapi import Response
 from fastapi.encoders import jsonable_encoder
 
 # 待測試的模組
@@ -191,3 +192,114 @@ def test_cache_disabled_if_redis_fails_on_startup(mocker):
     # 驗證
     assert result == {"data": "live_result_redis_disabled"}
     original_func.assert_called_once()
+
+
+def test_cache_miss_stores_serialized_json_response(mock_redis):
+    """
+    【新增】測試端點回傳已序列化的 JSON Response 時，快取會直接存入其內容。
+    """
+    mock_redis.get.return_value = None
+    live_response = Response(
+        content='{"data":"已序列化"}'.encode("utf-8"), media_type="application/json"
+    )
+
+    @cache.cache()
+    def cached_endpoint(request: MagicMock):
+        return live_response
+
+    request = mock_request_with_params(query_params={"id": "123"})
+    result = cached_endpoint(request=request)
+
+    assert result is live_response
+    mock_redis.setex.assert_called_once_with(
+        "test_cache:cached_endpoint:id=123",
+        3600 * 24,
+        'raw-json:{"data":"已序列化"}',
+    )
+
+
+def test_cache_hit_returns_serialized_json_response(mock_redis):
+    """
+    【新增】測試命中已序列化的快取內容時，直接回傳 JSON Response 而不再解析。
+    """
+    mock_redis.get.return_value = 'raw-json:{"data":"cached_result"}'
+    original_func = MagicMock()
+
+    @cache.cache()
+    def cached_endpoint(request: MagicMock):
+        return original_func(request=request)
+
+    request = mock_request_with_params(query_params={"id": "123"})
+    result = cached_endpoint(request=request)
+
+    assert isinstance(result, Response)
+    assert result.media_type == "application/json"
+    assert json.loads(result.body) == {"data": "cached_result"}
+    original_func.assert_not_called()
+    mock_redis.setex.assert_not_called()
+
+
+def test_cache_skips_compressed_response(mock_redis):
+    """【新增】測試經過壓縮的 Response 不會被寫入快取。"""
+    mock_redis.get.return_value = None
+    compressed_response = Response(
+        content=b"\x1f\x8b",
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    @cache.cache()
+    def cached_endpoint(request: MagicMock):
+        return compressed_response
+
+    request = mock_request_with_params(query_params={"id": "123"})
+    assert cached_endpoint(request=request) is compressed_response
+    mock_redis.setex.assert_not_called()
+
+
+# --- 測試 cache_per_item 批次快取 ---
+
+
+def test_cache_per_item_partial_hit(mock_redis):
+    """
+    測試批次快取部分命中的情境。
+    預期行為：
+    1. 已快取的項目 (包含快取的 null) 直接使用，不再計算。
+    2. 只有未命中的項目會交給 compute 批次計算，並逐項寫入快取。
+    """
+    # 準備：A 命中、B 命中 (快取值為 null)、C 未命中
+    mock_redis.mget.return_value = [json.dumps({"hr": 1}), "null", None]
+    compute = MagicMock(return_value={"C": {"hr": 3}})
+
+    # 執行
+    result = cache.cache_per_item(
+        mock_func, ["A", "B", "C"], params={"skip": 0}, compute=compute
+    )
+
+    # 驗證
+    assert result == {"A": {"hr": 1}, "B": None, "C": {"hr": 3}}
+    compute.assert_called_once_with(["C"])
+    mock_redis.mget.assert_called_once_with(
+        [
+            "test_cache:mock_func:player_name=A&skip=0",
+            "test_cache:mock_func:player_name=B&skip=0",
+            "test_cache:mock_func:player_name=C&skip=0",
+        ]
+    )
+    pipeline = mock_redis.pipeline.return_value
+    pipeline.setex.assert_called_once_with(
+        "test_cache:mock_func:player_name=C&skip=0", 3600 * 24, json.dumps({"hr": 3})
+    )
+    pipeline.execute.assert_called_once()
+
+
+def test_cache_per_item_redis_operational_error(mock_redis):
+    """測試 Redis 讀取失敗時，批次快取會直接計算所有項目。"""
+    mock_redis.mget.side_effect = redis.exceptions.RedisError("Operation failed")
+    compute = MagicMock(return_value={"A": 1, "B": 2})
+
+    result = cache.cache_per_item(mock_func, ["A", "B"], params={}, compute=compute)
+
+    assert result == {"A": 1, "B": 2}
+    compute.assert_called_once_with(["A", "B"])
+    mock_redis.pipeline.assert_not_called()
@@ -0,0 +1,93 @@
+# tests/test_page_archive.py
+
+import pytest
+
+from app import models, page_archive
+from app.config import settings
+
+
+@pytest.fixture
+def archive_enabled(monkeypatch, TestingSessionLocal, setup_database):
+    """啟用頁面封存，並讓封存模組使用測試資料庫。"""
+    monkeypatch.setattr(settings, "PAGE_ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(page_archive, "SessionLocal", TestingSessionLocal)
+
+
+def test_archive_page_disabled_by_default(db_session):
+    """測試預設不封存任何頁面。"""
+    assert (
+        page_archive.archive_page(page_archive.SCHEDULE, "2025-08", "<html/>") is None
+    )
+    assert db_session.query(models.PageArchiveEntryDB).count() == 0
+
+
+def test_archive_page_deduplicates_blobs_by_content_hash(archive_enabled, db_session):
+    """測試相同內容只存放一份壓縮 blob，清單則每次抓取各一筆。"""
+    html = "<div class='GameBoxDetail'>" + "<tr><td>1</td></tr>" * 500 + "</div>"
+    game_key = page_archive.game_key({"game_date": "2025-08-12", "cpbl_game_id": "176"})
+
+    first = page_archive.archive_page(
+        page_archive.BOX_SCORE, game_key, html, url="https://www.cpbl.com.tw/box"
+    )
+    second = page_archive.archive_page(page_archive.BOX_SCORE, game_key, html)
+
+    assert first == second
+    blob = db_session.get(models.PageBlobDB, first)
+    assert blob.size == len(html.encode("utf-8"))
+    assert blob.compressed_size < blob.size
+    entries = db_session.query(models.PageArchiveEntryDB).all()
+    assert [(e.archive_key, e.page_type) for e in entries] == [
+        ("2025-08-12/176", "box_score"),
+        ("2025-08-12/176", "box_score"),
+    ]
+    assert page_archive.load_entry(db_session, entries[0]) == html
+
+
+def test_archive_page_stores_structured_payloads_as_json(archive_enabled, db_session):
+    """測試瀏覽器內擷取的半局資料以 JSON 封存，讀回時還原為原本的結構。"""
+    raw_events = [{"hitter_name": "王柏融", "description_text": "一壘安打"}]
+
+    page_archive.archive_page(
+        page_archive.LIVE,
+        "2025-08-12/176",
+        raw_events,
+        part=page_archive.live_part(3, "section.bot"),
+    )
+
+    entry = db_session.query(models.PageArchiveEntryDB).one()
+    assert (entry.part, entry.content_format) == ("3-bot", "json")
+    assert page_archive.load_entry(db_session, entry) == raw_events
+
+
+def test_archive_page_failure_does_not_interrupt_scraping(monkeypatch):
+    """測試封存失敗時只記錄警告並回傳 None。"""
+    monkeypatch.setattr(settings, "PAGE_ARCHIVE_ENABLED", True)
+
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(page_archive, "SessionLocal", broken_session)
+
+    assert (
+        page_archive.archive_page(page_archive.SCHEDULE, "2025-08", "<html/>") is None
+    )
+
+
+def test_latest_entries_returns_newest_entry_per_part(archive_enabled, db_session):
+    """測試每個 (頁面類型, 片段) 只回傳最新一次的封存，並可還原片段對應的半局。"""
+    game_key = "2025-08-12/176"
+    page_archive.archive_page(page_archive.LIVE, game_key, "<old/>", part="3-bot")
+    page_archive.archive_page(page_archive.LIVE, game_key, "<new/>", part="3-bot")
+    page_archive.archive_page(page_archive.LIVE, game_key, "<top/>", part="3-top")
+    page_archive.archive_page(page_archive.SCHEDULE, "2025-08", "<html/>")
+
+    latest = page_archive.latest_entries(
+        db_session, [game_key, "2025-08-13/177"], [page_archive.LIVE]
+    )
+
+    assert list(latest) == [game_key]
+    entries = latest[game_key]
+    assert page_archive.load_entry(db_session, entries[("live", "3-bot")]) == "<new/>"
+    assert page_archive.load_entry(db_session, entries[("live", "3-top")]) == "<top/>"
+    assert page_archive.parse_live_part("3-bot") == (3, "section.bot")
+    assert page_archive.parse_live_part("3-top") == (3, "section.top")
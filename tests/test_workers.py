@@ -26,6 +26,10 @@ def mock_task_dependencies(monkeypatch):
         "crud_games": patch("app.workers.crud_games").start(),
         "fetcher": patch("app.workers.fetcher").start(),
         "schedule_parser": patch("app.workers.schedule").start(),
+        "DashboardService": patch("app.workers.DashboardService").start(),
+        "advanced_metrics": patch("app.workers.advanced_metrics").start(),
+        "at_bat_columns": patch("app.workers.at_bat_columns").start(),
+        "read_snapshot": patch("app.workers.read_snapshot").start(),
         "task_scrape_single_day_send": patch(
             "app.workers.task_scrape_single_day.send"
         ).start(),
@@ -258,6 +262,141 @@ def test_task_update_schedule_stops_on_fatal_error(mock_task_dependencies):
     assert "發生致命錯誤" in mock_logger.error.call_args[0][0]
 
 
+# --- [新增] 測試儀表板快照更新 ---
+
+
+@pytest.mark.parametrize(
+    "task_func, task_args",
+    [
+        (workers.task_scrape_single_day, ("2025-07-16", [])),
+        (workers.task_update_schedule_and_reschedule, ()),
+    ],
+)
+def test_tasks_refresh_dashboard_snapshot_on_success(
+    mock_task_dependencies, task_func, task_args
+):
+    """測試單日爬蟲與賽程更新任務成功後，會重新產生首頁儀表板快照。"""
+    mock_dashboard_service = mock_task_dependencies["DashboardService"]
+
+    task_func(*task_args)
+
+    mock_dashboard_service.assert_called_once_with(
+        db=mock_task_dependencies["SessionLocal"].return_value, settings=settings
+    )
+    mock_dashboard_service.return_value.refresh_dashboard_snapshots.assert_called_once()
+    # 每個開啟的 session 都必須關閉
+    mock_session_local = mock_task_dependencies["SessionLocal"]
+    assert (
+        mock_session_local.return_value.close.call_count
+        == mock_session_local.call_count
+    )
+
+
+def test_dashboard_snapshot_failure_does_not_fail_task(mock_task_dependencies):
+    """測試快照更新失敗時只記錄警告並回滾，任務仍會繼續清除快取。"""
+    mock_dashboard_service = mock_task_dependencies["DashboardService"]
+    mock_dashboard_service.return_value.refresh_dashboard_snapshots.side_effect = (
+        Exception("DB down")
+    )
+    mock_db = mock_task_dependencies["SessionLocal"].return_value
+
+    workers.task_scrape_single_day("2025-07-16", [])
+
+    mock_db.rollback.assert_called_once()
+    mock_task_dependencies["logger"].warning.assert_called_once()
+    mock_task_dependencies["requests_post"].assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "task_func, task_args, expected_season",
+    [
+        (workers.task_scrape_single_day, ("2025-07-16", []), 2025),
+        (workers.task_scrape_entire_month, ("2024-05",), 2024),
+        (workers.task_scrape_entire_year, ("2023",), 2023),
+        (workers.task_run_crawl_plan, ("2023",), 2023),
+    ],
+)
+def test_scrape_tasks_refresh_advanced_metrics(
+    mock_task_dependencies, task_func, task_args, expected_season
+):
+    """測試爬蟲任務完成後，會重新計算該賽季的球員進階數據並發布打席欄式快照。"""
+    task_func(*task_args)
+
+    mock_db = mock_task_dependencies["SessionLocal"].return_value
+    mock_task_dependencies[
+        "advanced_metrics"
+    ].refresh_advanced_metrics.assert_called_once_with(mock_db, expected_season)
+    mock_task_dependencies[
+        "at_bat_columns"
+    ].publish_season_columns.assert_called_once_with(mock_db, expected_season)
+
+
+@pytest.mark.parametrize(
+    "task_func, task_args",
+    [
+        (workers.task_scrape_single_day, ("2025-07-16", [])),
+        (workers.task_scrape_entire_month, ("2024-05",)),
+        (workers.task_scrape_entire_year, ("2023",)),
+        (workers.task_update_schedule_and_reschedule, ()),
+    ],
+)
+def test_tasks_export_read_snapshot(
+    mock_task_dependencies, monkeypatch, task_func, task_args
+):
+    """測試啟用唯讀快照時，寫入資料的任務完成後會匯出唯讀 SQLite 快照。"""
+    monkeypatch.setattr(settings, "SERVE_READ_SNAPSHOT", True)
+    task_func(*task_args)
+
+    mock_task_dependencies[
+        "read_snapshot"
+    ].export_read_snapshot.assert_called_once_with(
+        mock_task_dependencies["SessionLocal"].return_value
+    )
+
+
+def test_read_snapshot_export_skipped_when_not_served(mock_task_dependencies):
+    """測試未啟用 SERVE_READ_SNAPSHOT 時不匯出唯讀快照。"""
+    workers.task_scrape_entire_month("2024-05")
+
+    mock_task_dependencies["read_snapshot"].export_read_snapshot.assert_not_called()
+
+
+def test_advanced_metrics_failure_does_not_fail_task(mock_task_dependencies):
+    """測試進階數據計算失敗時只記錄警告並回滾，任務仍會繼續清除快取。"""
+    mock_task_dependencies[
+        "advanced_metrics"
+    ].refresh_advanced_metrics.side_effect = Exception("DB down")
+    mock_db = mock_task_dependencies["SessionLocal"].return_value
+
+    workers.task_scrape_entire_year("2024")
+
+    mock_db.rollback.assert_called_once()
+    mock_task_dependencies["logger"].warning.assert_called_once()
+    mock_task_dependencies["requests_post"].assert_called_once()
+
+
+def test_refresh_derived_data_rebuilds_each_season_once(mock_task_dependencies):
+    """測試整批更新後會重建各賽季的衍生資料，再更新儀表板與唯讀快照並清除快取。"""
+    mock_db = mock_task_dependencies["SessionLocal"].return_value
+
+    workers.refresh_derived_data([2025, 2024, 2025])
+
+    assert [
+        c.args
+        for c in mock_task_dependencies[
+            "advanced_metrics"
+        ].refresh_advanced_metrics.call_args_list
+    ] == [(mock_db, 2024), (mock_db, 2025)]
+    assert (
+        mock_task_dependencies["at_bat_columns"].publish_season_columns.call_count == 2
+    )
+    mock_task_dependencies[
+        "DashboardService"
+    ].return_value.refresh_dashboard_snapshots.assert_called_once()
+    mock_task_dependencies["read_snapshot"].export_read_snapshot.assert_not_called()
+    mock_task_dependencies["requests_post"].assert_called_once()
+
+
 # --- 測試其他主要任務 ---
 
 
@@ -277,6 +416,22 @@ def test_task_scrape_entire_year_success(mock_task_dependencies):
     mock_game_data_service.scrape_entire_year.assert_called_once_with("2024")
 
 
+def test_task_run_crawl_plan_skips_refresh_when_nothing_planned(
+    mock_task_dependencies,
+):
+    """[新增] 測試補爬計畫沒有任何待處理比賽時，不會重算衍生資料或清除快取。"""
+    mock_game_data_service = mock_task_dependencies["game_data_service"]
+    mock_game_data_service.scrape_planned_games.return_value = 0
+
+    workers.task_run_crawl_plan("2024")
+
+    mock_game_data_service.scrape_planned_games.assert_called_once_with("2024")
+    mock_task_dependencies[
+        "advanced_metrics"
+    ].refresh_advanced_metrics.assert_not_called()
+    mock_task_dependencies["requests_post"].assert_not_called()
+
+
 # --- 測試快取清除邏輯 ---
 
 
@@ -7,6 +7,9 @@ from app.utils.parsing_helpers import (
     map_result_short_to_type,
     calculate_last_10_games_record,
     calculate_current_streak,
+    parse_position_appearances,
+    describe_streak,
+    summarize_results,
 )
 from app.models import AtBatResultType
 from app.schemas import GameResult
@@ -76,6 +79,30 @@ def test_map_result_short_to_type(result_short, expected_type):
     assert map_result_short_to_type(result_short) == expected_type
 
 
+# --- 【新增】測試 parse_position_appearances ---
+
+
+@pytest.mark.parametrize(
+    "position_str, expected",
+    [
+        ("SS", [("SS", True)]),
+        ("(2B)", [("2B", False)]),
+        ("(PH)(C)", [("PH", False), ("C", False)]),
+        ("(PR)(LF)", [("PR", False), ("LF", False)]),
+        ("RF(CF)", [("RF", True), ("CF", False)]),
+        ("2B,SS", [("2B", True), ("SS", False)]),
+        ("dh", [("DH", True)]),
+        ("", []),
+        (None, []),
+    ],
+)
+def test_parse_position_appearances(position_str, expected):
+    """
+    測試 parse_position_appearances 能將 Box Score 位置字串拆解為 (位置, 是否先發)。
+    """
+    assert parse_position_appearances(position_str) == expected
+
+
 # --- 【新增】測試 calculate_last_10_games_record ---
 
 
@@ -172,3 +199,18 @@ def test_calculate_current_streak():
     assert calculate_current_streak(games6_win, team_name) == "1連勝"
     games6_loss = [create_mock_game(team_name, "A", 3, 5)]
     assert calculate_current_streak(games6_loss, team_name) == "1連敗"
+
+
+@pytest.mark.parametrize(
+    "streak, expected",
+    [(3, "3連勝"), (-2, "2連敗"), (0, "中止")],
+)
+def test_describe_streak(streak, expected):
+    """[新增] 測試戰績帳本的連勝/敗數值轉換為文字描述。"""
+    assert describe_streak(streak) == expected
+
+
+def test_summarize_results():
+    """[新增] 測試 W / L / T 結果字串彙總為勝-敗-和。"""
+    assert summarize_results("WWLTW") == "3-1-1"
+    assert summarize_results("") == "0-0-0"
@@ -0,0 +1,52 @@
+# tests/utils/test_rate_limiter.py
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    rate_limiter.reset()
+    yield
+    rate_limiter.reset()
+
+
+def test_wait_for_request_slot_spaces_consecutive_requests():
+    """測試連續請求會依序預約時間點，每次至少間隔 min_interval 秒。"""
+    with (
+        patch("app.utils.rate_limiter.time.monotonic", return_value=100.0),
+        patch("app.utils.rate_limiter.time.sleep") as mock_sleep,
+    ):
+        delays = [rate_limiter.wait_for_request_slot(2.0) for _ in range(3)]
+
+    assert delays == [0.0, 2.0, 4.0]
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [2.0, 4.0]
+
+
+def test_wait_for_request_slot_is_shared_across_threads(monkeypatch):
+    """測試多個執行緒共用同一個請求間隔，不會同時取得相同的時間點。"""
+    monkeypatch.setattr(rate_limiter.settings, "SCRAPER_MIN_REQUEST_INTERVAL", 1.0)
+    with (
+        patch("app.utils.rate_limiter.time.monotonic", return_value=0.0),
+        patch("app.utils.rate_limiter.time.sleep") as mock_sleep,
+    ):
+        threads = [
+            threading.Thread(target=rate_limiter.wait_for_request_slot)
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 4 個執行緒依序預約第 0、1、2、3 秒，之後的請求排在第 4 秒
+        assert sorted(call.args[0] for call in mock_sleep.call_args_list) == [
+            1.0,
+            2.0,
+            3.0,
+        ]
+        assert rate_limiter.wait_for_request_slot() == 4.0